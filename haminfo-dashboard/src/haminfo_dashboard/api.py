@@ -3,9 +3,19 @@
 
 from __future__ import annotations
 
-from flask import jsonify, request, render_template
+import json
+
+from flask import Response, current_app, jsonify, request, render_template, url_for
 
 from haminfo.db.db import setup_session
+from haminfo.response_cache import ResponseCache, conditional_response
+from haminfo_dashboard.pagination import (
+    InvalidCursor,
+    callsign_cursor,
+    decode_callsign_cursor,
+    decode_packet_cursor,
+    packet_cursor,
+)
 from haminfo_dashboard.routes import dashboard_bp
 from haminfo_dashboard.utils import get_states_for_country
 from haminfo_dashboard.queries import (
@@ -20,6 +30,7 @@ from haminfo_dashboard.queries import (
     get_station_weather_reports,
     get_all_countries_breakdown,
     get_country_stats,
+    get_country_states,
     get_country_top_stations,
 )
 from haminfo_dashboard.state_queries import (
@@ -29,6 +40,11 @@ from haminfo_dashboard.state_queries import (
     detect_state_alerts,
 )
 
+# ETag'd, precompressed bodies for slow-changing endpoints. The underlying
+# queries are memcached for longer than this, so a rebuild usually yields
+# the same body and the compressed encodings are reused.
+response_cache = ResponseCache(ttl=60)
+
 
 def _get_session():
     """Get a database session."""
@@ -36,6 +52,33 @@ def _get_session():
     return session_factory()
 
 
+@dashboard_bp.errorhandler(InvalidCursor)
+def _invalid_cursor(error):
+    return jsonify({'error': str(error)}), 400
+
+
+def _cursor_arg(decode):
+    """Decode the request's ``cursor`` argument, or None if there isn't one."""
+    cursor = request.args.get('cursor')
+    return decode(cursor) if cursor else None
+
+
+def _next_page_url(cursor: str) -> str:
+    """URL of the current endpoint with the same filters at ``cursor``."""
+    args = request.args.to_dict()
+    args.pop('offset', None)
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+
+def _with_next_cursor(response, cursor):
+    """Attach a next page cursor to a JSON list response."""
+    if cursor:
+        response.headers['X-Next-Cursor'] = cursor
+        response.headers['Link'] = f'<{_next_page_url(cursor)}>; rel="next"'
+    return response
+
+
 # Stats endpoints
 @dashboard_bp.route('/api/dashboard/stats')
 def api_stats():
@@ -142,7 +185,12 @@ def api_hourly():
 # Recent packets endpoint
 @dashboard_bp.route('/api/dashboard/packets')
 def api_packets():
-    """Recent packets - returns JSON."""
+    """Recent packets - returns JSON.
+
+    Page with the opaque ``cursor`` from the X-Next-Cursor header (also in
+    the Link header) instead of ``offset``.
+    """
+    after = _cursor_arg(decode_packet_cursor)
     session = _get_session()
     try:
         limit = request.args.get('limit', 50, type=int)
@@ -159,8 +207,12 @@ def api_packets():
             callsign=callsign,
             country=country,
             hours=hours,
+            after=after,
         )
-        return jsonify(packets)
+        next_cursor = (
+            packet_cursor(packets[-1]) if packets and len(packets) >= limit else None
+        )
+        return _with_next_cursor(jsonify(packets), next_cursor)
     finally:
         session.close()
 
@@ -168,7 +220,12 @@ def api_packets():
 # Weather stations endpoints
 @dashboard_bp.route('/api/dashboard/weather/stations')
 def api_weather_stations():
-    """Weather stations - returns HTMX partial."""
+    """Weather stations - returns HTMX partial.
+
+    A full page ends with a row that loads the next page when scrolled
+    into view.
+    """
+    after = _cursor_arg(decode_callsign_cursor)
     session = _get_session()
     try:
         limit = request.args.get('limit', 50, type=int)
@@ -190,9 +247,18 @@ def api_weather_stations():
             state=state if state else None,
             has_recent_data=has_recent_data,
             search=search if search else None,
+            after=after,
+        )
+        next_cursor = (
+            callsign_cursor(stations[-1]['callsign'])
+            if stations and len(stations) >= limit
+            else None
         )
         return render_template(
-            'dashboard/partials/weather_grid.html', stations=stations
+            'dashboard/partials/weather_grid.html',
+            stations=stations,
+            next_url=_next_page_url(next_cursor) if next_cursor else None,
+            is_next_page=after is not None,
         )
     finally:
         session.close()
@@ -200,7 +266,8 @@ def api_weather_stations():
 
 @dashboard_bp.route('/api/dashboard/weather/stations/json')
 def api_weather_stations_json():
-    """Weather stations - returns JSON."""
+    """Weather stations - returns JSON, paged like api_packets."""
+    after = _cursor_arg(decode_callsign_cursor)
     session = _get_session()
     try:
         limit = request.args.get('limit', 50, type=int)
@@ -222,8 +289,14 @@ def api_weather_stations_json():
             state=state if state else None,
             has_recent_data=has_recent_data,
             search=search if search else None,
+            after=after,
         )
-        return jsonify(stations)
+        next_cursor = (
+            callsign_cursor(stations[-1]['callsign'])
+            if stations and len(stations) >= limit
+            else None
+        )
+        return _with_next_cursor(jsonify(stations), next_cursor)
     finally:
         session.close()
 
@@ -249,6 +322,16 @@ def api_weather_countries():
         session.close()
 
 
+@dashboard_bp.route('/api/dashboard/callsigns/complete')
+def api_callsign_complete():
+    """Callsign autocomplete from the in-memory dictionary - returns JSON."""
+    from haminfo_dashboard.callsign_search import callsign_dictionary
+
+    prefix = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int), 50)
+    return jsonify(callsign_dictionary.complete(prefix, limit=limit))
+
+
 # Station detail endpoints
 @dashboard_bp.route('/api/dashboard/station/<callsign>')
 def api_station_detail(callsign: str):
@@ -283,16 +366,28 @@ def api_station_detail_json(callsign: str):
 # Station packets endpoint (HTMX partial)
 @dashboard_bp.route('/api/dashboard/station/<callsign>/packets')
 def api_station_packets(callsign: str):
-    """Station packets - returns HTMX partial."""
+    """Station packets - returns HTMX partial.
+
+    A full page ends with a row that loads older packets when scrolled
+    into view.
+    """
+    after = _cursor_arg(decode_packet_cursor)
     session = _get_session()
     try:
         limit = request.args.get('limit', 20, type=int)
         offset = request.args.get('offset', 0, type=int)
         packets = get_recent_packets(
-            session, limit=limit, offset=offset, callsign=callsign
+            session, limit=limit, offset=offset, callsign=callsign, after=after
+        )
+        next_cursor = (
+            packet_cursor(packets[-1]) if packets and len(packets) >= limit else None
         )
         return render_template(
-            'dashboard/partials/packets_table.html', packets=packets, callsign=callsign
+            'dashboard/partials/packets_table.html',
+            packets=packets,
+            callsign=callsign,
+            next_url=_next_page_url(next_cursor) if next_cursor else None,
+            is_next_page=after is not None,
         )
     finally:
         session.close()
@@ -338,18 +433,26 @@ def api_map_stations():
     """Map stations - returns GeoJSON FeatureCollection.
 
     Uses tile-based caching when bbox is provided for better performance.
-    Falls back to fast query when no bbox is provided.
+    ``total`` is the number of stations matching the filters, of which at
+    most ``limit`` are returned.
 
     Supports two modes:
     - fast=true (default): Quick load without trails
     - fast=false: Full load with trails (slower but complete)
+
+    Full mode pages by callsign: pass the ``next_cursor`` from the
+    response back as ``cursor``.
+
+    In full mode trails are simplified for ``zoom`` (default: the bbox
+    width) and sent as encoded polylines with encoded timestamps, or as
+    (lon, lat, iso_timestamp) lists with ``trail_format=points``.
     """
     from haminfo_dashboard.queries import (
-        get_map_stations_fast,
-        get_map_stations_tiled,
+        get_map_stations,
         get_map_stations_with_trails,
     )
 
+    after = _cursor_arg(decode_callsign_cursor)
     session = _get_session()
     try:
         # Parse bbox parameter (min_lon,min_lat,max_lon,max_lat)
@@ -369,6 +472,10 @@ def api_map_stations():
         hours = request.args.get('hours', 24, type=int)
         # Fast mode: skip trails for quick initial load
         fast_mode = request.args.get('fast', 'true').lower() == 'true'
+        zoom = request.args.get('zoom', type=int)
+        trail_format = request.args.get('trail_format', 'polyline')
+        if trail_format not in ('polyline', 'points'):
+            trail_format = 'polyline'
 
         # Clamp hours to valid range
         if hours not in (1, 2, 6, 24):
@@ -377,18 +484,10 @@ def api_map_stations():
         # Clamp limit to reasonable range
         limit = min(max(limit, 100), 2000)
 
-        # Use tile-based caching when bbox is provided (most common case)
-        if bbox and fast_mode:
-            stations = get_map_stations_tiled(
-                session,
-                bbox=bbox,
-                hours=hours,
-                station_type=station_type,
-                limit=limit,
-            )
-        elif fast_mode:
-            # No bbox - use fast query without caching
-            stations = get_map_stations_fast(
+        if fast_mode:
+            # Latest positions only, through the tile cache when a bbox is
+            # given
+            stations, total = get_map_stations(
                 session,
                 bbox=bbox,
                 station_type=station_type,
@@ -397,13 +496,16 @@ def api_map_stations():
             )
         else:
             # Full query with trails (slower)
-            stations = get_map_stations_with_trails(
+            stations, total = get_map_stations_with_trails(
                 session,
                 bbox=bbox,
                 station_type=station_type,
                 hours=hours,
                 limit=limit,
                 offset=offset,
+                zoom=zoom,
+                trail_format=trail_format,
+                after=after,
             )
 
         # Convert to GeoJSON FeatureCollection
@@ -429,6 +531,8 @@ def api_map_stations():
                         or station.get('received_at'),
                         'country_code': station.get('country_code'),
                         'trail': station.get('trail', []),
+                        'trail_times': station.get('trail_times'),
+                        'trail_points': station.get('trail_points'),
                     },
                 }
                 features.append(feature)
@@ -437,7 +541,10 @@ def api_map_stations():
             'type': 'FeatureCollection',
             'features': features,
             'mode': 'fast' if fast_mode else 'full',
+            'total': total,
         }
+        if not fast_mode and stations and len(stations) >= limit:
+            geojson['next_cursor'] = callsign_cursor(stations[-1]['callsign'])
 
         return jsonify(geojson)
     finally:
@@ -601,60 +708,81 @@ def api_country_top_stations_json(country_code: str):
         session.close()
 
 
-@dashboard_bp.route('/api/dashboard/countries/all')
-def api_all_countries():
-    """All countries with packet counts - returns HTMX partial."""
-    from haminfo_dashboard.utils import get_country_name, COUNTRY_FLAGS
-
+@dashboard_bp.route('/api/dashboard/country/<country_code>/states/json')
+def api_country_states_json(country_code: str):
+    """Per-state/province activity for a country - returns JSON."""
     session = _get_session()
     try:
-        countries = get_all_countries_breakdown(session)
-        # Enhance with names and flags, rename 'count' to 'packet_count'
-        for country in countries:
-            code = country['country_code']
-            country['name'] = get_country_name(code)
-            country['flag'] = COUNTRY_FLAGS.get(code, '')
-            country['packet_count'] = country.pop('count')
-        # Sort by packet count
-        countries.sort(key=lambda x: x['packet_count'], reverse=True)
-        return render_template(
-            'dashboard/partials/countries_grid.html',
-            countries=countries,
-        )
+        states = get_country_states(session, country_code.upper())
+        return jsonify(states)
     finally:
         session.close()
 
 
+def _get_all_countries_enriched(session) -> list[dict]:
+    """All countries with names and flags, sorted by packet count."""
+    from haminfo_dashboard.utils import get_country_name, COUNTRY_FLAGS
+
+    countries = get_all_countries_breakdown(session)
+    # Enhance with names and flags, rename 'count' to 'packet_count'.
+    # Work on copies so the (possibly in-process cached) rows stay intact.
+    result = []
+    for row in countries:
+        country = dict(row)
+        code = country['country_code']
+        country['name'] = get_country_name(code)
+        country['flag'] = COUNTRY_FLAGS.get(code, '')
+        country['packet_count'] = country.pop('count')
+        result.append(country)
+    # Sort by packet count
+    result.sort(key=lambda x: x['packet_count'], reverse=True)
+    return result
+
+
+@dashboard_bp.route('/api/dashboard/countries/all')
+def api_all_countries():
+    """All countries with packet counts - returns HTMX partial.
+
+    Served from the response cache with an ETag so HTMX polls that
+    send ``If-None-Match`` get a 304 until the breakdown changes.
+    """
+
+    def _build():
+        session = _get_session()
+        try:
+            return render_template(
+                'dashboard/partials/countries_grid.html',
+                countries=_get_all_countries_enriched(session),
+            )
+        finally:
+            session.close()
+
+    cached = response_cache.get_or_build('countries:all', _build, mimetype='text/html')
+    return conditional_response(cached)
+
+
 @dashboard_bp.route('/api/dashboard/countries/all/json')
 def api_all_countries_json():
     """All countries with packet counts - returns JSON."""
-    from haminfo_dashboard.utils import get_country_name, COUNTRY_FLAGS
-    from haminfo_dashboard.queries import get_dashboard_stats
 
-    session = _get_session()
-    try:
-        countries = get_all_countries_breakdown(session)
-        # Enhance with names and flags, rename 'count' to 'packet_count'
-        for country in countries:
-            code = country['country_code']
-            country['name'] = get_country_name(code)
-            country['flag'] = COUNTRY_FLAGS.get(code, '')
-            country['packet_count'] = country.pop('count')
-        # Sort by packet count
-        countries.sort(key=lambda x: x['packet_count'], reverse=True)
-
-        # Get the real total from dashboard stats (same source as home page)
-        stats = get_dashboard_stats(session)
-        total_packets = stats.get('total_packets_24h', 0)
+    def _build():
+        session = _get_session()
+        try:
+            countries = _get_all_countries_enriched(session)
+            # Get the real total from dashboard stats (same source as home page)
+            stats = get_dashboard_stats(session)
+            total_packets = stats.get('total_packets_24h', 0)
+            return current_app.json.dumps(
+                {
+                    'countries': countries,
+                    'total_packets_24h': total_packets,
+                }
+            )
+        finally:
+            session.close()
 
-        return jsonify(
-            {
-                'countries': countries,
-                'total_packets_24h': total_packets,
-            }
-        )
-    finally:
-        session.close()
+    cached = response_cache.get_or_build('countries:all:json', _build)
+    return conditional_response(cached)
 
 
 # Packet decoder endpoint
@@ -682,3 +810,41 @@ def api_decode_packet():
             'dashboard/partials/decode_error.html',
             error=result['error'],
         )
+
+
+@dashboard_bp.route('/api/dashboard/decode/batch', methods=['POST'])
+def api_decode_batch():
+    """Decode many raw APRS packets, one per line, streamed as NDJSON.
+
+    Takes a ``raw_packets`` form field or a text/plain body, such as a
+    pasted log.  Each output line is a decode result with the ``line``
+    number it came from; a final ``truncated`` record is sent if the batch
+    ran into the time limit.
+    """
+    from haminfo_dashboard.decoder import (
+        MAX_BATCH_BYTES,
+        MAX_BATCH_LINES,
+        decode_batch,
+    )
+
+    too_large = {'error': f'Batch is limited to {MAX_BATCH_BYTES} bytes'}
+    if (request.content_length or 0) > MAX_BATCH_BYTES:
+        return jsonify(too_large), 413
+    if request.mimetype in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+        text = request.form.get('raw_packets', '')
+    else:
+        # Bounded read, for chunked bodies without a Content-Length
+        body = request.stream.read(MAX_BATCH_BYTES + 1)
+        if len(body) > MAX_BATCH_BYTES:
+            return jsonify(too_large), 413
+        text = body.decode('utf-8', 'replace')
+
+    lines = text.splitlines()
+    if len(lines) > MAX_BATCH_LINES:
+        return jsonify({'error': f'Batch is limited to {MAX_BATCH_LINES} lines'}), 413
+
+    def _generate():
+        for result in decode_batch(lines):
+            yield json.dumps(result, default=str) + '\n'
+
+    return Response(_generate(), mimetype='application/x-ndjson')
@@ -5,7 +5,12 @@ from __future__ import annotations
 
 import os
 import sys
+import tempfile
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
 from flask import Flask, render_template_string, redirect, url_for, jsonify
 
 from haminfo_dashboard.routes import dashboard_bp
@@ -229,6 +234,8 @@ def create_app(config_file: str | None = None) -> Flask:
     if config_file:
         _load_haminfo_config(config_file)
         _init_cache()
+        # Serve the last warm-up results while the cache is refreshed
+        _load_warm_snapshot()
         # Start cache warming in background thread
         warming_thread = threading.Thread(target=_warm_cache, daemon=True)
         warming_thread.start()
@@ -295,72 +302,275 @@ def _init_cache() -> None:
     cache.init_cache(memcached_url, ttl=expire_time)
 
 
-def _warm_cache() -> None:
-    """Pre-populate cache with expensive queries on startup.
+# Directory (ideally on tmpfs, e.g. /dev/shm/haminfo-dashboard) for the
+# cross-worker station table. Unset keeps a per-process station cache.
+SHARED_CACHE_DIR_ENV = 'HAMINFO_DASHBOARD_SHARED_CACHE_DIR'
+SHARED_CACHE_REFRESH_ENV = 'HAMINFO_DASHBOARD_SHARED_CACHE_REFRESH'
+DEFAULT_SHARED_CACHE_REFRESH = 900
+
+# Held for the life of the process by the worker that warms the shared table
+_shared_warmer_lock = None
 
-    This runs in a background thread so the app can serve the loading page.
+
+def _init_shared_station_table(session_factory, directory: str) -> None:
+    """Attach the shared station table; warm it if no other worker does.
+
+    The first worker to take the warmer lock runs the warm-up query and
+    keeps refreshing the table in the background. Every other worker skips
+    the query and reads the table that worker publishes.
+    """
+    global _shared_warmer_lock
+    from haminfo_dashboard import shared_station_table
+    from haminfo_dashboard.station_cache import (
+        publish_shared_station_table,
+        station_cache,
+    )
+
+    station_cache.set_shared_table(shared_station_table.SharedStationTable(directory))
+
+    _shared_warmer_lock = shared_station_table.acquire_warmer_lock(directory)
+    if _shared_warmer_lock is None:
+        print(
+            f'  - Using shared station table in {directory}',
+            file=sys.stderr,
+            flush=True,
+        )
+        return
+
+    session = session_factory()
+    try:
+        stats = publish_shared_station_table(session, directory, hours=24)
+    finally:
+        session.close()
+    print(
+        f'  - Shared station table published: {stats["stations_loaded"]} stations',
+        file=sys.stderr,
+        flush=True,
+    )
+
+    interval = float(
+        os.environ.get(SHARED_CACHE_REFRESH_ENV, DEFAULT_SHARED_CACHE_REFRESH)
+    )
+
+    def _refresh_loop():
+        while True:
+            time.sleep(interval)
+            session = session_factory()
+            try:
+                publish_shared_station_table(session, directory, hours=24)
+            finally:
+                session.close()
+
+    threading.Thread(target=_refresh_loop, daemon=True).start()
+
+
+# Most map tiles re-rendered per refresh cycle; 0 disables the tile refresher
+TILE_REFRESH_BUDGET_ENV = 'HAMINFO_DASHBOARD_TILE_REFRESH_BUDGET'
+
+
+def _start_tile_refresher(session_factory) -> None:
+    """Keep the most requested map tiles cached in the background.
+
+    Only runs when memcached is configured, since the refreshed tiles
+    have nowhere to go otherwise.
+    """
+    from haminfo_dashboard.tile_refresh import DEFAULT_REFRESH_BUDGET, TileRefresher
+
+    budget = int(os.environ.get(TILE_REFRESH_BUDGET_ENV, DEFAULT_REFRESH_BUDGET))
+    if budget <= 0 or not cache.is_enabled():
+        return
+
+    refresher = TileRefresher(session_factory, budget=budget)
+    threading.Thread(target=refresher.run_forever, daemon=True).start()
+    print(
+        f'  - Tile refresher started (budget {budget} tiles)',
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+# Local file holding the last warm-up results; loaded on the next start so
+# the dashboard is ready at once and refreshes in the background.
+WARM_SNAPSHOT_ENV = 'HAMINFO_DASHBOARD_WARM_SNAPSHOT'
+WARM_SNAPSHOT_MAX_AGE_ENV = 'HAMINFO_DASHBOARD_WARM_SNAPSHOT_MAX_AGE'
+DEFAULT_WARM_SNAPSHOT = os.path.join(
+    tempfile.gettempdir(), 'haminfo-dashboard', 'warm-snapshot.json'
+)
+DEFAULT_WARM_SNAPSHOT_MAX_AGE = 86400
+
+
+def _warm_snapshot_path() -> str | None:
+    """Snapshot file from the environment; an empty value disables it."""
+    return os.environ.get(WARM_SNAPSHOT_ENV, DEFAULT_WARM_SNAPSHOT) or None
+
+
+def _load_warm_snapshot() -> bool:
+    """Serve the last warm-up snapshot, if any, and mark the app ready.
+
+    Returns:
+        True if a snapshot was loaded.
+    """
+    from haminfo_dashboard import warm_snapshot
+
+    path = _warm_snapshot_path()
+    if not path:
+        return False
+
+    max_age = float(
+        os.environ.get(WARM_SNAPSHOT_MAX_AGE_ENV, DEFAULT_WARM_SNAPSHOT_MAX_AGE)
+    )
+    snapshot = warm_snapshot.load(path, max_age)
+    if snapshot is None:
+        return False
+
+    stats = warm_snapshot.apply(snapshot)
+    print(
+        f'Loaded warm-start snapshot ({stats["values"]} queries, '
+        f'{stats["stations"]} stations, {stats["age"]:.0f}s old)',
+        file=sys.stderr,
+        flush=True,
+    )
+    startup_state.set_ready()
+    return True
+
+
+def _warm_steps(session_factory) -> list[tuple[str, Callable]]:
+    """The startup warm-up steps, as (status, step(session)) pairs.
+
+    Query steps return (cache_key, result) for the snapshot; the others
+    return None.
     """
-    from haminfo.db.db import setup_session
     from haminfo_dashboard.queries import (
         get_dashboard_stats,
         get_top_stations,
         get_country_breakdown,
         get_hourly_distribution,
     )
+    from haminfo_dashboard.callsign_search import load_callsign_dictionary
     from haminfo_dashboard.geo_cache import warm_cache as warm_geo_cache
     from haminfo_dashboard.station_cache import warm_station_cache
 
+    def query(func, **kwargs):
+        # refresh() bypasses snapshot values so the warm-up always hits the DB
+        def step(session):
+            return func.cache_key(session, **kwargs), func.refresh(session, **kwargs)
+
+        return step
+
+    def geo(session):
+        geo_stats = warm_geo_cache(session, hours=24)
+        print(
+            f'  - Geo cache warmed: {geo_stats["populated"]} cells, '
+            f'{geo_stats["errors"]} errors',
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def stations(session):
+        shared_dir = os.environ.get(SHARED_CACHE_DIR_ENV)
+        if shared_dir:
+            _init_shared_station_table(session_factory, shared_dir)
+            return
+        station_stats = warm_station_cache(session, hours=24)
+        print(
+            f'  - Station cache warmed: {station_stats["stations_loaded"]} stations',
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def callsigns(session):
+        callsign_stats = load_callsign_dictionary(session, hours=24)
+        print(
+            f'  - Callsign dictionary loaded: '
+            f'{callsign_stats["callsigns_loaded"]} callsigns',
+            file=sys.stderr,
+            flush=True,
+        )
+
+    return [
+        ('Dashboard stats', query(get_dashboard_stats)),
+        ('Top stations', query(get_top_stations, limit=10)),
+        ('Country breakdown', query(get_country_breakdown, limit=10)),
+        ('Hourly distribution', query(get_hourly_distribution)),
+        ('Reverse geocoder', geo),
+        ('Station locations', stations),
+        ('Callsign dictionary', callsigns),
+    ]
+
+
+def _warm_cache() -> None:
+    """Pre-populate cache with expensive queries on startup.
+
+    This runs in a background thread so the app can serve the loading page
+    (or, after a warm-start snapshot was loaded, the snapshot data). The
+    steps run concurrently, each with its own session, and the results are
+    written to the warm-start snapshot for the next start.
+    """
+    from haminfo.db.db import setup_session
+    from haminfo_dashboard import warm_snapshot
+    from haminfo_dashboard.station_cache import station_cache
+
     print('Warming cache with dashboard stats...', file=sys.stderr, flush=True)
 
     try:
-        startup_state.update('Connecting to database...', 1)
+        if not startup_state.ready:
+            startup_state.update('Connecting to database...', 0)
         session_factory = setup_session()
-        session = session_factory()
-
-        # Pre-cache the main dashboard queries
-        startup_state.update('Loading dashboard stats...', 2)
-        get_dashboard_stats(session)
-        print('  - Dashboard stats cached', file=sys.stderr, flush=True)
-
-        startup_state.update('Loading top stations...', 3)
-        get_top_stations(session, limit=10)
-        print('  - Top stations cached', file=sys.stderr, flush=True)
-
-        get_country_breakdown(session, limit=10)
-        print('  - Country breakdown cached', file=sys.stderr, flush=True)
-
-        startup_state.update('Loading hourly distribution...', 4)
-        get_hourly_distribution(session)
-        print('  - Hourly distribution cached', file=sys.stderr, flush=True)
-
-        # Warm geo cache for reverse geocoding
-        startup_state.update('Initializing reverse geocoder...', 5)
-        try:
-            geo_stats = warm_geo_cache(session, hours=24)
-            print(
-                f'  - Geo cache warmed: {geo_stats["populated"]} cells, '
-                f'{geo_stats["errors"]} errors',
-                file=sys.stderr,
-                flush=True,
-            )
-        except Exception as e:
-            print(f'  - Geo cache warm-up failed: {e}', file=sys.stderr, flush=True)
-
-        # Warm station location cache for live feed country routing
-        startup_state.update('Loading station locations...', 6)
-        try:
-            station_stats = warm_station_cache(session, hours=24)
-            print(
-                f'  - Station cache warmed: {station_stats["stations_loaded"]} stations',
-                file=sys.stderr,
-                flush=True,
-            )
-        except Exception as e:
-            print(f'  - Station cache warm-up failed: {e}', file=sys.stderr, flush=True)
+        steps = _warm_steps(session_factory)
+        startup_state.total_steps = len(steps)
+
+        def run(step):
+            # scoped_session hands each pool thread its own session
+            session = session_factory()
+            try:
+                return step(session)
+            finally:
+                session_factory.remove()
+
+        values = {}
+        failed = 0
+        with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+            futures = {pool.submit(run, step): name for name, step in steps}
+            for done, future in enumerate(as_completed(futures), start=1):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(
+                        f'  - {name} warm-up failed: {e}', file=sys.stderr, flush=True
+                    )
+                    continue
+                if result is not None:
+                    key, value = result
+                    values[key] = value
+                print(f'  - {name} cached', file=sys.stderr, flush=True)
+                if not startup_state.ready:
+                    startup_state.update(f'{name} loaded...', done)
+
+        # Fresh values are in place; stop serving the snapshot
+        cache.clear_stale()
+
+        path = _warm_snapshot_path()
+        if path and not failed:
+            try:
+                stations = (
+                    None
+                    if os.environ.get(SHARED_CACHE_DIR_ENV)
+                    else station_cache.entries()
+                )
+                warm_snapshot.write(path, values, stations)
+            except Exception as e:
+                print(
+                    f'  - Warm-start snapshot not written: {e}',
+                    file=sys.stderr,
+                    flush=True,
+                )
 
-        session.close()
         print('Cache warming complete', file=sys.stderr, flush=True)
 
+        _start_tile_refresher(session_factory)
+
         # Mark as ready
         startup_state.set_ready()
 
@@ -0,0 +1,158 @@
+# haminfo_dashboard/broadcaster.py
+"""Coalescing broadcaster for live feed packets.
+
+Each packet is JSON encoded once, however many rooms it goes to.  Encoded
+packets are queued per room and flushed every ``interval`` seconds as a
+single ``packets`` event carrying a JSON array, so a burst of packets
+costs each room one socket write per window instead of one per packet.
+
+A room holds at most ``max_per_window`` packets per window; when a burst
+exceeds that, the oldest queued packets are dropped (a live feed only
+shows the newest ones anyway) and counted in :attr:`stats`.
+
+Frames are :class:`EncodedFrame` strings.  :class:`FrameJSON`, passed to
+SocketIO as its json module, writes them into the Socket.IO packet as-is
+instead of encoding them again as a JSON string.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Iterable
+import json
+import logging
+
+import gevent
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.25
+DEFAULT_MAX_PER_WINDOW = 100
+
+# Compact separators, as Socket.IO uses for the rest of the packet
+_SEPARATORS = (',', ':')
+
+
+class EncodedFrame(str):
+    """JSON text that is sent to clients verbatim."""
+
+
+class FrameJSON:
+    """json module for SocketIO that passes EncodedFrame through."""
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        if isinstance(obj, list) and any(isinstance(o, EncodedFrame) for o in obj):
+            return (
+                '['
+                + ','.join(
+                    o if isinstance(o, EncodedFrame) else json.dumps(o, **kwargs)
+                    for o in obj
+                )
+                + ']'
+            )
+        return json.dumps(obj, **kwargs)
+
+    @staticmethod
+    def loads(*args, **kwargs):
+        return json.loads(*args, **kwargs)
+
+
+def encode_packet(packet_data: dict) -> str:
+    """Encode a packet once for every room it is broadcast to."""
+    return json.dumps(packet_data, separators=_SEPARATORS, default=str)
+
+
+class PacketBroadcaster:
+    """Queue packets per room and emit one combined frame per window."""
+
+    def __init__(
+        self,
+        emit: Callable[[str, EncodedFrame, str], None],
+        interval: float = DEFAULT_INTERVAL,
+        max_per_window: int = DEFAULT_MAX_PER_WINDOW,
+    ):
+        """Initialize the broadcaster.
+
+        Args:
+            emit: Called as emit(event, frame, room) to send a frame.
+            interval: Seconds per window. 0 emits every packet at once,
+                still encoded only once.
+            max_per_window: Most packets a room is sent per window.
+        """
+        self._emit = emit
+        self._interval = interval
+        self._max_per_window = max_per_window
+        self._pending: dict[str, deque[str]] = {}
+        self._greenlet = None
+        self._published = 0
+        self._sent = 0
+        self._frames = 0
+        self._dropped = 0
+
+    def publish(self, packet_data: dict, rooms: Iterable[str]) -> None:
+        """Queue a packet for the given rooms.
+
+        Args:
+            packet_data: The packet, JSON serializable.
+            rooms: Rooms to send it to.
+        """
+        encoded = encode_packet(packet_data)
+        self._published += 1
+        for room in rooms:
+            queue = self._pending.get(room)
+            if queue is None:
+                queue = self._pending[room] = deque(maxlen=self._max_per_window)
+            elif len(queue) == self._max_per_window:
+                self._dropped += 1
+            queue.append(encoded)
+
+        if self._interval <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Emit one frame to every room with queued packets."""
+        pending, self._pending = self._pending, {}
+        for room, queue in pending.items():
+            frame = EncodedFrame('[' + ','.join(queue) + ']')
+            try:
+                self._emit('packets', frame, room)
+            except Exception as e:
+                LOG.warning(f'Broadcast to {room} failed: {e}')
+                continue
+            self._frames += 1
+            self._sent += len(queue)
+
+    def start(self) -> None:
+        """Start the flush loop if it is not running."""
+        if self._interval > 0 and (self._greenlet is None or self._greenlet.dead):
+            self._greenlet = gevent.spawn(self._run)
+
+    def _run(self) -> None:
+        while True:
+            gevent.sleep(self._interval)
+            try:
+                self.flush()
+            except Exception as e:
+                LOG.error(f'Broadcast flush failed: {e}')
+
+    @property
+    def stats(self) -> dict:
+        """Get broadcast statistics."""
+        return {
+            'interval': self._interval,
+            'max_per_window': self._max_per_window,
+            'published': self._published,
+            'sent': self._sent,
+            'frames': self._frames,
+            'dropped': self._dropped,
+            'pending_rooms': len(self._pending),
+        }
+
+    def clear(self) -> None:
+        """Drop queued packets and reset statistics."""
+        self._pending.clear()
+        self._published = 0
+        self._sent = 0
+        self._frames = 0
+        self._dropped = 0
@@ -15,6 +15,10 @@ LOG = logging.getLogger(__name__)
 _client: Optional[Any] = None
 _default_ttl: int = 300
 
+# Values loaded from a warm-start snapshot. They are served when memcached
+# has nothing for the key, until the startup refresh replaces them.
+_stale: dict[str, Any] = {}
+
 
 def init_cache(url: Optional[str], ttl: int = 300) -> None:
     """Initialize memcached connection.
@@ -51,6 +55,11 @@ def init_cache(url: Optional[str], ttl: int = 300) -> None:
         _client = None
 
 
+def is_enabled() -> bool:
+    """Whether a memcached client is configured."""
+    return _client is not None
+
+
 def _make_key(key: str) -> str:
     """Convert key to memcached-safe format using MD5 hash."""
     return md5(key.encode('utf-8')).hexdigest()
@@ -66,7 +75,7 @@ def get(key: str) -> Optional[Any]:
         Cached value or None if not found/error
     """
     if _client is None:
-        return None
+        return _stale.get(key)
 
     try:
         safe_key = _make_key(key)
@@ -76,7 +85,21 @@ def get(key: str) -> Optional[Any]:
     except Exception as e:
         LOG.debug(f'Cache get error for {key}: {e}')
 
-    return None
+    return _stale.get(key)
+
+
+def seed_stale(values: dict[str, Any]) -> None:
+    """Serve snapshot values until fresh ones are computed.
+
+    Args:
+        values: Cache key to value
+    """
+    _stale.update(values)
+
+
+def clear_stale() -> None:
+    """Stop serving snapshot values."""
+    _stale.clear()
 
 
 def set(key: str, value: Any, ttl: Optional[int] = None) -> bool:
@@ -120,8 +143,7 @@ def cached(key_template: str, ttl: Optional[int] = None) -> Callable:
             ...
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
+        def key_for(*args, **kwargs) -> str:
             # Build cache key from template and function arguments
             # Skip 'session' argument for key building
             sig = func.__code__.co_varnames[:func.__code__.co_argcount]
@@ -133,9 +155,20 @@ def cached(key_template: str, ttl: Optional[int] = None) -> Callable:
 
             # Format key template
             try:
-                cache_key = key_template.format(**key_args)
+                return key_template.format(**key_args)
             except KeyError:
-                cache_key = key_template
+                return key_template
+
+        def refresh(*args, **kwargs):
+            """Recompute and store the result, ignoring cached values."""
+            result = func(*args, **kwargs)
+            if result is not None:
+                set(key_for(*args, **kwargs), result, ttl)
+            return result
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key_for(*args, **kwargs)
 
             # Try to get from cache
             result = get(cache_key)
@@ -152,6 +185,9 @@ def cached(key_template: str, ttl: Optional[int] = None) -> Callable:
                 set(cache_key, result, ttl)
 
             return result
+
+        wrapper.cache_key = key_for
+        wrapper.refresh = refresh
         return wrapper
     return decorator
 
@@ -0,0 +1,149 @@
+# haminfo_dashboard/callsign_search.py
+"""Callsign search and autocomplete.
+
+Search terms that look like a callsign (``K1ABC``, ``9M2PJU-9``) or end in
+``*`` are matched as prefixes, ``upper(callsign) LIKE 'K1ABC%'``, which the
+``*_callsign_prefix`` indexes serve.  Anything else (``ABC``, ``*PJU``) is
+still a substring match, served by the pg_trgm indexes for terms of three
+or more characters.
+
+:class:`CallsignDictionary` keeps a sorted list of recently heard
+callsigns in memory so autocomplete is a binary search instead of a query.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import TYPE_CHECKING
+import logging
+
+from sqlalchemy import func, text
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+LOG = logging.getLogger(__name__)
+
+# Prefix (1-3 chars), a digit, a 1-4 letter suffix, optional SSID
+_CALLSIGN_RE = re.compile(r'^[A-Z0-9]{1,3}[0-9][A-Z]{1,4}(-[A-Z0-9]{1,2})?$')
+_LIKE_ESCAPE = '\\'
+
+
+def _escape_like(term: str) -> str:
+    return (
+        term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+        .replace('%', _LIKE_ESCAPE + '%')
+        .replace('_', _LIKE_ESCAPE + '_')
+    )
+
+
+def like_pattern(term: str) -> tuple[str, bool]:
+    """Build the LIKE pattern for a callsign search term.
+
+    Args:
+        term: User input.
+
+    Returns:
+        (pattern, is_prefix). Prefix patterns are uppercase and meant for
+        upper(column) LIKE; substring patterns are for ILIKE.
+    """
+    term = term.strip().upper()
+    if term.startswith('*'):
+        return f'%{_escape_like(term.strip("*"))}%', False
+    if term.endswith('*') or _CALLSIGN_RE.match(term):
+        return f'{_escape_like(term.rstrip("*"))}%', True
+    return f'%{_escape_like(term)}%', False
+
+
+def callsign_filter(column, term: str):
+    """SQLAlchemy filter for a callsign search on ``column``."""
+    pattern, prefix = like_pattern(term)
+    if prefix:
+        return func.upper(column).like(pattern, escape=_LIKE_ESCAPE)
+    return column.ilike(pattern, escape=_LIKE_ESCAPE)
+
+
+class CallsignDictionary:
+    """Sorted in-memory callsign list for prefix autocomplete."""
+
+    def __init__(self, max_size: int = 500_000):
+        """Initialize the dictionary.
+
+        Args:
+            max_size: Most callsigns to hold; adds beyond it are ignored
+                until the next reload.
+        """
+        self._calls: list[str] = []
+        self._known: set[str] = set()
+        self._max_size = max_size
+
+    def load(self, callsigns) -> int:
+        """Replace the contents with the given callsigns.
+
+        Returns:
+            The number of callsigns loaded.
+        """
+        known = {call.upper() for call in callsigns if call}
+        calls = sorted(known)[: self._max_size]
+        # Swap both at once so readers never see a half-built list
+        self._calls, self._known = calls, set(calls)
+        return len(calls)
+
+    def add(self, callsign: str) -> None:
+        """Add a callsign heard since the last load."""
+        if not callsign:
+            return
+        callsign = callsign.upper()
+        if callsign in self._known or len(self._calls) >= self._max_size:
+            return
+        self._known.add(callsign)
+        bisect.insort(self._calls, callsign)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """Callsigns starting with ``prefix``, in sorted order."""
+        prefix = prefix.strip().upper()
+        if not prefix:
+            return []
+        calls = self._calls
+        start = bisect.bisect_left(calls, prefix)
+        result = []
+        for call in calls[start : start + limit]:
+            if not call.startswith(prefix):
+                break
+            result.append(call)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+# Global dictionary instance
+callsign_dictionary = CallsignDictionary()
+
+
+def load_callsign_dictionary(session: Session, hours: int = 24) -> dict:
+    """Load callsigns heard in the last N hours plus weather stations.
+
+    Args:
+        session: SQLAlchemy database session.
+        hours: How far back to look for packets.
+
+    Returns:
+        Dict with loading statistics.
+    """
+    query = text(
+        """
+        SELECT DISTINCT from_call FROM aprs_packet
+        WHERE received_at > NOW() - INTERVAL ':hours hours'
+        UNION
+        SELECT callsign FROM weather_station
+    """.replace(':hours', str(int(hours)))
+    )
+    try:
+        count = callsign_dictionary.load(row[0] for row in session.execute(query))
+        LOG.info(f'Callsign dictionary loaded with {count} callsigns')
+        return {'callsigns_loaded': count, 'hours': hours}
+    except Exception as e:
+        LOG.error(f'Failed to load callsign dictionary: {e}')
+        return {'callsigns_loaded': 0, 'hours': hours, 'error': str(e)}
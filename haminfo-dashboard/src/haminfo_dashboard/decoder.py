@@ -2,17 +2,101 @@
 
 Uses aprslib to parse raw APRS packets and generates annotated output
 with color-coded segments for display.
+
+Results are cached in-process by content hash, so re-decoding a packet
+someone pasted before (or a line repeated in a pasted log) is a dict
+lookup.  :func:`decode_batch` decodes many lines at once in chunks,
+yielding results in input order as they complete.  Chunks are decoded
+inline, giving other greenlets a turn between them, unless a decoder
+process pool is enabled with DECODE_WORKERS_ENV.
 """
 
-from typing import Any
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Iterable, Iterator, Optional
 
 import aprslib
+import gevent
+
+LOG = logging.getLogger(__name__)
+
+# Decoded results kept in the LRU cache
+DECODE_CACHE_SIZE = 4096
+
+# Per-request limits for decode_batch
+MAX_BATCH_LINES = 1000
+MAX_BATCH_BYTES = 256 * 1024
+MAX_LINE_LENGTH = 512
+BATCH_TIME_LIMIT = 10.0  # seconds
+
+# Lines decoded at a time; batches with fewer cache misses than this are
+# never sent to the pool, which is cheaper than the round trip
+BATCH_CHUNK_SIZE = 50
+
+# Number of decoder processes per web worker. Off by default: the pool's
+# manager thread and result waits run on gevent's monkey-patched
+# threading, so only enable it where that has been tried.
+DECODE_WORKERS_ENV = 'HAMINFO_DASHBOARD_DECODE_WORKERS'
+
+
+class _ResultCache:
+    """Thread-safe LRU of decode results keyed by packet digest."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(raw: str) -> bytes:
+        return hashlib.blake2b(
+            raw.encode('utf-8', 'surrogateescape'), digest_size=16
+        ).digest()
+
+    def get(self, key: bytes) -> Optional[dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: bytes, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = _ResultCache(DECODE_CACHE_SIZE)
+
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+# One slot per pool worker, shared by every request in this process
+_pool_slots: Optional[threading.BoundedSemaphore] = None
 
 
 def decode_packet(raw: str) -> dict[str, Any]:
     """
     Decode a raw APRS packet string.
 
+    Results are cached; callers must treat the returned dict as read-only.
+
     Args:
         raw: Raw APRS packet string (e.g., "W3ADO>APRS:@092345z3955.00N/...")
 
@@ -25,6 +109,16 @@ def decode_packet(raw: str) -> dict[str, Any]:
         - annotations: list - color annotation tuples for raw packet display
         - sections: dict - categorized fields for structured display
     """
+    key = _cache.key(raw)
+    result = _cache.get(key)
+    if result is None:
+        result = _decode(raw)
+        _cache.put(key, result)
+    return result
+
+
+def _decode(raw: str) -> dict[str, Any]:
+    """Decode a raw packet without consulting the cache."""
     if not raw or not raw.strip():
         return {
             'success': False,
@@ -70,6 +164,169 @@ def decode_packet(raw: str) -> dict[str, Any]:
     }
 
 
+def _error_result(raw: str, error: str) -> dict[str, Any]:
+    return {
+        'success': False,
+        'error': error,
+        'raw': raw,
+        'parsed': None,
+        'annotations': [],
+        'sections': {},
+    }
+
+
+def _decode_chunk(raws: list[str]) -> list[dict[str, Any]]:
+    """Decode a chunk of packets in a pool worker."""
+    return [_decode(raw) for raw in raws]
+
+
+def _worker_count() -> int:
+    try:
+        return max(0, int(os.environ.get(DECODE_WORKERS_ENV, 0)))
+    except ValueError:
+        return 0
+
+
+def get_pool() -> Optional[Executor]:
+    """Return the shared decoder process pool, creating it on first use.
+
+    Workers are spawned rather than forked so they don't inherit the web
+    worker's gevent hub or sockets.
+
+    Returns:
+        The pool, or None if DECODE_WORKERS_ENV is unset or 0.
+    """
+    global _pool, _pool_slots
+    with _pool_lock:
+        if _pool is None:
+            workers = _worker_count()
+            if workers:
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                _pool_slots = threading.BoundedSemaphore(workers)
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared decoder pool, if one was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def decode_batch(
+    lines: Iterable[str],
+    time_limit: float = BATCH_TIME_LIMIT,
+) -> Iterator[dict[str, Any]]:
+    """Decode many raw packets, yielding results in input order.
+
+    Blank lines are skipped and each result carries the 1-based ``line``
+    number it came from.  Lines longer than MAX_LINE_LENGTH get an error
+    result without being parsed.  Cache misses are decoded in chunks of
+    BATCH_CHUNK_SIZE, yielding to other greenlets after each chunk decoded
+    inline.  With the pool enabled, chunks go to it only while one of its
+    workers is free across all requests; otherwise they are decoded
+    inline, so concurrent large pastes can't queue up behind each other.
+    If the batch runs past ``time_limit`` seconds, outstanding chunks are
+    cancelled and a final ``{'truncated': True, ...}`` record is yielded.
+
+    Args:
+        lines: Raw packet lines, e.g. ``text.splitlines()``.
+        time_limit: Seconds allowed for the whole batch.
+
+    Yields:
+        decode_packet results with an added ``line`` key.
+    """
+    deadline = time.monotonic() + time_limit
+    numbered = [(n, line.strip()) for n, line in enumerate(lines, 1) if line.strip()]
+
+    keys: list[Optional[bytes]] = []
+    results: list[Optional[dict[str, Any]]] = []
+    misses: list[int] = []
+    for index, (_, raw) in enumerate(numbered):
+        if len(raw) > MAX_LINE_LENGTH:
+            keys.append(None)
+            results.append(
+                _error_result(raw, f'Packet longer than {MAX_LINE_LENGTH} characters.')
+            )
+            continue
+        key = _cache.key(raw)
+        keys.append(key)
+        results.append(_cache.get(key))
+        if results[-1] is None:
+            misses.append(index)
+
+    chunks = deque(
+        misses[i : i + BATCH_CHUNK_SIZE]
+        for i in range(0, len(misses), BATCH_CHUNK_SIZE)
+    )
+    pool = get_pool() if len(misses) > BATCH_CHUNK_SIZE else None
+    slots = _pool_slots
+    in_flight: deque = deque()
+
+    def release(_future):
+        slots.release()
+
+    def store(indices, decoded):
+        for index, result in zip(indices, decoded, strict=True):
+            results[index] = result
+            _cache.put(keys[index], result)
+
+    position = 0
+    try:
+        while True:
+            while position < len(results) and results[position] is not None:
+                yield {'line': numbered[position][0], **results[position]}
+                position += 1
+            if position == len(results) or time.monotonic() >= deadline:
+                break
+
+            while pool is not None and chunks and slots.acquire(blocking=False):
+                indices = chunks.popleft()
+                raws = [numbered[i][1] for i in indices]
+                future = pool.submit(_decode_chunk, raws)
+                future.add_done_callback(release)
+                in_flight.append((indices, future))
+
+            if not in_flight:
+                indices = chunks.popleft()
+                store(indices, _decode_chunk([numbered[i][1] for i in indices]))
+                gevent.sleep(0)
+                continue
+
+            indices, future = in_flight.popleft()
+            try:
+                decoded = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                in_flight.appendleft((indices, future))
+                break
+            except BrokenProcessPool:
+                LOG.warning('Decoder pool died; decoding the rest of the batch inline')
+                chunks.extendleft(reversed([indices, *(i for i, _ in in_flight)]))
+                in_flight.clear()
+                shutdown_pool()
+                pool = None
+                continue
+            store(indices, decoded)
+    finally:
+        # Also runs if the client disconnects mid-stream
+        for _, future in in_flight:
+            future.cancel()
+
+    if position < len(results):
+        yield {
+            'truncated': True,
+            'error': f'Batch exceeded the {time_limit:g}s time limit.',
+            'line': numbered[position][0],
+            'decoded': position,
+            'remaining': len(results) - position,
+        }
+
+
 def _generate_annotations(raw: str, parsed: dict) -> list[dict]:
     """
     Generate color annotations for the raw packet string.
@@ -4,10 +4,18 @@
 Uses the reverse_geocoder library for microsecond-fast country lookups
 instead of slow PostGIS ST_Contains queries. The library uses a k-d tree
 with built-in city/country data.
+
+Coordinates are quantized to a grid (0.01 degrees, roughly 1 km, by
+default) and results are memoized per grid cell in an LRU, so busy
+digipeaters and fixed stations never reach the k-d tree twice.  Misses
+from :meth:`GeoCache.lookup_many` are resolved with a single k-d tree
+query instead of one ``rg.search`` call per coordinate.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from threading import Lock
+from typing import TYPE_CHECKING, Iterable, Optional
 import logging
 
 import reverse_geocoder as rg
@@ -84,14 +92,29 @@ class LocationInfo:
 class GeoCache:
     """Fast in-memory geographic lookup using reverse_geocoder.
 
-    This replaces the slow PostGIS-based cache with a k-d tree lookup
-    that runs in microseconds. No warm-up needed - the library loads
-    its data on first use.
+    Results are cached per quantized grid cell in an LRU of ``max_size``
+    cells.  Every lookup of a cell is answered from the cell's center, so
+    a cached answer is exactly what a fresh k-d tree query would return.
     """
 
-    def __init__(self):
+    def __init__(self, max_size: int = 100_000, grid_resolution: float = 0.01):
+        """Initialize cache.
+
+        Args:
+            max_size: Maximum number of grid cells to cache. When exceeded,
+                the least recently used cell is evicted.
+            grid_resolution: Grid cell size in degrees.
+        """
+        self._cache: OrderedDict[tuple[float, float], LocationInfo] = OrderedDict()
+        self._lock = Lock()
+        self._max_size = max_size
+        self._resolution = grid_resolution
         self._initialized = False
         self._lookups = 0
+        self._searches = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
     def _ensure_initialized(self):
         """Initialize reverse_geocoder on first use."""
@@ -100,11 +123,58 @@ class GeoCache:
             LOG.info('Initializing reverse geocoder (first lookup)...')
             self._initialized = True
 
+    def _grid_key(self, lat: float, lon: float) -> tuple[float, float]:
+        """Quantize coordinates to the center of their grid cell."""
+        res = self._resolution
+        # The outer round() strips float noise, so 421 * 0.1 keys as 42.1
+        return (
+            round(round(lat / res) * res, 6),
+            round(round(lon / res) * res, 6),
+        )
+
+    def get(self, lat: float, lon: float) -> Optional[LocationInfo]:
+        """Get the cached location for the grid cell containing a point.
+
+        Args:
+            lat: Latitude in degrees.
+            lon: Longitude in degrees.
+
+        Returns:
+            Cached LocationInfo, or None if the cell is not cached.
+        """
+        key = self._grid_key(lat, lon)
+        with self._lock:
+            info = self._cache.get(key)
+            if info is None:
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return info
+
+    def put(self, lat: float, lon: float, info: LocationInfo) -> None:
+        """Cache a location for the grid cell containing a point.
+
+        Args:
+            lat: Latitude in degrees.
+            lon: Longitude in degrees.
+            info: Location to cache.
+        """
+        key = self._grid_key(lat, lon)
+        with self._lock:
+            self._store(key, info)
+
+    def _store(self, key: tuple[float, float], info: LocationInfo) -> None:
+        # Caller holds self._lock
+        self._cache[key] = info
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self._evictions += 1
+
     def lookup(self, lat: float, lon: float) -> LocationInfo:
         """Look up country and state for coordinates.
 
-        Uses reverse_geocoder's k-d tree for fast lookup (~1 microsecond).
-
         Args:
             lat: Latitude in degrees.
             lon: Longitude in degrees.
@@ -112,46 +182,110 @@ class GeoCache:
         Returns:
             LocationInfo with country_code and state_code (if US).
         """
-        self._ensure_initialized()
-        self._lookups += 1
+        return self.lookup_many([(lat, lon)])[0]
 
-        try:
-            # reverse_geocoder returns list of results, get first
-            results = rg.search((lat, lon), mode=1)  # mode=1 for single coord
-            if not results:
-                return LocationInfo(country_code=None, state_code=None)
+    def lookup_many(self, coords: Iterable[tuple[float, float]]) -> list[LocationInfo]:
+        """Look up country and state for many coordinates at once.
 
-            result = results[0]
+        Cached cells are answered from the LRU; the remaining distinct
+        cells are resolved with one k-d tree query.
+
+        Args:
+            coords: (latitude, longitude) pairs in degrees.
+
+        Returns:
+            LocationInfo per coordinate, in input order.
+        """
+        self._ensure_initialized()
+        keys = [self._grid_key(lat, lon) for lat, lon in coords]
+
+        found: dict[tuple[float, float], LocationInfo] = {}
+        with self._lock:
+            self._lookups += len(keys)
+            for key in keys:
+                info = found.get(key) or self._cache.get(key)
+                if info is None:
+                    self._misses += 1
+                    continue
+                if key not in found:
+                    self._cache.move_to_end(key)
+                    found[key] = info
+                self._hits += 1
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing:
+            resolved = self._search(missing)
+            with self._lock:
+                for key, info in zip(missing, resolved, strict=True):
+                    # Failed searches are not cached so they are retried
+                    if info is not None:
+                        self._store(key, info)
+            for key, info in zip(missing, resolved, strict=True):
+                found[key] = info or LocationInfo(country_code=None, state_code=None)
+
+        return [found[key] for key in keys]
+
+    def _search(
+        self, points: list[tuple[float, float]]
+    ) -> list[Optional[LocationInfo]]:
+        """Resolve points with a single reverse_geocoder query."""
+        self._searches += 1
+        try:
+            # mode=1 searches in this process; the tree is queried with the
+            # whole array at once
+            results = rg.search(points, mode=1)
+        except Exception as e:
+            LOG.warning(f'Reverse geocode failed for {len(points)} points: {e}')
+            return [None] * len(points)
+
+        if len(results) != len(points):
+            LOG.warning(
+                f'Reverse geocode returned {len(results)} results '
+                f'for {len(points)} points'
+            )
+            return [None] * len(points)
+
+        infos = []
+        for result in results:
             country_code = result.get('cc')
             state_code = None
 
             # For US, extract state from admin1 field
             if country_code == 'US':
-                admin1 = result.get('admin1', '')
-                state_code = US_STATE_CODES.get(admin1)
+                state_code = US_STATE_CODES.get(result.get('admin1', ''))
 
-            return LocationInfo(country_code=country_code, state_code=state_code)
+            infos.append(LocationInfo(country_code=country_code, state_code=state_code))
+        return infos
 
-        except Exception as e:
-            LOG.warning(f'Reverse geocode failed for ({lat}, {lon}): {e}')
-            return LocationInfo(country_code=None, state_code=None)
+    def __len__(self) -> int:
+        return len(self._cache)
 
     @property
     def stats(self) -> dict:
-        """Get lookup statistics."""
+        """Get cache statistics."""
+        total = self._hits + self._misses
         return {
             'lookups': self._lookups,
             'initialized': self._initialized,
-            # For compatibility with old cache interface
-            'hits': self._lookups,
-            'misses': 0,
-            'size': 0,
-            'hit_rate': 1.0,
+            'searches': self._searches,
+            'hits': self._hits,
+            'misses': self._misses,
+            'size': len(self._cache),
+            'max_size': self._max_size,
+            'grid_resolution': self._resolution,
+            'evictions': self._evictions,
+            'hit_rate': self._hits / total if total > 0 else 0.0,
         }
 
     def clear(self) -> None:
-        """Reset statistics (cache itself is in-memory, no clearing needed)."""
-        self._lookups = 0
+        """Clear the cache and reset statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._lookups = 0
+            self._searches = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
 
 
 # Global cache instance
@@ -192,24 +326,58 @@ def get_location_info(session: 'Session', lat: float, lon: float) -> LocationInf
 
 
 def warm_cache(session: 'Session', hours: int = 24) -> dict[str, int]:
-    """Warm-up function for compatibility.
+    """Pre-populate the cache with grid cells seen in recent packets.
 
-    With reverse_geocoder, no warm-up is needed - the k-d tree is
-    loaded on first lookup. This function is kept for API compatibility.
+    Loads the distinct grid cells of the last N hours of positions and
+    resolves them with one batch k-d tree query, which also loads the
+    reverse_geocoder data set before the first live packet arrives.
 
     Args:
-        session: Database session (ignored).
-        hours: Ignored.
+        session: SQLAlchemy database session.
+        hours: How far back to look for position packets.
 
     Returns:
-        Stats dict for compatibility.
+        Dict with warming statistics.
     """
-    # Trigger initialization by doing one lookup
-    geo_cache.lookup(0, 0)
+    from sqlalchemy import text
+
+    res = geo_cache.stats['grid_resolution']
+    query = text(
+        """
+        SELECT DISTINCT
+            ROUND(CAST(latitude / :res AS numeric)) * :res AS lat,
+            ROUND(CAST(longitude / :res AS numeric)) * :res AS lon
+        FROM aprs_packet
+        WHERE received_at > NOW() - INTERVAL ':hours hours'
+          AND latitude IS NOT NULL
+          AND longitude IS NOT NULL
+    """.replace(':hours', str(int(hours)))
+    )
+
+    try:
+        cells = [
+            (float(lat), float(lon))
+            for lat, lon in session.execute(query, {'res': res}).fetchall()
+        ]
+    except Exception as e:
+        LOG.error(f'Failed to load grid cells for geo cache: {e}')
+        # Still load the k-d tree so the first live lookup is fast
+        geo_cache.lookup(0, 0)
+        return {
+            'grid_cells_found': 0,
+            'populated': 0,
+            'errors': 1,
+            'cache_size': len(geo_cache),
+        }
+
+    if not cells:
+        geo_cache.lookup(0, 0)
 
+    populated = sum(1 for info in geo_cache.lookup_many(cells) if info.country_code)
+    LOG.info(f'Geo cache warmed with {populated} of {len(cells)} grid cells')
     return {
-        'grid_cells_found': 0,
-        'populated': 0,
-        'errors': 0,
-        'cache_size': 0,
+        'grid_cells_found': len(cells),
+        'populated': populated,
+        'errors': len(cells) - populated,
+        'cache_size': len(geo_cache),
     }
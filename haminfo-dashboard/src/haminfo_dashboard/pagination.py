@@ -0,0 +1,94 @@
+# haminfo_dashboard/pagination.py
+"""Opaque keyset pagination cursors.
+
+Listings page with ``WHERE (sort key) > (last row's key)`` instead of
+``OFFSET``, so a deep page costs the same as the first one.  Endpoints
+hand the last row's key to clients as a cursor: URL-safe base64 of a small
+JSON list, which clients pass back unchanged as ``?cursor=``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that wasn't produced by this module."""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort key values as an opaque cursor.
+
+    Args:
+        *values: Strings, numbers or datetimes.
+
+    Returns:
+        The cursor string.
+    """
+    data = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, length: int) -> list[Any]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: The cursor string.
+        length: Number of values the cursor must hold.
+
+    Returns:
+        The encoded values (datetimes come back as ISO strings).
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Invalid cursor') from None
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor('Invalid cursor')
+    return values
+
+
+def packet_cursor(packet: dict[str, Any]) -> str:
+    """Cursor for the page after a packet dict from get_recent_packets."""
+    return encode_cursor(packet['received_at'], packet['from_call'])
+
+
+def decode_packet_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a packet cursor to (received_at, from_call).
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    received_at, from_call = decode_cursor(cursor, 2)
+    if not isinstance(from_call, str) or not isinstance(received_at, str):
+        raise InvalidCursor('Invalid cursor')
+    try:
+        return datetime.fromisoformat(received_at), from_call
+    except ValueError:
+        raise InvalidCursor('Invalid cursor') from None
+
+
+def callsign_cursor(callsign: str) -> str:
+    """Cursor for the page after a callsign-ordered row."""
+    return encode_cursor(callsign)
+
+
+def decode_callsign_cursor(cursor: str) -> str:
+    """Decode a callsign cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    (callsign,) = decode_cursor(cursor, 1)
+    if not isinstance(callsign, str):
+        raise InvalidCursor('Invalid cursor')
+    return callsign
@@ -0,0 +1,295 @@
+# haminfo_dashboard/position_recovery.py
+"""Recover positions the ingest didn't extract from raw packets.
+
+The Rust ingest leaves latitude/longitude NULL for some position-bearing
+formats (objects, items, compressed and Mic-E positions).  Station pages
+used to work around that by running aprslib over a station's recent raw
+packets on every view.  :class:`PositionRecovery` instead scans recent
+``aprs_packet`` rows with no position whose APRS data type identifier
+says they carry one, decodes them in batches on a process pool and
+writes the position back, so the station page's stored-position query
+finds it.  A recovered position newer than the station's summary
+position also updates ``aprs_station_summary``, which the map reads.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional
+import logging
+import time
+
+from sqlalchemy import bindparam, text
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+LOG = logging.getLogger(__name__)
+
+# APRS data type identifiers of formats that carry a position: plain and
+# timestamped positions, objects, items and Mic-E (current and old)
+POSITION_DATA_TYPES = ('!', '=', '/', '@', ';', ')', '`', "'")
+
+# aprslib formats that never carry a real position
+_NON_POSITION_FORMATS = ('telemetry', 'telemetry-message', 'message', 'status')
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 100
+
+_CANDIDATES_SQL = text(
+    """
+    SELECT from_call, timestamp, received_at, raw
+    FROM aprs_packet
+    WHERE received_at > :since
+      AND (received_at, from_call, timestamp)
+          > (:after_received_at, :after_call, :after_timestamp)
+      AND latitude IS NULL
+      AND raw IS NOT NULL
+      AND substr(raw, strpos(raw, ':') + 1, 1) IN :data_types
+    ORDER BY received_at, from_call, timestamp
+    LIMIT :limit
+    """
+).bindparams(bindparam('data_types', value=POSITION_DATA_TYPES, expanding=True))
+
+_BACKFILL_SQL = text(
+    """
+    UPDATE aprs_packet SET
+        latitude = :latitude,
+        longitude = :longitude,
+        location = ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326)::geography,
+        altitude = COALESCE(altitude, :altitude),
+        speed = COALESCE(speed, :speed),
+        course = COALESCE(course, :course)
+    WHERE from_call = :from_call
+      AND timestamp = :timestamp
+      AND latitude IS NULL
+    """
+)
+
+_SUMMARY_POSITION_SQL = text(
+    """
+    UPDATE aprs_station_summary SET
+        position_at = :received_at,
+        latitude = :latitude,
+        longitude = :longitude,
+        altitude = :altitude,
+        speed = :speed,
+        course = :course,
+        updated_at = now()
+    WHERE from_call = :from_call
+      AND :received_at > COALESCE(position_at, '-infinity')
+    """
+)
+
+
+def decode_position(raw: str) -> Optional[dict[str, Any]]:
+    """Decode a position from a raw packet.
+
+    Args:
+        raw: Raw APRS packet string.
+
+    Returns:
+        Dict with latitude, longitude, altitude, speed and course, or None
+        if the packet has no plausible position.
+    """
+    try:
+        import aprslib
+
+        parsed = aprslib.parse(raw)
+    except Exception:
+        return None
+
+    # Only accept position from formats that actually contain position
+    if parsed.get('format', '') in _NON_POSITION_FORMATS:
+        return None
+
+    lat = parsed.get('latitude')
+    lon = parsed.get('longitude')
+    if lat is None or lon is None:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    # Reject coordinates above 85° latitude (likely parsing errors)
+    if abs(lat) > 85:
+        return None
+    # Reject 0,0 (null island - usually parsing error)
+    if lat == 0 and lon == 0:
+        return None
+
+    course = parsed.get('course')
+    return {
+        'latitude': lat,
+        'longitude': lon,
+        'altitude': parsed.get('altitude'),
+        'speed': parsed.get('speed'),
+        'course': int(course) if course is not None else None,
+    }
+
+
+def decode_batch(raws: list[str]) -> list[Optional[dict[str, Any]]]:
+    """Decode a chunk of raw packets; runs in a pool worker process."""
+    return [decode_position(raw) for raw in raws]
+
+
+def find_candidates(
+    session: Session,
+    since: datetime,
+    after: tuple[datetime, str, datetime],
+    limit: int,
+) -> list:
+    """Rows without a position whose data type says they have one.
+
+    Args:
+        session: Database session.
+        since: Only look at packets received after this time.
+        after: (received_at, from_call, timestamp) of the last row
+            already scanned.
+        limit: Most rows to return.
+
+    Returns:
+        Rows of (from_call, timestamp, received_at, raw), oldest first.
+    """
+    return session.execute(
+        _CANDIDATES_SQL,
+        {
+            'since': since,
+            'after_received_at': after[0],
+            'after_call': after[1],
+            'after_timestamp': after[2],
+            'limit': limit,
+        },
+    ).all()
+
+
+def backfill_positions(session: Session, updates: list[dict[str, Any]]) -> int:
+    """Write recovered positions back to aprs_packet and the summary.
+
+    Args:
+        session: Database session; committed on success.
+        updates: Dicts with from_call, timestamp, received_at and the
+            decode_position fields, oldest first.
+
+    Returns:
+        The number of rows written.
+    """
+    if not updates:
+        return 0
+    session.execute(_BACKFILL_SQL, updates)
+    session.execute(_SUMMARY_POSITION_SQL, updates)
+    session.commit()
+    return len(updates)
+
+
+class PositionRecovery:
+    """Incrementally recover positions for recent packets."""
+
+    def __init__(
+        self,
+        session_factory,
+        hours: int = 24,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: Optional[int] = None,
+    ):
+        """Initialize the worker.
+
+        Args:
+            session_factory: Callable returning a database session.
+            hours: How far back to scan.
+            batch_size: Rows fetched and written per batch.
+            chunk_size: Raw packets per pool task.
+            workers: Decoder processes (default: CPU count).
+        """
+        self._session_factory = session_factory
+        self._hours = hours
+        self._batch_size = batch_size
+        self._chunk_size = chunk_size
+        self._workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Keyset position of the last scanned row; rows that didn't
+        # decode aren't looked at again
+        self._after: tuple[datetime, str, datetime] = (
+            datetime.min,
+            '',
+            datetime.min,
+        )
+        self._stats = {'runs': 0, 'scanned': 0, 'recovered': 0}
+
+    def _decode(self, raws: list[str]) -> list[Optional[dict[str, Any]]]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        chunks = [
+            raws[i : i + self._chunk_size]
+            for i in range(0, len(raws), self._chunk_size)
+        ]
+        results = []
+        for chunk_result in self._pool.map(decode_batch, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def run_once(self) -> dict[str, int]:
+        """Scan everything new since the last run.
+
+        Returns:
+            Dict with the rows scanned and positions recovered this run.
+        """
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            hours=self._hours
+        )
+        scanned = recovered = 0
+        session = self._session_factory()
+        try:
+            while True:
+                rows = find_candidates(session, since, self._after, self._batch_size)
+                if not rows:
+                    break
+                positions = self._decode([row.raw for row in rows])
+                updates = [
+                    {
+                        'from_call': row.from_call,
+                        'timestamp': row.timestamp,
+                        'received_at': row.received_at,
+                        **position,
+                    }
+                    for row, position in zip(rows, positions, strict=True)
+                    if position
+                ]
+                recovered += backfill_positions(session, updates)
+                scanned += len(rows)
+                last = rows[-1]
+                self._after = (last.received_at, last.from_call, last.timestamp)
+                if len(rows) < self._batch_size:
+                    break
+        finally:
+            session.close()
+
+        self._stats['runs'] += 1
+        self._stats['scanned'] += scanned
+        self._stats['recovered'] += recovered
+        if scanned:
+            LOG.info(f'Position recovery: {recovered} of {scanned} packets recovered')
+        return {'scanned': scanned, 'recovered': recovered}
+
+    def run_forever(self, interval: float = 60) -> None:
+        """Run a scan every ``interval`` seconds until interrupted."""
+        try:
+            while True:
+                try:
+                    self.run_once()
+                except Exception as e:
+                    LOG.error(f'Position recovery failed: {e}')
+                time.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Shut down the decoder pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get totals since the worker started."""
+        return dict(self._stats)
@@ -3,14 +3,30 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
 import math
+import os
+import threading
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any, Optional
-
-from sqlalchemy import func, distinct, and_, text
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+
+from sqlalchemy import (
+    func,
+    distinct,
+    and_,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    union_all,
+)
 
 from haminfo.db.models.aprs_packet import APRSPacket
+from haminfo.db.models.aprs_station_summary import APRSStationSummary
 from haminfo.db.models.weather_report import WeatherStation, WeatherReport
 from haminfo_dashboard.utils import (
     get_country_from_callsign,
@@ -23,6 +39,15 @@ from haminfo_dashboard.utils import (
 )
 from haminfo_dashboard import cache
 from haminfo_dashboard.cache import cached
+from haminfo_dashboard.callsign_search import callsign_filter
+from haminfo_dashboard.rollups import ROLLUP_TOP_N
+from haminfo_dashboard.trails import (
+    DEFAULT_TOLERANCE,
+    build_trail,
+    simplify_points,
+    tolerance_for_bbox,
+    tolerance_for_zoom,
+)
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -33,6 +58,30 @@ LOG = logging.getLogger(__name__)
 # Set to True after migrations are run and aggregates are populated
 USE_CONTINUOUS_AGGREGATES = True
 
+# Feature flag for the aprs_station_summary table
+# Set to True after the migration is run and the table is rebuilt
+USE_STATION_SUMMARY = True
+
+# Set to 1 when every ingest writes the summary with each batch (the
+# Python ingest's [mqtt] station_summary, on by default; the Rust ingest's
+# [database] station_summary, off by default). Otherwise its positions lag
+# by up to one reconcile run, so the map and the station pages read the
+# latest positions from aprs_packet instead.
+MAP_FROM_SUMMARY_ENV = 'HAMINFO_DASHBOARD_MAP_FROM_SUMMARY'
+MAP_FROM_SUMMARY = os.environ.get(MAP_FROM_SUMMARY_ENV, '0').lower() in (
+    '1',
+    'true',
+    'yes',
+)
+
+# Feature flag for the aprs_country_rollup/aprs_state_rollup tables
+# Falls back to the other queries while the rollup worker isn't running
+USE_REGION_ROLLUPS = True
+
+# Rollup rows older than this (seconds, five runs of the worker) are
+# ignored, so the other queries take over when the worker stops
+ROLLUP_MAX_AGE = 300
+
 # Tile-based caching constants
 TILE_CACHE_TTL = 60  # seconds
 MAX_TILES_PER_REQUEST = 100
@@ -84,6 +133,289 @@ def get_tiles_for_bbox(
     return tiles
 
 
+def tile_cache_key(hours: int, station_type: str, tile_lat: int, tile_lon: int) -> str:
+    """Cache key of one map tile."""
+    return f'map:tile:{hours}:{station_type}:{tile_lat}:{tile_lon}'
+
+
+# Tiles whose decayed request count drops below this are forgotten
+TILE_FORGET_SCORE = 0.1
+
+# Upper bound on tiles tracked per process
+MAX_TRACKED_TILES = 20000
+
+TileKey = tuple[int, str, int, int]
+
+
+class TileTracker:
+    """Count how often each map tile is requested in this process.
+
+    Tiles are keyed by (hours, station_type, tile_lat, tile_lon). Every
+    request through the tile cache adds 1 to each tile it covers and
+    :meth:`decay` scales all counts down, so a score follows the recent
+    request rate rather than the all-time total.
+    """
+
+    def __init__(self, decay: float = 0.5):
+        """Initialize the tracker.
+
+        Args:
+            decay: Factor applied to every score by :meth:`decay`.
+        """
+        self._decay = decay
+        self._lock = threading.Lock()
+        self._scores: dict[TileKey, float] = {}
+
+    def record(
+        self, hours: int, station_type: str, tiles: Iterable[tuple[int, int]]
+    ) -> None:
+        """Count one request for each of ``tiles``."""
+        with self._lock:
+            for tile_lat, tile_lon in tiles:
+                key = (hours, station_type, tile_lat, tile_lon)
+                if key in self._scores:
+                    self._scores[key] += 1
+                elif len(self._scores) < MAX_TRACKED_TILES:
+                    self._scores[key] = 1.0
+
+    def seed(self, scores: Iterable[tuple[TileKey, float]]) -> None:
+        """Raise tiles to at least the given scores, e.g. another run's."""
+        with self._lock:
+            for key, score in scores:
+                if key in self._scores or len(self._scores) < MAX_TRACKED_TILES:
+                    self._scores[key] = max(self._scores.get(key, 0.0), score)
+
+    def hottest(
+        self, limit: int, min_score: float = 0.0
+    ) -> list[tuple[TileKey, float]]:
+        """Up to ``limit`` (tile, score) pairs scoring at least ``min_score``."""
+        with self._lock:
+            candidates = [item for item in self._scores.items() if item[1] >= min_score]
+        return heapq.nlargest(limit, candidates, key=itemgetter(1))
+
+    def decay(self) -> None:
+        """Scale every score down and forget the tiles no longer requested."""
+        with self._lock:
+            self._scores = {
+                key: score * self._decay
+                for key, score in self._scores.items()
+                if score * self._decay >= TILE_FORGET_SCORE
+            }
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+# Tile requests seen by this process, read by the tile refresher
+tile_tracker = TileTracker()
+
+
+# SRID of the lon/lat envelopes; inlined so the expressions match the
+# GiST indexes from migration c6d7e8f9a0b1
+_WGS84 = literal_column('4326')
+
+
+def _bbox_envelope(bbox: tuple[float, float, float, float]):
+    """ST_MakeEnvelope for a (min_lon, min_lat, max_lon, max_lat) bbox."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, _WGS84)
+
+
+def _packet_bbox_filter(*bboxes: tuple[float, float, float, float]) -> list[Any]:
+    """Filters for packets located inside any of the bboxes (edges included).
+
+    ``geometry(location) && envelope`` is answered together with the
+    received_at range by ix_aprs_packet_location_received_at. The planar
+    envelope is exact for points, so no latitude/longitude recheck is
+    needed.
+    """
+    location = func.geometry(APRSPacket.location)
+    return [
+        APRSPacket.location.isnot(None),
+        or_(*(location.op('&&')(_bbox_envelope(bbox)) for bbox in bboxes)),
+    ]
+
+
+def _summary_bbox_filter(*bboxes: tuple[float, float, float, float]) -> list[Any]:
+    """Filters for station summaries positioned inside any of the bboxes."""
+    point = func.ST_SetSRID(
+        func.ST_MakePoint(APRSStationSummary.longitude, APRSStationSummary.latitude),
+        _WGS84,
+    )
+    return [or_(*(point.op('&&')(_bbox_envelope(bbox)) for bbox in bboxes))]
+
+
+def _latest_station_source(
+    bboxes: Sequence[tuple[float, float, float, float]],
+    since: datetime,
+    station_type: str,
+    after: Optional[str],
+):
+    """Select the latest position of each station matching the filters.
+
+    Stations must be inside one of ``bboxes``; an empty sequence means
+    anywhere.
+
+    Reads aprs_station_summary, which already holds one position per
+    station, when the ingest keeps it current (MAP_FROM_SUMMARY) and no
+    packet type is requested: the summary only knows the type of a
+    station's latest packet. Otherwise the latest packet (of that type)
+    comes from aprs_packet with DISTINCT ON.
+    """
+    if USE_STATION_SUMMARY and MAP_FROM_SUMMARY and not station_type:
+        source = APRSStationSummary
+        columns = [
+            APRSStationSummary.last_packet_type.label('packet_type'),
+            APRSStationSummary.position_at.label('received_at'),
+        ]
+        received_at = APRSStationSummary.position_at
+    else:
+        source = APRSPacket
+        columns = [APRSPacket.packet_type, APRSPacket.received_at]
+        received_at = APRSPacket.received_at
+
+    filters = [
+        received_at >= since,
+        source.latitude.isnot(None),
+        source.longitude.isnot(None),
+    ]
+    if bboxes:
+        if source is APRSPacket:
+            filters.extend(_packet_bbox_filter(*bboxes))
+        else:
+            filters.extend(_summary_bbox_filter(*bboxes))
+    if after is not None:
+        filters.append(source.from_call > after)
+
+    query = select(
+        source.from_call,
+        source.latitude,
+        source.longitude,
+        source.symbol,
+        source.symbol_table,
+        source.speed,
+        source.course,
+        source.altitude,
+        source.comment,
+        *columns,
+    ).where(*filters)
+
+    if source is APRSPacket:
+        if station_type:
+            query = query.where(APRSPacket.packet_type == station_type)
+        query = query.distinct(APRSPacket.from_call).order_by(
+            APRSPacket.from_call, APRSPacket.received_at.desc()
+        )
+    return query.subquery('latest')
+
+
+def _map_station_dict(row: Any) -> dict[str, Any]:
+    """Compact station dict, as cached per tile."""
+    country_info = get_country_from_callsign(row.from_call)
+    return {
+        'callsign': row.from_call,
+        'latitude': row.latitude,
+        'longitude': row.longitude,
+        'packet_type': row.packet_type,
+        'symbol': row.symbol,
+        'symbol_table': row.symbol_table,
+        'speed': row.speed,
+        'course': row.course,
+        'altitude': row.altitude,
+        'comment': row.comment,
+        'received_at': row.received_at.isoformat() if row.received_at else None,
+        'country_code': country_info[0] if country_info else None,
+    }
+
+
+def query_latest_stations(
+    session: Session,
+    bbox: Optional[tuple[float, float, float, float]] = None,
+    hours: int = 24,
+    station_type: str = '',
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after: Optional[str] = None,
+    order: str = 'recent',
+) -> tuple[list[dict[str, Any]], int]:
+    """Get the latest position of each station and how many stations match.
+
+    This is the single source for every map mode. Rows and the total
+    come from one scan: ``count(*) OVER ()`` is evaluated before the
+    LIMIT, so the separate COUNT(DISTINCT from_call) over the same filters
+    is no longer needed.
+
+    Args:
+        session: Database session.
+        bbox: Optional bounding box (min_lon, min_lat, max_lon, max_lat).
+        hours: Hours of history to include.
+        station_type: Packet type filter (empty string for all).
+        limit: Maximum number of stations to return (None for all).
+        offset: Number of stations to skip. Prefer ``after``.
+        after: Only return callsigns after this one.
+        order: 'recent' for most recently heard first, or 'callsign'.
+
+    Returns:
+        Tuple of (station dicts, total matching stations). The total
+        ignores ``limit`` and ``offset`` but not ``after``; it is 0 when
+        the page is empty.
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    latest = _latest_station_source([bbox] if bbox else [], since, station_type, after)
+
+    query = select(latest, func.count().over().label('total'))
+    if order == 'callsign':
+        query = query.order_by(latest.c.from_call)
+    else:
+        query = query.order_by(latest.c.received_at.desc(), latest.c.from_call)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+
+    rows = session.execute(query).all()
+    total = rows[0].total if rows else 0
+    return [_map_station_dict(row) for row in rows], total
+
+
+def query_latest_stations_by_type(
+    session: Session,
+    regions: dict[str, tuple[int, Sequence[tuple[float, float, float, float]]]],
+) -> dict[str, list[dict[str, Any]]]:
+    """Get the latest stations for several type filters in one statement.
+
+    Each entry is answered like :func:`query_latest_stations` with that
+    packet type, window and bboxes; the selects are combined with UNION
+    ALL so the tile refresher makes one round trip per cycle.
+
+    Args:
+        session: Database session.
+        regions: station_type -> (hours, bboxes). A type's stations are
+            those heard within ``hours`` inside any of its bboxes.
+
+    Returns:
+        station_type -> station dicts, in no particular order.
+    """
+    if not regions:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    types = list(regions)
+    selects = []
+    for index, station_type in enumerate(types):
+        hours, bboxes = regions[station_type]
+        latest = _latest_station_source(
+            bboxes, now - timedelta(hours=hours), station_type, None
+        )
+        selects.append(select(latest, literal(index).label('region')))
+
+    query = selects[0] if len(selects) == 1 else union_all(*selects)
+    result: dict[str, list[dict[str, Any]]] = {t: [] for t in types}
+    for row in session.execute(query):
+        result[types[row.region]].append(_map_station_dict(row))
+    return result
+
+
 def query_tile_from_db(
     session: Session,
     tile_lat: int,
@@ -108,12 +440,12 @@ def query_tile_from_db(
     now = datetime.now(timezone.utc)
     since = now - timedelta(hours=hours)
 
-    # Build filters for the tile
+    # Build filters for the tile. The envelope includes its edges; the
+    # northern and eastern ones belong to the neighbouring tiles.
     filters = [
         APRSPacket.received_at >= since,
-        APRSPacket.latitude >= tile_lat,
+        *_packet_bbox_filter((tile_lon, tile_lat, tile_lon + 1, tile_lat + 1)),
         APRSPacket.latitude < tile_lat + 1,
-        APRSPacket.longitude >= tile_lon,
         APRSPacket.longitude < tile_lon + 1,
         APRSPacket.latitude.isnot(None),
         APRSPacket.longitude.isnot(None),
@@ -180,7 +512,8 @@ def get_tile_stations(
     Returns:
         List of station dicts.
     """
-    cache_key = f'map:tile:{hours}:{station_type}:{tile_lat}:{tile_lon}'
+    cache_key = tile_cache_key(hours, station_type, tile_lat, tile_lon)
+    tile_tracker.record(hours, station_type, [(tile_lat, tile_lon)])
 
     # Try cache first
     try:
@@ -212,11 +545,11 @@ def query_bbox_from_db(
     max_lat: float,
     hours: int,
     station_type: str,
-    max_rows: int = 20000,
+    max_rows: Optional[int] = 20000,
 ) -> list[dict[str, Any]]:
     """Query database for stations within a bounding box.
 
-    Returns the most recent packet per callsign within the bbox.
+    Returns the most recent position per callsign within the bbox.
     This is used for bulk loading when many tiles have cache misses.
 
     Args:
@@ -227,68 +560,20 @@ def query_bbox_from_db(
         max_lat: Northern edge.
         hours: Hours of history to include.
         station_type: Optional packet type filter (empty string for all).
-        max_rows: Maximum rows to fetch from DB. Limits query time for large
-            bboxes. Ordered by received_at DESC so most recent packets are
-            returned. Default 20000 (enough for ~2000+ unique stations).
+        max_rows: Maximum stations to fetch, most recently heard first
+            (None for all).
 
     Returns:
         List of compact station dicts.
     """
-    now = datetime.now(timezone.utc)
-    since = now - timedelta(hours=hours)
-
-    # Build filters for the bbox
-    filters = [
-        APRSPacket.received_at >= since,
-        APRSPacket.latitude >= min_lat,
-        APRSPacket.latitude <= max_lat,
-        APRSPacket.longitude >= min_lon,
-        APRSPacket.longitude <= max_lon,
-        APRSPacket.latitude.isnot(None),
-        APRSPacket.longitude.isnot(None),
-    ]
-
-    if station_type:
-        filters.append(APRSPacket.packet_type == station_type)
-
-    # Query with ordering to get most recent per callsign
-    # LIMIT prevents scanning entire table for very large bboxes
-    packets = (
-        session.query(APRSPacket)
-        .filter(and_(*filters))
-        .order_by(APRSPacket.received_at.desc())
-        .limit(max_rows)
-        .all()
+    stations, _ = query_latest_stations(
+        session,
+        bbox=(min_lon, min_lat, max_lon, max_lat),
+        hours=hours,
+        station_type=station_type,
+        limit=max_rows,
     )
-
-    # Deduplicate by callsign, keeping most recent
-    seen: set[str] = set()
-    result = []
-
-    for packet in packets:
-        if packet.from_call in seen:
-            continue
-        seen.add(packet.from_call)
-
-        result.append(
-            {
-                'callsign': packet.from_call,
-                'latitude': packet.latitude,
-                'longitude': packet.longitude,
-                'packet_type': packet.packet_type,
-                'symbol': packet.symbol,
-                'symbol_table': packet.symbol_table,
-                'speed': packet.speed,
-                'course': packet.course,
-                'altitude': packet.altitude,
-                'comment': packet.comment,
-                'received_at': packet.received_at.isoformat()
-                if packet.received_at
-                else None,
-            }
-        )
-
-    return result
+    return stations
 
 
 def get_map_stations_tiled(
@@ -314,24 +599,44 @@ def get_map_stations_tiled(
     Returns:
         List of station dicts sorted by recency.
     """
+    stations, _ = _get_tiled_stations(session, bbox, hours, station_type, limit)
+    return stations
+
+
+def _get_tiled_stations(
+    session: Session,
+    bbox: tuple[float, float, float, float],
+    hours: int,
+    station_type: str,
+    limit: int,
+) -> tuple[list[dict[str, Any]], int]:
+    """Get stations in a bbox through the tile cache, by recency.
+
+    Returns:
+        Tuple of (up to ``limit`` station dicts, total stations in the
+        bbox).
+    """
     min_lon, min_lat, max_lon, max_lat = bbox
 
     # Get tiles for bbox
     tiles = get_tiles_for_bbox(min_lon, min_lat, max_lon, max_lat)
 
-    # Limit tiles to prevent abuse
+    # Too many tiles to cache piecemeal (e.g. the zoomed-out default view);
+    # query the bbox directly rather than dropping the tiles past the cap
     if len(tiles) > MAX_TILES_PER_REQUEST:
-        LOG.warning(
-            f'Bbox too large: {len(tiles)} tiles, limiting to {MAX_TILES_PER_REQUEST}'
+        LOG.debug(f'Bbox spans {len(tiles)} tiles, querying without tile cache')
+        return query_latest_stations(
+            session, bbox=bbox, hours=hours, station_type=station_type, limit=limit
         )
-        tiles = tiles[:MAX_TILES_PER_REQUEST]
+
+    tile_tracker.record(hours, station_type, tiles)
 
     # Check cache for each tile, collect cached data and uncached tiles
     all_stations: dict[str, dict[str, Any]] = {}
     uncached_tiles: list[tuple[int, int]] = []
 
     for tile_lat, tile_lon in tiles:
-        cache_key = f'map:tile:{hours}:{station_type}:{tile_lat}:{tile_lon}'
+        cache_key = tile_cache_key(hours, station_type, tile_lat, tile_lon)
         try:
             cached_data = cache.get(cache_key)
             if cached_data is not None:
@@ -350,14 +655,25 @@ def get_map_stations_tiled(
             LOG.warning(f'Cache read failed for {cache_key}: {e}')
             uncached_tiles.append((tile_lat, tile_lon))
 
-    # If there are uncached tiles, do ONE database query for the whole bbox
-    # (or the uncached portion) and then cache per-tile
+    # If there are uncached tiles, do ONE database query covering all of
+    # them and then cache per-tile
     if uncached_tiles:
         LOG.debug(f'Cache miss for {len(uncached_tiles)} tiles, querying DB')
 
-        # Query the entire bbox in one go (faster than N separate queries)
+        # Query whole tiles, not just the bbox, so the edge tiles that get
+        # cached are complete for the next viewport that overlaps them.
+        # Uncapped for the same reason; the tile limit bounds the area.
+        tile_lats = [tile_lat for tile_lat, _ in uncached_tiles]
+        tile_lons = [tile_lon for _, tile_lon in uncached_tiles]
         db_stations = query_bbox_from_db(
-            session, min_lon, min_lat, max_lon, max_lat, hours, station_type
+            session,
+            min(tile_lons),
+            min(tile_lats),
+            max(tile_lons) + 1,
+            max(tile_lats) + 1,
+            hours,
+            station_type,
+            max_rows=None,
         )
 
         # Organize stations by tile for caching
@@ -383,7 +699,7 @@ def get_map_stations_tiled(
 
         # Cache each tile's data
         for (tile_lat, tile_lon), tile_stations in tiles_data.items():
-            cache_key = f'map:tile:{hours}:{station_type}:{tile_lat}:{tile_lon}'
+            cache_key = tile_cache_key(hours, station_type, tile_lat, tile_lon)
             try:
                 cache.set(cache_key, tile_stations, ttl=TILE_CACHE_TTL)
             except Exception as e:
@@ -398,10 +714,10 @@ def get_map_stations_tiled(
         )
     ]
 
-    # Sort by recency and apply limit
+    # Sort by recency
     result.sort(key=lambda s: s.get('received_at', ''), reverse=True)
 
-    return result[:limit]
+    return result[:limit], len(result)
 
 
 @cached('dashboard:stats', ttl=30)
@@ -589,11 +905,68 @@ def get_country_breakdown(session: Session, limit: int = 10) -> list[dict[str, A
     Returns:
         List of dicts with country_code, country_name, count.
     """
+    if USE_REGION_ROLLUPS:
+        result = _get_countries_from_rollup(session, limit)
+        if result:
+            return result
     if USE_CONTINUOUS_AGGREGATES:
         return _get_country_breakdown_from_aggregates(session, limit)
     return _get_country_breakdown_from_raw(session, limit)
 
 
+def _rollup_fresh_since() -> datetime:
+    """Oldest updated_at of rollup rows still served (naive UTC)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        seconds=ROLLUP_MAX_AGE
+    )
+
+
+def _get_countries_from_rollup(
+    session: Session, limit: Optional[int] = None
+) -> list[dict[str, Any]]:
+    """Get the country breakdown from aprs_country_rollup."""
+    from haminfo_dashboard.utils import COUNTRY_FLAGS
+
+    results = session.execute(
+        text("""
+        SELECT country_code, country_name, packets_24h, unique_stations
+        FROM aprs_country_rollup
+        WHERE packets_24h > 0
+          AND updated_at > :fresh_since
+        ORDER BY packets_24h DESC, country_code
+        LIMIT :limit
+    """),
+        {'limit': limit, 'fresh_since': _rollup_fresh_since()},
+    ).fetchall()
+
+    return [
+        {
+            'country_code': row.country_code,
+            'country_name': row.country_name,
+            'flag': COUNTRY_FLAGS.get(row.country_code, ''),
+            'unique_stations': int(row.unique_stations),
+            'count': int(row.packets_24h),
+        }
+        for row in results
+    ]
+
+
+def _get_country_rollup(session: Session, country_code: str) -> Optional[Any]:
+    """Get a country's aprs_country_rollup row, or None if it's stale."""
+    return session.execute(
+        text("""
+        SELECT packets_24h, unique_stations, top_stations, weather_stations
+        FROM aprs_country_rollup
+        WHERE country_code = :country_code
+          AND updated_at > :fresh_since
+    """),
+        {
+            'country_code': country_code.upper(),
+            'fresh_since': _rollup_fresh_since(),
+        },
+    ).fetchone()
+
+
 def _get_country_breakdown_from_aggregates(
     session: Session, limit: int
 ) -> list[dict[str, Any]]:
@@ -703,6 +1076,10 @@ def get_all_countries_breakdown(session: Session) -> list[dict[str, Any]]:
     Returns:
         List of dicts with country_code, country_name, count, sorted by count desc.
     """
+    if USE_REGION_ROLLUPS:
+        result = _get_countries_from_rollup(session)
+        if result:
+            return result
     # Always use fast aggregates for now - country_code coverage is still low
     # TODO: Add a daily check/flag to switch to country_code when coverage >50%
     if USE_CONTINUOUS_AGGREGATES:
@@ -833,6 +1210,17 @@ def get_country_stats(session: Session, country_code: str) -> dict[str, Any]:
     Returns:
         Dict with packets_24h, unique_stations, top_station.
     """
+    if USE_REGION_ROLLUPS:
+        rollup = _get_country_rollup(session, country_code)
+        if rollup is not None:
+            top_stations = rollup.top_stations or []
+            return {
+                'packets_24h': int(rollup.packets_24h),
+                'unique_stations': int(rollup.unique_stations),
+                'top_station': top_stations[0]['callsign'] if top_stations else None,
+                'weather_stations': int(rollup.weather_stations),
+            }
+
     # Check if country_code column exists (denormalized approach - fast)
     try:
         result = session.execute(
@@ -924,6 +1312,11 @@ def get_country_top_stations(
     Returns:
         List of dicts with callsign and count.
     """
+    if USE_REGION_ROLLUPS and limit <= ROLLUP_TOP_N:
+        rollup = _get_country_rollup(session, country_code)
+        if rollup is not None:
+            return list(rollup.top_stations or [])[:limit]
+
     # Check if country_code column exists (denormalized approach - fast)
     try:
         result = session.execute(
@@ -1079,6 +1472,54 @@ def _get_country_top_stations_from_raw(
     return stations
 
 
+@cached('dashboard:country_states:{country_code}', ttl=60)
+def get_country_states(session: Session, country_code: str) -> list[dict[str, Any]]:
+    """Get per-state/province activity for a country from aprs_state_rollup.
+
+    Only US, CA and AU are rolled up per state; other countries (and any
+    country while the rollup worker isn't running) return an empty list.
+
+    Args:
+        session: Database session.
+        country_code: ISO 3166-1 alpha-2 country code.
+
+    Returns:
+        List of dicts with state_code, state_name, packets_24h,
+        unique_stations, top_station and weather_stations, busiest first.
+    """
+    if not USE_REGION_ROLLUPS:
+        return []
+
+    results = session.execute(
+        text("""
+        SELECT state_code, state_name, packets_24h, unique_stations,
+               top_stations, weather_stations
+        FROM aprs_state_rollup
+        WHERE country_code = :country_code
+          AND updated_at > :fresh_since
+        ORDER BY packets_24h DESC, state_code
+    """),
+        {
+            'country_code': country_code.upper(),
+            'fresh_since': _rollup_fresh_since(),
+        },
+    ).fetchall()
+
+    return [
+        {
+            'state_code': row.state_code,
+            'state_name': row.state_name,
+            'packets_24h': int(row.packets_24h),
+            'unique_stations': int(row.unique_stations),
+            'top_station': row.top_stations[0]['callsign']
+            if row.top_stations
+            else None,
+            'weather_stations': int(row.weather_stations),
+        }
+        for row in results
+    ]
+
+
 @cached('dashboard:daily_packets', ttl=300)
 def get_daily_packet_counts(session: Session, days: int = 7) -> dict[str, list]:
     """Get packet count per day for the last N days.
@@ -1266,6 +1707,7 @@ def get_recent_packets(
     callsign: Optional[str] = None,
     country: Optional[str] = None,
     hours: int = 24,
+    after: Optional[tuple[datetime, str]] = None,
 ) -> list[dict[str, Any]]:
     """Get recent packets with optional filters.
 
@@ -1274,26 +1716,37 @@ def get_recent_packets(
     Args:
         session: Database session.
         limit: Maximum number of packets to return.
-        offset: Number of packets to skip.
-        callsign: Filter by callsign (partial match).
+        offset: Number of packets to skip. Prefer ``after``, which doesn't
+            get slower on deep pages.
+        callsign: Filter by callsign (prefix match for callsign-like input or
+            a trailing '*', otherwise partial match).
         country: Filter by country code (uses denormalized country_code column).
         hours: Time window in hours (default 24). Limits query to recent data
             for fast performance with TimescaleDB compressed chunks.
+        after: (received_at, from_call) of the last packet on the previous
+            page; only older packets are returned.
 
     Returns:
-        List of packet dicts.
+        List of packet dicts, newest first.
     """
     now = datetime.now(timezone.utc)
     since = now - timedelta(hours=hours)
 
-    query = session.query(APRSPacket).order_by(APRSPacket.received_at.desc())
+    query = session.query(APRSPacket).order_by(
+        APRSPacket.received_at.desc(), APRSPacket.from_call.desc()
+    )
+
+    if after:
+        query = query.filter(
+            tuple_(APRSPacket.received_at, APRSPacket.from_call) < tuple_(*after)
+        )
 
     # Always add time constraint for performance with TimescaleDB compression
     # This prevents scanning compressed historical chunks
     query = query.filter(APRSPacket.received_at >= since)
 
     if callsign:
-        query = query.filter(APRSPacket.from_call.ilike(f'%{callsign}%'))
+        query = query.filter(callsign_filter(APRSPacket.from_call, callsign))
 
     # Use denormalized country_code column for fast filtering
     if country:
@@ -1341,8 +1794,13 @@ def get_recent_packets(
     return result
 
 
+# Stations read per query while filling a weather stations page
+WEATHER_STATION_BATCH = 200
+
+
 @cached(
-    'dashboard:wx_stations:{limit}:{offset}:{country}:{state}:{has_recent_data}:{search}'
+    'dashboard:wx_stations:{limit}:{offset}:{country}:{state}:{has_recent_data}'
+    ':{search}:{after}'
 )
 def get_weather_stations(
     session: Session,
@@ -1352,17 +1810,24 @@ def get_weather_stations(
     state: Optional[str] = None,
     has_recent_data: bool = False,
     search: Optional[str] = None,
+    after: Optional[str] = None,
 ) -> list[dict[str, Any]]:
     """Get weather stations with their latest reports.
 
+    Stations are read in callsign order a batch at a time until the page
+    is full, rather than loading every station up front.
+
     Args:
         session: Database session.
         limit: Maximum number of stations to return.
-        offset: Number of stations to skip.
+        offset: Number of stations to skip. Prefer ``after``.
         country: Filter by country code.
         state: Filter by state/province code (US, CA, AU only).
         has_recent_data: Only return stations with reports in last 24h.
-        search: Filter by callsign (partial match, case-insensitive).
+        search: Filter by callsign (case-insensitive; prefix match for
+            callsign-like input or a trailing '*', otherwise partial match).
+        after: Callsign of the last station on the previous page; only
+            later callsigns are returned.
 
     Returns:
         List of weather station dicts with latest report data.
@@ -1374,76 +1839,101 @@ def get_weather_stations(
 
     # Apply callsign search filter at DB level for efficiency
     if search:
-        query = query.filter(WeatherStation.callsign.ilike(f'%{search}%'))
-
-    stations_list = query.all()
+        query = query.filter(callsign_filter(WeatherStation.callsign, search))
 
+    wanted = limit + offset
+    batch_size = max(wanted, WEATHER_STATION_BATCH)
     result = []
-    for station in stations_list:
-        report_query = session.query(WeatherReport).filter(
-            WeatherReport.weather_station_id == station.id
-        )
+    while len(result) < wanted:
+        batch_query = query
+        if after is not None:
+            batch_query = batch_query.filter(WeatherStation.callsign > after)
+        batch = batch_query.limit(batch_size).all()
+
+        for station in batch:
+            station_dict = _weather_station_dict(
+                session, station, last_24h, has_recent_data, country, state
+            )
+            if station_dict:
+                result.append(station_dict)
+                if len(result) >= wanted:
+                    break
 
-        if has_recent_data:
-            report_query = report_query.filter(WeatherReport.time >= last_24h)
+        if len(batch) < batch_size:
+            break
+        after = batch[-1].callsign
 
-        latest_report = report_query.order_by(WeatherReport.time.desc()).first()
+    return result[offset : offset + limit]
 
-        # Skip stations with no reports at all
-        if not latest_report:
-            continue
 
-        # Get country from coordinates first (more reliable for weather stations)
-        # Fall back to callsign prefix if coords don't match any country
-        country_info = get_country_from_coords(station.latitude, station.longitude)
-        if not country_info:
-            country_info = get_country_from_callsign(station.callsign)
+def _weather_station_dict(
+    session: Session,
+    station: WeatherStation,
+    last_24h: datetime,
+    has_recent_data: bool,
+    country: Optional[str],
+    state: Optional[str],
+) -> Optional[dict[str, Any]]:
+    """Build a weather station listing entry, or None if it's filtered out."""
+    report_query = session.query(WeatherReport).filter(
+        WeatherReport.weather_station_id == station.id
+    )
 
-        if country:
-            if not country_info or country_info[0] != country:
-                continue
+    if has_recent_data:
+        report_query = report_query.filter(WeatherReport.time >= last_24h)
 
-        # Get state info for supported countries
-        state_info = None
-        if country_info and country_info[0] in ('US', 'CA', 'AU'):
-            state_info = get_state_from_coords(
-                station.latitude, station.longitude, country_info[0]
-            )
+    latest_report = report_query.order_by(WeatherReport.time.desc()).first()
 
-        # Filter by state if specified
-        if state:
-            if not state_info or state_info[0] != state:
-                continue
+    # Skip stations with no reports at all
+    if not latest_report:
+        return None
 
-        station_dict = {
-            'id': station.id,
-            'callsign': station.callsign,
-            'latitude': station.latitude,
-            'longitude': station.longitude,
-            'comment': station.comment,
-            'country_code': country_info[0] if country_info else None,
-            'country_name': country_info[1] if country_info else None,
-            'state_code': state_info[0] if state_info else None,
-            'state_name': state_info[1] if state_info else None,
-        }
+    # Get country from coordinates first (more reliable for weather stations)
+    # Fall back to callsign prefix if coords don't match any country
+    country_info = get_country_from_coords(station.latitude, station.longitude)
+    if not country_info:
+        country_info = get_country_from_callsign(station.callsign)
 
-        station_dict['latest_report'] = {
-            'time': latest_report.time.isoformat() if latest_report.time else None,
-            'temperature': convert_temperature_to_celsius(
-                latest_report.temperature, latest_report.time
-            ),
-            'humidity': latest_report.humidity,
-            'pressure': latest_report.pressure,
-            'wind_speed': latest_report.wind_speed,
-            'wind_direction': latest_report.wind_direction,
-        }
+    if country:
+        if not country_info or country_info[0] != country:
+            return None
 
-        result.append(station_dict)
+    # Get state info for supported countries
+    state_info = None
+    if country_info and country_info[0] in ('US', 'CA', 'AU'):
+        state_info = get_state_from_coords(
+            station.latitude, station.longitude, country_info[0]
+        )
 
-        if len(result) >= limit + offset:
-            break
+    # Filter by state if specified
+    if state:
+        if not state_info or state_info[0] != state:
+            return None
+
+    station_dict = {
+        'id': station.id,
+        'callsign': station.callsign,
+        'latitude': station.latitude,
+        'longitude': station.longitude,
+        'comment': station.comment,
+        'country_code': country_info[0] if country_info else None,
+        'country_name': country_info[1] if country_info else None,
+        'state_code': state_info[0] if state_info else None,
+        'state_name': state_info[1] if state_info else None,
+    }
 
-    return result[offset : offset + limit]
+    station_dict['latest_report'] = {
+        'time': latest_report.time.isoformat() if latest_report.time else None,
+        'temperature': convert_temperature_to_celsius(
+            latest_report.temperature, latest_report.time
+        ),
+        'humidity': latest_report.humidity,
+        'pressure': latest_report.pressure,
+        'wind_speed': latest_report.wind_speed,
+        'wind_direction': latest_report.wind_direction,
+    }
+
+    return station_dict
 
 
 @cached('dashboard:wx_countries')
@@ -1456,6 +1946,27 @@ def get_weather_countries(session: Session) -> list[dict[str, Any]]:
     Returns:
         List of dicts with country_code, country_name, count.
     """
+    if USE_REGION_ROLLUPS:
+        results = session.execute(
+            text("""
+            SELECT country_code, country_name, weather_stations
+            FROM aprs_country_rollup
+            WHERE weather_stations > 0
+              AND updated_at > :fresh_since
+            ORDER BY weather_stations DESC, country_code
+        """),
+            {'fresh_since': _rollup_fresh_since()},
+        ).fetchall()
+        if results:
+            return [
+                {
+                    'country_code': row.country_code,
+                    'country_name': row.country_name,
+                    'count': int(row.weather_stations),
+                }
+                for row in results
+            ]
+
     # Only get stations that have at least one weather report
     from sqlalchemy import exists
 
@@ -1503,10 +2014,109 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
     Returns:
         Dict with station details or None if not found.
     """
-    callsign_upper = callsign.upper()
+    if USE_STATION_SUMMARY:
+        detail = _get_station_detail_from_summary(session, callsign)
+        if detail is not None:
+            return detail
+    return _get_station_detail_from_raw(session, callsign)
 
-    latest_packet = (
-        session.query(APRSPacket)
+
+def _get_station_detail_from_summary(
+    session: Session, callsign: str
+) -> Optional[dict[str, Any]]:
+    """Get station details from aprs_station_summary.
+
+    One primary-key lookup plus one read of aprs_station_stats_hourly.
+    Unless the ingest keeps the summary current (MAP_FROM_SUMMARY),
+    last_seen, symbol, comment and position come from the station's
+    latest packet instead. Returns None for stations without a summary
+    row.
+    """
+    summary = session.get(APRSStationSummary, callsign.upper())
+    if summary is None:
+        return None
+
+    counts = session.execute(
+        text("""
+        SELECT
+            COALESCE(SUM(packet_count) FILTER (
+                WHERE bucket >= NOW() - INTERVAL '24 hours'), 0) AS packets_24h,
+            COALESCE(SUM(packet_count), 0) AS packets_7d
+        FROM aprs_station_stats_hourly
+        WHERE from_call = :callsign
+          AND bucket >= NOW() - INTERVAL '7 days'
+    """),
+        {'callsign': summary.from_call},
+    ).fetchone()
+
+    latest = summary
+    last_seen = summary.last_seen
+    position_at = summary.position_at
+    if not MAP_FROM_SUMMARY:
+        # The summary's latest-packet columns lag by up to one reconcile run
+        packet = (
+            session.query(APRSPacket)
+            .filter(APRSPacket.from_call == summary.from_call)
+            .order_by(APRSPacket.received_at.desc())
+            .first()
+        )
+        if packet is not None:
+            latest = packet
+            last_seen = position_at = packet.received_at
+
+    lat, lon = latest.latitude, latest.longitude
+    alt, spd, crs = latest.altitude, latest.speed, latest.course
+    if lat is None or lon is None:
+        position_at = None
+        # The latest packet carries no position (telemetry, status, ...),
+        # or position_recovery backfilled it after the summary row was
+        # written
+        position = (
+            session.query(APRSPacket)
+            .filter(
+                APRSPacket.from_call == summary.from_call,
+                APRSPacket.latitude.isnot(None),
+                APRSPacket.longitude.isnot(None),
+            )
+            .order_by(APRSPacket.received_at.desc())
+            .first()
+        )
+        if position:
+            lat, lon = position.latitude, position.longitude
+            alt, spd, crs = position.altitude, position.speed, position.course
+            position_at = position.received_at
+
+    return {
+        'callsign': summary.from_call,
+        'last_seen': last_seen.isoformat() if last_seen else None,
+        'latitude': lat,
+        'longitude': lon,
+        'altitude': alt,
+        'speed': spd,
+        'course': crs,
+        'symbol': latest.symbol,
+        'symbol_table': latest.symbol_table,
+        'comment': latest.comment,
+        'packets_24h': int(counts.packets_24h) if counts else 0,
+        'packets_7d': int(counts.packets_7d) if counts else 0,
+        'packets_total': summary.packet_count,
+        'first_seen': summary.first_seen.strftime('%Y-%m-%d')
+        if summary.first_seen
+        else None,
+        'packet_types': dict(summary.type_counts_24h or {}),
+        'position_last_seen': position_at.isoformat() if position_at else None,
+        **_station_region(callsign, lat, lon),
+    }
+
+
+def _get_station_detail_from_raw(
+    session: Session, callsign: str
+) -> Optional[dict[str, Any]]:
+    """Get station details from aprs_packet (slow fallback)."""
+    callsign_upper = callsign.upper()
+
+    latest_packet = (
+        session.query(APRSPacket)
         .filter(APRSPacket.from_call == callsign_upper)
         .order_by(APRSPacket.received_at.desc())
         .first()
@@ -1514,7 +2124,9 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
 
     # Also get the most recent packet WITH position data in the database
     # This handles cases where the latest packet is telemetry/message/status
-    # but older packets have valid position information
+    # but older packets have valid position information. Positions the
+    # ingest missed (objects, Mic-E, ...) are backfilled by the
+    # position_recovery worker, so no raw packets are parsed here.
     latest_position_packet = (
         session.query(APRSPacket)
         .filter(
@@ -1526,60 +2138,6 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
         .first()
     )
 
-    # If no position packet found in DB, try parsing recent raw packets with aprslib
-    # This handles cases where Rust ingest didn't extract position (e.g., objects)
-    parsed_position = None
-    if not latest_position_packet:
-        # Get a few recent packets to try parsing (not just the latest)
-        recent_packets = (
-            session.query(APRSPacket)
-            .filter(APRSPacket.from_call == callsign_upper)
-            .order_by(APRSPacket.received_at.desc())
-            .limit(20)
-            .all()
-        )
-
-        for packet in recent_packets:
-            if not packet.raw:
-                continue
-            try:
-                import aprslib
-
-                parsed = aprslib.parse(packet.raw)
-
-                # Only accept position from formats that actually contain position
-                # Reject telemetry and other non-position formats
-                fmt = parsed.get('format', '')
-                if fmt in ('telemetry', 'telemetry-message', 'message', 'status'):
-                    continue
-
-                lat = parsed.get('latitude')
-                lon = parsed.get('longitude')
-
-                # Validate coordinates are within valid ranges
-                # Also reject coordinates that are suspiciously close to 0,0 or poles
-                if lat is not None and lon is not None:
-                    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
-                        continue
-                    # Reject coordinates above 85° latitude (likely parsing errors)
-                    if abs(lat) > 85:
-                        continue
-                    # Reject 0,0 (null island - usually parsing error)
-                    if lat == 0 and lon == 0:
-                        continue
-
-                    parsed_position = {
-                        'latitude': lat,
-                        'longitude': lon,
-                        'altitude': parsed.get('altitude'),
-                        'speed': parsed.get('speed'),
-                        'course': parsed.get('course'),
-                        'received_at': packet.received_at,
-                    }
-                    break  # Found valid position, stop searching
-            except Exception:
-                continue
-
     if not latest_packet:
         # Fall back to weather station table - some weather stations
         # may not have APRS packets but exist in WeatherStation table
@@ -1689,8 +2247,7 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
 
     # Determine position data source (in priority order):
     # 1. DB packet with position data
-    # 2. Parsed position from raw packet
-    # 3. Latest packet (which may have None lat/lon)
+    # 2. Latest packet (which may have None lat/lon)
     if latest_position_packet:
         lat = latest_position_packet.latitude
         lon = latest_position_packet.longitude
@@ -1702,17 +2259,6 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
             if latest_position_packet.received_at
             else None
         )
-    elif parsed_position:
-        lat = parsed_position['latitude']
-        lon = parsed_position['longitude']
-        alt = parsed_position['altitude']
-        spd = parsed_position['speed']
-        crs = parsed_position['course']
-        pos_last_seen = (
-            parsed_position['received_at'].isoformat()
-            if parsed_position['received_at']
-            else None
-        )
     else:
         lat = latest_packet.latitude
         lon = latest_packet.longitude
@@ -1721,18 +2267,6 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
         crs = latest_packet.course
         pos_last_seen = None
 
-    # Get country - prefer coords lookup over callsign prefix
-    country_info = None
-    if lat is not None and lon is not None:
-        country_info = get_country_from_coords(lat, lon)
-    if not country_info:
-        country_info = get_country_from_callsign(callsign)
-
-    # Get state for US stations
-    state_info = None
-    if country_info and country_info[0] == 'US' and lat is not None and lon is not None:
-        state_info = get_state_from_coords(lat, lon, 'US')
-
     return {
         'callsign': latest_packet.from_call,
         'last_seen': latest_packet.received_at.isoformat()
@@ -1751,9 +2285,30 @@ def get_station_detail(session: Session, callsign: str) -> Optional[dict[str, An
         'packets_total': packets_total,
         'first_seen': first_seen,
         'packet_types': packet_types,
+        'position_last_seen': pos_last_seen,
+        **_station_region(callsign, lat, lon),
+    }
+
+
+def _station_region(
+    callsign: str, lat: Optional[float], lon: Optional[float]
+) -> dict[str, Optional[str]]:
+    """Country and (US) state of a station for the detail page."""
+    # Get country - prefer coords lookup over callsign prefix
+    country_info = None
+    if lat is not None and lon is not None:
+        country_info = get_country_from_coords(lat, lon)
+    if not country_info:
+        country_info = get_country_from_callsign(callsign)
+
+    # Get state for US stations
+    state_info = None
+    if country_info and country_info[0] == 'US' and lat is not None and lon is not None:
+        state_info = get_state_from_coords(lat, lon, 'US')
+
+    return {
         'country_code': country_info[0] if country_info else None,
         'country_name': country_info[1] if country_info else None,
-        'position_last_seen': pos_last_seen,
         'state_code': state_info[0] if state_info else None,
         'state_name': state_info[1] if state_info else None,
     }
@@ -1828,238 +2383,36 @@ def get_station_weather_reports(
     }
 
 
-@cached('dashboard:map:{bbox}:{station_type}:{limit}')
 def get_map_stations(
     session: Session,
     bbox: Optional[tuple[float, float, float, float]] = None,
-    station_type: Optional[str] = None,
-    limit: int = 1000,
-) -> list[dict[str, Any]]:
-    """Get stations for map display with optional bounding box filter.
-
-    Args:
-        session: Database session.
-        bbox: Optional bounding box (min_lon, min_lat, max_lon, max_lat).
-        station_type: Optional packet type filter.
-        limit: Maximum number of stations to return.
-
-    Returns:
-        List of station dicts with position data.
-    """
-    now = datetime.now(timezone.utc)
-    last_24h = now - timedelta(hours=24)
-
-    # Build base filters for the subquery
-    subq_filters = [
-        APRSPacket.received_at >= last_24h,
-        APRSPacket.latitude.isnot(None),
-        APRSPacket.longitude.isnot(None),
-    ]
-
-    # If filtering by station type, include it in subquery
-    # This ensures we find the latest packet OF THAT TYPE for each station
-    if station_type:
-        subq_filters.append(APRSPacket.packet_type == station_type)
-
-    latest_subq = (
-        session.query(
-            APRSPacket.from_call,
-            func.max(APRSPacket.received_at).label('max_received'),
-        )
-        .filter(*subq_filters)
-        .group_by(APRSPacket.from_call)
-        .subquery()
-    )
-
-    query = session.query(APRSPacket).join(
-        latest_subq,
-        (APRSPacket.from_call == latest_subq.c.from_call)
-        & (APRSPacket.received_at == latest_subq.c.max_received),
-    )
-
-    if bbox:
-        min_lon, min_lat, max_lon, max_lat = bbox
-        query = query.filter(
-            APRSPacket.longitude >= min_lon,
-            APRSPacket.longitude <= max_lon,
-            APRSPacket.latitude >= min_lat,
-            APRSPacket.latitude <= max_lat,
-        )
-
-    # Also filter main query by station_type to match the subquery
-    if station_type:
-        query = query.filter(APRSPacket.packet_type == station_type)
-
-    packets = query.limit(limit).all()
-
-    result = []
-    for packet in packets:
-        country_info = get_country_from_callsign(packet.from_call)
-        result.append(
-            {
-                'callsign': packet.from_call,
-                'latitude': packet.latitude,
-                'longitude': packet.longitude,
-                'packet_type': packet.packet_type,
-                'symbol': packet.symbol,
-                'symbol_table': packet.symbol_table,
-                'speed': packet.speed,
-                'course': packet.course,
-                'altitude': packet.altitude,
-                'comment': packet.comment,
-                'last_seen': packet.received_at.isoformat()
-                if packet.received_at
-                else None,
-                'country_code': country_info[0] if country_info else None,
-            }
-        )
-
-    return result
-
-
-def get_map_stations_fast(
-    session: Session,
-    bbox: Optional[tuple[float, float, float, float]] = None,
-    station_type: Optional[str] = None,
+    station_type: str = '',
     hours: int = 24,
     limit: int = 500,
-) -> list[dict[str, Any]]:
-    """Get stations for map display using a fast query (no trails).
-
-    This is optimized for quick initial load - it fetches recent packets
-    and deduplicates by callsign in Python, which is much faster than
-    the GROUP BY subquery approach for large datasets.
-
-    Args:
-        session: Database session.
-        bbox: Optional bounding box (min_lon, min_lat, max_lon, max_lat).
-        station_type: Optional packet type filter.
-        hours: Number of hours of history to include.
-        limit: Maximum number of unique stations to return.
-
-    Returns:
-        List of station dicts with position data (no trails).
-    """
-    now = datetime.now(timezone.utc)
-    since = now - timedelta(hours=hours)
-
-    # Build filters - query recent packets directly, ordered by time desc
-    filters = [
-        APRSPacket.received_at >= since,
-        APRSPacket.latitude.isnot(None),
-        APRSPacket.longitude.isnot(None),
-    ]
-
-    if station_type:
-        filters.append(APRSPacket.packet_type == station_type)
-
-    if bbox:
-        min_lon, min_lat, max_lon, max_lat = bbox
-        filters.extend(
-            [
-                APRSPacket.longitude >= min_lon,
-                APRSPacket.longitude <= max_lon,
-                APRSPacket.latitude >= min_lat,
-                APRSPacket.latitude <= max_lat,
-            ]
-        )
-
-    # Fetch more packets than needed, then deduplicate
-    # This is faster than GROUP BY for getting first N unique stations
-    packets = (
-        session.query(APRSPacket)
-        .filter(*filters)
-        .order_by(APRSPacket.received_at.desc())
-        .limit(limit * 10)  # Fetch extra to ensure we get enough unique
-        .all()
-    )
-
-    # Deduplicate by callsign, keeping the most recent packet
-    seen_callsigns: set[str] = set()
-    result = []
-
-    for packet in packets:
-        if packet.from_call in seen_callsigns:
-            continue
-        seen_callsigns.add(packet.from_call)
-
-        country_info = get_country_from_callsign(packet.from_call)
-        result.append(
-            {
-                'callsign': packet.from_call,
-                'latitude': packet.latitude,
-                'longitude': packet.longitude,
-                'packet_type': packet.packet_type,
-                'symbol': packet.symbol,
-                'symbol_table': packet.symbol_table,
-                'speed': packet.speed,
-                'course': packet.course,
-                'altitude': packet.altitude,
-                'comment': packet.comment,
-                'last_seen': packet.received_at.isoformat()
-                if packet.received_at
-                else None,
-                'country_code': country_info[0] if country_info else None,
-                'trail': [],  # No trails in fast mode
-            }
-        )
-
-        if len(result) >= limit:
-            break
-
-    return result
+) -> tuple[list[dict[str, Any]], int]:
+    """Get stations for map display (no trails) and how many are in view.
 
-
-def count_map_stations(
-    session: Session,
-    bbox: Optional[tuple[float, float, float, float]] = None,
-    station_type: Optional[str] = None,
-    hours: int = 24,
-) -> int:
-    """Count unique stations in the map view area.
+    With a bbox the stations come through the per-tile cache, unless it
+    spans more than MAX_TILES_PER_REQUEST tiles; otherwise straight from
+    :func:`query_latest_stations`.
 
     Args:
         session: Database session.
         bbox: Optional bounding box (min_lon, min_lat, max_lon, max_lat).
-        station_type: Optional packet type filter.
+        station_type: Packet type filter (empty string for all).
         hours: Number of hours of history to include.
+        limit: Maximum number of stations to return.
 
     Returns:
-        Count of unique stations.
+        Tuple of (station dicts, most recently heard first, total
+        stations in view).
     """
-    now = datetime.now(timezone.utc)
-    since = now - timedelta(hours=hours)
-
-    # Build filters
-    filters = [
-        APRSPacket.received_at >= since,
-        APRSPacket.latitude.isnot(None),
-        APRSPacket.longitude.isnot(None),
-    ]
-
-    if station_type:
-        filters.append(APRSPacket.packet_type == station_type)
-
     if bbox:
-        min_lon, min_lat, max_lon, max_lat = bbox
-        filters.extend(
-            [
-                APRSPacket.longitude >= min_lon,
-                APRSPacket.longitude <= max_lon,
-                APRSPacket.latitude >= min_lat,
-                APRSPacket.latitude <= max_lat,
-            ]
-        )
-
-    count = (
-        session.query(func.count(distinct(APRSPacket.from_call)))
-        .filter(*filters)
-        .scalar()
-        or 0
+        return _get_tiled_stations(session, bbox, hours, station_type, limit)
+    return query_latest_stations(
+        session, hours=hours, station_type=station_type, limit=limit
     )
 
-    return count
-
 
 def get_map_stations_with_trails(
     session: Session,
@@ -2068,72 +2421,53 @@ def get_map_stations_with_trails(
     hours: int = 1,
     limit: int = 500,
     offset: int = 0,
-) -> list[dict[str, Any]]:
+    zoom: Optional[int] = None,
+    trail_format: str = 'polyline',
+    after: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], int]:
     """Get stations for map display with position trails.
 
+    Trails are deduped and simplified to about a pixel at ``zoom`` (or at
+    the bbox's width when no zoom is given), so stationary beacons and
+    dense tracks don't send points the map can't show.
+
     Args:
         session: Database session.
         bbox: Optional bounding box (min_lon, min_lat, max_lon, max_lat).
         station_type: Optional packet type filter.
         hours: Number of hours of history to include (1, 2, 6, 24).
         limit: Maximum number of stations to return.
-        offset: Number of stations to skip (for pagination).
+        offset: Number of stations to skip (for pagination). Prefer
+            ``after``.
+        zoom: Map zoom level the trails are simplified for.
+        trail_format: 'polyline' for an encoded polyline ``trail`` with
+            encoded ``trail_times``, or 'points' for a list of
+            (lon, lat, iso_timestamp) tuples.
+        after: Callsign of the last station on the previous page; only
+            later callsigns are returned.
 
     Returns:
-        List of station dicts with position data and trail coordinates.
+        Tuple of (station dicts with position data, the trail and
+        ``trail_points``, the number of fixes before simplification;
+        total stations from ``after`` on).
     """
-    now = datetime.now(timezone.utc)
-    since = now - timedelta(hours=hours)
-
-    # First get the unique stations with their latest position in the bbox
-    subq_filters = [
-        APRSPacket.received_at >= since,
-        APRSPacket.latitude.isnot(None),
-        APRSPacket.longitude.isnot(None),
-    ]
-
-    if station_type:
-        subq_filters.append(APRSPacket.packet_type == station_type)
-
-    # Subquery to find latest packet per station
-    latest_subq = (
-        session.query(
-            APRSPacket.from_call,
-            func.max(APRSPacket.received_at).label('max_received'),
-        )
-        .filter(*subq_filters)
-        .group_by(APRSPacket.from_call)
-        .subquery()
-    )
 
-    # Get latest packet for each station
-    query = session.query(APRSPacket).join(
-        latest_subq,
-        (APRSPacket.from_call == latest_subq.c.from_call)
-        & (APRSPacket.received_at == latest_subq.c.max_received),
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+    # Latest position per station, paged by callsign
+    latest, total = query_latest_stations(
+        session,
+        bbox=bbox,
+        hours=hours,
+        station_type=station_type or '',
+        limit=limit,
+        offset=offset,
+        after=after,
+        order='callsign',
     )
-
-    if bbox:
-        min_lon, min_lat, max_lon, max_lat = bbox
-        query = query.filter(
-            APRSPacket.longitude >= min_lon,
-            APRSPacket.longitude <= max_lon,
-            APRSPacket.latitude >= min_lat,
-            APRSPacket.latitude <= max_lat,
-        )
-
-    if station_type:
-        query = query.filter(APRSPacket.packet_type == station_type)
-
-    # Apply pagination - order by callsign for consistent pagination
-    query = query.order_by(APRSPacket.from_call)
-    latest_packets = query.offset(offset).limit(limit).all()
-
-    # Get callsigns of stations in view
-    callsigns = [p.from_call for p in latest_packets]
-
-    if not callsigns:
-        return []
+    if not latest:
+        return [], total
+    callsigns = [station['callsign'] for station in latest]
 
     # Now get all positions for these stations within the time window
     # to build trails
@@ -2156,45 +2490,33 @@ def get_map_stations_with_trails(
     )
 
     # Group trail points by callsign
-    trails_by_callsign: dict[str, list[tuple[float, float, str]]] = {}
+    trails_by_callsign: dict[str, list[tuple[float, float, datetime]]] = {}
     for row in trail_query:
         callsign = row.from_call
         if callsign not in trails_by_callsign:
             trails_by_callsign[callsign] = []
         trails_by_callsign[callsign].append(
-            (
-                row.longitude,
-                row.latitude,
-                row.received_at.isoformat() if row.received_at else None,
-            )
+            (row.longitude, row.latitude, row.received_at)
         )
 
+    if zoom is not None:
+        tolerance = tolerance_for_zoom(zoom)
+    elif bbox:
+        tolerance = tolerance_for_bbox(bbox)
+    else:
+        tolerance = DEFAULT_TOLERANCE
+
     # Build result with latest position and trail
     result = []
-    for packet in latest_packets:
-        country_info = get_country_from_callsign(packet.from_call)
-        trail = trails_by_callsign.get(packet.from_call, [])
-
-        result.append(
-            {
-                'callsign': packet.from_call,
-                'latitude': packet.latitude,
-                'longitude': packet.longitude,
-                'packet_type': packet.packet_type,
-                'symbol': packet.symbol,
-                'symbol_table': packet.symbol_table,
-                'speed': packet.speed,
-                'course': packet.course,
-                'altitude': packet.altitude,
-                'comment': packet.comment,
-                'last_seen': packet.received_at.isoformat()
-                if packet.received_at
-                else None,
-                'country_code': country_info[0] if country_info else None,
-                'trail': trail
-                if len(trail) > 1
-                else [],  # Only include if multiple points
+    for station in latest:
+        points = trails_by_callsign.get(station['callsign'], [])
+        if trail_format == 'points':
+            trail = {
+                'trail': simplify_points(points, tolerance),
+                'trail_points': len(points),
             }
-        )
+        else:
+            trail = build_trail(points, tolerance)
+        result.append({**station, **trail})
 
-    return result
+    return result, total
@@ -0,0 +1,356 @@
+# haminfo_dashboard/rollups.py
+"""Maintain the per-country and per-state rollup tables.
+
+The country pages used to recompute per-country totals over 24 hours of
+packets whenever their cache entries expired.  :class:`RegionRollup`
+keeps the last 24 hourly buckets of ``aprs_station_stats_hourly`` in
+memory, re-reads only the buckets the continuous aggregate may still be
+changing, and rewrites ``aprs_country_rollup`` and ``aprs_state_rollup``
+(migration a4b5c6d7e8f9) from them.  Countries come from the callsign
+prefix, the same as the country breakdown; states come from the station's
+last position in ``aprs_station_summary``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlalchemy import text
+
+from haminfo_dashboard.utils import (
+    get_country_from_callsign,
+    get_country_from_coords,
+    get_state_from_coords,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+LOG = logging.getLogger(__name__)
+
+# Stations kept per region in top_stations
+ROLLUP_TOP_N = 25
+
+# Countries whose stations are also rolled up per state/province
+STATE_COUNTRIES = ('US', 'CA', 'AU')
+
+# aprs_station_stats_hourly's refresh policy rewrites the last 2 hours,
+# so those buckets are re-read on every run
+AGGREGATE_REFRESH_WINDOW = timedelta(hours=2)
+
+# Weather station counts change slowly; recount them this often (seconds)
+WEATHER_REFRESH_INTERVAL = 900
+
+_BUCKETS_SQL = text(
+    """
+    SELECT bucket, from_call, packet_count
+    FROM aprs_station_stats_hourly
+    WHERE bucket >= :since
+    """
+)
+
+_POSITIONS_SQL = text(
+    """
+    SELECT from_call, latitude, longitude, updated_at
+    FROM aprs_station_summary
+    WHERE updated_at >= :since
+      AND latitude IS NOT NULL
+      AND longitude IS NOT NULL
+    """
+)
+
+# Stations with at least one report, as get_weather_countries counts them
+_WEATHER_STATIONS_SQL = text(
+    """
+    SELECT ws.callsign, ws.latitude, ws.longitude
+    FROM weather_station ws
+    WHERE EXISTS (
+        SELECT 1 FROM weather_report wr WHERE wr.weather_station_id = ws.id
+    )
+    """
+)
+
+_INSERT_COUNTRY_SQL = text(
+    """
+    INSERT INTO aprs_country_rollup (
+        country_code, country_name, packets_24h, unique_stations,
+        top_stations, weather_stations, updated_at
+    ) VALUES (
+        :country_code, :country_name, :packets_24h, :unique_stations,
+        CAST(:top_stations AS jsonb), :weather_stations, :updated_at
+    )
+    """
+)
+
+_INSERT_STATE_SQL = text(
+    """
+    INSERT INTO aprs_state_rollup (
+        country_code, state_code, state_name, packets_24h, unique_stations,
+        top_stations, weather_stations, updated_at
+    ) VALUES (
+        :country_code, :state_code, :state_name, :packets_24h, :unique_stations,
+        CAST(:top_stations AS jsonb), :weather_stations, :updated_at
+    )
+    """
+)
+
+
+class _Region:
+    """Totals for one country or state while a rollup is built."""
+
+    __slots__ = ('name', 'packets', 'stations', 'weather_stations')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.packets = 0
+        self.stations: list[tuple[int, str]] = []
+        self.weather_stations = 0
+
+    def add_station(self, callsign: str, count: int) -> None:
+        self.packets += count
+        self.stations.append((count, callsign))
+
+    def to_row(self) -> dict[str, Any]:
+        top = heapq.nlargest(ROLLUP_TOP_N, self.stations)
+        return {
+            'packets_24h': self.packets,
+            'unique_stations': len(self.stations),
+            'top_stations': json.dumps(
+                [{'callsign': call, 'count': count} for count, call in top]
+            ),
+            'weather_stations': self.weather_stations,
+        }
+
+
+def station_state(
+    country_code: str, lat: float, lon: float
+) -> Optional[tuple[str, str]]:
+    """State/province of a position for countries with state rollups."""
+    if country_code not in STATE_COUNTRIES:
+        return None
+    return get_state_from_coords(lat, lon, country_code)
+
+
+def build_rollups(
+    station_counts: dict[str, int],
+    positions: dict[str, tuple[float, float]],
+    weather_stations: list[tuple[str, Optional[float], Optional[float]]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Aggregate per-station counts into country and state rows.
+
+    Args:
+        station_counts: Packets per callsign in the window.
+        positions: Last known (latitude, longitude) per callsign.
+        weather_stations: (callsign, latitude, longitude) of every
+            weather station with a report.
+
+    Returns:
+        (country rows, state rows) ready for the rollup tables.
+    """
+    countries: dict[str, _Region] = {}
+    states: dict[tuple[str, str], _Region] = {}
+
+    def state_region(country_code, position):
+        state = station_state(country_code, *position)
+        if not state:
+            return None
+        key = (country_code, state[0])
+        if key not in states:
+            states[key] = _Region(state[1])
+        return states[key]
+
+    for callsign, count in station_counts.items():
+        country = get_country_from_callsign(callsign)
+        if not country:
+            continue
+        code, name = country
+        if code not in countries:
+            countries[code] = _Region(name)
+        countries[code].add_station(callsign, count)
+
+        position = positions.get(callsign)
+        if position:
+            region = state_region(code, position)
+            if region:
+                region.add_station(callsign, count)
+
+    for callsign, lat, lon in weather_stations:
+        # Coordinates first, as get_weather_countries does
+        country = get_country_from_coords(lat, lon)
+        if not country:
+            country = get_country_from_callsign(callsign)
+        if not country:
+            continue
+        code, name = country
+        if code not in countries:
+            countries[code] = _Region(name)
+        countries[code].weather_stations += 1
+
+        if lat is not None and lon is not None:
+            region = state_region(code, (lat, lon))
+            if region:
+                region.weather_stations += 1
+
+    country_rows = [
+        {'country_code': code, 'country_name': region.name, **region.to_row()}
+        for code, region in countries.items()
+    ]
+    state_rows = [
+        {
+            'country_code': country_code,
+            'state_code': state_code,
+            'state_name': region.name,
+            **region.to_row(),
+        }
+        for (country_code, state_code), region in states.items()
+    ]
+    return country_rows, state_rows
+
+
+def write_rollups(
+    session: Session,
+    country_rows: list[dict[str, Any]],
+    state_rows: list[dict[str, Any]],
+    updated_at: datetime,
+) -> None:
+    """Replace the contents of both rollup tables in one transaction.
+
+    Args:
+        session: Database session; committed on success.
+        country_rows: Rows for aprs_country_rollup.
+        state_rows: Rows for aprs_state_rollup.
+        updated_at: Timestamp stored on every row.
+    """
+    session.execute(text('DELETE FROM aprs_country_rollup'))
+    session.execute(text('DELETE FROM aprs_state_rollup'))
+    if country_rows:
+        session.execute(
+            _INSERT_COUNTRY_SQL,
+            [{**row, 'updated_at': updated_at} for row in country_rows],
+        )
+    if state_rows:
+        session.execute(
+            _INSERT_STATE_SQL,
+            [{**row, 'updated_at': updated_at} for row in state_rows],
+        )
+    session.commit()
+
+
+class RegionRollup:
+    """Incrementally maintain aprs_country_rollup and aprs_state_rollup."""
+
+    def __init__(self, session_factory, hours: int = 24):
+        """Initialize the worker.
+
+        Args:
+            session_factory: Callable returning a database session.
+            hours: Window the rollups cover.
+        """
+        self._session_factory = session_factory
+        self._hours = hours
+        # bucket -> {from_call: packet_count}
+        self._buckets: dict[datetime, dict[str, int]] = {}
+        # from_call -> (latitude, longitude, updated_at)
+        self._positions: dict[str, tuple[float, float, datetime]] = {}
+        self._positions_since: Optional[datetime] = None
+        self._weather_stations: list = []
+        self._weather_loaded_at = 0.0
+
+    def _refresh_buckets(self, session: Session, now: datetime) -> None:
+        window_start = now - timedelta(hours=self._hours)
+        if self._buckets:
+            since = max(window_start, now - AGGREGATE_REFRESH_WINDOW)
+        else:
+            since = window_start
+
+        fresh: dict[datetime, dict[str, int]] = {}
+        for row in session.execute(_BUCKETS_SQL, {'since': since}):
+            fresh.setdefault(row.bucket, {})[row.from_call] = int(row.packet_count)
+
+        self._buckets = {
+            bucket: counts
+            for bucket, counts in self._buckets.items()
+            if window_start <= bucket < since
+        }
+        self._buckets.update(fresh)
+
+    def _refresh_positions(self, session: Session, now: datetime) -> None:
+        window_start = now - timedelta(hours=self._hours)
+        since = self._positions_since or window_start
+        for row in session.execute(_POSITIONS_SQL, {'since': since}):
+            self._positions[row.from_call] = (
+                row.latitude,
+                row.longitude,
+                row.updated_at,
+            )
+            if row.updated_at > since:
+                since = row.updated_at
+        self._positions_since = since
+
+        # Stations that haven't been heard in the window drop out of the
+        # rollups anyway; they are read again when their summary changes
+        self._positions = {
+            callsign: position
+            for callsign, position in self._positions.items()
+            if position[2] >= window_start
+        }
+
+    def _refresh_weather_stations(self, session: Session) -> None:
+        if time.monotonic() - self._weather_loaded_at < WEATHER_REFRESH_INTERVAL:
+            return
+        self._weather_stations = [
+            (row.callsign, row.latitude, row.longitude)
+            for row in session.execute(_WEATHER_STATIONS_SQL)
+        ]
+        self._weather_loaded_at = time.monotonic()
+
+    def run_once(self) -> dict[str, int]:
+        """Refresh the rollup tables.
+
+        Returns:
+            Dict with the number of country and state rows written.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        session = self._session_factory()
+        try:
+            self._refresh_buckets(session, now)
+            self._refresh_positions(session, now)
+            self._refresh_weather_stations(session)
+
+            station_counts: dict[str, int] = {}
+            for counts in self._buckets.values():
+                for callsign, count in counts.items():
+                    station_counts[callsign] = station_counts.get(callsign, 0) + count
+
+            positions = {
+                callsign: (lat, lon)
+                for callsign, (lat, lon, _) in self._positions.items()
+            }
+            country_rows, state_rows = build_rollups(
+                station_counts, positions, self._weather_stations
+            )
+            write_rollups(session, country_rows, state_rows, now)
+        finally:
+            session.close()
+
+        return {'countries': len(country_rows), 'states': len(state_rows)}
+
+    def run_forever(self, interval: float = 60) -> None:
+        """Refresh every ``interval`` seconds until interrupted."""
+        while True:
+            started = time.monotonic()
+            try:
+                result = self.run_once()
+                LOG.debug(
+                    f'Region rollups: {result["countries"]} countries, '
+                    f'{result["states"]} states in '
+                    f'{time.monotonic() - started:.1f}s'
+                )
+            except Exception as e:
+                LOG.error(f'Region rollup failed: {e}')
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
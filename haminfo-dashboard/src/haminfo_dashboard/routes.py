@@ -13,6 +13,7 @@ from haminfo_dashboard.queries import (
     get_country_breakdown,
     get_all_countries_breakdown,
     get_country_stats,
+    get_country_states,
     get_country_top_stations,
 )
 from haminfo_dashboard.utils import US_STATE_BOUNDS, get_country_name, COUNTRY_FLAGS
@@ -171,6 +172,7 @@ def country_detail(country_code: str):
         # Get country stats
         stats = get_country_stats(session, country_code)
         top_stations = get_country_top_stations(session, country_code, limit=10)
+        states = get_country_states(session, country_code)
 
         return render_template(
             'dashboard/country_detail.html',
@@ -179,6 +181,7 @@ def country_detail(country_code: str):
             country_flag=country_flag,
             stats=stats,
             top_stations=top_stations,
+            states=states,
         )
     finally:
         session.close()
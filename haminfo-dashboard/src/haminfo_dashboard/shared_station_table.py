@@ -0,0 +1,293 @@
+# haminfo_dashboard/shared_station_table.py
+"""Cross-worker station location table backed by mmap.
+
+Every gunicorn worker used to run its own warm-up query (a DISTINCT ON over
+24h of packets) and hold its own copy of the result.  With a shared table
+one worker (the one holding ``warm.lock``) runs the query and publishes a
+read-only, fixed-width hash table to a directory, ideally on tmpfs such as
+``/dev/shm``.  Every worker maps the file and probes it in place, so the
+pages are shared by the kernel instead of copied into each process.
+
+Refreshes write a new generation file and then atomically replace the small
+``current`` pointer file.  Readers notice the new pointer (checked at most
+once per ``check_interval`` seconds) and swap maps; a reader that is still
+probing the old generation keeps a valid mapping even after the file is
+unlinked.
+
+File layout (little-endian)::
+
+    header:  magic 'HSTB', version u16, reserved u16, slots u32, count u32
+    records: slots x (callsign 10s, country 2s, state 2s,
+                      latitude f32, longitude f32, updated_at u32)
+
+Records use open addressing with linear probing on crc32(callsign), so the
+layout is identical in every process (Python's ``hash()`` is salted).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import IO, Iterable, NamedTuple, Optional
+import logging
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'HSTB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+RECORD = struct.Struct('<10s2s2sffI')
+CALLSIGN_LEN = 10
+
+POINTER_FILE = 'current'
+LOCK_FILE = 'warm.lock'
+GENERATION_PREFIX = 'stations.'
+
+MIN_SLOTS = 1024
+
+
+class SharedStation(NamedTuple):
+    """A station's last known location from the shared table."""
+
+    country_code: str
+    state_code: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    updated_at: int
+
+
+def _normalize(callsign: str) -> Optional[bytes]:
+    """Strip the SSID and encode a callsign as a table key."""
+    if not callsign:
+        return None
+    base_call = callsign.split('-')[0].upper().encode('ascii', 'ignore')
+    if not base_call or len(base_call) > CALLSIGN_LEN:
+        return None
+    return base_call
+
+
+def _slot_count(count: int) -> int:
+    # Keep the table at most half full so probe chains stay short
+    return max(MIN_SLOTS, 1 << math.ceil(math.log2(max(count, 1) * 2)))
+
+
+def build_table(
+    entries: Iterable[tuple[str, str, Optional[str], Optional[float], Optional[float]]],
+) -> bytes:
+    """Build a table image from station entries.
+
+    Args:
+        entries: (callsign, country_code, state_code, latitude, longitude)
+            tuples. Later entries for the same callsign win.
+
+    Returns:
+        The serialized table.
+    """
+    rows: dict[bytes, tuple] = {}
+    for callsign, country_code, state_code, lat, lon in entries:
+        key = _normalize(callsign)
+        if key is None or not country_code:
+            continue
+        rows[key] = (country_code, state_code, lat, lon)
+
+    slots = _slot_count(len(rows))
+    mask = slots - 1
+    buffer = bytearray(HEADER.size + slots * RECORD.size)
+    occupied = bytearray(slots)
+    now = int(time.time())
+    for key, (country_code, state_code, lat, lon) in rows.items():
+        index = zlib.crc32(key) & mask
+        while occupied[index]:
+            index = (index + 1) & mask
+        occupied[index] = 1
+        RECORD.pack_into(
+            buffer,
+            HEADER.size + index * RECORD.size,
+            key,
+            country_code.encode('ascii', 'ignore')[:2],
+            (state_code or '').encode('ascii', 'ignore')[:2],
+            math.nan if lat is None else lat,
+            math.nan if lon is None else lon,
+            now,
+        )
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, 0, slots, len(rows))
+    return bytes(buffer)
+
+
+def publish(
+    directory: str | Path,
+    entries: Iterable[tuple[str, str, Optional[str], Optional[float], Optional[float]]],
+) -> dict:
+    """Write a new table generation and make it current.
+
+    Args:
+        directory: Shared table directory, created if missing.
+        entries: See :func:`build_table`.
+
+    Returns:
+        Dict with generation, stations and bytes.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    image = build_table(entries)
+
+    generation = time.time_ns()
+    name = f'{GENERATION_PREFIX}{generation}.bin'
+    tmp = directory / f'{name}.tmp'
+    tmp.write_bytes(image)
+    os.replace(tmp, directory / name)
+
+    pointer_tmp = directory / f'{POINTER_FILE}.tmp'
+    pointer_tmp.write_text(name)
+    os.replace(pointer_tmp, directory / POINTER_FILE)
+
+    # Older generations can go: mapped readers keep their pages until they
+    # swap, unlinking only removes the name.
+    for path in directory.glob(f'{GENERATION_PREFIX}*.bin'):
+        if path.name != name:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    count = HEADER.unpack_from(image, 0)[4]
+    return {'generation': generation, 'stations': count, 'bytes': len(image)}
+
+
+def acquire_warmer_lock(directory: str | Path) -> Optional[IO]:
+    """Try to become the process that warms and refreshes the table.
+
+    Returns:
+        The open lock file (keep a reference for as long as this process
+        should stay the warmer), or None if another process holds it.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    lock_file = open(directory / LOCK_FILE, 'a+')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+class SharedStationTable:
+    """Read-only view of the current shared table generation."""
+
+    def __init__(self, directory: str | Path, check_interval: float = 1.0):
+        """Initialize the reader.
+
+        Args:
+            directory: Shared table directory.
+            check_interval: Seconds between checks for a new generation.
+        """
+        self._directory = Path(directory)
+        self._check_interval = check_interval
+        self._map: Optional[mmap.mmap] = None
+        self._name: Optional[str] = None
+        self._slots = 0
+        self._count = 0
+        self._last_check = -math.inf
+        self._hits = 0
+        self._misses = 0
+        self._swaps = 0
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self._check_interval:
+            return
+        self._last_check = now
+
+        try:
+            name = (self._directory / POINTER_FILE).read_text().strip()
+        except OSError:
+            return
+        if name == self._name:
+            return
+
+        try:
+            with open(self._directory / name, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            LOG.warning(f'Failed to map shared station table {name}: {e}')
+            return
+
+        magic, version, _, slots, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION:
+            LOG.warning(f'Ignoring shared station table {name}: bad header')
+            mapped.close()
+            return
+
+        # Drop our reference to the old map; it is unmapped once unused
+        self._map = mapped
+        self._name = name
+        self._slots = slots
+        self._count = count
+        self._swaps += 1
+
+    def get(self, callsign: str) -> Optional[SharedStation]:
+        """Look up a callsign's last known location.
+
+        Args:
+            callsign: The callsign (with or without SSID).
+
+        Returns:
+            SharedStation if present in the current generation.
+        """
+        key = _normalize(callsign)
+        if key is None:
+            return None
+
+        self._refresh()
+        mapped = self._map
+        if mapped is None:
+            self._misses += 1
+            return None
+
+        padded = key.ljust(CALLSIGN_LEN, b'\x00')
+        mask = self._slots - 1
+        index = zlib.crc32(key) & mask
+        base = HEADER.size
+        size = RECORD.size
+        for _ in range(self._slots):
+            offset = base + index * size
+            stored = mapped[offset : offset + CALLSIGN_LEN]
+            if stored[0] == 0:
+                break
+            if stored == padded:
+                _, country, state, lat, lon, updated = RECORD.unpack_from(
+                    mapped, offset
+                )
+                self._hits += 1
+                return SharedStation(
+                    country_code=country.decode('ascii'),
+                    state_code=state.rstrip(b'\x00').decode('ascii') or None,
+                    latitude=None if math.isnan(lat) else lat,
+                    longitude=None if math.isnan(lon) else lon,
+                    updated_at=updated,
+                )
+            index = (index + 1) & mask
+
+        self._misses += 1
+        return None
+
+    @property
+    def stats(self) -> dict:
+        """Get table statistics."""
+        total = self._hits + self._misses
+        return {
+            'generation': self._name,
+            'size': self._count,
+            'slots': self._slots,
+            'swaps': self._swaps,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / total if total > 0 else 0.0,
+        }
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any
 from sqlalchemy import text
 
 from haminfo_dashboard.cache import cached
+from haminfo_dashboard.queries import USE_CONTINUOUS_AGGREGATES
 from haminfo_dashboard.utils import (
     convert_temperature_to_celsius,
     fahrenheit_to_celsius,
@@ -145,7 +146,8 @@ def get_state_trends(session: Session, state_code: str) -> dict[str, Any]:
     """Get 24-hour trend data for a state.
 
     Returns hourly aggregates for temperature, pressure, humidity, wind.
-    Uses TimescaleDB time_bucket for efficient bucketing.
+    Reads the weather_report_hourly continuous aggregate when enabled,
+    otherwise buckets raw weather reports with time_bucket.
 
     Args:
         session: Database session
@@ -156,23 +158,10 @@ def get_state_trends(session: Session, state_code: str) -> dict[str, Any]:
     """
     state_code = state_code.upper()
 
-    query = text("""
-        SELECT
-            time_bucket('1 hour', wr.time) as hour,
-            AVG(wr.temperature) as avg_temp,
-            MIN(wr.temperature) as min_temp,
-            MAX(wr.temperature) as max_temp,
-            AVG(NULLIF(wr.pressure, 0)) as avg_pressure,
-            AVG(NULLIF(wr.humidity, 0)) as avg_humidity,
-            AVG(wr.wind_speed) as avg_wind
-        FROM weather_report wr
-        JOIN weather_station ws ON wr.weather_station_id = ws.id
-        WHERE ws.state = :state_code
-          AND UPPER(ws.country_code) = 'US'
-          AND wr.time > NOW() - INTERVAL '24 hours'
-        GROUP BY hour
-        ORDER BY hour
-    """)
+    if USE_CONTINUOUS_AGGREGATES:
+        query = _state_trends_from_aggregates_query()
+    else:
+        query = _state_trends_from_raw_query()
 
     result = session.execute(query, {'state_code': state_code})
     rows = [dict(row) for row in result.mappings().all()]
@@ -200,6 +189,57 @@ def get_state_trends(session: Session, state_code: str) -> dict[str, Any]:
     }
 
 
+def _state_trends_from_aggregates_query():
+    """Hourly state trends from weather_report_hourly (fast).
+
+    Per-station hourly averages are re-weighted by report_count so the
+    state average matches averaging the raw reports. Stations that report
+    0 for pressure/humidity (no sensor) are excluded per station-hour.
+    """
+    return text("""
+        SELECT
+            wrh.bucket as hour,
+            SUM(wrh.temperature_avg * wrh.report_count)
+                / NULLIF(SUM(CASE WHEN wrh.temperature_avg IS NOT NULL
+                                  THEN wrh.report_count END), 0) as avg_temp,
+            MIN(wrh.temperature_min) as min_temp,
+            MAX(wrh.temperature_max) as max_temp,
+            AVG(NULLIF(wrh.pressure_avg, 0)) as avg_pressure,
+            AVG(NULLIF(wrh.humidity_avg, 0)) as avg_humidity,
+            SUM(wrh.wind_speed_avg * wrh.report_count)
+                / NULLIF(SUM(CASE WHEN wrh.wind_speed_avg IS NOT NULL
+                                  THEN wrh.report_count END), 0) as avg_wind
+        FROM weather_report_hourly wrh
+        JOIN weather_station ws ON wrh.weather_station_id = ws.id
+        WHERE ws.state = :state_code
+          AND UPPER(ws.country_code) = 'US'
+          AND wrh.bucket > NOW() - INTERVAL '24 hours'
+        GROUP BY hour
+        ORDER BY hour
+    """)
+
+
+def _state_trends_from_raw_query():
+    """Hourly state trends from raw weather reports (slow fallback)."""
+    return text("""
+        SELECT
+            time_bucket('1 hour', wr.time) as hour,
+            AVG(wr.temperature) as avg_temp,
+            MIN(wr.temperature) as min_temp,
+            MAX(wr.temperature) as max_temp,
+            AVG(NULLIF(wr.pressure, 0)) as avg_pressure,
+            AVG(NULLIF(wr.humidity, 0)) as avg_humidity,
+            AVG(wr.wind_speed) as avg_wind
+        FROM weather_report wr
+        JOIN weather_station ws ON wr.weather_station_id = ws.id
+        WHERE ws.state = :state_code
+          AND UPPER(ws.country_code) = 'US'
+          AND wr.time > NOW() - INTERVAL '24 hours'
+        GROUP BY hour
+        ORDER BY hour
+    """)
+
+
 def detect_state_alerts(stations: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Detect severe weather alerts from station data.
 
@@ -10,45 +10,70 @@ the cached country.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+from collections import OrderedDict
 from typing import Optional
 import logging
+import time
+
+from haminfo_dashboard.shared_station_table import SharedStationTable, publish
 
 LOG = logging.getLogger(__name__)
 
 
-@dataclass
 class StationLocation:
-    """Cached location info for a station."""
+    """Cached location info for a station.
 
-    country_code: str
-    state_code: Optional[str] = None
-    updated_at: datetime = None
+    ``updated_at`` is a ``time.monotonic()`` timestamp, used for TTL expiry.
+    """
 
-    def __post_init__(self):
-        if self.updated_at is None:
-            self.updated_at = datetime.utcnow()
+    __slots__ = ('country_code', 'state_code', 'updated_at')
+
+    def __init__(
+        self,
+        country_code: str,
+        state_code: Optional[str] = None,
+        updated_at: Optional[float] = None,
+    ):
+        self.country_code = country_code
+        self.state_code = state_code
+        self.updated_at = time.monotonic() if updated_at is None else updated_at
+
+    def __repr__(self) -> str:
+        return (
+            f'StationLocation(country_code={self.country_code!r}, '
+            f'state_code={self.state_code!r})'
+        )
 
 
 class StationLocationCache:
-    """In-memory cache mapping callsigns to their last known location.
+    """In-memory LRU cache mapping callsigns to their last known location.
+
+    Entries are kept in an OrderedDict in least-recently-used order, so
+    lookups, updates and evictions are all O(1); ``broadcast_packet`` never
+    pauses to sort the cache when it is full.
 
     Thread-safe for the typical use case of single-writer (poll_packets)
     and single-reader (broadcast_packet) in the same greenlet.
     """
 
-    def __init__(self, max_size: int = 100_000):
+    def __init__(self, max_size: int = 100_000, ttl: Optional[float] = None):
         """Initialize cache.
 
         Args:
             max_size: Maximum number of stations to cache. When exceeded,
-                oldest entries are evicted.
+                the least recently used entry is evicted.
+            ttl: Optional seconds after which an entry that has not been
+                updated expires. None keeps entries until evicted.
         """
-        self._cache: dict[str, StationLocation] = {}
+        self._cache: OrderedDict[str, StationLocation] = OrderedDict()
         self._max_size = max_size
+        self._ttl = ttl
+        self._shared: Optional[SharedStationTable] = None
+        self._shared_hits = 0
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
     def get(self, callsign: str) -> Optional[StationLocation]:
         """Get cached location for a callsign.
@@ -65,12 +90,31 @@ class StationLocationCache:
             return None
 
         location = self._cache.get(base_call)
-        if location:
+        if location is not None and self._ttl is not None:
+            if time.monotonic() - location.updated_at > self._ttl:
+                del self._cache[base_call]
+                self._expirations += 1
+                location = None
+
+        if location is not None:
+            self._cache.move_to_end(base_call)
             self._hits += 1
+        elif self._shared is not None and (shared := self._shared.get(base_call)):
+            # Warmed by another worker; not copied into this process
+            location = StationLocation(shared.country_code, shared.state_code)
+            self._shared_hits += 1
         else:
             self._misses += 1
         return location
 
+    def set_shared_table(self, table: Optional[SharedStationTable]) -> None:
+        """Fall back to a cross-worker shared table on local misses.
+
+        Args:
+            table: Shared table reader, or None to disable the fallback.
+        """
+        self._shared = table
+
     def update(
         self,
         callsign: str,
@@ -90,31 +134,29 @@ class StationLocationCache:
         # Normalize: strip SSID for storage
         base_call = callsign.split('-')[0].upper()
 
-        # Evict oldest entries if at capacity
-        if len(self._cache) >= self._max_size and base_call not in self._cache:
-            self._evict_oldest()
-
-        self._cache[base_call] = StationLocation(
-            country_code=country_code,
-            state_code=state_code,
-        )
+        location = self._cache.get(base_call)
+        if location is not None:
+            # Reuse the entry instead of allocating a new one
+            location.country_code = country_code
+            location.state_code = state_code
+            location.updated_at = time.monotonic()
+            self._cache.move_to_end(base_call)
+            return
 
-    def _evict_oldest(self, count: int = 1000) -> None:
-        """Evict oldest entries from cache.
+        self._cache[base_call] = StationLocation(country_code, state_code)
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self._evictions += 1
 
-        Args:
-            count: Number of entries to evict.
-        """
-        if not self._cache:
-            return
+    def __len__(self) -> int:
+        return len(self._cache)
 
-        # Sort by updated_at and remove oldest
-        sorted_calls = sorted(
-            self._cache.keys(),
-            key=lambda c: self._cache[c].updated_at,
-        )
-        for call in sorted_calls[:count]:
-            del self._cache[call]
+    def entries(self) -> list[tuple[str, str, Optional[str]]]:
+        """Cached (callsign, country_code, state_code), oldest first."""
+        return [
+            (call, location.country_code, location.state_code)
+            for call, location in self._cache.items()
+        ]
 
     @property
     def stats(self) -> dict:
@@ -123,8 +165,12 @@ class StationLocationCache:
         return {
             'size': len(self._cache),
             'max_size': self._max_size,
+            'ttl': self._ttl,
             'hits': self._hits,
+            'shared_hits': self._shared_hits,
             'misses': self._misses,
+            'evictions': self._evictions,
+            'expirations': self._expirations,
             'hit_rate': self._hits / total if total > 0 else 0.0,
         }
 
@@ -132,13 +178,69 @@ class StationLocationCache:
         """Clear the cache."""
         self._cache.clear()
         self._hits = 0
+        self._shared_hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
 
 # Global cache instance
 station_cache = StationLocationCache()
 
 
+def _recent_station_locations(session, hours: int):
+    """Most recent position with a country_code per callsign."""
+    from sqlalchemy import text
+
+    # Uses DISTINCT ON to get one row per callsign (most recent)
+    query = text(
+        """
+        SELECT DISTINCT ON (from_call)
+            from_call,
+            country_code,
+            latitude,
+            longitude
+        FROM aprs_packet
+        WHERE received_at > NOW() - INTERVAL ':hours hours'
+          AND country_code IS NOT NULL
+        ORDER BY from_call, received_at DESC
+    """.replace(':hours', str(hours))
+    )
+    return session.execute(query)
+
+
+def _with_us_states(rows) -> list[tuple]:
+    """Attach US state codes to station rows with one batch geocode.
+
+    Returns:
+        (callsign, country_code, state_code, latitude, longitude) tuples.
+    """
+    from haminfo_dashboard.geo_cache import geo_cache
+
+    rows = list(rows)
+    us_rows = [
+        row
+        for row in rows
+        if row.country_code == 'US'
+        and row.latitude is not None
+        and row.longitude is not None
+    ]
+    infos = geo_cache.lookup_many((row.latitude, row.longitude) for row in us_rows)
+    states = {
+        row.from_call: info.state_code for row, info in zip(us_rows, infos, strict=True)
+    }
+    return [
+        (
+            row.from_call,
+            row.country_code,
+            states.get(row.from_call),
+            row.latitude,
+            row.longitude,
+        )
+        for row in rows
+    ]
+
+
 def warm_station_cache(session, hours: int = 24) -> dict:
     """Pre-warm the station cache from recent position packets.
 
@@ -153,29 +255,13 @@ def warm_station_cache(session, hours: int = 24) -> dict:
     Returns:
         Dict with warming statistics.
     """
-    from sqlalchemy import text
-
     LOG.info(f'Warming station cache from last {hours}h of position packets...')
 
-    # Get most recent country_code for each callsign
-    # Uses DISTINCT ON to get one row per callsign (most recent)
-    query = text(
-        """
-        SELECT DISTINCT ON (from_call)
-            from_call,
-            country_code
-        FROM aprs_packet
-        WHERE received_at > NOW() - INTERVAL ':hours hours'
-          AND country_code IS NOT NULL
-        ORDER BY from_call, received_at DESC
-    """.replace(':hours', str(hours))
-    )
-
     try:
-        result = session.execute(query)
         count = 0
-        for row in result:
-            station_cache.update(row.from_call, row.country_code)
+        rows = _with_us_states(_recent_station_locations(session, hours))
+        for callsign, country_code, state_code, _, _ in rows:
+            station_cache.update(callsign, country_code, state_code)
             count += 1
 
         LOG.info(f'Station cache warmed with {count} stations')
@@ -184,3 +270,33 @@ def warm_station_cache(session, hours: int = 24) -> dict:
     except Exception as e:
         LOG.error(f'Failed to warm station cache: {e}')
         return {'stations_loaded': 0, 'hours': hours, 'error': str(e)}
+
+
+def publish_shared_station_table(session, directory: str, hours: int = 24) -> dict:
+    """Publish recent station locations to the cross-worker shared table.
+
+    Runs the same query as :func:`warm_station_cache`, but writes a new
+    shared table generation instead of filling this process's cache.
+
+    Args:
+        session: SQLAlchemy database session.
+        directory: Shared table directory.
+        hours: How far back to look for position packets.
+
+    Returns:
+        Dict with warming statistics.
+    """
+    LOG.info(f'Publishing shared station table from last {hours}h of packets...')
+
+    try:
+        rows = _with_us_states(_recent_station_locations(session, hours))
+        result = publish(directory, rows)
+        LOG.info(
+            f'Shared station table generation {result["generation"]}: '
+            f'{result["stations"]} stations, {result["bytes"]} bytes'
+        )
+        return {'stations_loaded': result['stations'], 'hours': hours}
+
+    except Exception as e:
+        LOG.error(f'Failed to publish shared station table: {e}')
+        return {'stations_loaded': 0, 'hours': hours, 'error': str(e)}
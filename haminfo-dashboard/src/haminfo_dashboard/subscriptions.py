@@ -0,0 +1,278 @@
+# haminfo_dashboard/subscriptions.py
+"""Server-side live feed subscriptions.
+
+A client can subscribe with any combination of a bounding box, a set of
+callsigns and a set of packet types; it then receives only packets that
+match every criterion it gave.  Subscriptions are indexed so routing a
+packet only looks at subscribers that could match it:
+
+- subscriptions with a bbox are registered in every grid cell
+  (``cell_size`` degrees) the bbox covers, and a positioned packet only
+  checks the subscribers of its own cell;
+- other subscriptions with callsigns are indexed by callsign and checked
+  against the packet's from/to/addressee calls;
+- the rest (packet types only, or a bbox too large to index) are checked
+  for every packet.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+import logging
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CELL_SIZE = 1.0
+# A bbox covering more cells than this is checked per packet instead
+MAX_INDEXED_CELLS = 4096
+MAX_CALLSIGNS = 100
+
+
+class SubscriptionError(ValueError):
+    """Raised for an invalid subscription request."""
+
+
+class Subscription:
+    """One client's live feed filter."""
+
+    __slots__ = ('sid', 'bbox', 'callsigns', 'packet_types')
+
+    def __init__(
+        self,
+        sid: str,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        callsigns: Optional[frozenset[str]] = None,
+        packet_types: Optional[frozenset[str]] = None,
+    ):
+        self.sid = sid
+        self.bbox = bbox
+        self.callsigns = callsigns
+        self.packet_types = packet_types
+
+    def matches(self, packet_data: dict) -> bool:
+        """Check a packet against every criterion of the subscription."""
+        if self.packet_types and packet_data.get('packet_type') not in (
+            self.packet_types
+        ):
+            return False
+
+        if self.callsigns and not self.callsigns.intersection(
+            _packet_calls(packet_data)
+        ):
+            return False
+
+        if self.bbox:
+            lat = packet_data.get('latitude')
+            lon = packet_data.get('longitude')
+            if lat is None or lon is None:
+                return False
+            south, west, north, east = self.bbox
+            if not south <= lat <= north:
+                return False
+            if west <= east:
+                return west <= lon <= east
+            # Crosses the antimeridian
+            return lon >= west or lon <= east
+
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            'bbox': list(self.bbox) if self.bbox else None,
+            'callsigns': sorted(self.callsigns) if self.callsigns else None,
+            'packet_types': sorted(self.packet_types) if self.packet_types else None,
+        }
+
+
+def _packet_calls(packet_data: dict) -> list[str]:
+    return [
+        call.upper()
+        for call in (
+            packet_data.get('from_call'),
+            packet_data.get('to_call'),
+            packet_data.get('addressee'),
+        )
+        if call
+    ]
+
+
+def parse_subscription(sid: str, data: dict) -> Subscription:
+    """Validate a client's subscribe request.
+
+    Args:
+        sid: The client's session id.
+        data: {'bbox': [south, west, north, east], 'callsigns': [...],
+            'packet_types': [...]}, all optional but not all empty.
+
+    Returns:
+        The Subscription.
+
+    Raises:
+        SubscriptionError: If the request is malformed.
+    """
+    if not isinstance(data, dict):
+        raise SubscriptionError('Subscription must be an object')
+
+    bbox = None
+    if data.get('bbox') is not None:
+        try:
+            south, west, north, east = (float(v) for v in data['bbox'])
+        except (TypeError, ValueError):
+            raise SubscriptionError('bbox must be [south, west, north, east]') from None
+        if not all(math.isfinite(v) for v in (south, west, north, east)):
+            raise SubscriptionError('bbox must be finite')
+        if not -90 <= south <= north <= 90:
+            raise SubscriptionError(
+                'bbox latitudes must satisfy -90 <= south <= north <= 90'
+            )
+        # Leaflet reports longitudes outside +/-180 after panning across
+        # the antimeridian
+        if east - west >= 360:
+            west, east = -180.0, 180.0
+        else:
+            west, east = _wrap_lon(west), _wrap_lon(east)
+        bbox = (south, west, north, east)
+
+    callsigns = _string_set(data.get('callsigns'), 'callsigns', upper=True)
+    if callsigns and len(callsigns) > MAX_CALLSIGNS:
+        raise SubscriptionError(f'At most {MAX_CALLSIGNS} callsigns')
+    packet_types = _string_set(data.get('packet_types'), 'packet_types')
+
+    if bbox is None and not callsigns and not packet_types:
+        raise SubscriptionError('Subscribe with a bbox, callsigns or packet_types')
+
+    return Subscription(sid, bbox, callsigns, packet_types)
+
+
+def _wrap_lon(lon: float) -> float:
+    if -180 <= lon <= 180:
+        return lon
+    return (lon + 180) % 360 - 180
+
+
+def _string_set(value, name: str, upper: bool = False) -> Optional[frozenset[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str) or not isinstance(value, (list, tuple)):
+        raise SubscriptionError(f'{name} must be a list of strings')
+    items = set()
+    for item in value:
+        if not isinstance(item, str) or not item.strip():
+            raise SubscriptionError(f'{name} must be a list of strings')
+        item = item.strip()
+        items.add(item.upper() if upper else item.lower())
+    return frozenset(items) or None
+
+
+class SubscriptionIndex:
+    """Active subscriptions, indexed by grid cell and callsign."""
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        """Initialize the index.
+
+        Args:
+            cell_size: Grid cell size in degrees.
+        """
+        self._cell_size = cell_size
+        self._subscriptions: dict[str, Subscription] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._callsigns: dict[str, set[str]] = {}
+        self._unindexed: set[str] = set()
+        # Where each sid was registered, for O(own keys) removal
+        self._sid_cells: dict[str, list[tuple[int, int]]] = {}
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return (
+            math.floor(lat / self._cell_size),
+            math.floor(lon / self._cell_size),
+        )
+
+    def _bbox_cells(
+        self, bbox: tuple[float, float, float, float]
+    ) -> Optional[list[tuple[int, int]]]:
+        south, west, north, east = bbox
+        lat_range = range(self._cell(south, 0)[0], self._cell(north, 0)[0] + 1)
+        if west <= east:
+            lon_spans = [(west, east)]
+        else:
+            lon_spans = [(west, 180.0), (-180.0, east)]
+        lon_cells = []
+        for lo, hi in lon_spans:
+            lon_cells.extend(range(self._cell(0, lo)[1], self._cell(0, hi)[1] + 1))
+
+        if len(lat_range) * len(lon_cells) > MAX_INDEXED_CELLS:
+            return None
+        return [(lat, lon) for lat in lat_range for lon in lon_cells]
+
+    def subscribe(self, subscription: Subscription) -> None:
+        """Add or replace a client's subscription."""
+        sid = subscription.sid
+        self.unsubscribe(sid)
+        self._subscriptions[sid] = subscription
+
+        cells = self._bbox_cells(subscription.bbox) if subscription.bbox else None
+        if cells is not None:
+            self._sid_cells[sid] = cells
+            for cell in cells:
+                self._cells.setdefault(cell, set()).add(sid)
+        elif subscription.callsigns:
+            for call in subscription.callsigns:
+                self._callsigns.setdefault(call, set()).add(sid)
+        else:
+            self._unindexed.add(sid)
+
+    def unsubscribe(self, sid: str) -> Optional[Subscription]:
+        """Remove a client's subscription, if any."""
+        subscription = self._subscriptions.pop(sid, None)
+        if subscription is None:
+            return None
+
+        for cell in self._sid_cells.pop(sid, ()):
+            sids = self._cells[cell]
+            sids.discard(sid)
+            if not sids:
+                del self._cells[cell]
+        if subscription.callsigns:
+            for call in subscription.callsigns:
+                sids = self._callsigns.get(call)
+                if sids is not None:
+                    sids.discard(sid)
+                    if not sids:
+                        del self._callsigns[call]
+        self._unindexed.discard(sid)
+        return subscription
+
+    def match(self, packet_data: dict) -> list[str]:
+        """Session ids whose subscription matches a packet."""
+        if not self._subscriptions:
+            return []
+
+        candidates: set[str] = set(self._unindexed)
+        lat = packet_data.get('latitude')
+        lon = packet_data.get('longitude')
+        if lat is not None and lon is not None:
+            candidates.update(self._cells.get(self._cell(lat, lon), ()))
+        if self._callsigns:
+            for call in _packet_calls(packet_data):
+                candidates.update(self._callsigns.get(call, ()))
+
+        return [
+            sid for sid in candidates if self._subscriptions[sid].matches(packet_data)
+        ]
+
+    def get(self, sid: str) -> Optional[Subscription]:
+        return self._subscriptions.get(sid)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def stats(self) -> dict:
+        """Get index statistics."""
+        return {
+            'subscriptions': len(self._subscriptions),
+            'cells': len(self._cells),
+            'callsigns': len(self._callsigns),
+            'unindexed': len(self._unindexed),
+        }
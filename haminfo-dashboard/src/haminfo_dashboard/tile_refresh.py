@@ -0,0 +1,222 @@
+# haminfo_dashboard/tile_refresh.py
+"""Re-render the most requested map tiles before they expire.
+
+Map tiles are cached for ``TILE_CACHE_TTL`` seconds, so the first viewer
+of a busy region after its tiles expire waits for the bbox query.
+:class:`TileRefresher` takes the tiles :data:`queries.tile_tracker` saw
+requested most often, for every hours/type combination, and rewrites
+them every ``TILE_CACHE_TTL - REFRESH_AHEAD`` seconds, so a tile that
+keeps being viewed is replaced before it expires.
+
+Each cycle runs one statement: adjacent tiles in a row are merged into
+one bbox, each packet-type filter is queried once for its longest
+window, and the shorter windows are cut from those rows.  The hottest
+tiles are also kept in the cache under ``HOT_TILES_KEY``, so a worker
+that has just started renders them before its own tracker catches up.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from haminfo_dashboard import cache
+from haminfo_dashboard.queries import (
+    TILE_CACHE_TTL,
+    TileKey,
+    TileTracker,
+    get_tile_coords,
+    query_latest_stations_by_type,
+    tile_cache_key,
+    tile_tracker,
+)
+
+LOG = logging.getLogger(__name__)
+
+# Seconds before expiry that hot tiles are rewritten; leaves room for
+# the refresh query itself
+REFRESH_AHEAD = 15
+REFRESH_INTERVAL = TILE_CACHE_TTL - REFRESH_AHEAD
+
+# Most tiles re-rendered per cycle
+DEFAULT_REFRESH_BUDGET = 200
+
+# A tile requested about once per cycle scores 2 when the cycle runs
+# (1 + 1/2 + 1/4 + ...), one requested once ever scores 1
+HOT_TILE_MIN_SCORE = 1.0
+
+# Hottest tiles of the last cycle, for workers that have just started
+HOT_TILES_KEY = 'map:tile:hot'
+HOT_TILES_TTL = 3600
+
+
+def tile_runs(
+    tiles: Iterable[tuple[int, int]],
+) -> list[tuple[float, float, float, float]]:
+    """Merge tiles into bboxes, one per run of adjacent tiles in a row.
+
+    Args:
+        tiles: (tile_lat, tile_lon) pairs.
+
+    Returns:
+        (min_lon, min_lat, max_lon, max_lat) bboxes covering the tiles.
+    """
+    bboxes: list[tuple[float, float, float, float]] = []
+    for tile_lat, tile_lon in sorted(set(tiles)):
+        if bboxes and bboxes[-1][1] == tile_lat and bboxes[-1][2] == tile_lon:
+            bboxes[-1] = (bboxes[-1][0], tile_lat, tile_lon + 1.0, tile_lat + 1.0)
+        else:
+            bboxes.append(
+                (float(tile_lon), float(tile_lat), tile_lon + 1.0, tile_lat + 1.0)
+            )
+    return bboxes
+
+
+def _received_at(station: dict[str, Any]) -> Optional[datetime]:
+    """A station's received_at as naive UTC, as the database stores it."""
+    value = station.get('received_at')
+    if not value:
+        return None
+    received_at = datetime.fromisoformat(value)
+    if received_at.tzinfo is not None:
+        received_at = received_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return received_at
+
+
+def render_tiles(
+    session, tiles: Iterable[TileKey]
+) -> dict[TileKey, list[dict[str, Any]]]:
+    """Query the stations of many tiles at once.
+
+    Args:
+        session: Database session.
+        tiles: (hours, station_type, tile_lat, tile_lon) keys.
+
+    Returns:
+        Every requested tile -> its stations, most recently heard first,
+        as the tile cache holds them. Tiles without stations map to an
+        empty list.
+    """
+    rendered: dict[TileKey, list[dict[str, Any]]] = {key: [] for key in tiles}
+
+    # One region per type filter, covering its longest window
+    windows: dict[str, set[int]] = {}
+    coords: dict[str, set[tuple[int, int]]] = {}
+    for hours, station_type, tile_lat, tile_lon in rendered:
+        windows.setdefault(station_type, set()).add(hours)
+        coords.setdefault(station_type, set()).add((tile_lat, tile_lon))
+
+    stations_by_type = query_latest_stations_by_type(
+        session,
+        {
+            station_type: (max(hours), tile_runs(coords[station_type]))
+            for station_type, hours in windows.items()
+        },
+    )
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for station_type, stations in stations_by_type.items():
+        cutoffs = {
+            hours: now - timedelta(hours=hours) for hours in windows[station_type]
+        }
+        for station in stations:
+            tile_lat, tile_lon = get_tile_coords(
+                station['latitude'], station['longitude']
+            )
+            received_at = _received_at(station)
+            for hours, since in cutoffs.items():
+                key = (hours, station_type, tile_lat, tile_lon)
+                if key in rendered and received_at and received_at >= since:
+                    rendered[key].append(station)
+
+    for stations in rendered.values():
+        stations.sort(key=lambda s: s.get('received_at') or '', reverse=True)
+    return rendered
+
+
+class TileRefresher:
+    """Keep the most requested map tiles in the cache."""
+
+    def __init__(
+        self,
+        session_factory,
+        budget: int = DEFAULT_REFRESH_BUDGET,
+        tracker: TileTracker = tile_tracker,
+    ):
+        """Initialize the refresher.
+
+        Args:
+            session_factory: Callable returning a database session.
+            budget: Most tiles re-rendered per cycle.
+            tracker: Tile request counts to rank tiles by.
+        """
+        self._session_factory = session_factory
+        self._budget = budget
+        self._tracker = tracker
+
+    def load_hot_tiles(self) -> int:
+        """Seed the tracker with the hot tiles the last cycle stored.
+
+        Returns:
+            Number of tiles loaded.
+        """
+        hot = cache.get(HOT_TILES_KEY) or []
+        self._tracker.seed(
+            ((hours, station_type, tile_lat, tile_lon), score)
+            for hours, station_type, tile_lat, tile_lon, score in hot
+        )
+        return len(hot)
+
+    def run_once(self) -> dict[str, int]:
+        """Re-render the hottest tiles and decay the request counts.
+
+        Returns:
+            Dict with the number of tiles and stations written.
+        """
+        hot = self._tracker.hottest(self._budget, HOT_TILE_MIN_SCORE)
+        self._tracker.decay()
+        if not hot:
+            return {'tiles': 0, 'stations': 0}
+
+        session = self._session_factory()
+        try:
+            rendered = render_tiles(session, (key for key, _ in hot))
+        finally:
+            session.close()
+
+        for (hours, station_type, tile_lat, tile_lon), stations in rendered.items():
+            cache.set(
+                tile_cache_key(hours, station_type, tile_lat, tile_lon),
+                stations,
+                ttl=TILE_CACHE_TTL,
+            )
+        cache.set(HOT_TILES_KEY, [[*key, score] for key, score in hot], HOT_TILES_TTL)
+
+        return {
+            'tiles': len(rendered),
+            'stations': sum(len(stations) for stations in rendered.values()),
+        }
+
+    def run_forever(self, interval: float = REFRESH_INTERVAL) -> None:
+        """Refresh every ``interval`` seconds until interrupted."""
+        try:
+            loaded = self.load_hot_tiles()
+            if loaded:
+                LOG.info(f'Tile refresh: pre-warming {loaded} hot tiles')
+        except Exception as e:
+            LOG.warning(f'Loading hot tiles failed: {e}')
+
+        while True:
+            started = time.monotonic()
+            try:
+                result = self.run_once()
+                LOG.debug(
+                    f'Tile refresh: {result["tiles"]} tiles, '
+                    f'{result["stations"]} stations in '
+                    f'{time.monotonic() - started:.1f}s'
+                )
+            except Exception as e:
+                LOG.error(f'Tile refresh failed: {e}')
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
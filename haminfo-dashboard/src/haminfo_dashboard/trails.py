@@ -0,0 +1,304 @@
+# haminfo_dashboard/trails.py
+"""Position trail simplification and compact encoding for the map.
+
+A trail is every position fix a station sent in the map's time window.
+Fixed stations beacon the same position over and over and moving stations
+send far more points than a map at a given zoom can show, so trails are
+deduped and simplified (Douglas-Peucker) to a tolerance of about one
+screen pixel before being sent.  Points go out as an encoded polyline
+(Google's polyline algorithm, which Leaflet plugins and most map clients
+decode) and timestamps as delta-encoded epoch seconds in the same format.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+# A trail point: (longitude, latitude, received_at)
+TrailPoint = tuple[float, float, Optional[datetime]]
+
+# Polyline precision: 5 decimal places is about a metre
+POLYLINE_PRECISION = 5
+
+# Tolerance in degrees when neither a zoom nor a bbox is known (~zoom 12)
+DEFAULT_TOLERANCE = 360 / (256 * 2**12)
+
+# Map width in pixels assumed when deriving the tolerance from a bbox
+DEFAULT_VIEWPORT_WIDTH = 1024
+
+MAX_ZOOM = 22
+
+
+def tolerance_for_zoom(zoom: int) -> float:
+    """Degrees of longitude covered by one pixel at a Web Mercator zoom.
+
+    Args:
+        zoom: Map zoom level.
+
+    Returns:
+        Simplification tolerance in degrees.
+    """
+    zoom = min(max(zoom, 0), MAX_ZOOM)
+    return 360 / (256 * 2**zoom)
+
+
+def tolerance_for_bbox(
+    bbox: tuple[float, float, float, float],
+    width: int = DEFAULT_VIEWPORT_WIDTH,
+) -> float:
+    """Degrees per pixel for a bbox shown ``width`` pixels wide.
+
+    Args:
+        bbox: Bounding box (min_lon, min_lat, max_lon, max_lat).
+        width: Viewport width in pixels.
+
+    Returns:
+        Simplification tolerance in degrees.
+    """
+    span = bbox[2] - bbox[0]
+    if span <= 0:
+        return DEFAULT_TOLERANCE
+    return span / width
+
+
+def dedupe_stationary(
+    points: Sequence[TrailPoint], tolerance: float
+) -> list[TrailPoint]:
+    """Drop fixes that didn't move from the previous kept fix.
+
+    The last fix is always kept so the trail still ends at the station's
+    latest position.
+
+    Args:
+        points: Trail points, oldest first.
+        tolerance: Movement in degrees below which a fix is stationary.
+
+    Returns:
+        The points that moved.
+    """
+    if len(points) < 3:
+        return list(points)
+    kept = [points[0]]
+    for point in points[1:-1]:
+        if _moved(point, kept[-1], tolerance):
+            kept.append(point)
+    kept.append(points[-1])
+    return kept
+
+
+def simplify(points: Sequence[TrailPoint], tolerance: float) -> list[TrailPoint]:
+    """Douglas-Peucker simplification.
+
+    Iterative, so long trails don't hit the recursion limit.
+
+    Args:
+        points: Trail points, oldest first.
+        tolerance: Largest distance in degrees a dropped point may be from
+            the simplified line.
+
+    Returns:
+        The kept points, in order.
+    """
+    count = len(points)
+    if count < 3:
+        return list(points)
+
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first][0], points[first][1]
+        dx = points[last][0] - ax
+        dy = points[last][1] - ay
+        length_sq = dx * dx + dy * dy
+
+        max_dist_sq = -1.0
+        index = first
+        for i in range(first + 1, last):
+            px = points[i][0] - ax
+            py = points[i][1] - ay
+            if length_sq == 0:
+                dist_sq = px * px + py * py
+            else:
+                # Distance to the segment, not the infinite line, so
+                # out-and-back trails keep their far end
+                t = min(max((px * dx + py * dy) / length_sq, 0.0), 1.0)
+                ex = px - t * dx
+                ey = py - t * dy
+                dist_sq = ex * ex + ey * ey
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                index = i
+
+        if max_dist_sq > tolerance_sq:
+            keep[index] = True
+            if index - first > 1:
+                stack.append((first, index))
+            if last - index > 1:
+                stack.append((index, last))
+
+    return [point for point, kept in zip(points, keep, strict=True) if kept]
+
+
+def _encode_value(value: int, out: list[str]) -> None:
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode_deltas(values: Sequence[int]) -> str:
+    """Encode integers as polyline-style deltas from the previous value.
+
+    Args:
+        values: Integers to encode; the first is encoded as-is.
+
+    Returns:
+        The encoded string.
+    """
+    out: list[str] = []
+    previous = 0
+    for value in values:
+        _encode_value(value - previous, out)
+        previous = value
+    return ''.join(out)
+
+
+def decode_deltas(encoded: str, dimensions: int = 1) -> list[tuple[int, ...]]:
+    """Decode a string produced by :func:`encode_deltas`.
+
+    Args:
+        encoded: Encoded string.
+        dimensions: Values per tuple; 2 for polylines.
+
+    Returns:
+        Decoded tuples of ``dimensions`` integers.
+    """
+    result = []
+    current = [0] * dimensions
+    index = 0
+    while index < len(encoded):
+        for dim in range(dimensions):
+            shift = value = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                value |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            current[dim] += ~(value >> 1) if value & 1 else value >> 1
+        result.append(tuple(current))
+    return result
+
+
+def encode_polyline(
+    points: Sequence[TrailPoint], precision: int = POLYLINE_PRECISION
+) -> str:
+    """Encode trail points as a Google encoded polyline (lat, lon order).
+
+    Args:
+        points: Trail points.
+        precision: Decimal places kept.
+
+    Returns:
+        The encoded polyline.
+    """
+    factor = 10**precision
+    out: list[str] = []
+    prev_lat = prev_lon = 0
+    for lon, lat, _ in points:
+        lat_i = round(lat * factor)
+        lon_i = round(lon * factor)
+        _encode_value(lat_i - prev_lat, out)
+        _encode_value(lon_i - prev_lon, out)
+        prev_lat, prev_lon = lat_i, lon_i
+    return ''.join(out)
+
+
+def decode_polyline(
+    encoded: str, precision: int = POLYLINE_PRECISION
+) -> list[tuple[float, float]]:
+    """Decode a polyline to (lat, lon) pairs."""
+    factor = 10**precision
+    return [(lat / factor, lon / factor) for lat, lon in decode_deltas(encoded, 2)]
+
+
+def encode_times(points: Sequence[TrailPoint]) -> str:
+    """Encode trail timestamps as delta-encoded epoch seconds.
+
+    Args:
+        points: Trail points; naive timestamps are UTC, missing ones
+            repeat the previous one.
+
+    Returns:
+        The encoded timestamps.
+    """
+    seconds = []
+    previous = 0
+    for _, _, received_at in points:
+        if received_at is not None:
+            if received_at.tzinfo is None:
+                received_at = received_at.replace(tzinfo=timezone.utc)
+            previous = int(received_at.timestamp())
+        seconds.append(previous)
+    return encode_deltas(seconds)
+
+
+def _simplified(points: Sequence[TrailPoint], tolerance: float) -> list[TrailPoint]:
+    simplified = simplify(dedupe_stationary(points, tolerance), tolerance)
+    if len(simplified) < 2:
+        return []
+    # A station that never moved dedupes to its first and last fix
+    if len(simplified) == 2 and not _moved(simplified[0], simplified[1], tolerance):
+        return []
+    return simplified
+
+
+def _moved(a: TrailPoint, b: TrailPoint, tolerance: float) -> bool:
+    return abs(a[0] - b[0]) > tolerance or abs(a[1] - b[1]) > tolerance
+
+
+def build_trail(
+    points: Sequence[TrailPoint], tolerance: float = DEFAULT_TOLERANCE
+) -> dict[str, Any]:
+    """Dedupe, simplify and encode one station's trail.
+
+    Args:
+        points: Trail points, oldest first.
+        tolerance: Simplification tolerance in degrees.
+
+    Returns:
+        Dict with the encoded ``trail`` and ``trail_times`` (empty when
+        the station didn't move) and ``trail_points``, the number of
+        fixes before simplification.
+    """
+    simplified = _simplified(points, tolerance)
+    return {
+        'trail': encode_polyline(simplified),
+        'trail_times': encode_times(simplified),
+        'trail_points': len(points),
+    }
+
+
+def simplify_points(
+    points: Sequence[TrailPoint], tolerance: float = DEFAULT_TOLERANCE
+) -> list[tuple[float, float, Optional[str]]]:
+    """Dedupe and simplify a trail, keeping the (lon, lat, iso) tuple form.
+
+    Args:
+        points: Trail points, oldest first.
+        tolerance: Simplification tolerance in degrees.
+
+    Returns:
+        Simplified (lon, lat, iso_timestamp) tuples; empty when the
+        station didn't move.
+    """
+    return [
+        (lon, lat, received_at.isoformat() if received_at else None)
+        for lon, lat, received_at in _simplified(points, tolerance)
+    ]
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, Union
 
 # Cutover timestamp: rust-aprsd started storing Fahrenheit instead of Celsius
@@ -371,6 +372,60 @@ def _clean_comment(comment: str) -> str:
     return comment
 
 
+# Parsed raw packets kept in memory; the live feed, the packet tables and
+# the template helpers all look at the same recent packets.
+PARSE_CACHE_SIZE = 10_000
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_raw_packet(raw: str) -> dict | None:
+    """Parse a raw APRS packet with aprslib, memoized.
+
+    The cache is keyed by the raw string (its hash, confirmed by equality),
+    so each distinct packet is parsed at most once while it stays in the
+    LRU.  Callers must treat the returned dict as read-only.
+
+    Args:
+        raw: Raw APRS packet string
+
+    Returns:
+        The aprslib parse result, or None if the packet can't be parsed
+    """
+    try:
+        import aprslib
+
+        return aprslib.parse(raw)
+    except Exception:
+        return None
+
+
+def enrich_packet(packet: dict) -> dict:
+    """Derive display fields for a packet dict from a single parse.
+
+    Sets the normalized ``packet_type``, ``addressee`` and ``human_info``.
+    Fields the packet already carries (for example when they were stored
+    at ingest) are kept, so those packets aren't parsed at all.
+
+    Args:
+        packet: Dict with packet data including 'raw' field
+
+    Returns:
+        The same dict, enriched in place
+    """
+    if 'human_info' in packet and 'addressee' in packet:
+        return packet
+
+    packet['packet_type'] = normalize_packet_type(
+        packet.get('packet_type'),
+        packet.get('latitude'),
+        packet.get('longitude'),
+        packet.get('raw'),
+    )
+    packet['human_info'] = get_packet_human_info(packet)
+    packet['addressee'] = get_packet_addressee(packet)
+    return packet
+
+
 def normalize_packet_type(
     packet_type: str | None,
     latitude: float | None = None,
@@ -407,23 +462,18 @@ def normalize_packet_type(
     is_telemetry_from_raw = False
 
     # If we don't have lat/lon but have raw packet, try to parse it
-    if raw:
-        try:
-            import aprslib
-
-            parsed = aprslib.parse(raw)
-            if latitude is None and longitude is None:
-                latitude = parsed.get('latitude')
-                longitude = parsed.get('longitude')
-
-            # Check if aprslib identified this as telemetry
-            aprslib_format = parsed.get('format', '')
-            if aprslib_format in ('telemetry', 'telemetry-message') or parsed.get(
-                'telemetry'
-            ):
-                is_telemetry_from_raw = True
-        except Exception:
-            pass
+    parsed = parse_raw_packet(raw) if raw else None
+    if parsed:
+        if latitude is None and longitude is None:
+            latitude = parsed.get('latitude')
+            longitude = parsed.get('longitude')
+
+        # Check if aprslib identified this as telemetry
+        aprslib_format = parsed.get('format', '')
+        if aprslib_format in ('telemetry', 'telemetry-message') or parsed.get(
+            'telemetry'
+        ):
+            is_telemetry_from_raw = True
 
     # Normalize based on type and available data
     if packet_type == 'beacon':
@@ -461,6 +511,9 @@ def get_packet_addressee(packet: dict) -> str | None:
     Returns:
         Addressee callsign for message packets, None otherwise
     """
+    if 'addressee' in packet:
+        return packet['addressee']
+
     raw = packet.get('raw', '')
     packet_type = packet.get('packet_type', '')
 
@@ -468,14 +521,9 @@ def get_packet_addressee(packet: dict) -> str | None:
     if packet_type not in ('message', 'ack') or not raw:
         return None
 
-    try:
-        import aprslib
-
-        parsed = aprslib.parse(raw)
-        # aprslib uses 'addresse' (note spelling) for message destination
-        return parsed.get('addresse')
-    except Exception:
-        return None
+    parsed = parse_raw_packet(raw)
+    # aprslib uses 'addresse' (note spelling) for message destination
+    return parsed.get('addresse') if parsed else None
 
 
 def get_packet_human_info(packet: dict) -> str:
@@ -490,83 +538,88 @@ def get_packet_human_info(packet: dict) -> str:
     Returns:
         Human-readable packet info string
     """
+    if packet.get('human_info'):
+        return packet['human_info']
+
     raw = packet.get('raw', '')
     packet_type = packet.get('packet_type') or 'unknown'
 
-    # Try to parse raw packet with aprslib for full details
-    if raw:
+    # Parse raw packet with aprslib for full details
+    parsed = parse_raw_packet(raw) if raw else None
+    if parsed:
         try:
-            import aprslib
-
-            parsed = aprslib.parse(raw)
-
-            # Weather packet
-            if parsed.get('weather') or packet_type == 'weather':
-                return _format_weather_human_info(parsed)
-
-            # Position/GPS packet
-            if (
-                parsed.get('latitude') is not None
-                and parsed.get('longitude') is not None
-            ):
-                return _format_gps_human_info(parsed)
-
-            # Message packet
-            if parsed.get('message_text'):
-                return f'Msg: {parsed.get("message_text", "")}'
-
-            # Status packet
-            if parsed.get('status'):
-                return f'Status: {parsed.get("status", "")}'
-
-            # Object packet
-            if parsed.get('object_name'):
-                name = parsed.get('object_name', '')
-                if parsed.get('latitude') is not None:
-                    return f"Object '{name}' at {parsed['latitude']:.4f}, {parsed['longitude']:.4f}"
-                return f'Object: {name}'
-
-            # Telemetry packet - data or definition
-            if parsed.get('telemetry'):
-                telem = parsed.get('telemetry', {})
-                vals = telem.get('vals', [])
-                if vals:
-                    return f'Telemetry: {", ".join(str(v) for v in vals[:5])}'
-                return 'Telemetry data'
-
-            # Telemetry definition packets (PARM, UNIT, BITS, EQNS)
-            if parsed.get('tPARM'):
-                params = [p for p in parsed['tPARM'] if p]  # Filter empty
-                return f'PARM: {", ".join(params[:5])}'
-            if parsed.get('tUNIT'):
-                units = [u for u in parsed['tUNIT'] if u]  # Filter empty
-                return f'UNIT: {", ".join(units[:5])}'
-            if parsed.get('tBITS'):
-                bits = parsed['tBITS']
-                title = parsed.get('title', '')
-                if title:
-                    return f'BITS: {bits} "{title}"'
-                return f'BITS: {bits}'
-            if parsed.get('tEQNS'):
-                # tEQNS is a list of [a,b,c] coefficient triples
-                eqns = parsed['tEQNS']
-                count = sum(1 for e in eqns if e != [0, 0, 0])
-                return f'EQNS: {count} channel equations defined'
-
-            # Fall back to comment if available
-            comment = parsed.get('comment', '')
-            if comment:
-                clean = _clean_comment(comment)
-                if clean:
-                    return clean[:60]
-
+            info = _format_parsed_human_info(parsed, packet_type)
         except Exception:
-            pass  # Fall through to basic formatting
+            info = None  # Fall through to basic formatting
+        if info:
+            return info
 
     # Fallback: use stored packet fields
     return _format_basic_human_info(packet)
 
 
+def _format_parsed_human_info(parsed: dict, packet_type: str) -> str | None:
+    """Format human_info from an aprslib parse, or None to use stored fields."""
+    # Weather packet
+    if parsed.get('weather') or packet_type == 'weather':
+        return _format_weather_human_info(parsed)
+
+    # Position/GPS packet
+    if parsed.get('latitude') is not None and parsed.get('longitude') is not None:
+        return _format_gps_human_info(parsed)
+
+    # Message packet
+    if parsed.get('message_text'):
+        return f'Msg: {parsed.get("message_text", "")}'
+
+    # Status packet
+    if parsed.get('status'):
+        return f'Status: {parsed.get("status", "")}'
+
+    # Object packet
+    if parsed.get('object_name'):
+        name = parsed.get('object_name', '')
+        if parsed.get('latitude') is not None:
+            return f"Object '{name}' at {parsed['latitude']:.4f}, {parsed['longitude']:.4f}"
+        return f'Object: {name}'
+
+    # Telemetry packet - data or definition
+    if parsed.get('telemetry'):
+        telem = parsed.get('telemetry', {})
+        vals = telem.get('vals', [])
+        if vals:
+            return f'Telemetry: {", ".join(str(v) for v in vals[:5])}'
+        return 'Telemetry data'
+
+    # Telemetry definition packets (PARM, UNIT, BITS, EQNS)
+    if parsed.get('tPARM'):
+        params = [p for p in parsed['tPARM'] if p]  # Filter empty
+        return f'PARM: {", ".join(params[:5])}'
+    if parsed.get('tUNIT'):
+        units = [u for u in parsed['tUNIT'] if u]  # Filter empty
+        return f'UNIT: {", ".join(units[:5])}'
+    if parsed.get('tBITS'):
+        bits = parsed['tBITS']
+        title = parsed.get('title', '')
+        if title:
+            return f'BITS: {bits} "{title}"'
+        return f'BITS: {bits}'
+    if parsed.get('tEQNS'):
+        # tEQNS is a list of [a,b,c] coefficient triples
+        eqns = parsed['tEQNS']
+        count = sum(1 for e in eqns if e != [0, 0, 0])
+        return f'EQNS: {count} channel equations defined'
+
+    # Fall back to comment if available
+    comment = parsed.get('comment', '')
+    if comment:
+        clean = _clean_comment(comment)
+        if clean:
+            return clean[:60]
+
+    return None
+
+
 def _format_weather_human_info(parsed: dict) -> str:
     """Format weather packet like APRSD: Temp 72F Humidity 55% Wind 10MPH@180 ..."""
     parts = []
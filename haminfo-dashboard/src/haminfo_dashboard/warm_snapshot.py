@@ -0,0 +1,116 @@
+# haminfo_dashboard/warm_snapshot.py
+"""Warm-start snapshot of the dashboard's startup queries.
+
+When the startup warmer finishes it writes the results of the expensive
+dashboard queries (keyed by their cache keys) and the station location
+cache to a local JSON file.  The next process loads that file before it
+touches the database, serves the values as stale-but-valid data and
+marks itself ready, then refreshes everything in the background.
+
+Snapshots older than ``max_age`` seconds, from another format version,
+or that fail to parse are ignored and the app warms from scratch.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+import logging
+
+from haminfo_dashboard import cache
+from haminfo_dashboard.station_cache import station_cache
+
+LOG = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+def write(
+    path: str | Path,
+    values: dict[str, Any],
+    stations: Optional[list[tuple[str, str, Optional[str]]]] = None,
+) -> None:
+    """Atomically write a snapshot.
+
+    Args:
+        path: Snapshot file; its directory is created if missing.
+        values: Cache key to query result (JSON serializable).
+        stations: (callsign, country_code, state_code) entries for the
+            station location cache.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        'version': VERSION,
+        'created_at': time.time(),
+        'values': values,
+        'stations': stations or [],
+    }
+    # Several workers may finish warming at once; each writes its own temp
+    # file and the last rename wins.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load(path: str | Path, max_age: float) -> Optional[dict]:
+    """Read a snapshot if it exists and is recent enough.
+
+    Args:
+        path: Snapshot file.
+        max_age: Oldest snapshot to accept, in seconds.
+
+    Returns:
+        The snapshot dict, or None if it is missing, stale or unreadable.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        LOG.warning(f'Ignoring unreadable warm-start snapshot {path}: {e}')
+        return None
+
+    if not isinstance(data, dict) or data.get('version') != VERSION:
+        LOG.warning(f'Ignoring warm-start snapshot {path}: unknown format')
+        return None
+
+    age = time.time() - data.get('created_at', 0)
+    if age > max_age:
+        LOG.info(f'Ignoring warm-start snapshot {path}: {age:.0f}s old')
+        return None
+
+    return data
+
+
+def apply(snapshot: dict) -> dict:
+    """Serve a loaded snapshot until the background refresh completes.
+
+    Args:
+        snapshot: Dict returned by :func:`load`.
+
+    Returns:
+        Dict with values, stations and age (seconds).
+    """
+    values = snapshot.get('values', {})
+    cache.seed_stale(values)
+
+    stations = snapshot.get('stations', [])
+    for callsign, country_code, state_code in stations:
+        station_cache.update(callsign, country_code, state_code)
+
+    return {
+        'values': len(values),
+        'stations': len(stations),
+        'age': time.time() - snapshot.get('created_at', 0),
+    }
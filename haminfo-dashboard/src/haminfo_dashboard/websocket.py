@@ -5,15 +5,19 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from flask import request
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import gevent
 
+from haminfo_dashboard.broadcaster import EncodedFrame, FrameJSON, PacketBroadcaster
+from haminfo_dashboard.callsign_search import callsign_dictionary
 from haminfo_dashboard.station_cache import station_cache
-from haminfo_dashboard.utils import (
-    get_packet_human_info,
-    get_packet_addressee,
-    normalize_packet_type,
+from haminfo_dashboard.subscriptions import (
+    SubscriptionError,
+    SubscriptionIndex,
+    parse_subscription,
 )
+from haminfo_dashboard.utils import enrich_packet
 
 socketio: SocketIO | None = None
 _poll_greenlet = None
@@ -23,6 +27,18 @@ _last_packet_time: datetime | None = None
 _session_factory = None
 
 
+def _emit_frame(event: str, frame: EncodedFrame, room: str) -> None:
+    if socketio:
+        socketio.emit(event, frame, room=room)
+
+
+# Packets are coalesced per room into one 'packets' frame every 250ms
+broadcaster = PacketBroadcaster(_emit_frame)
+
+# Filtered subscriptions; matching packets go to the client's own sid room
+subscriptions = SubscriptionIndex()
+
+
 def _get_session():
     """Get a database session, initializing factory on first call."""
     global _session_factory
@@ -36,7 +52,9 @@ def _get_session():
 def init_socketio(app):
     """Initialize SocketIO with Flask app."""
     global socketio
-    socketio = SocketIO(app, cors_allowed_origins='*', async_mode='gevent')
+    socketio = SocketIO(
+        app, cors_allowed_origins='*', async_mode='gevent', json=FrameJSON
+    )
     register_handlers()
     return socketio
 
@@ -55,6 +73,30 @@ def register_handlers():
     def handle_disconnect():
         """Handle client disconnection."""
         leave_room('live_feed')
+        subscriptions.unsubscribe(request.sid)
+
+    @socketio.on('subscribe')
+    def handle_subscribe(data):
+        """Handle a filtered subscription (bbox, callsigns, packet types).
+
+        Replaces any previous subscription and leaves the global live_feed
+        room, so the client only receives matching packets.
+        """
+        try:
+            subscription = parse_subscription(request.sid, data)
+        except SubscriptionError as e:
+            emit('subscription_error', {'error': str(e)})
+            return
+        subscriptions.subscribe(subscription)
+        leave_room('live_feed')
+        emit('subscribed', subscription.to_dict())
+
+    @socketio.on('unsubscribe')
+    def handle_unsubscribe(data=None):
+        """Drop the client's subscription and return to the live feed."""
+        subscriptions.unsubscribe(request.sid)
+        join_room('live_feed')
+        emit('unsubscribed', {})
 
     @socketio.on('filter')
     def handle_filter(data):
@@ -89,6 +131,7 @@ def register_handlers():
 def start_polling():
     """Start background polling for new packets using gevent."""
     global _poll_greenlet
+    broadcaster.start()
     if _poll_greenlet is None or _poll_greenlet.dead:
         _poll_greenlet = gevent.spawn(poll_packets)
 
@@ -121,12 +164,7 @@ def poll_packets():
                         'from_call': packet.from_call,
                         'to_call': packet.to_call,
                         'path': packet.path,
-                        'packet_type': normalize_packet_type(
-                            packet.packet_type,
-                            packet.latitude,
-                            packet.longitude,
-                            packet.raw,
-                        ),
+                        'packet_type': packet.packet_type,
                         'latitude': packet.latitude,
                         'longitude': packet.longitude,
                         'speed': packet.speed,
@@ -137,9 +175,7 @@ def poll_packets():
                         else None,
                         'country_code': packet.country_code,
                     }
-                    packet_data['human_info'] = get_packet_human_info(packet_data)
-                    packet_data['addressee'] = get_packet_addressee(packet_data)
-                    broadcast_packet(packet_data)
+                    broadcast_packet(enrich_packet(packet_data))
 
                     if packet.received_at and (
                         _last_packet_time is None
@@ -158,10 +194,12 @@ def poll_packets():
 def broadcast_packet(packet_data: dict):
     """Broadcast new packet to all connected clients.
 
-    Emits to:
+    The packet is queued on the broadcaster, which sends each room one
+    'packets' frame per window. Goes to:
     - 'live_feed' room (all clients on homepage/live feed)
     - 'country:<code>' room (clients viewing that country's detail page)
     - 'state:<code>' room (clients viewing that state's detail page, US only)
+    - each client whose subscription (bbox, callsigns, packet types) matches
 
     Uses the country_code stored in the packet (populated by rust-aprsd at insert time).
     For packets without country_code, falls back to the station's last known location
@@ -169,12 +207,15 @@ def broadcast_packet(packet_data: dict):
     """
     if socketio:
         # Always emit to global live feed
-        socketio.emit('packet', packet_data, room='live_feed')
+        rooms = ['live_feed']
 
         from_call = packet_data.get('from_call')
         country_code = packet_data.get('country_code')
         state_code = None
 
+        if from_call:
+            callsign_dictionary.add(from_call)
+
         # If packet has country_code (has coordinates), update station cache
         if country_code and from_call:
             # For US, look up state code
@@ -206,7 +247,12 @@ def broadcast_packet(packet_data: dict):
 
         # Emit to country/state rooms if we have location
         if country_code:
-            socketio.emit('packet', packet_data, room=f'country:{country_code}')
+            rooms.append(f'country:{country_code}')
 
             if state_code:
-                socketio.emit('packet', packet_data, room=f'state:{state_code}')
+                rooms.append(f'state:{state_code}')
+
+        # Each client is in a room named by its sid
+        rooms.extend(subscriptions.match(packet_data))
+
+        broadcaster.publish(packet_data, rooms)
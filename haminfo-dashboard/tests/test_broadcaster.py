@@ -0,0 +1,79 @@
+"""Tests for the coalescing packet broadcaster."""
+
+import json
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from socketio import packet
+
+from haminfo_dashboard.broadcaster import EncodedFrame, FrameJSON, PacketBroadcaster
+
+
+class TestPacketBroadcaster:
+    """Tests for PacketBroadcaster."""
+
+    def test_packets_encoded_once(self, monkeypatch):
+        """One encode per packet, however many rooms it goes to."""
+        from haminfo_dashboard import broadcaster as module
+
+        encode = MagicMock(wraps=module.encode_packet)
+        monkeypatch.setattr(module, 'encode_packet', encode)
+        emit = MagicMock()
+        broadcaster = PacketBroadcaster(emit)
+
+        broadcaster.publish({'from_call': 'N0CALL'}, ['live_feed', 'country:US'])
+        broadcaster.flush()
+
+        assert encode.call_count == 1
+        assert emit.call_count == 2
+
+    def test_room_cap_keeps_newest(self):
+        emit = MagicMock()
+        broadcaster = PacketBroadcaster(emit, max_per_window=3)
+        for i in range(5):
+            broadcaster.publish({'n': i}, ['live_feed'])
+        broadcaster.flush()
+
+        event, frame, room = emit.call_args.args
+        assert (event, room) == ('packets', 'live_feed')
+        assert json.loads(frame) == [{'n': 2}, {'n': 3}, {'n': 4}]
+        assert broadcaster.stats['dropped'] == 2
+        assert broadcaster.stats['sent'] == 3
+
+    def test_zero_interval_emits_immediately(self):
+        emit = MagicMock()
+        broadcaster = PacketBroadcaster(emit, interval=0)
+        broadcaster.publish({'n': 1}, ['live_feed'])
+        emit.assert_called_once_with('packets', '[{"n":1}]', 'live_feed')
+
+    def test_non_json_values_are_stringified(self):
+        emit = MagicMock()
+        broadcaster = PacketBroadcaster(emit)
+        broadcaster.publish({'at': datetime(2024, 1, 1)}, ['live_feed'])
+        broadcaster.flush()
+        assert json.loads(emit.call_args.args[1]) == [{'at': '2024-01-01 00:00:00'}]
+
+    def test_emit_error_does_not_stop_other_rooms(self):
+        emit = MagicMock(side_effect=[RuntimeError('gone'), None])
+        broadcaster = PacketBroadcaster(emit)
+        broadcaster.publish({'n': 1}, ['live_feed', 'country:US'])
+        broadcaster.flush()
+        assert emit.call_count == 2
+        assert broadcaster.stats['frames'] == 1
+
+
+class TestFrameJSON:
+    """Tests for splicing encoded frames into Socket.IO packets."""
+
+    def test_frame_is_not_encoded_twice(self, monkeypatch):
+        monkeypatch.setattr(packet.Packet, 'json', FrameJSON)
+        frame = EncodedFrame('[{"n":1}]')
+        encoded = packet.Packet(packet.EVENT, data=['packets', frame]).encode()
+        assert encoded == '2["packets",[{"n":1}]]'
+        assert json.loads(encoded[1:]) == ['packets', [{'n': 1}]]
+
+    def test_other_data_is_plain_json(self):
+        assert FrameJSON.dumps(['status', {'connected': True}]) == json.dumps(
+            ['status', {'connected': True}]
+        )
+        assert FrameJSON.loads('{"a": 1}') == {'a': 1}
@@ -0,0 +1,89 @@
+"""Tests for callsign search and autocomplete."""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from haminfo.db.models.aprs_packet import APRSPacket
+from haminfo_dashboard import callsign_search
+from haminfo_dashboard.callsign_search import (
+    CallsignDictionary,
+    callsign_filter,
+    like_pattern,
+)
+
+
+class TestLikePattern:
+    """Tests for choosing prefix or substring matching."""
+
+    @pytest.mark.parametrize(
+        'term, expected',
+        [
+            ('k1abc', ('K1ABC%', True)),
+            ('9M2PJU-9', ('9M2PJU-9%', True)),
+            ('VE3', ('%VE3%', False)),
+            ('VE3*', ('VE3%', True)),
+            ('ABC', ('%ABC%', False)),
+            ('*K1ABC', ('%K1ABC%', False)),
+            (' w6abc ', ('W6ABC%', True)),
+        ],
+    )
+    def test_patterns(self, term, expected):
+        assert like_pattern(term) == expected
+
+    def test_wildcards_are_escaped(self):
+        assert like_pattern('A_B%') == ('%A\\_B\\%%', False)
+
+    def test_prefix_filter_uses_upper_like(self):
+        clause = callsign_filter(APRSPacket.from_call, 'K1ABC')
+        sql = str(clause.compile(dialect=postgresql.dialect()))
+        assert 'upper(aprs_packet.from_call) LIKE' in sql
+        assert 'ILIKE' not in sql
+
+    def test_substring_filter_uses_ilike(self):
+        clause = callsign_filter(APRSPacket.from_call, 'ABC')
+        sql = str(clause.compile(dialect=postgresql.dialect()))
+        assert 'ILIKE' in sql
+
+
+class TestCallsignDictionary:
+    """Tests for the in-memory autocomplete dictionary."""
+
+    def test_complete(self):
+        dictionary = CallsignDictionary()
+        dictionary.load(['K1ABC-9', 'k1abc', 'K1ABD', 'W6XYZ', None])
+        assert dictionary.complete('k1ab') == ['K1ABC', 'K1ABC-9', 'K1ABD']
+        assert dictionary.complete('K1ABC', limit=1) == ['K1ABC']
+        assert dictionary.complete('N0') == []
+        assert dictionary.complete('') == []
+
+    def test_add_keeps_order(self):
+        dictionary = CallsignDictionary()
+        dictionary.load(['W6XYZ'])
+        dictionary.add('K1ABC')
+        dictionary.add('k1abc')
+        assert dictionary.complete('K') == ['K1ABC']
+        assert len(dictionary) == 2
+
+    def test_max_size(self):
+        dictionary = CallsignDictionary(max_size=2)
+        dictionary.load(['C', 'A', 'B'])
+        dictionary.add('D')
+        assert dictionary.complete('A') == ['A']
+        assert dictionary.complete('C') == []
+        assert dictionary.complete('D') == []
+
+
+class TestCompleteEndpoint:
+    """Tests for the autocomplete API."""
+
+    def test_returns_completions(self, client, monkeypatch):
+        from haminfo_dashboard.app import startup_state
+
+        monkeypatch.setattr(startup_state, 'ready', True)
+        dictionary = CallsignDictionary()
+        dictionary.load(['K1ABC', 'K1ABD', 'W6XYZ'])
+        monkeypatch.setattr(callsign_search, 'callsign_dictionary', dictionary)
+
+        response = client.get('/api/dashboard/callsigns/complete?q=k1a&limit=1')
+        assert response.status_code == 200
+        assert response.get_json() == ['K1ABC']
@@ -1,7 +1,12 @@
 """Tests for APRS packet decoder."""
 
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
 import pytest
-from haminfo_dashboard.decoder import decode_packet
+from haminfo_dashboard.decoder import decode_batch, decode_packet
 
 
 class TestDecodePacket:
@@ -105,3 +110,162 @@ class TestDecodePacket:
         # Verify source annotation has value
         source_ann = [a for a in result['annotations'] if a['field'] == 'source'][0]
         assert source_ann['value'] == 'WB4APR-14'
+
+
+@pytest.fixture
+def clear_cache():
+    """Start with an empty decode cache."""
+    from haminfo_dashboard import decoder
+
+    decoder._cache.clear()
+    yield decoder
+    decoder._cache.clear()
+
+
+POSITION = 'W3ADO-1>APRS,WIDE1-1,qAR,W3XYZ:@092345z3955.00N/07520.00W_'
+STATUS = 'W3ADO-1>APRS:>Status message'
+
+
+class TestDecodeCache:
+    """Tests for the decode result cache."""
+
+    def test_repeat_decode_is_cached(self, clear_cache):
+        with patch.object(
+            clear_cache, '_decode', wraps=clear_cache._decode
+        ) as mock_decode:
+            first = decode_packet(POSITION)
+            second = decode_packet(POSITION)
+
+        assert first is second
+        mock_decode.assert_called_once_with(POSITION)
+
+    def test_least_recently_used_evicted(self):
+        from haminfo_dashboard.decoder import _ResultCache
+
+        cache = _ResultCache(2)
+        cache.put(b'a', {'n': 1})
+        cache.put(b'b', {'n': 2})
+        cache.get(b'a')
+        cache.put(b'c', {'n': 3})
+
+        assert cache.get(b'b') is None
+        assert cache.get(b'a') == {'n': 1}
+
+
+class TestDecodeBatch:
+    """Tests for decode_batch."""
+
+    def test_results_in_input_order(self, clear_cache):
+        results = list(decode_batch([POSITION, '', 'not a packet', STATUS]))
+
+        assert [r['line'] for r in results] == [1, 3, 4]
+        assert [r['success'] for r in results] == [True, False, True]
+
+    def test_long_line_not_parsed(self, clear_cache):
+        raw = STATUS + 'x' * clear_cache.MAX_LINE_LENGTH
+        with patch.object(clear_cache, '_decode') as mock_decode:
+            (result,) = decode_batch([raw])
+
+        assert result['success'] is False
+        mock_decode.assert_not_called()
+
+    def test_pool_off_by_default(self, clear_cache, monkeypatch):
+        monkeypatch.delenv(clear_cache.DECODE_WORKERS_ENV, raising=False)
+        assert clear_cache.get_pool() is None
+
+    def test_misses_fan_out_in_chunks(self, clear_cache, monkeypatch):
+        pool = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr(clear_cache, 'get_pool', lambda: pool)
+        monkeypatch.setattr(clear_cache, '_pool_slots', threading.BoundedSemaphore(2))
+        lines = [f'W3ADO-{i}>APRS:>Status {i}' for i in range(120)]
+        decode_packet(lines[0])
+
+        with patch.object(pool, 'submit', wraps=pool.submit) as mock_submit:
+            results = list(decode_batch(lines))
+        pool.shutdown()
+
+        assert [r['line'] for r in results] == list(range(1, 121))
+        assert all(r['success'] for r in results)
+        assert [len(call.args[1]) for call in mock_submit.call_args_list] == [
+            50,
+            50,
+            19,
+        ]
+
+    def test_busy_pool_decodes_inline(self, clear_cache, monkeypatch):
+        pool = MagicMock()
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()  # taken by another request
+        monkeypatch.setattr(clear_cache, 'get_pool', lambda: pool)
+        monkeypatch.setattr(clear_cache, '_pool_slots', slots)
+        lines = [f'W3ADO-{i}>APRS:>Status {i}' for i in range(120)]
+
+        results = list(decode_batch(lines))
+
+        assert [r['line'] for r in results] == list(range(1, 121))
+        pool.submit.assert_not_called()
+
+    def test_time_limit_truncates(self, clear_cache):
+        decode_packet(POSITION)
+
+        results = list(decode_batch([POSITION, STATUS, STATUS], time_limit=0))
+
+        assert results[0]['line'] == 1
+        assert results[-1] == {
+            'truncated': True,
+            'error': 'Batch exceeded the 0s time limit.',
+            'line': 2,
+            'decoded': 1,
+            'remaining': 2,
+        }
+
+
+@pytest.fixture
+def client(client, monkeypatch):
+    """Test client for an app that has finished warming up."""
+    from haminfo_dashboard.app import startup_state
+
+    monkeypatch.setattr(startup_state, 'ready', True)
+    return client
+
+
+class TestDecodeBatchEndpoint:
+    """Tests for /api/dashboard/decode/batch."""
+
+    def test_streams_ndjson(self, client, clear_cache):
+        response = client.post(
+            '/api/dashboard/decode/batch',
+            data={'raw_packets': f'{POSITION}\n\n{STATUS}\n'},
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        results = [json.loads(line) for line in response.data.splitlines()]
+        assert [(r['line'], r['success']) for r in results] == [(1, True), (3, True)]
+
+    def test_plain_text_body(self, client, clear_cache):
+        response = client.post(
+            '/api/dashboard/decode/batch',
+            data=STATUS,
+            content_type='text/plain',
+        )
+        assert json.loads(response.data)['parsed']['status'] == 'Status message'
+
+    def test_too_many_lines(self, client):
+        from haminfo_dashboard.decoder import MAX_BATCH_LINES
+
+        response = client.post(
+            '/api/dashboard/decode/batch',
+            data={'raw_packets': 'x\n' * (MAX_BATCH_LINES + 1)},
+        )
+        assert response.status_code == 413
+
+    def test_too_many_bytes(self, client):
+        from haminfo_dashboard.decoder import MAX_BATCH_BYTES
+
+        response = client.post(
+            '/api/dashboard/decode/batch',
+            data='x' * (MAX_BATCH_BYTES + 1),
+            content_type='text/plain',
+        )
+        assert response.status_code == 413
@@ -1,7 +1,7 @@
 """Tests for geographic caching module."""
 
 from concurrent.futures import ThreadPoolExecutor
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -169,6 +169,58 @@ class TestGeoCache:
         assert len(errors) == 0, f'Thread safety errors: {errors}'
 
 
+class TestLookupMany:
+    """Tests for batch lookups."""
+
+    @staticmethod
+    def _results(points, mode=1):
+        return [{'cc': 'US', 'admin1': 'Massachusetts'} for _ in points]
+
+    def test_one_search_for_all_misses(self):
+        """Distinct missing cells are resolved with a single search."""
+        cache = GeoCache(grid_resolution=0.01)
+        with patch(
+            'haminfo_dashboard.geo_cache.rg.search', side_effect=self._results
+        ) as search:
+            infos = cache.lookup_many(
+                [(42.3601, -71.0589), (42.3602, -71.0588), (1, 1)]
+            )
+
+        search.assert_called_once()
+        # The first two points share a grid cell, which is queried once
+        assert search.call_args.args[0] == [(42.36, -71.06), (1.0, 1.0)]
+        assert [info.state_code for info in infos] == ['MA', 'MA', 'MA']
+        assert cache.stats['size'] == 2
+
+    def test_cached_cells_skip_search(self):
+        """A second batch over the same cells is answered from the cache."""
+        cache = GeoCache()
+        with patch(
+            'haminfo_dashboard.geo_cache.rg.search', side_effect=self._results
+        ) as search:
+            cache.lookup_many([(42.36, -71.06), (34.05, -118.24)])
+            infos = cache.lookup_many([(34.05, -118.24)])
+            cache.lookup(42.36, -71.06)
+
+        assert search.call_count == 1
+        assert infos[0].country_code == 'US'
+        stats = cache.stats
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['hit_rate'] == 0.5
+
+    def test_failed_search_is_not_cached(self):
+        """Errors return empty locations and are retried next time."""
+        cache = GeoCache()
+        with patch(
+            'haminfo_dashboard.geo_cache.rg.search', side_effect=RuntimeError('boom')
+        ):
+            info = cache.lookup(42.36, -71.06)
+
+        assert info.country_code is None
+        assert len(cache) == 0
+
+
 class TestGlobalCache:
     """Tests for global cache instance."""
 
@@ -289,7 +341,6 @@ class TestWarmCache:
     def test_warm_cache_populates_from_recent_packets(self):
         """Test that warm_cache loads grid cells from recent packets."""
         from haminfo_dashboard.geo_cache import warm_cache, geo_cache
-        from unittest.mock import MagicMock
 
         geo_cache.clear()
 
@@ -333,7 +384,6 @@ class TestWarmCache:
     def test_warm_cache_handles_errors_gracefully(self):
         """Test that warm_cache continues on individual lookup errors."""
         from haminfo_dashboard.geo_cache import warm_cache, geo_cache
-        from unittest.mock import MagicMock
 
         geo_cache.clear()
 
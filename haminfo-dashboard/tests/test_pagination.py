@@ -0,0 +1,124 @@
+# tests/test_pagination.py
+"""Tests for keyset pagination cursors."""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from haminfo_dashboard.pagination import (
+    InvalidCursor,
+    callsign_cursor,
+    decode_callsign_cursor,
+    decode_packet_cursor,
+    encode_cursor,
+    packet_cursor,
+)
+
+
+class TestCursors:
+    """Tests for cursor encoding."""
+
+    def test_packet_cursor_round_trip(self):
+        cursor = packet_cursor(
+            {'received_at': '2026-01-01T12:00:00.123456', 'from_call': 'N0CALL-9'}
+        )
+        assert decode_packet_cursor(cursor) == (
+            datetime(2026, 1, 1, 12, 0, 0, 123456),
+            'N0CALL-9',
+        )
+
+    def test_callsign_cursor_round_trip(self):
+        assert decode_callsign_cursor(callsign_cursor('WB4BOR')) == 'WB4BOR'
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor('?/+&=' * 5)
+        assert cursor.replace('-', '').replace('_', '').isalnum()
+
+    @pytest.mark.parametrize(
+        'cursor',
+        ['not a cursor', '!!!', encode_cursor('a', 'b'), encode_cursor(42), ''],
+    )
+    def test_invalid_callsign_cursor(self, cursor):
+        with pytest.raises(InvalidCursor):
+            decode_callsign_cursor(cursor)
+
+    def test_invalid_packet_cursor_timestamp(self):
+        with pytest.raises(InvalidCursor):
+            decode_packet_cursor(encode_cursor('yesterday', 'N0CALL'))
+
+
+@pytest.fixture
+def client(client, monkeypatch):
+    """Test client for an app that has finished warming up."""
+    from haminfo_dashboard.app import startup_state
+
+    monkeypatch.setattr(startup_state, 'ready', True)
+    return client
+
+
+def _packet(second):
+    return {
+        'from_call': 'N0CALL',
+        'received_at': datetime(2026, 1, 1, 0, 0, second).isoformat(),
+    }
+
+
+class TestPagedEndpoints:
+    """Tests for cursors on the API endpoints."""
+
+    @patch('haminfo_dashboard.api._get_session', return_value=MagicMock())
+    @patch('haminfo_dashboard.api.get_recent_packets')
+    def test_packets_next_cursor(self, mock_packets, mock_session, client):
+        mock_packets.return_value = [_packet(2), _packet(1)]
+
+        response = client.get('/api/dashboard/packets?limit=2&offset=4')
+
+        assert response.status_code == 200
+        cursor = response.headers['X-Next-Cursor']
+        assert decode_packet_cursor(cursor) == (datetime(2026, 1, 1, 0, 0, 1), 'N0CALL')
+        assert f'cursor={cursor}' in response.headers['Link']
+        assert 'offset' not in response.headers['Link']
+
+    @patch('haminfo_dashboard.api._get_session', return_value=MagicMock())
+    @patch('haminfo_dashboard.api.get_recent_packets')
+    def test_packets_last_page(self, mock_packets, mock_session, client):
+        mock_packets.return_value = [_packet(1)]
+        cursor = packet_cursor(_packet(2))
+
+        response = client.get(f'/api/dashboard/packets?limit=2&cursor={cursor}')
+
+        assert 'X-Next-Cursor' not in response.headers
+        assert mock_packets.call_args.kwargs['after'] == (
+            datetime(2026, 1, 1, 0, 0, 2),
+            'N0CALL',
+        )
+
+    def test_invalid_cursor_rejected(self, client):
+        response = client.get('/api/dashboard/packets?cursor=bogus')
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid cursor'}
+
+    @patch('haminfo_dashboard.api._get_session', return_value=MagicMock())
+    @patch('haminfo_dashboard.api.get_weather_stations')
+    def test_weather_grid_load_more(self, mock_stations, mock_session, client):
+        mock_stations.return_value = [
+            {'callsign': 'K1ABC', 'latest_report': None},
+            {'callsign': 'K2ABC', 'latest_report': None},
+        ]
+
+        response = client.get('/api/dashboard/weather/stations?limit=2')
+
+        assert b'hx-trigger="revealed"' in response.data
+        assert callsign_cursor('K2ABC').encode() in response.data
+
+    @patch('haminfo_dashboard.api._get_session', return_value=MagicMock())
+    @patch('haminfo_dashboard.api.get_weather_stations')
+    def test_weather_grid_empty_next_page(self, mock_stations, mock_session, client):
+        mock_stations.return_value = []
+        cursor = callsign_cursor('K2ABC')
+
+        response = client.get(f'/api/dashboard/weather/stations?cursor={cursor}')
+
+        assert b'No weather stations found' not in response.data
+        assert mock_stations.call_args.kwargs['after'] == 'K2ABC'
@@ -0,0 +1,143 @@
+# tests/test_position_recovery.py
+"""Tests for the background position recovery worker."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from haminfo_dashboard.position_recovery import (
+    PositionRecovery,
+    backfill_positions,
+    decode_batch,
+    decode_position,
+)
+
+OBJECT = 'N0CALL>APRS:;LEADER   *092345z4903.50N/07201.75W>088/036'
+MIC_E = 'N0CALL>S32U6T:`(_fn"Oj/'
+COMPRESSED = 'N0CALL>APRS:!/5L!!<*e7>7P['
+MESSAGE = 'N0CALL>APRS::WB4BOR-9 :Hello{1'
+
+
+class TestDecodePosition:
+    """Tests for decode_position."""
+
+    @pytest.mark.parametrize('raw', [OBJECT, MIC_E, COMPRESSED])
+    def test_position_formats(self, raw):
+        position = decode_position(raw)
+        assert position is not None
+        assert -85 <= position['latitude'] <= 85
+        assert -180 <= position['longitude'] <= 180
+
+    def test_object_fields(self):
+        position = decode_position(OBJECT)
+        assert position['latitude'] == pytest.approx(49.0583, abs=1e-4)
+        assert position['longitude'] == pytest.approx(-72.0292, abs=1e-4)
+        assert position['course'] == 88
+
+    def test_message_has_no_position(self):
+        assert decode_position(MESSAGE) is None
+
+    def test_null_island_rejected(self):
+        assert decode_position('N0CALL>APRS:!0000.00N/00000.00W-') is None
+
+    def test_garbage(self):
+        assert decode_position('garbage') is None
+
+    def test_decode_batch_keeps_order(self):
+        results = decode_batch([OBJECT, MESSAGE, MIC_E])
+        assert results[0] is not None
+        assert results[1] is None
+        assert results[2] is not None
+
+
+def _row(raw, second):
+    return SimpleNamespace(
+        from_call='N0CALL',
+        timestamp=datetime(2026, 1, 1, 0, 0, second),
+        received_at=datetime(2026, 1, 1, 0, 0, second),
+        raw=raw,
+    )
+
+
+class TestBackfillPositions:
+    """Tests for backfill_positions."""
+
+    def test_updates_packets_and_summary(self):
+        session = MagicMock()
+        update = {
+            'from_call': 'N0CALL',
+            'timestamp': datetime(2026, 10, 19, 12),
+            'received_at': datetime(2026, 10, 19, 12),
+            **decode_position(OBJECT),
+        }
+
+        assert backfill_positions(session, [update]) == 1
+
+        statements = [str(c.args[0]) for c in session.execute.call_args_list]
+        assert 'UPDATE aprs_packet' in statements[0]
+        assert 'UPDATE aprs_station_summary' in statements[1]
+        assert session.execute.call_args_list[1].args[1] == [update]
+        session.commit.assert_called_once()
+
+    def test_nothing_to_write(self):
+        session = MagicMock()
+        assert backfill_positions(session, []) == 0
+        session.execute.assert_not_called()
+
+
+class TestPositionRecovery:
+    """Tests for PositionRecovery.run_once."""
+
+    def test_backfills_decoded_rows_and_advances(self):
+        rows = [_row(OBJECT, 1), _row(MESSAGE, 2), _row(MIC_E, 3)]
+        worker = PositionRecovery(MagicMock(), batch_size=10)
+        with (
+            patch(
+                'haminfo_dashboard.position_recovery.find_candidates',
+                return_value=rows,
+            ) as find,
+            patch(
+                'haminfo_dashboard.position_recovery.backfill_positions',
+                side_effect=lambda session, updates: len(updates),
+            ) as backfill,
+            patch.object(worker, '_decode', side_effect=decode_batch),
+        ):
+            result = worker.run_once()
+
+        assert result == {'scanned': 3, 'recovered': 2}
+        find.assert_called_once()
+        updates = backfill.call_args[0][1]
+        assert [u['timestamp'].second for u in updates] == [1, 3]
+        assert worker._after == (rows[2].received_at, 'N0CALL', rows[2].timestamp)
+
+    def test_pages_through_full_batches(self):
+        batches = [[_row(OBJECT, 1), _row(OBJECT, 2)], [_row(OBJECT, 3)]]
+        worker = PositionRecovery(MagicMock(), batch_size=2)
+        with (
+            patch(
+                'haminfo_dashboard.position_recovery.find_candidates',
+                side_effect=batches,
+            ) as find,
+            patch(
+                'haminfo_dashboard.position_recovery.backfill_positions',
+                side_effect=lambda session, updates: len(updates),
+            ),
+            patch.object(worker, '_decode', side_effect=decode_batch),
+        ):
+            result = worker.run_once()
+
+        assert result == {'scanned': 3, 'recovered': 3}
+        assert find.call_count == 2
+        # The second page starts after the last row of the first
+        assert find.call_args_list[1][0][2][0] == batches[0][1].received_at
+
+    def test_decodes_on_process_pool(self):
+        worker = PositionRecovery(MagicMock(), chunk_size=1, workers=1)
+        try:
+            results = worker._decode([OBJECT, MESSAGE])
+        finally:
+            worker.close()
+        assert results[0]['course'] == 88
+        assert results[1] is None
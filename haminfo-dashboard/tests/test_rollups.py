@@ -0,0 +1,161 @@
+# tests/test_rollups.py
+"""Tests for the country and state rollup worker and its readers."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from haminfo_dashboard import queries
+from haminfo_dashboard.rollups import RegionRollup, build_rollups
+
+RICHMOND = (37.5, -77.5)
+TORONTO = (43.7, -79.4)
+
+
+def _by_code(rows, key='country_code'):
+    return {row[key]: row for row in rows}
+
+
+class TestBuildRollups:
+    """Tests for build_rollups."""
+
+    def test_countries_and_states(self):
+        countries, states = build_rollups(
+            {'W1AW': 10, 'K4ABC-9': 30, 'VE3ABC': 5, 'DL1ABC': 7, 'WINLINK': 99},
+            {'K4ABC-9': RICHMOND, 'VE3ABC': TORONTO, 'DL1ABC': (52.5, 13.4)},
+            [('KW4WX', *RICHMOND), ('DL2WX', None, None)],
+        )
+
+        countries = _by_code(countries)
+        assert set(countries) == {'US', 'CA', 'DE'}
+        us = countries['US']
+        assert us['packets_24h'] == 40
+        assert us['unique_stations'] == 2
+        assert us['weather_stations'] == 1
+        assert json.loads(us['top_stations']) == [
+            {'callsign': 'K4ABC-9', 'count': 30},
+            {'callsign': 'W1AW', 'count': 10},
+        ]
+        assert countries['DE']['weather_stations'] == 1
+
+        states = _by_code(states, 'state_code')
+        assert set(states) == {'VA', 'ON'}
+        assert states['VA']['country_code'] == 'US'
+        assert states['VA']['packets_24h'] == 30
+        assert states['VA']['weather_stations'] == 1
+        assert states['ON']['state_name'] == 'Ontario'
+
+    def test_top_stations_capped(self):
+        counts = {f'W{i}AW': i for i in range(1, 60)}
+        countries, _ = build_rollups(counts, {}, [])
+        top = json.loads(countries[0]['top_stations'])
+        assert len(top) == 25
+        assert top[0] == {'callsign': 'W59AW', 'count': 59}
+
+
+def _bucket_rows(bucket, counts):
+    return [
+        SimpleNamespace(bucket=bucket, from_call=call, packet_count=count)
+        for call, count in counts.items()
+    ]
+
+
+class TestRegionRollup:
+    """Tests for RegionRollup.run_once."""
+
+    def test_rereads_only_recent_buckets(self):
+        now = datetime(2026, 10, 19, 12, 30)
+        old = datetime(2026, 10, 19, 3)
+        recent = datetime(2026, 10, 19, 12)
+        session = MagicMock()
+        worker = RegionRollup(MagicMock(return_value=session))
+        worker._weather_loaded_at = float('inf')
+
+        bucket_reads = []
+
+        def execute(sql, params=None):
+            if 'aprs_station_stats_hourly' in str(sql):
+                bucket_reads.append(params['since'])
+                if len(bucket_reads) == 1:
+                    return _bucket_rows(old, {'W1AW': 5}) + _bucket_rows(
+                        recent, {'W1AW': 1}
+                    )
+                return _bucket_rows(recent, {'W1AW': 3})
+            return []
+
+        session.execute.side_effect = execute
+        with (
+            patch('haminfo_dashboard.rollups.datetime') as mock_datetime,
+            patch('haminfo_dashboard.rollups.write_rollups') as write,
+        ):
+            mock_datetime.now.return_value = now
+            worker.run_once()
+            worker.run_once()
+
+        assert bucket_reads == [now - timedelta(hours=24), now - timedelta(hours=2)]
+        countries = write.call_args[0][1]
+        assert countries[0]['packets_24h'] == 8
+
+
+class TestRollupReaders:
+    """Country queries served from the rollup tables."""
+
+    def _session(self, row):
+        session = MagicMock()
+        session.execute.return_value.fetchone.return_value = row
+        return session
+
+    def test_country_stats(self):
+        session = self._session(
+            SimpleNamespace(
+                packets_24h=1000,
+                unique_stations=50,
+                top_stations=[{'callsign': 'K4ABC-9', 'count': 300}],
+                weather_stations=4,
+            )
+        )
+
+        stats = queries.get_country_stats(session, 'US')
+
+        assert stats == {
+            'packets_24h': 1000,
+            'unique_stations': 50,
+            'top_station': 'K4ABC-9',
+            'weather_stations': 4,
+        }
+        session.execute.assert_called_once()
+
+    def test_stale_rollup_ignored(self):
+        session = self._session(None)
+        with patch.object(
+            queries, '_get_country_top_stations_from_aggregates', return_value=['agg']
+        ) as fallback:
+            assert queries.get_country_top_stations(session, 'US') == ['agg']
+
+        sql, params = session.execute.call_args_list[0][0]
+        assert 'updated_at > :fresh_since' in str(sql)
+        age = datetime.now(timezone.utc).replace(tzinfo=None) - params['fresh_since']
+        assert (
+            timedelta(seconds=queries.ROLLUP_MAX_AGE)
+            <= age
+            < timedelta(seconds=queries.ROLLUP_MAX_AGE + 60)
+        )
+        fallback.assert_called_once()
+
+    def test_country_top_stations(self):
+        top = [{'callsign': f'W{i}AW', 'count': 100 - i} for i in range(25)]
+        session = self._session(
+            SimpleNamespace(
+                packets_24h=1, unique_stations=1, top_stations=top, weather_stations=0
+            )
+        )
+        assert queries.get_country_top_stations(session, 'US', limit=3) == top[:3]
+
+    def test_country_breakdown_falls_back_when_empty(self):
+        session = MagicMock()
+        session.execute.return_value.fetchall.return_value = []
+        with patch.object(
+            queries, '_get_country_breakdown_from_aggregates', return_value=['agg']
+        ):
+            assert queries.get_country_breakdown(session, limit=5) == ['agg']
@@ -0,0 +1,101 @@
+"""Tests for the cross-worker shared station table."""
+
+from haminfo_dashboard import shared_station_table
+from haminfo_dashboard.shared_station_table import SharedStationTable, publish
+from haminfo_dashboard.station_cache import StationLocationCache
+
+
+def _entries(count, country='US'):
+    return [
+        (f'N{i}CALL-9', country, None, 35.0 + i * 1e-3, -80.0) for i in range(count)
+    ]
+
+
+class TestSharedStationTable:
+    """Tests for publishing and reading the shared table."""
+
+    def test_lookup_after_publish(self, tmp_path):
+        """Published stations can be read back by any reader."""
+        publish(tmp_path, [('N0CALL-9', 'US', 'CA', 34.5, -120.25)])
+        table = SharedStationTable(tmp_path, check_interval=0)
+
+        station = table.get('n0call-1')
+        assert station.country_code == 'US'
+        assert station.state_code == 'CA'
+        assert station.latitude == 34.5
+        assert station.longitude == -120.25
+
+    def test_missing_callsign(self, tmp_path):
+        """Unknown callsigns miss, including in a well-filled table."""
+        publish(tmp_path, _entries(5000))
+        table = SharedStationTable(tmp_path, check_interval=0)
+        assert table.get('N4999CALL') is not None
+        assert table.get('K1ABC') is None
+        assert table.stats['size'] == 5000
+
+    def test_no_table_published(self, tmp_path):
+        """A reader without a published table just misses."""
+        table = SharedStationTable(tmp_path / 'missing', check_interval=0)
+        assert table.get('N0CALL') is None
+
+    def test_optional_fields(self, tmp_path):
+        """Missing state and position come back as None."""
+        publish(tmp_path, [('DL1ABC', 'DE', None, None, None)])
+        station = SharedStationTable(tmp_path, check_interval=0).get('DL1ABC')
+        assert station.state_code is None
+        assert station.latitude is None
+
+    def test_generation_swap(self, tmp_path):
+        """Readers pick up a newly published generation."""
+        publish(tmp_path, [('N0CALL', 'US', None, None, None)])
+        table = SharedStationTable(tmp_path, check_interval=0)
+        assert table.get('N0CALL').country_code == 'US'
+
+        publish(tmp_path, [('N0CALL', 'CA', None, None, None)])
+        assert table.get('N0CALL').country_code == 'CA'
+        assert table.stats['swaps'] == 2
+        # Only the current generation is left on disk
+        assert len(list(tmp_path.glob('stations.*.bin'))) == 1
+
+    def test_reader_checks_for_new_generations_periodically(self, tmp_path):
+        """Within check_interval the current map is reused."""
+        publish(tmp_path, [('N0CALL', 'US', None, None, None)])
+        table = SharedStationTable(tmp_path, check_interval=3600)
+        table.get('N0CALL')
+
+        publish(tmp_path, [('N0CALL', 'CA', None, None, None)])
+        assert table.get('N0CALL').country_code == 'US'
+
+    def test_warmer_lock_is_exclusive(self, tmp_path):
+        """Only one process (open file) becomes the warmer."""
+        first = shared_station_table.acquire_warmer_lock(tmp_path)
+        assert first is not None
+        assert shared_station_table.acquire_warmer_lock(tmp_path) is None
+
+        first.close()
+        again = shared_station_table.acquire_warmer_lock(tmp_path)
+        assert again is not None
+        again.close()
+
+
+class TestStationCacheSharedFallback:
+    """StationLocationCache falls back to the shared table on misses."""
+
+    def test_local_miss_reads_shared_table(self, tmp_path):
+        publish(tmp_path, [('N0CALL', 'US', 'TX', None, None)])
+        cache = StationLocationCache()
+        cache.set_shared_table(SharedStationTable(tmp_path, check_interval=0))
+
+        location = cache.get('N0CALL-7')
+        assert location.country_code == 'US'
+        assert location.state_code == 'TX'
+        # Shared entries are not copied into the local cache
+        assert len(cache) == 0
+        assert cache.stats['shared_hits'] == 1
+
+    def test_local_entries_win(self, tmp_path):
+        publish(tmp_path, [('N0CALL', 'US', 'TX', None, None)])
+        cache = StationLocationCache()
+        cache.set_shared_table(SharedStationTable(tmp_path, check_interval=0))
+        cache.update('N0CALL', 'MX')
+        assert cache.get('N0CALL').country_code == 'MX'
@@ -212,6 +212,33 @@ class TestGetStateTrends:
         assert result['labels'] == []
         assert result['temperature']['avg'] == []
 
+    def test_uses_hourly_aggregate(self):
+        """Should read weather_report_hourly when aggregates are enabled."""
+        from haminfo_dashboard.state_queries import get_state_trends
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.mappings.return_value.all.return_value = []
+
+        with patch('haminfo_dashboard.state_queries.USE_CONTINUOUS_AGGREGATES', True):
+            get_state_trends.__wrapped__(mock_session, 'VA')
+
+        sql = str(mock_session.execute.call_args[0][0])
+        assert 'weather_report_hourly' in sql
+        assert 'FROM weather_report wr' not in sql
+
+    def test_falls_back_to_raw_reports(self):
+        """Should bucket raw weather reports when aggregates are disabled."""
+        from haminfo_dashboard.state_queries import get_state_trends
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.mappings.return_value.all.return_value = []
+
+        with patch('haminfo_dashboard.state_queries.USE_CONTINUOUS_AGGREGATES', False):
+            get_state_trends.__wrapped__(mock_session, 'VA')
+
+        sql = str(mock_session.execute.call_args[0][0])
+        assert 'FROM weather_report wr' in sql
+
 
 class TestDetectStateAlerts:
     """Tests for detect_state_alerts function."""
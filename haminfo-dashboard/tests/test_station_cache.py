@@ -0,0 +1,129 @@
+"""Tests for the station location cache."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from haminfo_dashboard.geo_cache import LocationInfo
+from haminfo_dashboard.station_cache import (
+    StationLocation,
+    StationLocationCache,
+    _with_us_states,
+)
+
+
+class TestStationLocation:
+    """Tests for the slotted cache entry."""
+
+    def test_has_no_instance_dict(self):
+        """Entries are slotted to keep 100k of them compact."""
+        location = StationLocation('US', 'CA')
+        assert not hasattr(location, '__dict__')
+        assert location.country_code == 'US'
+        assert location.state_code == 'CA'
+
+
+class TestStationLocationCache:
+    """Tests for StationLocationCache."""
+
+    def test_get_strips_ssid(self):
+        """Lookups ignore the SSID and case."""
+        cache = StationLocationCache()
+        cache.update('n0call-9', 'US', 'CA')
+        assert cache.get('N0CALL-1').state_code == 'CA'
+
+    def test_update_replaces_location(self):
+        """A new position overwrites the cached one."""
+        cache = StationLocationCache()
+        cache.update('N0CALL', 'US', 'CA')
+        cache.update('N0CALL', 'CA')
+        location = cache.get('N0CALL')
+        assert location.country_code == 'CA'
+        assert location.state_code is None
+        assert len(cache) == 1
+
+    def test_evicts_least_recently_used(self):
+        """The entry not read or written for longest is evicted first."""
+        cache = StationLocationCache(max_size=3)
+        for call in ('A1', 'B1', 'C1'):
+            cache.update(call, 'US')
+
+        cache.get('A1')
+        cache.update('D1', 'US')
+
+        assert cache.get('B1') is None
+        assert cache.get('A1') is not None
+        assert len(cache) == 3
+        assert cache.stats['evictions'] == 1
+
+    def test_update_refreshes_recency(self):
+        """Updating an entry protects it from the next eviction."""
+        cache = StationLocationCache(max_size=2)
+        cache.update('A1', 'US')
+        cache.update('B1', 'US')
+        cache.update('A1', 'DE')
+        cache.update('C1', 'US')
+
+        assert cache.get('A1').country_code == 'DE'
+        assert cache.get('B1') is None
+
+    def test_ttl_expires_stale_entries(self):
+        """Entries not updated within the TTL are treated as misses."""
+        cache = StationLocationCache(ttl=60)
+        with patch('haminfo_dashboard.station_cache.time.monotonic', return_value=0):
+            cache.update('N0CALL', 'US')
+        with patch('haminfo_dashboard.station_cache.time.monotonic', return_value=30):
+            assert cache.get('N0CALL') is not None
+        with patch('haminfo_dashboard.station_cache.time.monotonic', return_value=61):
+            assert cache.get('N0CALL') is None
+
+        assert len(cache) == 0
+        assert cache.stats['expirations'] == 1
+
+    def test_stats(self):
+        """Hits and misses are counted."""
+        cache = StationLocationCache()
+        cache.update('N0CALL', 'US')
+        cache.get('N0CALL')
+        cache.get('K1ABC')
+        stats = cache.stats
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_clear(self):
+        """Clear drops entries and counters."""
+        cache = StationLocationCache()
+        cache.update('N0CALL', 'US')
+        cache.get('N0CALL')
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats['hits'] == 0
+
+
+class TestWithUsStates:
+    """Tests for filling state codes during warm-up."""
+
+    def test_batch_geocodes_us_stations(self):
+        rows = [
+            SimpleNamespace(
+                from_call='N0CALL', country_code='US', latitude=34.0, longitude=-118.0
+            ),
+            SimpleNamespace(
+                from_call='DL1ABC', country_code='DE', latitude=52.5, longitude=13.4
+            ),
+            SimpleNamespace(
+                from_call='K1ABC', country_code='US', latitude=None, longitude=None
+            ),
+        ]
+        with patch(
+            'haminfo_dashboard.geo_cache.geo_cache.lookup_many',
+            return_value=[LocationInfo('US', 'CA')],
+        ) as lookup_many:
+            result = _with_us_states(rows)
+
+        assert list(lookup_many.call_args.args[0]) == [(34.0, -118.0)]
+        assert result == [
+            ('N0CALL', 'US', 'CA', 34.0, -118.0),
+            ('DL1ABC', 'DE', None, 52.5, 13.4),
+            ('K1ABC', 'US', None, None, None),
+        ]
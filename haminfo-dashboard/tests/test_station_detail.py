@@ -0,0 +1,136 @@
+"""Tests for the station detail query."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from haminfo_dashboard import queries
+
+
+def _summary(**overrides):
+    fields = {
+        'from_call': 'N0CALL-9',
+        'first_seen': datetime(2026, 1, 2, 3, 4, 5),
+        'last_seen': datetime(2026, 10, 19, 12, 0, 0),
+        'packet_count': 12345,
+        'symbol': '>',
+        'symbol_table': '/',
+        'comment': 'Mobile',
+        'position_at': datetime(2026, 10, 19, 11, 59, 0),
+        'latitude': 37.5,
+        'longitude': -77.5,
+        'altitude': 100.0,
+        'speed': 50.0,
+        'course': 90,
+        'type_counts_24h': {'position': 40, 'status': 2},
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _packet(**overrides):
+    fields = {
+        'from_call': 'N0CALL-9',
+        'received_at': datetime(2026, 10, 19, 12, 10, 0),
+        'symbol': '[',
+        'symbol_table': '/',
+        'comment': 'On foot',
+        'latitude': 37.6,
+        'longitude': -77.4,
+        'altitude': None,
+        'speed': 5.0,
+        'course': 180,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestGetStationDetailFromSummary:
+    """Station detail served from aprs_station_summary."""
+
+    @patch.object(queries, 'MAP_FROM_SUMMARY', True)
+    def test_reads_summary_and_hourly_counts(self):
+        session = MagicMock()
+        session.get.return_value = _summary()
+        session.execute.return_value.fetchone.return_value = SimpleNamespace(
+            packets_24h=42, packets_7d=300
+        )
+
+        detail = queries.get_station_detail(session, 'n0call-9')
+
+        session.get.assert_called_once_with(queries.APRSStationSummary, 'N0CALL-9')
+        session.query.assert_not_called()
+        assert detail['packets_total'] == 12345
+        assert detail['packets_24h'] == 42
+        assert detail['packets_7d'] == 300
+        assert detail['first_seen'] == '2026-01-02'
+        assert detail['packet_types'] == {'position': 40, 'status': 2}
+        assert detail['latitude'] == 37.5
+        assert detail['position_last_seen'] == '2026-10-19T11:59:00'
+        assert detail['country_code'] == 'US'
+
+    @patch.object(queries, 'MAP_FROM_SUMMARY', True)
+    def test_missing_position_reads_latest_stored_position(self):
+        session = MagicMock()
+        session.get.return_value = _summary(
+            latitude=None, longitude=None, position_at=None
+        )
+        session.execute.return_value.fetchone.return_value = None
+        packet = SimpleNamespace(
+            latitude=48.1,
+            longitude=11.6,
+            altitude=None,
+            speed=None,
+            course=None,
+            received_at=datetime(2026, 10, 18),
+        )
+        session.query.return_value.filter.return_value.order_by.return_value.first.return_value = packet
+
+        detail = queries.get_station_detail(session, 'N0CALL-9')
+
+        assert detail['latitude'] == 48.1
+        assert detail['position_last_seen'] == '2026-10-18T00:00:00'
+        assert detail['packets_24h'] == 0
+
+    def test_latest_packet_overrides_summary_by_default(self):
+        session = MagicMock()
+        session.get.return_value = _summary()
+        session.execute.return_value.fetchone.return_value = None
+        session.query.return_value.filter.return_value.order_by.return_value.first.return_value = _packet()
+
+        detail = queries.get_station_detail(session, 'N0CALL-9')
+
+        session.query.assert_called_once_with(queries.APRSPacket)
+        assert detail['last_seen'] == '2026-10-19T12:10:00'
+        assert detail['symbol'] == '['
+        assert detail['comment'] == 'On foot'
+        assert detail['latitude'] == 37.6
+        assert detail['position_last_seen'] == '2026-10-19T12:10:00'
+        # Totals still come from the summary
+        assert detail['packets_total'] == 12345
+        assert detail['first_seen'] == '2026-01-02'
+
+    def test_latest_packet_without_position(self):
+        session = MagicMock()
+        session.get.return_value = _summary()
+        session.execute.return_value.fetchone.return_value = None
+        session.query.return_value.filter.return_value.order_by.return_value.first.side_effect = [
+            _packet(comment='Telemetry', latitude=None, longitude=None),
+            _packet(received_at=datetime(2026, 10, 19, 12, 5, 0)),
+        ]
+
+        detail = queries.get_station_detail(session, 'N0CALL-9')
+
+        assert detail['last_seen'] == '2026-10-19T12:10:00'
+        assert detail['comment'] == 'Telemetry'
+        assert detail['latitude'] == 37.6
+        assert detail['position_last_seen'] == '2026-10-19T12:05:00'
+
+    def test_falls_back_without_summary_row(self):
+        session = MagicMock()
+        session.get.return_value = None
+        with patch.object(
+            queries, '_get_station_detail_from_raw', return_value={'callsign': 'X'}
+        ) as raw:
+            assert queries.get_station_detail(session, 'N0CALL') == {'callsign': 'X'}
+        raw.assert_called_once_with(session, 'N0CALL')
@@ -0,0 +1,178 @@
+"""Tests for live feed subscriptions."""
+
+from unittest.mock import patch
+
+import pytest
+
+import haminfo_dashboard.websocket as websocket_module
+from haminfo_dashboard.subscriptions import (
+    SubscriptionError,
+    SubscriptionIndex,
+    parse_subscription,
+)
+
+
+def _packet(lat=None, lon=None, **fields):
+    return {'from_call': 'N0CALL', 'latitude': lat, 'longitude': lon, **fields}
+
+
+def _index(**subscriptions):
+    index = SubscriptionIndex()
+    for sid, data in subscriptions.items():
+        index.subscribe(parse_subscription(sid, data))
+    return index
+
+
+class TestParseSubscription:
+    """Tests for validating subscribe requests."""
+
+    def test_normalizes_fields(self):
+        subscription = parse_subscription(
+            'sid',
+            {
+                'bbox': [40, 190, 41, 200],
+                'callsigns': [' n0call-9 '],
+                'packet_types': ['Position'],
+            },
+        )
+        assert subscription.bbox == (40, -170, 41, -160)
+        assert subscription.callsigns == {'N0CALL-9'}
+        assert subscription.packet_types == {'position'}
+
+    def test_world_bbox(self):
+        subscription = parse_subscription('sid', {'bbox': [-90, -180, 90, 180]})
+        assert subscription.bbox == (-90, -180, 90, 180)
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            {},
+            {'bbox': [1, 2, 3]},
+            {'bbox': [50, 0, 40, 10]},
+            {'bbox': ['a', 0, 1, 1]},
+            {'callsigns': 'N0CALL'},
+            {'callsigns': [1]},
+            {'callsigns': [f'N{i}CALL' for i in range(101)]},
+            'bbox',
+        ],
+    )
+    def test_rejects_invalid(self, data):
+        with pytest.raises(SubscriptionError):
+            parse_subscription('sid', data)
+
+
+class TestSubscriptionIndex:
+    """Tests for routing packets to subscribers."""
+
+    def test_bbox(self):
+        index = _index(
+            boston={'bbox': [42, -72, 43, -71]}, la={'bbox': [33, -119, 35, -118]}
+        )
+        assert index.match(_packet(42.36, -71.06)) == ['boston']
+        assert index.match(_packet(34.05, -118.24)) == ['la']
+        # Same grid cell as Boston but outside its bbox
+        assert index.match(_packet(42.5, -71.5)) == ['boston']
+        assert index.match(_packet(42.5, -70.5)) == []
+        # No position, no bbox match
+        assert index.match(_packet()) == []
+
+    def test_bbox_across_antimeridian(self):
+        index = _index(pacific={'bbox': [-20, 170, -10, -170]})
+        assert index.match(_packet(-15, 175)) == ['pacific']
+        assert index.match(_packet(-15, -175)) == ['pacific']
+        assert index.match(_packet(-15, 0)) == []
+
+    def test_callsigns_match_from_to_and_addressee(self):
+        index = _index(station={'callsigns': ['K1ABC']})
+        assert index.match(_packet(from_call='K1ABC')) == ['station']
+        assert index.match(_packet(addressee='k1abc')) == ['station']
+        assert index.match(_packet(to_call='APRS')) == []
+
+    def test_all_criteria_must_match(self):
+        index = _index(
+            weather={'bbox': [42, -72, 43, -71], 'packet_types': ['weather']}
+        )
+        assert index.match(_packet(42.5, -71.5, packet_type='weather')) == ['weather']
+        assert index.match(_packet(42.5, -71.5, packet_type='position')) == []
+
+    def test_type_only_subscription(self):
+        index = _index(messages={'packet_types': ['message']})
+        assert index.match(_packet(packet_type='message')) == ['messages']
+        assert index.stats['unindexed'] == 1
+
+    def test_huge_bbox_is_not_indexed_by_cell(self):
+        index = _index(world={'bbox': [-90, -180, 90, 180]})
+        assert index.stats['cells'] == 0
+        assert index.match(_packet(0, 0)) == ['world']
+
+    def test_resubscribe_and_unsubscribe(self):
+        index = _index(a={'bbox': [42, -72, 43, -71]})
+        index.subscribe(parse_subscription('a', {'callsigns': ['K1ABC']}))
+        assert index.match(_packet(42.5, -71.5)) == []
+        assert index.stats == {
+            'subscriptions': 1,
+            'cells': 0,
+            'callsigns': 1,
+            'unindexed': 0,
+        }
+
+        index.unsubscribe('a')
+        assert len(index) == 0
+        assert index.stats['callsigns'] == 0
+        assert index.unsubscribe('a') is None
+
+    def test_only_candidate_subscriptions_are_checked(self):
+        """Routing cost follows matching cells, not total subscribers."""
+        index = SubscriptionIndex()
+        for i in range(100):
+            index.subscribe(
+                parse_subscription(f'sid{i}', {'bbox': [i - 50, 0, i - 50 + 0.5, 1]})
+            )
+
+        with patch(
+            'haminfo_dashboard.subscriptions.Subscription.matches',
+            autospec=True,
+            return_value=True,
+        ) as matches:
+            index.match(_packet(10.2, 0.5))
+
+        assert [call.args[0].sid for call in matches.call_args_list] == ['sid60']
+
+
+class TestSubscribeHandlers:
+    """Tests for the websocket subscribe events."""
+
+    @pytest.fixture
+    def client(self, app):
+        with patch.object(websocket_module, 'start_polling'):
+            client = websocket_module.socketio.test_client(app)
+            yield client
+            if client.is_connected():
+                client.disconnect()
+        websocket_module.broadcaster.clear()
+
+    def test_subscribe_routes_matching_packets(self, client):
+        client.get_received()
+        client.emit('subscribe', {'callsigns': ['K1ABC']})
+        assert client.get_received()[0]['name'] == 'subscribed'
+
+        websocket_module.broadcast_packet({'from_call': 'K1ABC'})
+        websocket_module.broadcast_packet({'from_call': 'W1XYZ'})
+        websocket_module.broadcaster.flush()
+
+        (frame,) = client.get_received()
+        assert frame['name'] == 'packets'
+        assert [p['from_call'] for p in frame['args'][0]] == ['K1ABC']
+
+    def test_invalid_subscription(self, client):
+        client.get_received()
+        client.emit('subscribe', {'bbox': [1, 2]})
+        (reply,) = client.get_received()
+        assert reply['name'] == 'subscription_error'
+        assert len(websocket_module.subscriptions) == 0
+
+    def test_disconnect_unsubscribes(self, client):
+        client.emit('subscribe', {'packet_types': ['weather']})
+        assert len(websocket_module.subscriptions) == 1
+        client.disconnect()
+        assert len(websocket_module.subscriptions) == 0
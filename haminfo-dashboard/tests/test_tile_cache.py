@@ -326,7 +326,7 @@ class TestGetMapStationsTiled:
         assert len(result) == 3
 
     @patch('haminfo_dashboard.queries.cache')
-    @patch('haminfo_dashboard.queries.query_bbox_from_db')
+    @patch('haminfo_dashboard.queries.query_latest_stations')
     def test_limits_tiles_per_request(self, mock_query_bbox, mock_cache):
         """Test that too many tiles are truncated."""
         from haminfo_dashboard.queries import (
@@ -335,7 +335,7 @@ class TestGetMapStationsTiled:
         )
 
         mock_cache.get.return_value = None
-        mock_query_bbox.return_value = []
+        mock_query_bbox.return_value = ([], 0)
         mock_session = MagicMock()
 
         # Request huge bbox that would span many tiles
@@ -350,6 +350,32 @@ class TestGetMapStationsTiled:
         # Should still work (just limited)
         mock_query_bbox.assert_called_once()
 
+    @patch('haminfo_dashboard.queries.cache')
+    @patch('haminfo_dashboard.queries.query_latest_stations')
+    def test_large_bbox_queried_whole(self, mock_latest, mock_cache):
+        """Test that a bbox over the tile cap isn't cut down to the cap."""
+        from haminfo_dashboard.queries import get_map_stations
+
+        station = {
+            'callsign': 'N0CALL',
+            'latitude': 45.5,
+            'longitude': -122.5,
+            'received_at': '2026-03-29T12:00:00',
+        }
+        mock_latest.return_value = ([station], 25000)
+
+        stations, total = get_map_stations(
+            MagicMock(), bbox=(-135.0, 22.0, -62.0, 55.0), hours=1, limit=500
+        )
+
+        assert mock_latest.call_args.kwargs['bbox'] == (-135.0, 22.0, -62.0, 55.0)
+        assert mock_latest.call_args.kwargs['limit'] == 500
+        assert stations == [station]
+        # The window count, not the rows fetched
+        assert total == 25000
+        mock_cache.get.assert_not_called()
+        mock_cache.set.assert_not_called()
+
     @patch('haminfo_dashboard.queries.cache')
     @patch('haminfo_dashboard.queries.query_bbox_from_db')
     def test_caches_results_per_tile(self, mock_query_bbox, mock_cache):
@@ -377,3 +403,169 @@ class TestGetMapStationsTiled:
 
         # Should cache each tile (4 tiles)
         assert mock_cache.set.call_count == 4
+
+
+def _latest_row(callsign, total, hour=12):
+    return MagicMock(
+        from_call=callsign,
+        latitude=45.5,
+        longitude=-122.5,
+        packet_type='position',
+        symbol='>',
+        symbol_table='/',
+        speed=None,
+        course=None,
+        altitude=None,
+        comment='',
+        received_at=datetime(2026, 3, 29, hour, 0, 0),
+        total=total,
+    )
+
+
+def _compiled(mock_session):
+    from sqlalchemy.dialects import postgresql
+
+    statement = mock_session.execute.call_args[0][0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestQueryLatestStations:
+    """Tests for query_latest_stations."""
+
+    def test_rows_and_total_in_one_query(self):
+        """Test that the total comes from the same query as the rows."""
+        from haminfo_dashboard.queries import query_latest_stations
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.all.return_value = [
+            _latest_row('N0CALL', 42),
+            _latest_row('K1ABC', 42, hour=11),
+        ]
+
+        with patch('haminfo_dashboard.queries.MAP_FROM_SUMMARY', True):
+            stations, total = query_latest_stations(mock_session, limit=2)
+
+        assert total == 42
+        assert [s['callsign'] for s in stations] == ['N0CALL', 'K1ABC']
+        assert stations[0]['received_at'] == '2026-03-29T12:00:00'
+        mock_session.execute.assert_called_once()
+        sql = _compiled(mock_session)
+        assert 'count(*) OVER ()' in sql
+        assert 'FROM aprs_station_summary' in sql
+
+    def test_packets_unless_summary_maintained(self):
+        """Test that the summary isn't read unless the ingest maintains it."""
+        from haminfo_dashboard.queries import query_latest_stations
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.all.return_value = []
+
+        with patch('haminfo_dashboard.queries.MAP_FROM_SUMMARY', False):
+            query_latest_stations(mock_session)
+
+        sql = _compiled(mock_session)
+        assert 'DISTINCT ON (aprs_packet.from_call)' in sql
+        assert 'aprs_packet.packet_type =' not in sql
+
+    def test_empty(self):
+        """Test that no rows means a total of zero."""
+        from haminfo_dashboard.queries import query_latest_stations
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.all.return_value = []
+
+        assert query_latest_stations(mock_session) == ([], 0)
+
+    def test_bbox_uses_envelope(self):
+        """Test that bbox filters use the GiST-indexed && predicate."""
+        from haminfo_dashboard.queries import query_latest_stations
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.all.return_value = []
+
+        query_latest_stations(
+            mock_session, bbox=(-123.0, 45.0, -122.0, 46.0), station_type='weather'
+        )
+
+        sql = _compiled(mock_session)
+        assert 'geometry(aprs_packet.location) && ST_MakeEnvelope(' in sql
+        assert ', 4326)' in sql
+        assert 'aprs_packet.latitude >=' not in sql
+
+    def test_packet_type_reads_packets(self):
+        """Test that a type filter picks the latest packet of that type."""
+        from haminfo_dashboard.queries import query_latest_stations
+
+        mock_session = MagicMock()
+        mock_session.execute.return_value.all.return_value = []
+
+        query_latest_stations(mock_session, station_type='weather', order='callsign')
+
+        sql = _compiled(mock_session)
+        assert 'DISTINCT ON (aprs_packet.from_call)' in sql
+        assert 'aprs_packet.packet_type =' in sql
+        assert sql.rstrip().endswith('ORDER BY latest.from_call')
+
+
+class TestGetMapStations:
+    """Tests for get_map_stations."""
+
+    @patch('haminfo_dashboard.queries.cache')
+    @patch('haminfo_dashboard.queries.query_bbox_from_db')
+    def test_total_counts_whole_bbox(self, mock_query_bbox, mock_cache):
+        """Test that the total covers stations past the limit."""
+        from haminfo_dashboard.queries import get_map_stations
+
+        mock_cache.get.return_value = None
+        mock_query_bbox.return_value = [
+            {
+                'callsign': f'CALL{i}',
+                'latitude': 45.5,
+                'longitude': -122.5,
+                'received_at': f'2026-03-29T{12 - i:02d}:00:00',
+            }
+            for i in range(10)
+        ]
+
+        stations, total = get_map_stations(
+            MagicMock(), bbox=(-122.7, 45.4, -122.3, 45.7), hours=1, limit=3
+        )
+
+        assert [s['callsign'] for s in stations] == ['CALL0', 'CALL1', 'CALL2']
+        assert total == 10
+
+    @patch('haminfo_dashboard.queries.cache')
+    @patch('haminfo_dashboard.queries.query_bbox_from_db')
+    def test_fills_whole_tiles(self, mock_query_bbox, mock_cache):
+        """Test that cache misses are filled for whole tiles, not the bbox."""
+        from haminfo_dashboard.queries import get_map_stations
+
+        mock_cache.get.return_value = None
+        mock_query_bbox.return_value = []
+
+        get_map_stations(MagicMock(), bbox=(-122.7, 45.4, -121.3, 45.7), hours=1)
+
+        assert mock_query_bbox.call_args[0][1:5] == (-123, 45, -121, 46)
+
+    @patch('haminfo_dashboard.queries.cache')
+    @patch('haminfo_dashboard.queries.query_bbox_from_db')
+    def test_tile_fill_uncapped(self, mock_query_bbox, mock_cache):
+        """Test that cache misses fetch whole tiles without a row cap."""
+        from haminfo_dashboard.queries import get_map_stations
+
+        mock_cache.get.return_value = None
+        mock_query_bbox.return_value = []
+
+        get_map_stations(MagicMock(), bbox=(-122.7, 45.4, -122.3, 45.7), hours=1)
+
+        assert mock_query_bbox.call_args.kwargs['max_rows'] is None
+
+    @patch('haminfo_dashboard.queries.query_latest_stations')
+    def test_no_bbox_skips_tiles(self, mock_latest):
+        """Test that a world view goes straight to the database."""
+        from haminfo_dashboard.queries import get_map_stations
+
+        mock_latest.return_value = ([], 0)
+
+        assert get_map_stations(MagicMock(), hours=6, limit=100) == ([], 0)
+        mock_latest.assert_called_once()
@@ -0,0 +1,184 @@
+# tests/test_tile_refresh.py
+"""Tests for map tile request tracking and the tile refresher."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from haminfo_dashboard import queries
+from haminfo_dashboard.queries import TileTracker, tile_cache_key
+from haminfo_dashboard.tile_refresh import (
+    HOT_TILES_KEY,
+    TileRefresher,
+    render_tiles,
+    tile_runs,
+)
+
+
+def _station(callsign, lat, lon, minutes_ago):
+    received_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        minutes=minutes_ago
+    )
+    return {
+        'callsign': callsign,
+        'latitude': lat,
+        'longitude': lon,
+        'received_at': received_at.isoformat(),
+    }
+
+
+class TestTileTracker:
+    """Tests for TileTracker."""
+
+    def test_hottest_ranked_by_requests(self):
+        tracker = TileTracker()
+        tracker.record(1, '', [(37, -78), (37, -77)])
+        tracker.record(1, '', [(37, -78)])
+        tracker.record(24, 'weather', [(37, -78)])
+
+        hot = tracker.hottest(2)
+
+        assert hot == [((1, '', 37, -78), 2.0), ((1, '', 37, -77), 1.0)]
+
+    def test_decay_forgets_unrequested_tiles(self):
+        tracker = TileTracker(decay=0.5)
+        tracker.record(1, '', [(37, -78)])
+        tracker.record(1, '', [(40, -75)] * 8)
+
+        for _ in range(4):
+            tracker.decay()
+
+        assert tracker.hottest(10) == [((1, '', 40, -75), 0.5)]
+
+    def test_min_score(self):
+        tracker = TileTracker()
+        tracker.record(1, '', [(37, -78), (37, -78), (40, -75)])
+        tracker.decay()
+
+        assert [key for key, _ in tracker.hottest(10, min_score=1.0)] == [
+            (1, '', 37, -78)
+        ]
+
+    def test_tracked_tiles_capped(self):
+        tracker = TileTracker()
+        with patch.object(queries, 'MAX_TRACKED_TILES', 2):
+            tracker.record(1, '', [(1, 1), (2, 2), (3, 3)])
+            tracker.record(1, '', [(1, 1)])
+        assert len(tracker) == 2
+        assert tracker.hottest(1) == [((1, '', 1, 1), 2.0)]
+
+    @patch('haminfo_dashboard.queries.cache')
+    @patch('haminfo_dashboard.queries.query_bbox_from_db', return_value=[])
+    def test_tiled_requests_recorded(self, mock_query_bbox, mock_cache):
+        mock_cache.get.return_value = None
+        tracker = TileTracker()
+        with patch.object(queries, 'tile_tracker', tracker):
+            queries.get_map_stations_tiled(
+                MagicMock(),
+                bbox=(-77.5, 37.2, -76.5, 37.8),
+                hours=6,
+                station_type='',
+                limit=500,
+            )
+
+        assert sorted(key for key, _ in tracker.hottest(10)) == [
+            (6, '', 37, -78),
+            (6, '', 37, -77),
+        ]
+
+
+class TestRenderTiles:
+    """Tests for tile_runs and render_tiles."""
+
+    def test_tile_runs_merge_rows(self):
+        assert tile_runs([(37, -77), (37, -78), (38, -78), (37, -75)]) == [
+            (-78.0, 37.0, -76.0, 38.0),
+            (-75.0, 37.0, -74.0, 38.0),
+            (-78.0, 38.0, -77.0, 39.0),
+        ]
+
+    @patch('haminfo_dashboard.tile_refresh.query_latest_stations_by_type')
+    def test_one_query_for_every_window(self, mock_query):
+        mock_query.return_value = {
+            '': [
+                _station('K4NEW', 37.5, -77.5, 10),
+                _station('K4OLD', 37.5, -77.5, 180),
+                _station('K4OUT', 45.5, -122.5, 10),
+            ],
+            'weather': [_station('KW4WX', 37.1, -77.9, 30)],
+        }
+
+        rendered = render_tiles(
+            MagicMock(),
+            [
+                (1, '', 37, -78),
+                (6, '', 37, -78),
+                (6, '', 38, -78),
+                (24, 'weather', 37, -78),
+            ],
+        )
+
+        mock_query.assert_called_once()
+        regions = mock_query.call_args[0][1]
+        assert regions == {
+            '': (6, [(-78.0, 37.0, -77.0, 38.0), (-78.0, 38.0, -77.0, 39.0)]),
+            'weather': (24, [(-78.0, 37.0, -77.0, 38.0)]),
+        }
+
+        def calls(key):
+            return [s['callsign'] for s in rendered[key]]
+
+        assert calls((1, '', 37, -78)) == ['K4NEW']
+        assert calls((6, '', 37, -78)) == ['K4NEW', 'K4OLD']
+        assert calls((6, '', 38, -78)) == []
+        assert calls((24, 'weather', 37, -78)) == ['KW4WX']
+
+
+class TestTileRefresher:
+    """Tests for TileRefresher.run_once."""
+
+    @patch('haminfo_dashboard.tile_refresh.cache')
+    @patch('haminfo_dashboard.tile_refresh.query_latest_stations_by_type')
+    def test_refreshes_hottest_within_budget(self, mock_query, mock_cache):
+        mock_query.return_value = {'': [_station('K4ABC', 37.5, -77.5, 5)]}
+        tracker = TileTracker()
+        tracker.record(1, '', [(37, -78)] * 3 + [(40, -75)] * 2 + [(10, 10)])
+        session = MagicMock()
+        refresher = TileRefresher(
+            MagicMock(return_value=session), budget=2, tracker=tracker
+        )
+
+        result = refresher.run_once()
+
+        assert result == {'tiles': 2, 'stations': 1}
+        session.close.assert_called_once()
+        written = {c.args[0]: c.args[1] for c in mock_cache.set.call_args_list}
+        assert [s['callsign'] for s in written[tile_cache_key(1, '', 37, -78)]] == [
+            'K4ABC'
+        ]
+        # Empty tiles are cached too, so they don't miss either
+        assert written[tile_cache_key(1, '', 40, -75)] == []
+        assert tile_cache_key(1, '', 10, 10) not in written
+        assert written[HOT_TILES_KEY] == [[1, '', 37, -78, 3.0], [1, '', 40, -75, 2.0]]
+        assert all(
+            c.kwargs.get('ttl') == queries.TILE_CACHE_TTL
+            for c in mock_cache.set.call_args_list
+            if c.args[0] != HOT_TILES_KEY
+        )
+
+    @patch('haminfo_dashboard.tile_refresh.cache')
+    @patch('haminfo_dashboard.tile_refresh.query_latest_stations_by_type')
+    def test_idle_cycle_skips_database(self, mock_query, mock_cache):
+        session_factory = MagicMock()
+        refresher = TileRefresher(session_factory, tracker=TileTracker())
+
+        assert refresher.run_once() == {'tiles': 0, 'stations': 0}
+        session_factory.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+    @patch('haminfo_dashboard.tile_refresh.cache')
+    def test_load_hot_tiles(self, mock_cache):
+        mock_cache.get.return_value = [[6, '', 37, -78, 4.0]]
+        tracker = TileTracker()
+
+        assert TileRefresher(MagicMock(), tracker=tracker).load_hot_tiles() == 1
+        assert tracker.hottest(10) == [((6, '', 37, -78), 4.0)]
@@ -0,0 +1,117 @@
+# tests/test_trails.py
+"""Tests for map trail simplification and encoding."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from haminfo_dashboard.trails import (
+    build_trail,
+    decode_deltas,
+    decode_polyline,
+    dedupe_stationary,
+    encode_polyline,
+    simplify,
+    simplify_points,
+    tolerance_for_bbox,
+    tolerance_for_zoom,
+)
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _points(coords):
+    return [
+        (lon, lat, START + timedelta(minutes=i)) for i, (lon, lat) in enumerate(coords)
+    ]
+
+
+class TestTolerance:
+    """Tests for zoom and bbox tolerances."""
+
+    def test_zoom_halves_tolerance(self):
+        assert tolerance_for_zoom(10) == pytest.approx(tolerance_for_zoom(9) / 2)
+
+    def test_zoom_clamped(self):
+        assert tolerance_for_zoom(-3) == tolerance_for_zoom(0)
+        assert tolerance_for_zoom(99) == tolerance_for_zoom(22)
+
+    def test_bbox(self):
+        assert tolerance_for_bbox((-10.24, 0.0, 10.24, 5.0)) == pytest.approx(0.02)
+
+
+class TestDedupeStationary:
+    """Tests for dedupe_stationary."""
+
+    def test_fixed_station_collapses(self):
+        points = _points([(-78.5, 37.5)] * 1440)
+        kept = dedupe_stationary(points, 1e-4)
+        assert kept == [points[0], points[-1]]
+
+    def test_jitter_below_tolerance_dropped(self):
+        points = _points([(-78.5, 37.5), (-78.50001, 37.50001), (-78.4, 37.5)])
+        assert dedupe_stationary(points, 1e-4) == [points[0], points[2]]
+
+
+class TestSimplify:
+    """Tests for Douglas-Peucker simplify."""
+
+    def test_straight_line(self):
+        points = _points([(i * 0.01, i * 0.01) for i in range(100)])
+        assert simplify(points, 1e-4) == [points[0], points[-1]]
+
+    def test_keeps_corner(self):
+        points = _points([(0, 0), (0.5, 0), (1, 0), (1, 0.5), (1, 1)])
+        assert simplify(points, 1e-3) == [points[0], points[2], points[4]]
+
+    def test_keeps_far_end_of_out_and_back(self):
+        points = _points([(0, 0), (0.5, 0), (1, 0), (0.5, 0), (0, 0)])
+        assert points[2] in simplify(points, 1e-3)
+
+    def test_deeper_than_recursion_limit(self):
+        # Every point is a corner, so each split peels off one point
+        points = _points([(i * 1e-3, (i % 2) * 1e-2) for i in range(1500)])
+        assert len(simplify(points, 1e-3)) == 1500
+
+
+class TestEncoding:
+    """Tests for polyline and timestamp encoding."""
+
+    def test_known_polyline(self):
+        # Example from Google's polyline algorithm documentation
+        points = [
+            (-120.2, 38.5, None),
+            (-120.95, 40.7, None),
+            (-126.453, 43.252, None),
+        ]
+        assert encode_polyline(points) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+
+    def test_polyline_round_trip(self):
+        points = _points([(-78.51234, 37.54321), (-78.6, 37.4), (179.9, -85.0)])
+        decoded = decode_polyline(encode_polyline(points))
+        assert decoded == [(lat, lon) for lon, lat, _ in points]
+
+
+class TestBuildTrail:
+    """Tests for build_trail and simplify_points."""
+
+    def test_stationary_has_no_trail(self):
+        trail = build_trail(_points([(-78.5, 37.5)] * 60))
+        assert trail == {'trail': '', 'trail_times': '', 'trail_points': 60}
+
+    def test_moving_trail(self):
+        points = _points([(0, 0), (0.5, 0), (1, 0), (1, 0.5), (1, 1)])
+        trail = build_trail(points, 1e-3)
+
+        assert trail['trail_points'] == 5
+        assert decode_polyline(trail['trail']) == [(0, 0), (0, 1), (1, 1)]
+        times = [t for (t,) in decode_deltas(trail['trail_times'])]
+        assert times == [1767268800, 1767268920, 1767269040]
+
+    def test_simplify_points_keeps_tuple_form(self):
+        points = _points([(0, 0), (0.5, 0), (1, 0), (1, 0.5), (1, 1)])
+        assert simplify_points(points, 1e-3) == [
+            (0, 0, '2026-01-01T12:00:00'),
+            (1, 0, '2026-01-01T12:02:00'),
+            (1, 1, '2026-01-01T12:04:00'),
+        ]
@@ -1,12 +1,18 @@
 # tests/test_utils.py
 """Tests for utility functions."""
 
+from unittest.mock import patch
+
+import aprslib
 import pytest
 from haminfo_dashboard.utils import (
+    enrich_packet,
     get_country_from_callsign,
     format_packet_summary,
     normalize_packet_type,
+    get_packet_addressee,
     get_packet_human_info,
+    parse_raw_packet,
 )
 
 
@@ -358,3 +364,55 @@ class TestGetPacketHumanInfo:
         }
         result = get_packet_human_info(packet)
         assert 'Hello World' in result
+
+
+class TestEnrichPacket:
+    """Tests for parse-once packet enrichment."""
+
+    def setup_method(self):
+        parse_raw_packet.cache_clear()
+
+    def test_raw_is_parsed_once(self):
+        """Type, addressee and human_info should share a single parse."""
+        packet = {
+            'raw': 'N0CALL>APRS::WB4BOR-9 :Hello World{123',
+            'packet_type': 'message',
+        }
+        with patch('aprslib.parse', wraps=aprslib.parse) as parse:
+            enrich_packet(packet)
+            enrich_packet(dict(packet))
+        assert parse.call_count == 1
+        assert packet['addressee'] == 'WB4BOR-9'
+        assert 'Hello World' in packet['human_info']
+
+    def test_normalizes_packet_type(self):
+        packet = {
+            'raw': 'N0CALL>APRS:!4903.50N/07201.75W-Test',
+            'packet_type': 'beacon',
+        }
+        assert enrich_packet(packet)['packet_type'] == 'position'
+        assert packet['addressee'] is None
+
+    def test_unparseable_raw_falls_back_to_stored_fields(self):
+        packet = {
+            'raw': 'garbage',
+            'packet_type': 'status',
+            'comment': 'On the air',
+        }
+        enrich_packet(packet)
+        assert parse_raw_packet('garbage') is None
+        assert packet['human_info']
+
+    def test_stored_fields_skip_parsing(self):
+        """Packets that already carry derived fields are not parsed."""
+        packet = {
+            'raw': 'N0CALL>APRS::WB4BOR-9 :Hello World{123',
+            'packet_type': 'message',
+            'addressee': 'WB4BOR-9',
+            'human_info': 'Msg: Hello World',
+        }
+        with patch('aprslib.parse') as parse:
+            enrich_packet(packet)
+            assert get_packet_human_info(packet) == 'Msg: Hello World'
+            assert get_packet_addressee(packet) == 'WB4BOR-9'
+        parse.assert_not_called()
@@ -0,0 +1,136 @@
+"""Tests for the warm-start snapshot."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from haminfo_dashboard import app as app_module
+from haminfo_dashboard import cache, warm_snapshot
+from haminfo_dashboard.station_cache import station_cache
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    yield
+    cache.clear_stale()
+    station_cache.clear()
+    app_module.startup_state.ready = False
+
+
+class TestSnapshotFile:
+    """Tests for writing and loading snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / 'warm.json'
+        warm_snapshot.write(
+            path, {'dashboard:stats': {'total': 5}}, [('N0CALL', 'US', 'CA')]
+        )
+
+        snapshot = warm_snapshot.load(path, max_age=60)
+        assert snapshot['values'] == {'dashboard:stats': {'total': 5}}
+        assert snapshot['stations'] == [['N0CALL', 'US', 'CA']]
+        # No temp files are left behind
+        assert [p.name for p in tmp_path.iterdir()] == ['warm.json']
+
+    def test_missing_file(self, tmp_path):
+        assert warm_snapshot.load(tmp_path / 'missing.json', max_age=60) is None
+
+    def test_too_old(self, tmp_path):
+        path = tmp_path / 'warm.json'
+        warm_snapshot.write(path, {})
+        with patch('haminfo_dashboard.warm_snapshot.time.time', return_value=1e12):
+            assert warm_snapshot.load(path, max_age=60) is None
+
+    def test_unknown_version_or_corrupt(self, tmp_path):
+        path = tmp_path / 'warm.json'
+        path.write_text(json.dumps({'version': 0, 'created_at': 0}))
+        assert warm_snapshot.load(path, max_age=1e12) is None
+        path.write_text('{not json')
+        assert warm_snapshot.load(path, max_age=1e12) is None
+
+
+class TestApply:
+    """Tests for serving a loaded snapshot."""
+
+    def test_values_served_until_cleared(self):
+        calls = []
+
+        @cache.cached('test:value:{limit}')
+        def query(session, limit=10):
+            calls.append(limit)
+            return {'fresh': limit}
+
+        warm_snapshot.apply(
+            {'created_at': 0, 'values': {'test:value:10': {'stale': True}}}
+        )
+        assert query(None, limit=10) == {'stale': True}
+        assert calls == []
+
+        # refresh() always computes, whatever the cache holds
+        assert query.refresh(None, limit=10) == {'fresh': 10}
+        assert query.cache_key(None, limit=10) == 'test:value:10'
+
+        cache.clear_stale()
+        assert query(None, limit=10) == {'fresh': 10}
+
+    def test_stations_loaded(self):
+        warm_snapshot.apply({'created_at': 0, 'stations': [['N0CALL', 'US', 'TX']]})
+        assert station_cache.get('N0CALL-9').state_code == 'TX'
+
+
+class TestWarmStart:
+    """Tests for the app's startup with a snapshot."""
+
+    def test_snapshot_marks_app_ready(self, tmp_path, monkeypatch):
+        path = tmp_path / 'warm.json'
+        warm_snapshot.write(path, {'dashboard:stats': {'total': 5}})
+        monkeypatch.setenv(app_module.WARM_SNAPSHOT_ENV, str(path))
+
+        assert app_module._load_warm_snapshot()
+        assert app_module.startup_state.ready
+        assert cache.get('dashboard:stats') == {'total': 5}
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv(app_module.WARM_SNAPSHOT_ENV, '')
+        assert not app_module._load_warm_snapshot()
+        assert not app_module.startup_state.ready
+
+    def test_warm_cache_writes_snapshot(self, tmp_path, monkeypatch):
+        path = tmp_path / 'warm.json'
+        monkeypatch.setenv(app_module.WARM_SNAPSHOT_ENV, str(path))
+        monkeypatch.delenv(app_module.SHARED_CACHE_DIR_ENV, raising=False)
+        steps = [
+            ('Stats', lambda session: ('dashboard:stats', {'total': 1})),
+            ('Stations', lambda session: station_cache.update('N0CALL', 'US')),
+        ]
+        cache.seed_stale({'dashboard:stats': {'total': 0}})
+
+        with (
+            patch('haminfo.db.db.setup_session', return_value=MagicMock()),
+            patch.object(app_module, '_warm_steps', return_value=steps),
+        ):
+            app_module._warm_cache()
+
+        assert app_module.startup_state.ready
+        assert cache.get('dashboard:stats') is None
+        snapshot = warm_snapshot.load(path, max_age=60)
+        assert snapshot['values'] == {'dashboard:stats': {'total': 1}}
+        assert snapshot['stations'] == [['N0CALL', 'US', None]]
+
+    def test_failed_step_keeps_previous_snapshot(self, tmp_path, monkeypatch):
+        path = tmp_path / 'warm.json'
+        warm_snapshot.write(path, {'dashboard:stats': {'total': 5}})
+        monkeypatch.setenv(app_module.WARM_SNAPSHOT_ENV, str(path))
+
+        def broken(session):
+            raise RuntimeError('db down')
+
+        with (
+            patch('haminfo.db.db.setup_session', return_value=MagicMock()),
+            patch.object(app_module, '_warm_steps', return_value=[('Stats', broken)]),
+        ):
+            app_module._warm_cache()
+
+        snapshot = warm_snapshot.load(path, max_age=60)
+        assert snapshot['values'] == {'dashboard:stats': {'total': 5}}
@@ -1,6 +1,8 @@
 # tests/test_websocket.py
 """Tests for WebSocket module."""
 
+import json
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -13,10 +15,23 @@ def mock_socketio():
     mock_sio = MagicMock()
     original = websocket_module.socketio
     websocket_module.socketio = mock_sio
+    websocket_module.broadcaster.clear()
     yield mock_sio
+    websocket_module.broadcaster.clear()
     websocket_module.socketio = original
 
 
+def _sent(mock_socketio) -> dict:
+    """Flush the broadcaster and return the packets sent to each room."""
+    websocket_module.broadcaster.flush()
+    sent = {}
+    for call in mock_socketio.emit.call_args_list:
+        event, frame = call.args
+        assert event == 'packets'
+        sent.setdefault(call.kwargs['room'], []).extend(json.loads(frame))
+    return sent
+
+
 class TestBroadcastPacket:
     """Tests for broadcast_packet function."""
 
@@ -28,7 +43,7 @@ class TestBroadcastPacket:
         broadcast_packet(packet)
 
         # Should emit to live_feed
-        mock_socketio.emit.assert_any_call('packet', packet, room='live_feed')
+        assert _sent(mock_socketio) == {'live_feed': [packet]}
 
     @patch('haminfo_dashboard.websocket._get_session')
     @patch('haminfo_dashboard.geo_cache.get_location_info')
@@ -47,7 +62,7 @@ class TestBroadcastPacket:
         broadcast_packet(packet)
 
         # Should emit to country room
-        mock_socketio.emit.assert_any_call('packet', packet, room='country:US')
+        assert _sent(mock_socketio)['country:US'] == [packet]
 
     @patch('haminfo_dashboard.websocket._get_session')
     @patch('haminfo_dashboard.geo_cache.get_location_info')
@@ -66,7 +81,7 @@ class TestBroadcastPacket:
         broadcast_packet(packet)
 
         # Should emit to state room
-        mock_socketio.emit.assert_any_call('packet', packet, room='state:CA')
+        assert _sent(mock_socketio)['state:CA'] == [packet]
 
     @patch('haminfo_dashboard.websocket._get_session')
     @patch('haminfo_dashboard.geo_cache.get_location_info')
@@ -85,9 +100,7 @@ class TestBroadcastPacket:
         broadcast_packet(packet)
 
         # Should only emit to live_feed, not country room
-        calls = [call.kwargs.get('room') for call in mock_socketio.emit.call_args_list]
-        assert 'live_feed' in calls
-        assert not any(room and room.startswith('country:') for room in calls)
+        assert list(_sent(mock_socketio)) == ['live_feed']
 
     @patch('haminfo_dashboard.websocket._get_session')
     @patch('haminfo_dashboard.geo_cache.get_location_info')
@@ -107,7 +120,7 @@ class TestBroadcastPacket:
         broadcast_packet(packet)
 
         # Should still emit to live_feed
-        mock_socketio.emit.assert_called_with('packet', packet, room='live_feed')
+        assert _sent(mock_socketio) == {'live_feed': [packet]}
 
     @patch('haminfo_dashboard.websocket._get_session')
     @patch('haminfo_dashboard.geo_cache.get_location_info')
@@ -127,11 +140,11 @@ class TestBroadcastPacket:
         broadcast_packet(packet)
 
         # Should emit to country room
-        mock_socketio.emit.assert_any_call('packet', packet, room='country:DE')
+        sent = _sent(mock_socketio)
+        assert sent['country:DE'] == [packet]
 
         # Should NOT emit to any state room
-        calls = [call.kwargs.get('room') for call in mock_socketio.emit.call_args_list]
-        assert not any(room and room.startswith('state:') for room in calls)
+        assert not any(room.startswith('state:') for room in sent)
 
     @patch('haminfo_dashboard.websocket._get_session')
     @patch('haminfo_dashboard.geo_cache.get_location_info')
@@ -169,3 +182,25 @@ class TestBroadcastPacket:
 
         # Session should still be closed
         mock_session.close.assert_called_once()
+
+
+class TestCoalescing:
+    """Tests for windowed broadcast frames."""
+
+    def test_burst_becomes_one_frame_per_room(self, mock_socketio):
+        """Packets queued within a window go out as one frame."""
+        from haminfo_dashboard.websocket import broadcast_packet
+
+        packets = [{'from_call': f'W{i}ABC', 'country_code': 'DE'} for i in range(5)]
+        for packet in packets:
+            broadcast_packet(packet)
+
+        assert mock_socketio.emit.call_count == 0
+        sent = _sent(mock_socketio)
+        assert mock_socketio.emit.call_count == 2
+        assert sent == {'live_feed': packets, 'country:DE': packets}
+
+        # Nothing is re-sent on the next window
+        mock_socketio.emit.reset_mock()
+        websocket_module.broadcaster.flush()
+        mock_socketio.emit.assert_not_called()
@@ -1,4 +1,6 @@
 import click
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 import json
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -13,6 +15,7 @@ from haminfo.main import cli
 from haminfo import cli_helper
 from haminfo import utils
 from haminfo.db import db
+from haminfo.db import snapshot
 from haminfo.db.models.station import Station
 
 LOG = logging.getLogger(utils.DOMAIN)
@@ -89,10 +92,37 @@ def _build_repeaterbook_headers():
     return headers
 
 
-# only alloe 1 request every 10 minutes
-@sleep_and_retry
-@limits(calls=1, period=600)
-def fetch_repeaters(url, session, fetch_only=False):
+NA_EXPORT_URL = 'https://www.repeaterbook.com/api/export.php'
+ROW_EXPORT_URL = 'https://www.repeaterbook.com/api/exportROW.php'
+
+# Number of regions downloaded concurrently.  Every download still goes
+# through the shared rate limit below; the workers overlap the waiting with
+# parsing and the database upserts of regions that already arrived.
+DEFAULT_FETCH_WORKERS = 4
+
+# only allow 1 request every 10 minutes, shared by every download path
+repeaterbook_rate_limit = limits(calls=1, period=600)
+
+
+def _na_url(country, state=None):
+    """Build a North America export URL for a country or one of its states."""
+    url = f'{NA_EXPORT_URL}?country={requests.utils.quote(country)}'
+    if state:
+        url += f'&state={requests.utils.quote(state)}'
+    return url
+
+
+def _row_url(country):
+    """Build a rest-of-world export URL for a country."""
+    return f'{ROW_EXPORT_URL}?country={requests.utils.quote(country)}'
+
+
+def _download_repeaters(url):
+    """Download and decode one RepeaterBook export.
+
+    Returns:
+        The list of repeater dicts from the export, or None on failure.
+    """
     console = Console()
 
     try:
@@ -111,12 +141,12 @@ def fetch_repeaters(url, session, fetch_only=False):
                 )
             console.print(error_msg)
             LOG.error(error_msg)
-            return 0
+            return None
         else:
             LOG.debug(f'URL responded with {resp.status_code}')
     except Exception as ex:
         console.print('Failed to fetch repeaters {}'.format(ex))
-        return 0
+        return None
 
     # Filter out unwanted characters
     # Wisconsin has some bogus characters in it
@@ -127,45 +157,160 @@ def fetch_repeaters(url, session, fetch_only=False):
         repeater_json = json.loads(data)
     except Exception as ex:
         LOG.exception(ex)
-        # LOG.error(data)
-    # repeater_json = resp.json()
 
-    count = 0
     if 'count' in repeater_json and repeater_json['count'] > 0:
-        LOG.info(f'Found {repeater_json["count"]} repeaters to load')
-        countdown = repeater_json['count']
-        for repeater in repeater_json['results']:
-            if 'Frequency' in repeater:
-                # If we don't have a frequency, it's useless.
-                msg_text = f'({countdown}) {repeater.get("Callsign", None)} {repeater["Frequency"]} : {repeater["Country"]}'
-                LOG.info(msg_text)
-
-                if not fetch_only:
-                    station = Station.find_station_by_ids(
-                        session, repeater['State ID'], int(repeater['Rptr ID'])
-                    )
-
-                    if station:
-                        # Update an existing record so we maintain the id in the DB
-                        repeater_obj = Station.update_from_json(repeater, station)
-                    else:
-                        repeater_obj = Station.from_json(repeater)
-
-                    session.add(repeater_obj)
-
-                    # Just in case we want to fail on a single repeater
-                    # this allows all others to be commited to the DB
-                    # and not lost.  less efficient for sure.
-                    session.commit()
-            else:
-                LOG.warning('No frequency for {}'.format(repeater))
-            # time.sleep(0.001)
-            countdown -= 1
-            count += 1
-    # session.commit()
+        LOG.info(f'Found {repeater_json["count"]} repeaters in {url}')
+        return repeater_json['results']
+    return []
+
+
+@sleep_and_retry
+@repeaterbook_rate_limit
+def download_repeaters(url):
+    """Rate limited :func:`_download_repeaters`, safe to call from threads."""
+    return _download_repeaters(url)
+
+
+def _station_rows(repeaters):
+    """Convert RepeaterBook results into upsert batches.
+
+    Rows are grouped by the set of columns an update may overwrite:
+    optional fields missing from the payload keep their DB values on
+    update (see Station._parse_json_fields).  A whole export normally
+    lands in a single group.
+
+    Returns:
+        Tuple of (dict of tuple(update_columns) -> list of row dicts,
+        set of the (state_id, repeater_id) keys of skipped repeaters).
+    """
+    batches = {}
+    skipped = set()
+    for repeater in repeaters:
+        if 'Frequency' not in repeater:
+            # If we don't have a frequency, it's useless.
+            LOG.warning('No frequency for {}'.format(repeater))
+            _add_skipped_key(skipped, repeater)
+            continue
+        try:
+            row = Station._parse_json_fields(repeater)
+            # Core inserts skip the ORM's string coercion for Date columns
+            row['last_update'] = date.fromisoformat(row['last_update'])
+            row['state_id'] = repeater['State ID']
+            row['repeater_id'] = int(repeater['Rptr ID'])
+            row['content_hash'] = Station.content_hash_from_json(repeater)
+            update_fields = Station._parse_json_fields(repeater, for_update=True)
+            update_columns = tuple(sorted([*update_fields, 'content_hash']))
+        except (KeyError, TypeError, ValueError) as ex:
+            LOG.error(f'Skipping unparsable repeater {repeater}: {ex}')
+            _add_skipped_key(skipped, repeater)
+            continue
+        batches.setdefault(update_columns, []).append(row)
+    return batches, skipped
+
+
+def _add_skipped_key(skipped, repeater):
+    """Remember a skipped repeater so the sync doesn't delete its station."""
+    try:
+        skipped.add((repeater['State ID'], int(repeater['Rptr ID'])))
+    except (KeyError, TypeError, ValueError):
+        pass
+
+
+def apply_repeaters(session, repeaters, fetch_only=False):
+    """Apply one region's repeaters as a delta and commit.
+
+    Only new and changed repeaters are written; repeaters that vanished
+    from the region are deleted (see db.sync_region_stations).  Repeaters
+    that fail to parse are skipped and their stations kept as they are.
+
+    Args:
+        session: Database session, or None with fetch_only.
+        repeaters: Repeater dicts from a RepeaterBook export.
+        fetch_only: Only parse, don't touch the database.
+
+    Returns:
+        Number of repeaters in the region (or parsed, with fetch_only).
+    """
+    batches, skipped = _station_rows(repeaters)
+    if fetch_only or session is None:
+        return sum(len(rows) for rows in batches.values())
+
+    counts = db.sync_region_stations(session, batches, skipped)
+    session.commit()
+    LOG.info(
+        f'{counts["added"]} added, {counts["updated"]} updated, '
+        f'{counts["removed"]} removed, {counts["unchanged"]} unchanged'
+    )
+    return counts['added'] + counts['updated'] + counts['unchanged']
+
+
+@sleep_and_retry
+@repeaterbook_rate_limit
+def fetch_repeaters(url, session, fetch_only=False):
+    """Download one RepeaterBook export and load it into the DB."""
+    repeaters = _download_repeaters(url)
+    if not repeaters:
+        return 0
+    return apply_repeaters(session, repeaters, fetch_only)
+
+
+def sync_regions(
+    session, urls, fetch_only=False, workers=DEFAULT_FETCH_WORKERS, payloads=None
+):
+    """Download RepeaterBook exports concurrently and load them.
+
+    Downloads run on a thread pool (sharing the rate limit); each region
+    is applied with one set-based upsert per batch on the calling thread,
+    as soon as it arrives, so the session is never shared between threads.
+
+    Args:
+        session: Database session, or None with fetch_only.
+        urls: Export URLs to fetch.
+        fetch_only: Only fetch and parse, don't touch the database.
+        workers: Number of concurrent downloads.
+        payloads: Optional dict that collects the raw repeater list of
+            every downloaded URL (see haminfo.db.snapshot).
+
+    Returns:
+        Number of repeaters loaded.
+    """
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(download_repeaters, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                repeaters = future.result()
+            except Exception as ex:
+                LOG.error(f"Failed to fetch '{url}' because {ex}")
+                continue
+            if not repeaters:
+                continue
+            if payloads is not None:
+                payloads[url] = repeaters
+            try:
+                loaded = apply_repeaters(session, repeaters, fetch_only)
+            except Exception as ex:
+                LOG.error(f"Failed to load '{url}' because {ex}")
+                if session is not None:
+                    session.rollback()
+                continue
+            LOG.info(f"Loaded {loaded} repeaters from '{url}'")
+            count += loaded
+
+    if not fetch_only:
+        db.invalidate_stations_cache()
     return count
 
 
+def _na_country_urls(country, state=None, state_names=None):
+    if state:
+        return [_na_url(country, state)]
+    elif state_names:
+        return [_na_url(country, name) for name in state_names]
+    return [_na_url(country)]
+
+
 def fetch_NA_country_repeaters_by_state(
     session,
     country,  # noqa:N802
@@ -173,174 +318,225 @@ def fetch_NA_country_repeaters_by_state(
     state_names=None,
     fetch_only=False,
 ):
-    count = 1
-    inserted = 0
-    if state:
-        msg = f'Fetching {country}, {state}'
-        LOG.info(msg)
-        try:
-            url = (
-                'https://www.repeaterbook.com/api/export.php?country={}&state={}'
-            ).format(requests.utils.quote(country), requests.utils.quote(state))
-            inserted = fetch_repeaters(url, session, fetch_only)
-        except Exception as ex:
-            LOG.error(f"Failed fetching state '{state}'  '{ex}'")
-            raise ex
-    elif state_names:
-        # Fetch by state name
-        for state in state_names:
-            msg = f'Fetching {country}, {state} - ({count} of {len(state_names)})'
-            LOG.info(msg)
-            try:
-                url = (
-                    'https://www.repeaterbook.com/api/export.php?country={}&state={}'
-                ).format(requests.utils.quote(country), requests.utils.quote(state))
-                inserted += fetch_repeaters(url, session, fetch_only)
-                count += 1
-            except Exception as ex:
-                # Log the exception and continue
-                LOG.error(f"Failed to fetch '{state}' because {ex}")
-    else:
-        # Just fetch by country
-        msg = f'Fetching {country}'
-        LOG.info(msg)
-        try:
-            url = ('https://www.repeaterbook.com/api/export.php?country={}').format(
-                requests.utils.quote(country)
-            )
-            inserted = fetch_repeaters(url, session, fetch_only)
-        except Exception as ex:
-            LOG.error(f"Failed fetching Country '{country}'  '{ex}'")
-            raise ex
-    return inserted
+    LOG.info(f'Fetching {country}')
+    urls = _na_country_urls(country, state, state_names)
+    return sync_regions(session, urls, fetch_only)
+
+
+USA_STATES = [
+    'Alaska',
+    'Alabama',
+    'Arkansas',
+    'American Samoa',
+    'Arizona',
+    'California',
+    'Colorado',
+    'Connecticut',
+    'District of Columbia',
+    'Delaware',
+    'Florida',
+    'Georgia',
+    'Guam',
+    'Hawaii',
+    'Iowa',
+    'Idaho',
+    'Illinois',
+    'Indiana',
+    'Kansas',
+    'Kentucky',
+    'Louisiana',
+    'Massachusetts',
+    'Maryland',
+    'Maine',
+    'Michigan',
+    'Minnesota',
+    'Missouri',
+    'Mississippi',
+    'Montana',
+    'North Carolina',
+    'North Dakota',
+    'Nebraska',
+    'New Hampshire',
+    'New Jersey',
+    'New Mexico',
+    'Nevada',
+    'New York',
+    'Ohio',
+    'Oklahoma',
+    'Oregon',
+    'Pennsylvania',
+    'Puerto Rico',
+    'Rhode Island',
+    'South Carolina',
+    'South Dakota',
+    'Tennessee',
+    'Texas',
+    'Utah',
+    'Virginia',
+    'Virgin Islands',
+    'Vermont',
+    'Washington',
+    'Wisconsin',
+    'West Virginia',
+    'Wyoming',
+]
+
+CANADA_PROVINCES = [
+    'Alberta',
+    'British Columbia',
+    'Manitoba',
+    'New Brunswick',
+    'Newfoundland and Labrador',
+    'Nova Scotia',
+    'Nunavut',
+    'Ontario',
+    'Northwest Territories',
+    'Prince Edward Island',
+    'Quebec',
+    'Saskatchewan',
+    'Yukon',
+]
+
+SOUTH_AMERICA_COUNTRIES = [
+    'Argentina',
+    'Bolivia',
+    'Brazil',
+    'Caribbean Netherlands',
+    'Chile',
+    'Columbia',
+    'Curacao',
+    'Ecuador',
+    'Panama',
+    'Paraguay',
+    'Peru',
+    'Uruguay',
+    'Venezuela',
+]
+
+EU_COUNTRIES = [
+    'Albania',
+    'Andorra',
+    'Austria',
+    'Belarus',
+    'Belgium',
+    'Bosnia and Herzegovina',
+    'Bulgaria',
+    'Croatia',
+    'Cyprus',
+    'Czech Republic',
+    'Denmark',
+    'Estonia',
+    'Faroe Islands',
+    'Finland',
+    'France',
+    'Georgia',
+    'Germany',
+    'Guernsey',
+    'Greece',
+    'Hungary',
+    'Iceland',
+    'Isle of Man',
+    'Ireland',
+    'Italy',
+    'Jersey',
+    'Kosovo',
+    'Latvia',
+    'Liechtenstein',
+    'Lithuania',
+    'Luxembourg',
+    'Macedonia',
+    'Malta',
+    'Netherlands',
+    'Norway',
+    'Poland',
+    'Portugal',
+    'Romania',
+    'Russian Federation',
+    'San Marino',
+    'Serbia',
+    'Slovakia',
+    'Slovenia',
+    'Spain',
+    'Sweden',
+    'Switzerland',
+    'Ukraine',
+    'United Kingdom',
+]
+
+ASIAN_COUNTRIES = [
+    'Australia',
+    'Azerbaijan',
+    'China',
+    'India',
+    'Indonesia',
+    'Israel',
+    'Japan',
+    'Jordan',
+    'Kuwait',
+    'Malaysia',
+    'Nepal',
+    'New Zealand',
+    'Oman',
+    'Philippines',
+    'Singapore',
+    'South Korea',
+    'Sri Lanka',
+    'Thailand',
+    'Turkey',
+    'Taiwan',
+    'United Arab Emirates',
+]
+
+AFRICA_COUNTRIES = ['Morocco', 'Namibia', 'South Africa']
+
+CARIBBEAN_COUNTRIES = [
+    'Bahamas',
+    'Barbados',
+    'Costa Rica',
+    'Cayman Islands',
+    'Dominican Republic',
+    'El Salvador',
+    'Grenada',
+    'Guatemala',
+    'Haiti',
+    'Honduras',
+    'Jamaica',
+    'Nicaragua',
+    'Saint Vincent and the Grenadines',
+    'Trinidad and Tobago',
+]
 
 
 def fetch_EU_country_repeaters(session, country, fetch_only=False):  # noqa: N802+
     # Just fetch by country
     LOG.info(f'Fetching {country}')
-    try:
-        url = ('https://www.repeaterbook.com/api/exportROW.php?country={}').format(
-            requests.utils.quote(country)
-        )
-        count = fetch_repeaters(url, session, fetch_only)
-    except Exception as ex:
-        LOG.error("Failed fetching Country '{}'".format(country))
-        LOG.exception(ex)
-        raise ex
-    return count
+    return sync_regions(session, [_row_url(country)], fetch_only)
 
 
 def fetch_USA_repeaters_by_state(session, state=None, fetch_only=False):  # noqa: N802
     """Only fetch United States repeaters."""
     country = 'United States'
-    state_names = [
-        'Alaska',
-        'Alabama',
-        'Arkansas',
-        'American Samoa',
-        'Arizona',
-        'California',
-        'Colorado',
-        'Connecticut',
-        'District of Columbia',
-        'Delaware',
-        'Florida',
-        'Georgia',
-        'Guam',
-        'Hawaii',
-        'Iowa',
-        'Idaho',
-        'Illinois',
-        'Indiana',
-        'Kansas',
-        'Kentucky',
-        'Louisiana',
-        'Massachusetts',
-        'Maryland',
-        'Maine',
-        'Michigan',
-        'Minnesota',
-        'Missouri',
-        'Mississippi',
-        'Montana',
-        'North Carolina',
-        'North Dakota',
-        'Nebraska',
-        'New Hampshire',
-        'New Jersey',
-        'New Mexico',
-        'Nevada',
-        'New York',
-        'Ohio',
-        'Oklahoma',
-        'Oregon',
-        'Pennsylvania',
-        'Puerto Rico',
-        'Rhode Island',
-        'South Carolina',
-        'South Dakota',
-        'Tennessee',
-        'Texas',
-        'Utah',
-        'Virginia',
-        'Virgin Islands',
-        'Vermont',
-        'Washington',
-        'Wisconsin',
-        'West Virginia',
-        'Wyoming',
-    ]
-    LOG.info(f"Fetching repeaters for '{country}' {len(state_names)}")
+    LOG.info(f"Fetching repeaters for '{country}' {len(USA_STATES)}")
     return fetch_NA_country_repeaters_by_state(
-        session, country, state, state_names, fetch_only=fetch_only
+        session, country, state, USA_STATES, fetch_only=fetch_only
     )
 
 
 def fetch_Canada_repeaters(session, fetch_only=False):  # noqa: N802
     country = 'Canada'
-    state_names = [
-        'Alberta',
-        'British Columbia',
-        'Manitoba',
-        'New Brunswick',
-        'Newfoundland and Labrador',
-        'Nova Scotia',
-        'Nunavut',
-        'Ontario',
-        'Northwest Territories',
-        'Prince Edward Island',
-        'Quebec',
-        'Saskatchewan',
-        'Yukon',
-    ]
     LOG.info('Fetching repeaters for {}'.format(country))
     return fetch_NA_country_repeaters_by_state(
-        session, country, state=None, state_names=state_names, fetch_only=fetch_only
+        session,
+        country,
+        state=None,
+        state_names=CANADA_PROVINCES,
+        fetch_only=fetch_only,
     )
 
 
 def fetch_south_america_repeaters(session, fetch_only=False):
-    countries = [
-        'Argentina',
-        'Bolivia',
-        'Brazil',
-        'Caribbean Netherlands',
-        'Chile',
-        'Columbia',
-        'Curacao',
-        'Ecuador',
-        'Panama',
-        'Paraguay',
-        'Peru',
-        'Uruguay',
-        'Venezuela',
-    ]
-
-    count = 0
-    for country in countries:
-        count += fetch_EU_country_repeaters(session, country, fetch_only=fetch_only)
-
-    return count
+    urls = [_row_url(country) for country in SOUTH_AMERICA_COUNTRIES]
+    return sync_regions(session, urls, fetch_only)
 
 
 def fetch_Mexico_repeaters(session, fetch_only=False):  # noqa: N802
@@ -352,139 +548,46 @@ def fetch_Mexico_repeaters(session, fetch_only=False):  # noqa: N802
 
 
 def fetch_EU_repeaters(session, fetch_only=False):  # noqa: N802
-    eu_countries = [
-        'Albania',
-        'Andorra',
-        'Austria',
-        'Belarus',
-        'Belgium',
-        'Bosnia and Herzegovina',
-        'Bulgaria',
-        'Croatia',
-        'Cyprus',
-        'Czech Republic',
-        'Denmark',
-        'Estonia',
-        'Faroe Islands',
-        'Finland',
-        'France',
-        'Georgia',
-        'Germany',
-        'Guernsey',
-        'Greece',
-        'Hungary',
-        'Iceland',
-        'Isle of Man',
-        'Ireland',
-        'Italy',
-        'Jersey',
-        'Kosovo',
-        'Latvia',
-        'Liechtenstein',
-        'Lithuania',
-        'Luxembourg',
-        'Macedonia',
-        'Malta',
-        'Netherlands',
-        'Norway',
-        'Poland',
-        'Portugal',
-        'Romania',
-        'Russian Federation',
-        'San Marino',
-        'Serbia',
-        'Slovakia',
-        'Slovenia',
-        'Spain',
-        'Sweden',
-        'Switzerland',
-        'Ukraine',
-        'United Kingdom',
-    ]
-    count = 0
-    for country in eu_countries:
-        count += fetch_EU_country_repeaters(session, country, fetch_only=fetch_only)
-
-    return count
+    urls = [_row_url(country) for country in EU_COUNTRIES]
+    return sync_regions(session, urls, fetch_only)
 
 
 def fetch_asian_repeaters(session, fetch_only=False):
-    countries = [
-        'Australia',
-        'Azerbaijan',
-        'China',
-        'India',
-        'Indonesia',
-        'Israel',
-        'Japan',
-        'Jordan',
-        'Kuwait',
-        'Malaysia',
-        'Nepal',
-        'New Zealand',
-        'Oman',
-        'Philippines',
-        'Singapore',
-        'South Korea',
-        'Sri Lanka',
-        'Thailand',
-        'Turkey',
-        'Taiwan',
-        'United Arab Emirates',
-    ]
-
-    count = 0
-    for country in countries:
-        count += fetch_EU_country_repeaters(session, country, fetch_only=fetch_only)
-
-    return count
+    urls = [_row_url(country) for country in ASIAN_COUNTRIES]
+    return sync_regions(session, urls, fetch_only)
 
 
 def fetch_africa_repeaters(session, fetch_only=False):
-    countries = ['Morocco', 'Namibia', 'South Africa']
-
-    count = 0
-    for country in countries:
-        count += fetch_EU_country_repeaters(session, country, fetch_only=fetch_only)
-
-    return count
+    urls = [_row_url(country) for country in AFRICA_COUNTRIES]
+    return sync_regions(session, urls, fetch_only)
 
 
 def fetch_caribbean_repeaters(session, fetch_only=False):
-    countries = [
-        'Bahamas',
-        'Barbados',
-        'Costa Rica',
-        'Cayman Islands',
-        'Dominican Republic',
-        'El Salvador',
-        'Grenada',
-        'Guatemala',
-        'Haiti',
-        'Honduras',
-        'Jamaica',
-        'Nicaragua',
-        'Saint Vincent and the Grenadines',
-        'Trinidad and Tobago',
-    ]
-
-    count = 0
-    for country in countries:
-        count += fetch_EU_country_repeaters(session, country, fetch_only=fetch_only)
-
-    return count
-
-
-def fetch_all_countries(session, fetch_only=False):
-    count = 0
-    count += fetch_USA_repeaters_by_state(session, fetch_only=fetch_only)
-    count += fetch_Canada_repeaters(session, fetch_only=fetch_only)
-    count += fetch_EU_repeaters(session, fetch_only=fetch_only)
-    count += fetch_asian_repeaters(session, fetch_only=fetch_only)
-    count += fetch_south_america_repeaters(session, fetch_only=fetch_only)
-    count += fetch_africa_repeaters(session, fetch_only=fetch_only)
-    count += fetch_caribbean_repeaters(session, fetch_only=fetch_only)
-    return count
+    urls = [_row_url(country) for country in CARIBBEAN_COUNTRIES]
+    return sync_regions(session, urls, fetch_only)
+
+
+def all_region_urls():
+    """Every export URL fetched by fetch-all-repeaters."""
+    urls = _na_country_urls('United States', state_names=USA_STATES)
+    urls += _na_country_urls('Canada', state_names=CANADA_PROVINCES)
+    for countries in (
+        EU_COUNTRIES,
+        ASIAN_COUNTRIES,
+        SOUTH_AMERICA_COUNTRIES,
+        AFRICA_COUNTRIES,
+        CARIBBEAN_COUNTRIES,
+    ):
+        urls += [_row_url(country) for country in countries]
+    return urls
+
+
+def fetch_all_countries(
+    session, fetch_only=False, workers=DEFAULT_FETCH_WORKERS, payloads=None
+):
+    return sync_regions(
+        session, all_region_urls(), fetch_only, workers=workers, payloads=payloads
+    )
 
 
 @rb.command()
@@ -539,9 +642,24 @@ def fetch_usa_repeaters(ctx, fetch_only):
     default=False,
     help='Only fetch repeaters from repeaterbook',
 )
+@click.option(
+    '--workers',
+    'workers',
+    show_default=True,
+    type=int,
+    default=DEFAULT_FETCH_WORKERS,
+    help='Number of regions to download concurrently',
+)
+@click.option(
+    '--snapshot-dir',
+    'snapshot_dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Also save the raw RepeaterBook payloads to this snapshot directory',
+)
 @click.pass_context
 @cli_helper.process_standard_options
-def fetch_all_repeaters(ctx, force, fetch_only):
+def fetch_all_repeaters(ctx, force, fetch_only, workers, snapshot_dir):
     """Fetch the stations from the haminfo API."""
     console = Console()
     console.print('Fetching stations from the haminfo API')
@@ -562,7 +680,13 @@ def fetch_all_repeaters(ctx, force, fetch_only):
         # count += fetch_south_america_repeaters(sp, session)
         # count += fetch_africa_repeaters(sp, session)
         # count += fetch_caribbean_repeaters(sp, session)
-        count = fetch_all_countries(session, fetch_only)
+        payloads = {} if snapshot_dir else None
+        count = fetch_all_countries(
+            session, fetch_only, workers=workers, payloads=payloads
+        )
+        if snapshot_dir:
+            regions = snapshot.export_payloads(payloads, snapshot_dir)
+            LOG.info(f"Saved {regions} RepeaterBook payloads to '{snapshot_dir}'")
 
     except Exception as ex:
         LOG.error('Failed to fetch state because {}'.format(ex))
@@ -571,3 +695,77 @@ def fetch_all_repeaters(ctx, force, fetch_only):
 
     if session:
         session.close()
+
+
+@rb.command()
+@cli_helper.add_options(cli_helper.common_options)
+@click.argument('snapshot_dir', type=click.Path(file_okay=False))
+@click.pass_context
+@cli_helper.process_standard_options
+def export_snapshot(ctx, snapshot_dir):
+    """Export the station table to a Parquet snapshot.
+
+    Raw RepeaterBook payloads are added to a snapshot with
+    fetch-all-repeaters --snapshot-dir.
+    """
+    db_session = db.setup_session()
+    session = db_session()
+    try:
+        start = time.perf_counter()
+        count = snapshot.export_stations(session, snapshot_dir)
+        elapsed = time.perf_counter() - start
+    except snapshot.SnapshotError as ex:
+        raise click.ClickException(str(ex)) from ex
+    finally:
+        session.close()
+    click.echo(f"Exported {count} stations to '{snapshot_dir}' in {elapsed:.1f}s")
+
+
+@rb.command()
+@cli_helper.add_options(cli_helper.common_options)
+@click.argument('snapshot_dir', type=click.Path(exists=True, file_okay=False))
+@click.option(
+    '--replace',
+    'replace',
+    is_flag=True,
+    default=False,
+    help='Delete all existing stations before loading',
+)
+@click.option(
+    '--from-payloads',
+    'from_payloads',
+    is_flag=True,
+    default=False,
+    help='Replay the raw RepeaterBook payloads through the regular sync',
+)
+@click.pass_context
+@cli_helper.process_standard_options
+def import_snapshot(ctx, snapshot_dir, replace, from_payloads):
+    """Load stations from a snapshot without calling RepeaterBook."""
+    db_session = db.setup_session()
+    session = db_session()
+    start = time.perf_counter()
+    try:
+        if from_payloads:
+            payloads = snapshot.read_payloads(snapshot_dir)
+            if replace:
+                snapshot.import_stations(session, [], replace=True)
+            count = sum(
+                apply_repeaters(session, repeaters) for repeaters in payloads.values()
+            )
+        else:
+            rows = snapshot.read_stations(snapshot_dir)
+            count = snapshot.import_stations(session, rows, replace=replace)
+            session.commit()
+    except snapshot.SnapshotError as ex:
+        session.rollback()
+        raise click.ClickException(str(ex)) from ex
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    db.invalidate_stations_cache()
+    elapsed = time.perf_counter() - start
+    click.echo(f"Imported {count} stations from '{snapshot_dir}' in {elapsed:.1f}s")
@@ -94,6 +94,7 @@ def wx_mqtt_ingest(ctx):
             stats_lock,
             thread_index=i,  # Pass index for staggered batch saves
             stats_only=stats_only,
+            station_summary=CONF.mqtt.station_summary,
         )
         processor.name = f'APRSPacketProcessorThread-{i}'
         aprs_processors.append(processor)
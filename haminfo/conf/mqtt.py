@@ -37,6 +37,13 @@ mqtt_opts = [
         'inserting them into the database. Useful for diagnosing throughput '
         'issues and measuring MQTT ingestion rate independent of DB performance.',
     ),
+    cfg.BoolOpt(
+        'station_summary',
+        default=True,
+        help='Maintain the aprs_station_summary table (first/last seen, packet '
+        'counts, last position per station) with each saved batch. Requires '
+        'the database migration that creates aprs_station_summary_apply().',
+    ),
 ]
 
 
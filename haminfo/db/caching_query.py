@@ -18,7 +18,30 @@ The three new concepts introduced here are:
 The rest of what's here are standard SQLAlchemy and
 dogpile.cache constructs.
 
+Tagged invalidation
+-------------------
+
+FromCache accepts ``tags`` (normally the table names a query reads).
+Every tag has a generation counter stored in the cache region itself, and
+the current generation of each tag is folded into the cache key.
+:meth:`ORMCache.invalidate_tags` bumps a tag's generation, so only entries
+depending on that tag stop being found; unrelated cached queries in the
+same region keep their hits.  Orphaned entries simply age out.
+
+Row caching
+-----------
+
+FromCache stores frozen ORM results, which are pickled with their full
+entity state and rebuilt through ``merge_frozen_result`` on every hit.
+For read-only lookups :meth:`ORMCache.get_rows` caches a Core select as a
+single pickled blob of plain column tuples and returns lightweight
+namedtuple rows, skipping the identity map entirely.
+
 """
+import collections
+import pickle
+import time
+
 from dogpile.cache.api import NO_VALUE
 
 from oslo_log import log as logging
@@ -30,6 +53,21 @@ from haminfo import utils
 
 LOG = logging.getLogger(utils.DOMAIN)
 
+# Prefix of the cache keys holding tag generation counters
+TAG_GENERATION_PREFIX = "cache-tag-generation:"
+
+# namedtuple classes used for cached rows, keyed by column names
+_row_types = {}
+
+
+def row_type(fields):
+    """Return the (shared) namedtuple class for a tuple of column names."""
+    cls = _row_types.get(fields)
+    if cls is None:
+        cls = collections.namedtuple("CachedRow", fields, rename=True)
+        _row_types[fields] = cls
+    return cls
+
 
 class ORMCache:
 
@@ -43,6 +81,40 @@ class ORMCache:
         self.cache_regions = regions
         self._statement_cache = {}
 
+    def tag_generations(self, region, tags):
+        """Return the current generation of each tag, in order.
+
+        A missing counter (never invalidated, or evicted by the backend)
+        is seeded with the current time in nanoseconds rather than 0, so
+        losing a counter can never make entries from an older generation
+        valid again.
+        """
+        if not tags:
+            return []
+        dogpile_region = self.cache_regions[region]
+        keys = [TAG_GENERATION_PREFIX + tag for tag in tags]
+        # Counters must not expire (or be soft-invalidated) with the region
+        values = dogpile_region.get_multi(keys, ignore_expiration=True)
+        generations = []
+        for key, value in zip(keys, values, strict=True):
+            if value is NO_VALUE:
+                value = time.time_ns()
+                dogpile_region.set(key, value)
+            generations.append(value)
+        return generations
+
+    def invalidate_tags(self, *tags, region="default"):
+        """Expire every cached query carrying any of the given tags.
+
+        Two concurrent invalidations may both write the same next value;
+        either way the generation moves away from the one the stale
+        entries were stored under.
+        """
+        dogpile_region = self.cache_regions[region]
+        generations = self.tag_generations(region, tags)
+        for tag, generation in zip(tags, generations, strict=True):
+            dogpile_region.set(TAG_GENERATION_PREFIX + tag, generation + 1)
+
     def listen_on_session(self, session_factory):
         event.listen(session_factory, "do_orm_execute", self._do_orm_execute)
 
@@ -92,6 +164,44 @@ class ORMCache:
         else:
             return None
 
+    def get_rows(
+        self,
+        session,
+        statement,
+        region="default",
+        tags=(),
+        expiration_time=None,
+    ):
+        """Load the rows of a Core select, from the cache when possible.
+
+        The cached value is ``pickle.dumps((column_names, [tuple, ...]))``,
+        so a hit is one backend get, one unpickle of plain values and one
+        namedtuple per row.
+
+        :param session: session used to run the statement on a miss.
+        :param statement: a select of plain columns (no ORM entities).
+        :param region: the cache region.
+        :param tags: labels the rows depend on, see :class:`FromCache`.
+        :param expiration_time: optional override of the region's.
+
+        :return: list of namedtuple rows with one attribute per column.
+        """
+        opt = FromCache(region, expiration_time=expiration_time, tags=tags)
+        cache_key = "rows:" + opt._generate_cache_key(statement, {}, self)
+
+        def createfunc():
+            result = session.execute(statement)
+            fields = tuple(result.keys())
+            rows = [tuple(row) for row in result]
+            return pickle.dumps((fields, rows), pickle.HIGHEST_PROTOCOL)
+
+        payload = self.cache_regions[region].get_or_create(
+            cache_key, createfunc, expiration_time=expiration_time
+        )
+        fields, rows = pickle.loads(payload)
+        make = row_type(fields)._make
+        return [make(row) for row in rows]
+
     def invalidate(self, statement, parameters, opt):
         """Invalidate the cache value represented by a statement."""
         statement = statement.__clause_element__()
@@ -111,6 +221,7 @@ class FromCache(UserDefinedOption):
         cache_key=None,
         expiration_time=None,
         ignore_expiration=False,
+        tags=(),
     ):
         """Construct a new FromCache.
 
@@ -124,11 +235,16 @@ class FromCache(UserDefinedOption):
          as when using in_()) which correspond more simply to
          some other identifier.
 
+        :param tags: optional.  Labels (usually table names) the
+         cached result depends on.  :meth:`ORMCache.invalidate_tags`
+         on any of them expires the entry.
+
         """
         self.region = region
         self.cache_key = cache_key
         self.expiration_time = expiration_time
         self.ignore_expiration = ignore_expiration
+        self.tags = tuple(sorted(tags))
         super().__init__(region)
 
     # this is not needed as of SQLAlchemy 1.4.28;
@@ -149,7 +265,9 @@ class FromCache(UserDefinedOption):
         key = statement_cache_key.to_offline_string(
             orm_cache._statement_cache, statement, parameters
         ) + repr(self.cache_key)
-        # print("here's our key...%s" % key)
+        if self.tags:
+            generations = orm_cache.tag_generations(self.region, self.tags)
+            key += repr(list(zip(self.tags, generations, strict=True)))
         return key
 
 
@@ -166,6 +284,7 @@ class RelationshipCache(FromCache):
         cache_key=None,
         expiration_time=None,
         ignore_expiration=False,
+        tags=(),
     ):
         """Construct a new RelationshipCache.
 
@@ -179,8 +298,12 @@ class RelationshipCache(FromCache):
          that will serve as the key to the query, bypassing
          the usual means of forming a key from the Query itself.
 
+        :param tags: optional.  Labels the cached result depends on.
+
         """
-        super().__init__(region, cache_key, expiration_time, ignore_expiration)
+        super().__init__(
+            region, cache_key, expiration_time, ignore_expiration, tags
+        )
         self._relationship_options = {
             (attribute.property.parent.class_, attribute.property.key): self
         }
@@ -8,12 +8,13 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 from hashlib import md5
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from dogpile.cache.region import make_region
+from geoalchemy2 import Geography
 import sqlalchemy
 from sqlalchemy import create_engine, func
 from sqlalchemy.exc import SQLAlchemyError
@@ -22,6 +23,7 @@ from sqlalchemy.orm import scoped_session, sessionmaker, Session, Query
 from haminfo.db import caching_query
 from haminfo.db.models.aprs_packet import APRSPacket
 from haminfo.db.models.station import Station
+from haminfo.db.models.station_change import StationChange
 from haminfo.db.models.modelbase import ModelBase
 from haminfo.db.models.request import Request, WXRequest
 from haminfo.db.models.weather_report import WeatherStation, WeatherReport
@@ -175,6 +177,217 @@ def delete_USA_state_repeaters(state: str, session: Session) -> None:  # noqa: N
     session.execute(stmt)
 
 
+# Rows per INSERT ... ON CONFLICT statement. Station has ~35 columns, so
+# this stays well under PostgreSQL's 65535 bind parameter limit.
+STATION_UPSERT_CHUNK = 500
+
+
+def upsert_stations(
+    session: Session,
+    rows: list[dict[str, Any]],
+    update_columns: Optional[list[str]] = None,
+) -> int:
+    """Insert or update stations keyed by (state_id, repeater_id).
+
+    Each chunk of rows is one INSERT ... ON CONFLICT DO UPDATE inside a
+    savepoint. If a chunk fails, it is split in half and retried until the
+    offending rows are isolated; those are logged and skipped while every
+    other row is applied. The caller commits.
+
+    Args:
+        session: Database session.
+        rows: Station column dicts; all rows must have the same keys.
+        update_columns: Columns to overwrite on conflict. Defaults to every
+            column in the rows except the key columns.
+
+    Returns:
+        Number of rows inserted or updated.
+    """
+    if not rows:
+        return 0
+
+    if update_columns is None:
+        update_columns = [
+            key for key in rows[0] if key not in ('id', 'state_id', 'repeater_id')
+        ]
+
+    return len(_upsert_stations(session, rows, update_columns))
+
+
+def _upsert_stations(
+    session: Session, rows: list[dict[str, Any]], update_columns: list[str]
+) -> list[dict[str, Any]]:
+    applied = []
+    for start in range(0, len(rows), STATION_UPSERT_CHUNK):
+        chunk = rows[start : start + STATION_UPSERT_CHUNK]
+        applied += _upsert_station_chunk(session, chunk, update_columns)
+    return applied
+
+
+def _station_upsert_statement(
+    session: Session, rows: list[dict[str, Any]], update_columns: list[str]
+) -> Any:
+    dialect = session.bind.dialect.name if session.bind else 'postgresql'
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    stmt = insert(Station).values(rows)
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    set_['updated_at'] = datetime.utcnow()
+    where = None
+    if 'content_hash' in update_columns:
+        # Leave rows whose payload did not change untouched
+        where = Station.content_hash.is_distinct_from(stmt.excluded.content_hash)
+    return stmt.on_conflict_do_update(
+        index_elements=['state_id', 'repeater_id'], set_=set_, where=where
+    )
+
+
+def _upsert_station_chunk(
+    session: Session, rows: list[dict[str, Any]], update_columns: list[str]
+) -> list[dict[str, Any]]:
+    try:
+        with session.begin_nested():
+            session.execute(_station_upsert_statement(session, rows, update_columns))
+        return rows
+    except SQLAlchemyError as ex:
+        if len(rows) == 1:
+            row = rows[0]
+            LOG.error(
+                f'Skipping repeater {row.get("state_id")}/{row.get("repeater_id")}'
+                f' {row.get("callsign")}: {ex}'
+            )
+            return []
+        middle = len(rows) // 2
+        return _upsert_station_chunk(
+            session, rows[:middle], update_columns
+        ) + _upsert_station_chunk(session, rows[middle:], update_columns)
+
+
+def sync_region_stations(
+    session: Session,
+    batches: dict[tuple[str, ...], list[dict[str, Any]]],
+    skipped: Iterable[tuple[str, int]] = (),
+) -> dict[str, int]:
+    """Apply one RepeaterBook region export as a delta.
+
+    The region's current (state_id, repeater_id, content_hash) keys are
+    read in one query and compared with the export:
+
+    - new keys are inserted and changed hashes updated through
+      :func:`upsert_stations`; unchanged rows are not written at all
+    - keys missing from the export are deleted in one statement, except
+      ``skipped`` ones: repeaters the export lists but that failed to parse
+    - every insert, update and delete is recorded in ``station_change``
+
+    The region is the set of state_ids in the export, so an empty or
+    failed export never deletes anything. The caller commits.
+
+    Args:
+        session: Database session.
+        batches: Row dicts (with content_hash) grouped by the tuple of
+            columns an update may overwrite.
+        skipped: (state_id, repeater_id) keys of exported repeaters
+            that were not parsed; their stations are kept as they are.
+
+    Returns:
+        Dict with added, updated, removed and unchanged counts.
+    """
+    counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    state_ids = {row['state_id'] for rows in batches.values() for row in rows}
+    if not state_ids:
+        return counts
+
+    existing = {
+        (row.state_id, row.repeater_id): (row.id, row.content_hash)
+        for row in session.execute(
+            sqlalchemy.select(
+                Station.id, Station.state_id, Station.repeater_id, Station.content_hash
+            ).where(Station.state_id.in_(state_ids))
+        )
+    }
+
+    changes = []
+    seen = set()
+    for update_columns, rows in batches.items():
+        changed = []
+        for row in rows:
+            key = (row['state_id'], row['repeater_id'])
+            if key in seen:
+                continue
+            seen.add(key)
+            current = existing.get(key)
+            if current is None or current[1] != row['content_hash']:
+                changed.append(row)
+            else:
+                counts['unchanged'] += 1
+
+        for row in _upsert_stations(session, changed, list(update_columns)):
+            key = (row['state_id'], row['repeater_id'])
+            if key in existing:
+                change_type = StationChange.UPDATED
+            else:
+                change_type = StationChange.ADDED
+            counts[change_type] += 1
+            changes.append(_station_change(change_type, key))
+
+    seen.update(skipped)
+    vanished = {key: value[0] for key, value in existing.items() if key not in seen}
+    if vanished:
+        session.execute(
+            sqlalchemy.delete(Station).where(Station.id.in_(list(vanished.values())))
+        )
+        counts['removed'] = len(vanished)
+        changes += [_station_change(StationChange.REMOVED, key) for key in vanished]
+
+    if changes:
+        session.execute(sqlalchemy.insert(StationChange), changes)
+    return counts
+
+
+def _station_change(change_type: str, key: tuple[str, int]) -> dict[str, Any]:
+    return {
+        'changed_at': datetime.utcnow(),
+        'change_type': change_type,
+        'state_id': key[0],
+        'repeater_id': key[1],
+    }
+
+
+def find_station_changes(
+    session: Session, after_id: int = 0, limit: int = 10000
+) -> list[StationChange]:
+    """Read the station change journal.
+
+    Args:
+        session: Database session.
+        after_id: Return entries newer than this journal id.
+        limit: Maximum number of entries.
+
+    Returns:
+        StationChange rows in journal order.
+    """
+    return (
+        session.query(StationChange)
+        .filter(StationChange.id > after_id)
+        .order_by(StationChange.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def invalidate_stations_cache() -> None:
+    """Invalidate cached station (repeater) queries."""
+    global cache
+    if cache is None:
+        return
+
+    LOG.info('Invalidate stations cache')
+    cache.invalidate_tags(Station.__tablename__)
+
+
 def log_request(session: Session, params: dict, results: list[dict]) -> None:
     """Log a nearest-repeater request to the database."""
     r = Request.from_json(params)
@@ -223,7 +436,7 @@ def find_stations_by_callsign(session: Session, stations: list[str]) -> Query:
     """Find stations by callsign."""
     query = (
         session.query(Station)
-        .options(caching_query.FromCache('default'))
+        .options(caching_query.FromCache('default', tags=[Station.__tablename__]))
         .filter(Station.callsign.in_(tuple(stations)))
     )
     return query
@@ -233,7 +446,7 @@ def find_stations_by_ids(session: Session, repeater_ids: list[int]) -> Query:
     """Find stations by their database IDs."""
     query = (
         session.query(Station)
-        .options(caching_query.FromCache('default'))
+        .options(caching_query.FromCache('default', tags=[Station.__tablename__]))
         .filter(Station.id.in_(tuple(repeater_ids)))
     )
     return query
@@ -249,12 +462,32 @@ def find_wx_station_by_callsign(session: Session, callsign: str) -> Query:
     """Find weather stations by callsign."""
     query = (
         session.query(WeatherStation)
-        .options(caching_query.FromCache('default'))
+        .options(
+            caching_query.FromCache('default', tags=[WeatherStation.__tablename__])
+        )
         .filter(WeatherStation.callsign == callsign)
     )
     return query
 
 
+def find_wx_station_row_by_callsign(session: Session, callsign: str) -> Optional[Any]:
+    """Find a weather station by callsign as a lightweight cached row.
+
+    Args:
+        session: Database session.
+        callsign: Station callsign (exact match).
+
+    Returns:
+        Row with the WeatherStation column attributes (except ``location``),
+        or None if not found.
+    """
+    query = session.query(*_plain_columns(WeatherStation)).filter(
+        WeatherStation.callsign == callsign
+    )
+    rows = _cached_rows(session, query, [WeatherStation.__tablename__])
+    return rows[0] if rows else None
+
+
 def get_wx_station_report(
     session: Session,
     wx_station_id: int,
@@ -262,7 +495,7 @@ def get_wx_station_report(
     """Find the latest weather report for a station."""
     query = (
         session.query(WeatherReport)
-        .options(caching_query.FromCache('default'))
+        .options(caching_query.FromCache('default', tags=[WeatherReport.__tablename__]))
         .filter(WeatherReport.weather_station_id == wx_station_id)
         .order_by(WeatherReport.time.desc())
         .first()
@@ -294,7 +527,7 @@ def find_requests(session: Session, number: Optional[int] = None) -> Query:
     """Find API request log entries, most recent first."""
     query = (
         session.query(Request)
-        .options(caching_query.FromCache('default'))
+        .options(caching_query.FromCache('default', tags=[Request.__tablename__]))
         .order_by(Request.id.desc())
     )
     if number:
@@ -309,8 +542,9 @@ def invalidate_requests_cache(session: Session) -> None:
         return
 
     LOG.info('Invalidate requests cache')
-    # Invalidate all cached request queries regardless of page size
-    cache.cache_regions['default'].invalidate(hard=False)
+    # Expire every cached request query regardless of page size, leaving
+    # station and weather lookups in the same region untouched
+    cache.invalidate_tags(Request.__tablename__)
 
 
 def find_nearest_to(
@@ -405,7 +639,7 @@ def find_wxrequests(session: Session, number: Optional[int] = None) -> Query:
     """Find weather request log entries, most recent first."""
     query = (
         session.query(WXRequest)
-        .options(caching_query.FromCache('default'))
+        .options(caching_query.FromCache('default', tags=[WXRequest.__tablename__]))
         .order_by(WXRequest.id.desc())
     )
     if number:
@@ -420,8 +654,8 @@ def invalidate_wxrequests_cache(session: Session) -> None:
         return
 
     LOG.info('Invalidate wx requests cache')
-    # Invalidate all cached wx request queries regardless of page size
-    cache.cache_regions['default'].invalidate(hard=False)
+    # Expire every cached wx request query regardless of page size
+    cache.invalidate_tags(WXRequest.__tablename__)
 
 
 def get_num_repeaters_in_db(session: Any) -> int:
@@ -473,30 +707,10 @@ def clean_empty_wx_stations(session: Session) -> int:
     return deleted
 
 
-def find_latest_positions_by_callsigns(
-    session: Session,
-    callsigns: list[str],
-) -> list[APRSPacket]:
-    """Find the most recent position-bearing packet for each callsign.
-
-    Uses a subquery with group_by and max(timestamp) to find the latest
-    position packet per callsign. This is portable across database backends
-    (works with both PostgreSQL and SQLite for testing).
-
-    Args:
-        session: Database session.
-        callsigns: List of callsigns to query (will be uppercased).
-
-    Returns:
-        List of APRSPacket instances, one per found callsign,
-        each being the most recent packet with position data.
-    """
-    if not callsigns:
-        return []
-
-    # Normalize callsigns to uppercase
-    upper_callsigns = [cs.upper() for cs in callsigns]
-
+def _latest_positions_query(
+    session: Session, entities: list[Any], upper_callsigns: list[str]
+) -> Query:
+    """Build the latest-position-per-callsign query for the given entities."""
     # Subquery: find the max timestamp per callsign for packets with positions
     latest_subq = (
         session.query(
@@ -513,9 +727,8 @@ def find_latest_positions_by_callsigns(
     )
 
     # Main query: join back to get the full packet row
-    results = (
-        session.query(APRSPacket)
-        .options(caching_query.FromCache('default'))
+    return (
+        session.query(*entities)
         .join(
             latest_subq,
             (APRSPacket.from_call == latest_subq.c.from_call)
@@ -525,10 +738,65 @@ def find_latest_positions_by_callsigns(
             APRSPacket.latitude.isnot(None),
             APRSPacket.longitude.isnot(None),
         )
+    )
+
+
+def find_latest_positions_by_callsigns(
+    session: Session,
+    callsigns: list[str],
+    as_rows: bool = False,
+) -> list[Any]:
+    """Find the most recent position-bearing packet for each callsign.
+
+    Uses a subquery with group_by and max(timestamp) to find the latest
+    position packet per callsign. This is portable across database backends
+    (works with both PostgreSQL and SQLite for testing).
+
+    Args:
+        session: Database session.
+        callsigns: List of callsigns to query (will be uppercased).
+        as_rows: Return lightweight read-only rows from the row cache
+            (same attribute names as APRSPacket, except ``location``)
+            instead of ORM instances. Cache hits then skip rebuilding ORM
+            state, which otherwise costs more than the query itself.
+
+    Returns:
+        List of APRSPacket instances (or rows), one per found callsign,
+        each being the most recent packet with position data.
+    """
+    if not callsigns:
+        return []
+
+    # Normalize callsigns to uppercase
+    upper_callsigns = [cs.upper() for cs in callsigns]
+
+    if as_rows:
+        query = _latest_positions_query(
+            session, _plain_columns(APRSPacket), upper_callsigns
+        )
+        return _cached_rows(session, query, [APRSPacket.__tablename__])
+
+    return (
+        _latest_positions_query(session, [APRSPacket], upper_callsigns)
+        .options(caching_query.FromCache('default', tags=[APRSPacket.__tablename__]))
         .all()
     )
 
-    return results
+
+def _plain_columns(model: Any) -> list[Any]:
+    """Return a model's table columns, minus geography columns."""
+    return [
+        column
+        for column in model.__table__.columns
+        if not isinstance(column.type, Geography)
+    ]
+
+
+def _cached_rows(session: Session, query: Query, tags: list[str]) -> list[Any]:
+    """Run a plain-column query through the row cache, if it is set up."""
+    if cache is None:
+        return session.execute(query.statement).all()
+    return cache.get_rows(session, query.statement, tags=tags)
 
 
 def find_latest_position_by_callsign(
@@ -623,16 +891,35 @@ def get_aprs_packet_stats(session: Session) -> dict[str, Any]:
     }
 
 
+# Weather history is served from the weather_report_hourly/daily continuous
+# aggregates (migration a8b9c0d1e2f3) on PostgreSQL. Set to False to always
+# aggregate raw weather_report rows instead.
+USE_WX_CONTINUOUS_AGGREGATES = True
+
+# Supported history intervals -> continuous aggregate view
+WX_HISTORY_AGGREGATES = {
+    '1h': 'weather_report_hourly',
+    '1d': 'weather_report_daily',
+}
+
+
 def get_wx_history(
     session: Session,
     station_id: int,
     start: datetime,
     end: datetime,
     fields: list[str],
+    interval: str = '1h',
 ) -> list[dict[str, Any]]:
-    """Get hourly aggregated weather history for a station.
+    """Get aggregated weather history for a station.
 
-    Uses date_trunc for hourly aggregation (PostgreSQL) or strftime (SQLite).
+    On PostgreSQL this reads the weather_report_hourly / weather_report_daily
+    continuous aggregates. They are real-time aggregates, so the raw
+    weather_report rows are only touched for the not-yet-materialized tail.
+    Buckets are aligned to the interval, so the first bucket may include
+    reports from before ``start`` in the same hour/day. On other backends
+    (SQLite in tests) or when the aggregates are unavailable, raw rows are
+    bucketed with date_trunc/strftime.
 
     Args:
         session: Database session.
@@ -640,41 +927,36 @@ def get_wx_history(
         start: Start datetime (inclusive).
         end: End datetime (exclusive).
         fields: List of field names to include.
+        interval: Bucket width, '1h' (default) or '1d'.
 
     Returns:
         List of dicts with 'time' and requested field values,
         ordered by time ascending.
     """
-    # Use date_trunc for hourly bucketing (works on PostgreSQL)
-    # For SQLite, use strftime-based approach
+    if interval not in WX_HISTORY_AGGREGATES:
+        raise ValueError(f'Unsupported interval {interval!r}')
+
     dialect = session.bind.dialect.name if session.bind else 'postgresql'
 
-    if dialect == 'sqlite':
-        # SQLite: use strftime to truncate to hour
-        bucket = func.strftime('%Y-%m-%d %H:00:00', WeatherReport.time).label('bucket')
+    if dialect == 'postgresql' and USE_WX_CONTINUOUS_AGGREGATES:
+        try:
+            rows = _get_wx_history_from_aggregates(
+                session, station_id, start, end, fields, interval
+            )
+        except SQLAlchemyError as ex:
+            # Aggregates not created yet (migration not run)
+            LOG.warning(f'wx history aggregates unavailable, using raw rows: {ex}')
+            session.rollback()
+            rows = _get_wx_history_from_raw(
+                session, station_id, start, end, fields, interval, dialect
+            )
     else:
-        # PostgreSQL/TimescaleDB: use date_trunc
-        bucket = func.date_trunc('hour', WeatherReport.time).label('bucket')
-
-    # Build select columns using centralized WX_FIELD_MAPPING
-    select_cols = [bucket]
-    for field in fields:
-        if field in WX_FIELD_MAPPING:
-            select_cols.append(func.avg(WX_FIELD_MAPPING[field]).label(field))
-
-    query = (
-        session.query(*select_cols)
-        .filter(
-            WeatherReport.weather_station_id == station_id,
-            WeatherReport.time >= start,
-            WeatherReport.time < end,
+        rows = _get_wx_history_from_raw(
+            session, station_id, start, end, fields, interval, dialect
         )
-        .group_by(bucket)
-        .order_by(bucket)
-    )
 
     results = []
-    for row in query:
+    for row in rows:
         bucket_val = row.bucket
         if isinstance(bucket_val, str):
             # SQLite returns string
@@ -693,3 +975,77 @@ def get_wx_history(
         results.append(entry)
 
     return results
+
+
+def _get_wx_history_from_aggregates(
+    session: Session,
+    station_id: int,
+    start: datetime,
+    end: datetime,
+    fields: list[str],
+    interval: str,
+) -> list[Any]:
+    """Read per-station buckets from a weather continuous aggregate."""
+    trunc = 'hour' if interval == '1h' else 'day'
+    columns = [sqlalchemy.column(f'{field}_avg') for field in fields]
+    view = sqlalchemy.table(
+        WX_HISTORY_AGGREGATES[interval],
+        sqlalchemy.column('bucket'),
+        sqlalchemy.column('weather_station_id'),
+        *columns,
+    )
+    query = (
+        sqlalchemy.select(
+            view.c.bucket,
+            *[
+                view.c[f'{field}_avg'].label(field)
+                for field in fields
+                if field in WX_FIELD_MAPPING
+            ],
+        )
+        .where(
+            view.c.weather_station_id == station_id,
+            view.c.bucket >= func.date_trunc(trunc, start),
+            view.c.bucket < end,
+        )
+        .order_by(view.c.bucket)
+    )
+    return session.execute(query).all()
+
+
+def _get_wx_history_from_raw(
+    session: Session,
+    station_id: int,
+    start: datetime,
+    end: datetime,
+    fields: list[str],
+    interval: str,
+    dialect: str,
+) -> list[Any]:
+    """Bucket and average raw weather_report rows."""
+    if dialect == 'sqlite':
+        # SQLite: use strftime to truncate to hour/day
+        fmt = '%Y-%m-%d %H:00:00' if interval == '1h' else '%Y-%m-%d 00:00:00'
+        bucket = func.strftime(fmt, WeatherReport.time).label('bucket')
+    else:
+        # PostgreSQL/TimescaleDB: use date_trunc
+        trunc = 'hour' if interval == '1h' else 'day'
+        bucket = func.date_trunc(trunc, WeatherReport.time).label('bucket')
+
+    # Build select columns using centralized WX_FIELD_MAPPING
+    select_cols = [bucket]
+    for field in fields:
+        if field in WX_FIELD_MAPPING:
+            select_cols.append(func.avg(WX_FIELD_MAPPING[field]).label(field))
+
+    query = (
+        session.query(*select_cols)
+        .filter(
+            WeatherReport.weather_station_id == station_id,
+            WeatherReport.time >= start,
+            WeatherReport.time < end,
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    return query.all()
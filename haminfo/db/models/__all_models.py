@@ -9,3 +9,7 @@ from haminfo.db.models.request import WXRequest  # noqa
 from haminfo.db.models.weather_report import WeatherStation  # noqa
 from haminfo.db.models.weather_report import WeatherReport  # noqa
 from haminfo.db.models.aprs_packet import APRSPacket  # noqa
+from haminfo.db.models.station_change import StationChange  # noqa
+from haminfo.db.models.aprs_station_summary import APRSStationSummary  # noqa
+from haminfo.db.models.aprs_region_rollup import APRSCountryRollup  # noqa
+from haminfo.db.models.aprs_region_rollup import APRSStateRollup  # noqa
@@ -32,6 +32,8 @@ class APRSPacket(ModelBase):
     PostgreSQL-specific indexes (created via migration, not model):
     - ix_aprs_packet_from_call_ts_pos: Composite partial index for position lookups
     - idx_aprs_packet_location: GIST spatial index on location column
+    - ix_aprs_packet_location_received_at: GIST on (geometry(location),
+      received_at) for bbox queries with && ST_MakeEnvelope
     """
 
     __tablename__ = 'aprs_packet'
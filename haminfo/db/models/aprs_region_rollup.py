@@ -0,0 +1,62 @@
+from __future__ import annotations
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from haminfo.db.models.modelbase import ModelBase
+
+
+class APRSCountryRollup(ModelBase):
+    """Last-24-hour activity per country.
+
+    Rebuilt every minute by the dashboard's rollup worker
+    (haminfo_dashboard.rollups) from aprs_station_stats_hourly.
+    top_stations is a list of {"callsign": ..., "count": ...} objects,
+    busiest first.
+    """
+
+    __tablename__ = 'aprs_country_rollup'
+
+    country_code = sa.Column(sa.String(2), primary_key=True)
+    country_name = sa.Column(sa.String(100), nullable=False)
+    packets_24h = sa.Column(sa.BigInteger, nullable=False, default=0)
+    unique_stations = sa.Column(sa.Integer, nullable=False, default=0)
+    top_stations = sa.Column(
+        sa.JSON().with_variant(JSONB, 'postgresql'), nullable=False, default=list
+    )
+    weather_stations = sa.Column(sa.Integer, nullable=False, default=0)
+    updated_at = sa.Column(sa.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<APRSCountryRollup(country_code='{self.country_code}', "
+            f'packets_24h={self.packets_24h})>'
+        )
+
+
+class APRSStateRollup(ModelBase):
+    """Last-24-hour activity per US state and Canadian/Australian province.
+
+    Maintained alongside aprs_country_rollup; stations are placed by their
+    last known position in aprs_station_summary.
+    """
+
+    __tablename__ = 'aprs_state_rollup'
+
+    country_code = sa.Column(sa.String(2), primary_key=True)
+    state_code = sa.Column(sa.String(3), primary_key=True)
+    state_name = sa.Column(sa.String(100), nullable=False)
+    packets_24h = sa.Column(sa.BigInteger, nullable=False, default=0)
+    unique_stations = sa.Column(sa.Integer, nullable=False, default=0)
+    top_stations = sa.Column(
+        sa.JSON().with_variant(JSONB, 'postgresql'), nullable=False, default=list
+    )
+    weather_stations = sa.Column(sa.Integer, nullable=False, default=0)
+    updated_at = sa.Column(sa.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<APRSStateRollup(country_code='{self.country_code}', "
+            f"state_code='{self.state_code}', packets_24h={self.packets_24h})>"
+        )
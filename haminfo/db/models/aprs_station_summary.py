@@ -0,0 +1,54 @@
+from __future__ import annotations
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from haminfo.db.models.modelbase import ModelBase
+
+
+class APRSStationSummary(ModelBase):
+    """Rolling per-station summary of aprs_packet.
+
+    One row per callsign, maintained incrementally by the ingest through
+    the aprs_station_summary_apply() SQL function and reconciled by the
+    aprs_station_summary_reconcile TimescaleDB job (both created by
+    migration f3a4b5c6d7e8).
+
+    type_counts_24h maps packet_type to the number of packets in the last
+    24 hours; the ingest increments it and the reconcile job resets it to
+    the exact counts.
+    """
+
+    __tablename__ = 'aprs_station_summary'
+
+    from_call = sa.Column(sa.String(9), primary_key=True)
+    first_seen = sa.Column(sa.DateTime, nullable=False)
+    last_seen = sa.Column(sa.DateTime, nullable=False, index=True)
+    packet_count = sa.Column(sa.BigInteger, nullable=False, default=0)
+
+    # Latest packet
+    last_packet_type = sa.Column(sa.String(20))
+    symbol = sa.Column(sa.CHAR(1))
+    symbol_table = sa.Column(sa.CHAR(1))
+    comment = sa.Column(sa.Text)
+
+    # Latest packet with a position
+    position_at = sa.Column(sa.DateTime)
+    latitude = sa.Column(sa.Float)
+    longitude = sa.Column(sa.Float)
+    altitude = sa.Column(sa.Float)
+    speed = sa.Column(sa.Float)
+    course = sa.Column(sa.SmallInteger)
+
+    type_counts_24h = sa.Column(
+        sa.JSON().with_variant(JSONB, 'postgresql'), nullable=False, default=dict
+    )
+    updated_at = sa.Column(sa.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<APRSStationSummary(from_call='{self.from_call}', "
+            f'packet_count={self.packet_count}, '
+            f"last_seen='{self.last_seen}')>"
+        )
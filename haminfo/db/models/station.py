@@ -1,4 +1,6 @@
 from datetime import datetime
+import hashlib
+import json
 
 import sqlalchemy as sa
 from geoalchemy2 import Geography
@@ -10,6 +12,12 @@ from haminfo import utils
 
 class Station(ModelBase):
     __tablename__ = 'station'
+    __table_args__ = (
+        # RepeaterBook's natural key; target of the sync upsert
+        sa.Index(
+            'uq_station_state_id_repeater_id', 'state_id', 'repeater_id', unique=True
+        ),
+    )
 
     id = sa.Column(sa.Integer, sa.Sequence('station_id_seq'), primary_key=True)
     state_id = sa.Column(sa.String, primary_key=True)
@@ -45,6 +53,8 @@ class Station(ModelBase):
     fm_analog = sa.Column(sa.Boolean)
     dmr = sa.Column(sa.Boolean)
     dstar = sa.Column(sa.Boolean)
+    # Hash of the RepeaterBook payload, used to skip unchanged rows on sync
+    content_hash = sa.Column(sa.String(32))
     # Timestamp tracking when haminfo last modified this record
     updated_at = sa.Column(
         sa.DateTime,
@@ -88,13 +98,19 @@ class Station(ModelBase):
                 else:
                     val = 0.000
                 dict_[key] = '{:.4f}'.format(val)
-            elif key == 'location':
+            elif key == 'location' or key == 'content_hash':
                 # don't include this.
                 pass
             else:
                 dict_[key] = getattr(self, key)
         return dict_
 
+    @staticmethod
+    def content_hash_from_json(r_json):
+        """Hash a RepeaterBook payload, independent of key order."""
+        payload = json.dumps(r_json, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
     @staticmethod
     def find_station_by_ids(session, state_id, repeater_id):
         try:
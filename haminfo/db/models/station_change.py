@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from haminfo.db.models.modelbase import ModelBase
+
+
+class StationChange(ModelBase):
+    """Journal of repeater rows changed by a RepeaterBook sync.
+
+    One row per station added, updated or removed. Consumers remember the
+    last id they applied and read newer entries instead of reloading the
+    whole station table.
+    """
+
+    __tablename__ = 'station_change'
+
+    ADDED = 'added'
+    UPDATED = 'updated'
+    REMOVED = 'removed'
+
+    id = sa.Column(sa.Integer, sa.Sequence('station_change_id_seq'), primary_key=True)
+    changed_at = sa.Column(sa.DateTime, default=datetime.utcnow, index=True)
+    change_type = sa.Column(sa.String(8), nullable=False)
+    state_id = sa.Column(sa.String, nullable=False)
+    repeater_id = sa.Column(sa.Integer, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<StationChange(id={self.id}, change_type='{self.change_type}', "
+            f"state_id='{self.state_id}', repeater_id={self.repeater_id})>"
+        )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'changed_at': str(self.changed_at) if self.changed_at else None,
+            'change_type': self.change_type,
+            'state_id': self.state_id,
+            'repeater_id': self.repeater_id,
+        }
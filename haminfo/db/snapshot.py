@@ -0,0 +1,242 @@
+"""Offline RepeaterBook snapshots.
+
+A snapshot is a directory holding up to two zstd-compressed Parquet files:
+
+- ``station.parquet``: the ``station`` table (every column except the
+  geography, which is rebuilt from lat/long on import)
+- ``repeaterbook.parquet``: raw RepeaterBook export payloads, one row per
+  region URL, as saved by ``rb fetch-all-repeaters --snapshot-dir``
+
+Importing ``station.parquet`` on PostgreSQL streams the rows into a temp
+table with COPY and merges them with one INSERT ... SELECT ... ON CONFLICT,
+so rebuilding a staging or CI database doesn't need the rate-limited
+RepeaterBook API.  Raw payloads can instead be replayed through the regular
+sync path (``haminfo.cmds.fetch_repeaterbook.apply_repeaters``).
+
+Requires the optional ``pyarrow`` package (``pip install haminfo[snapshot]``).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import sqlalchemy as sa
+from oslo_log import log as logging
+from sqlalchemy.orm import Session
+
+from haminfo import utils
+from haminfo.db import db
+from haminfo.db.models.station import Station
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+LOG = logging.getLogger(utils.DOMAIN)
+
+STATION_FILE = 'station.parquet'
+PAYLOAD_FILE = 'repeaterbook.parquet'
+
+# The geography column is derived from lat/long, everything else is stored
+STATION_COLUMNS = [
+    column for column in Station.__table__.columns if column.name != 'location'
+]
+
+# Marks NULL in the COPY stream, so empty strings stay empty strings
+COPY_NULL = r'\N'
+
+
+class SnapshotError(Exception):
+    """Error reading or writing a snapshot."""
+
+    pass
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise SnapshotError(
+            'Snapshots need the pyarrow package: pip install haminfo[snapshot]'
+        )
+
+
+def _arrow_type(column: sa.Column) -> Any:
+    if isinstance(column.type, sa.Boolean):
+        return pa.bool_()
+    if isinstance(column.type, sa.Integer):
+        return pa.int64()
+    if isinstance(column.type, sa.Float):
+        return pa.float64()
+    if isinstance(column.type, sa.DateTime):
+        return pa.timestamp('us')
+    if isinstance(column.type, sa.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _write_table(columns: dict[str, list], schema: Any, path: Path) -> None:
+    table = pa.Table.from_pydict(columns, schema=schema)
+    pq.write_table(table, path, compression='zstd')
+
+
+def export_stations(session: Session, directory: str | Path) -> int:
+    """Write the station table to ``<directory>/station.parquet``.
+
+    Args:
+        session: Database session.
+        directory: Snapshot directory, created if missing.
+
+    Returns:
+        Number of stations written.
+    """
+    _require_pyarrow()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    names = [column.name for column in STATION_COLUMNS]
+    columns: dict[str, list] = {name: [] for name in names}
+    result = session.execute(sa.select(*STATION_COLUMNS).order_by(Station.id))
+    for row in result:
+        for name, value in zip(names, row, strict=True):
+            columns[name].append(value)
+
+    schema = pa.schema(
+        [(column.name, _arrow_type(column)) for column in STATION_COLUMNS]
+    )
+    _write_table(columns, schema, directory / STATION_FILE)
+    return len(columns['id'])
+
+
+def read_stations(directory: str | Path) -> list[dict[str, Any]]:
+    """Read the station rows from a snapshot directory."""
+    _require_pyarrow()
+    path = Path(directory) / STATION_FILE
+    if not path.exists():
+        raise SnapshotError(f'No {STATION_FILE} in {directory}')
+    return pq.read_table(path).to_pylist()
+
+
+def export_payloads(payloads: dict[str, list[dict]], directory: str | Path) -> int:
+    """Write raw RepeaterBook payloads to ``<directory>/repeaterbook.parquet``.
+
+    Args:
+        payloads: Export URL -> list of repeater dicts.
+        directory: Snapshot directory, created if missing.
+
+    Returns:
+        Number of regions written.
+    """
+    _require_pyarrow()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    urls = sorted(payloads)
+    columns = {
+        'url': urls,
+        'payload': [json.dumps(payloads[url]) for url in urls],
+    }
+    schema = pa.schema([('url', pa.string()), ('payload', pa.string())])
+    _write_table(columns, schema, directory / PAYLOAD_FILE)
+    return len(urls)
+
+
+def read_payloads(directory: str | Path) -> dict[str, list[dict]]:
+    """Read raw RepeaterBook payloads from a snapshot directory."""
+    _require_pyarrow()
+    path = Path(directory) / PAYLOAD_FILE
+    if not path.exists():
+        raise SnapshotError(f'No {PAYLOAD_FILE} in {directory}')
+    table = pq.read_table(path)
+    return {row['url']: json.loads(row['payload']) for row in table.to_pylist()}
+
+
+def import_stations(
+    session: Session, rows: list[dict[str, Any]], replace: bool = False
+) -> int:
+    """Bulk load snapshot station rows.
+
+    Rows are merged on (state_id, repeater_id); new rows keep their
+    snapshot id.  PostgreSQL uses COPY, other backends fall back to
+    :func:`haminfo.db.db.upsert_stations`.  The caller commits.
+
+    Args:
+        session: Database session.
+        rows: Station rows, as returned by :func:`read_stations`.
+        replace: Delete every existing station first.
+
+    Returns:
+        Number of rows loaded.
+    """
+    if replace:
+        session.execute(sa.delete(Station))
+    if not rows:
+        return 0
+
+    dialect = session.bind.dialect.name if session.bind else 'postgresql'
+    if dialect == 'postgresql':
+        return _copy_stations(session, rows)
+
+    for row in rows:
+        row['location'] = 'POINT({} {})'.format(row['long'], row['lat'])
+    return db.upsert_stations(session, rows)
+
+
+def stations_csv(rows: list[dict[str, Any]], names: list[str]) -> io.StringIO:
+    """Render rows as a CSV stream for COPY ... (FORMAT csv, NULL '\\N')."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow(
+            [COPY_NULL if row.get(name) is None else row[name] for name in names]
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_stations(session: Session, rows: list[dict[str, Any]]) -> int:
+    names = [column.name for column in STATION_COLUMNS]
+    column_list = ', '.join(f'"{name}"' for name in names)
+    updates = ', '.join(
+        f'"{name}" = EXCLUDED."{name}"'
+        for name in names
+        if name not in ('id', 'state_id', 'repeater_id')
+    )
+
+    session.execute(
+        sa.text(
+            'CREATE TEMP TABLE station_snapshot_load (LIKE station INCLUDING DEFAULTS)'
+        )
+    )
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f'COPY station_snapshot_load ({column_list}) '
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            stations_csv(rows, names),
+        )
+    finally:
+        cursor.close()
+
+    session.execute(
+        sa.text(f"""
+        INSERT INTO station ({column_list}, location)
+        SELECT {column_list},
+               ST_SetSRID(ST_MakePoint(long, lat), 4326)::geography
+        FROM station_snapshot_load
+        ON CONFLICT (state_id, repeater_id) DO UPDATE SET {updates}
+    """)
+    )
+    # Snapshot ids bypassed the sequence
+    session.execute(
+        sa.text(
+            "SELECT setval('station_id_seq', (SELECT COALESCE(MAX(id), 1) FROM station))"
+        )
+    )
+    session.execute(sa.text('DROP TABLE station_snapshot_load'))
+    return len(rows)
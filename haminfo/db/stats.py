@@ -0,0 +1,247 @@
+"""Constant-time APRS packet statistics for the /stats endpoint.
+
+The exact statistics (:func:`haminfo.db.db.get_aprs_packet_stats`) scan the
+whole ``aprs_packet`` hypertable, so their cost grows with every day of
+retained packets.  The approximate mode answers from pre-aggregated data
+instead:
+
+- ``total``: TimescaleDB ``approximate_row_count('aprs_packet')``, which
+  reads chunk statistics rather than rows
+- per-type counts: ``aprs_packet_type_stats_daily`` (one row per day and
+  packet type)
+- ``last_24h``: ``aprs_stats_hourly``
+- ``unique_callsigns``: a :class:`HyperLogLog` sketch per day built from
+  ``aprs_station_stats_daily``.  Past days are loaded once; each refresh
+  only re-reads the current day's rows.
+
+Results from either mode are cached per process for ``STATS_CACHE_TTL``
+seconds.  Exact mode stays available through the ``web.exact_stats``
+option and is always used on non-PostgreSQL backends.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from oslo_log import log as logging
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from haminfo import utils
+from haminfo.db import db
+
+LOG = logging.getLogger(utils.DOMAIN)
+
+# Seconds a computed stats dict is served before it is recomputed
+STATS_CACHE_TTL = 60
+
+# HyperLogLog precision: 2**12 registers, ~1.6% standard error
+HLL_PRECISION = 12
+
+MAIN_PACKET_TYPES = ('position', 'weather', 'message')
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator.
+
+    Adding the same value twice never changes the estimate, so overlapping
+    reads of a still-growing bucket can be folded in again safely.
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        """Create an empty sketch.
+
+        Args:
+            precision: Number of index bits; the sketch has 2**precision
+                one-byte registers.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError('precision must be between 4 and 16')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        width = 64 - self.precision
+        index = hashed >> width
+        remainder = hashed & ((1 << width) - 1)
+        rank = width - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add every value from an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: HyperLogLog) -> None:
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge sketches with different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Return the estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class PacketStats:
+    """Cached packet statistics with an approximate and an exact mode."""
+
+    def __init__(self, ttl: float = STATS_CACHE_TTL) -> None:
+        """Initialize the stats cache.
+
+        Args:
+            ttl: Seconds a computed result is reused.
+        """
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._results: dict[bool, tuple[float, dict[str, Any]]] = {}
+        # Per-day callsign sketches, keyed by bucket start
+        self._day_sketches: dict[datetime, HyperLogLog] = {}
+
+    def get(self, session: Session, exact: bool = False) -> dict[str, Any]:
+        """Return packet statistics, recomputing them when stale.
+
+        Args:
+            session: Database session.
+            exact: Scan aprs_packet for exact counts instead of using the
+                rollups.  Forced on for non-PostgreSQL backends.
+
+        Returns:
+            Dict with total, position, weather, message, other,
+            unique_callsigns, last_24h and approximate.
+        """
+        dialect = session.bind.dialect.name if session.bind else 'postgresql'
+        if dialect != 'postgresql':
+            exact = True
+
+        with self._lock:
+            cached = self._results.get(exact)
+            if cached and time.monotonic() - cached[0] < self._ttl:
+                return cached[1]
+
+            stats = None
+            if not exact:
+                try:
+                    stats = self._approximate_stats(session)
+                except SQLAlchemyError as ex:
+                    # Rollups not created yet (migration not run)
+                    LOG.warning(f'Approximate stats unavailable, using exact: {ex}')
+                    session.rollback()
+            if stats is None:
+                stats = db.get_aprs_packet_stats(session)
+                stats['approximate'] = False
+
+            self._results[exact] = (time.monotonic(), stats)
+            return stats
+
+    def invalidate(self) -> None:
+        """Drop cached results and callsign sketches."""
+        with self._lock:
+            self._results.clear()
+            self._day_sketches.clear()
+
+    def _approximate_stats(self, session: Session) -> dict[str, Any]:
+        total = session.execute(
+            text("SELECT approximate_row_count('aprs_packet')")
+        ).scalar()
+
+        type_rows = session.execute(
+            text("""
+            SELECT packet_type, SUM(packet_count) AS packet_count
+            FROM aprs_packet_type_stats_daily
+            GROUP BY packet_type
+        """)
+        ).all()
+        type_dict: dict[str, int] = {}
+        for ptype, cnt in type_rows:
+            key = ptype if ptype else 'unknown'
+            type_dict[key] = type_dict.get(key, 0) + int(cnt or 0)
+
+        last_24h = session.execute(
+            text("""
+            SELECT COALESCE(SUM(packet_count), 0)
+            FROM aprs_stats_hourly
+            WHERE bucket >= NOW() - INTERVAL '24 hours'
+        """)
+        ).scalar()
+
+        return {
+            'total': int(total or 0),
+            'position': type_dict.get('position', 0),
+            'weather': type_dict.get('weather', 0),
+            'message': type_dict.get('message', 0),
+            'other': sum(v for k, v in type_dict.items() if k not in MAIN_PACKET_TYPES),
+            'unique_callsigns': self._estimate_unique_callsigns(session),
+            'last_24h': int(last_24h or 0),
+            'approximate': True,
+        }
+
+    def _estimate_unique_callsigns(self, session: Session) -> int:
+        oldest = session.execute(
+            text('SELECT MIN(bucket) FROM aprs_station_stats_daily')
+        ).scalar()
+        if oldest is None:
+            self._day_sketches.clear()
+            return 0
+
+        # Forget days the retention policy has dropped
+        for day in [d for d in self._day_sketches if d < oldest]:
+            del self._day_sketches[day]
+
+        # Re-read the newest known day (it may still be growing) and any
+        # day after it; everything older is already in its sketch.
+        since: Optional[datetime] = max(self._day_sketches, default=None)
+        params = {'since': since if since is not None else oldest}
+        rows = session.execute(
+            text("""
+            SELECT bucket, from_call
+            FROM aprs_station_stats_daily
+            WHERE bucket >= :since
+        """),
+            params,
+        )
+        for bucket, from_call in rows:
+            sketch = self._day_sketches.get(bucket)
+            if sketch is None:
+                sketch = self._day_sketches[bucket] = HyperLogLog()
+            sketch.add(from_call)
+
+        combined = HyperLogLog()
+        for sketch in self._day_sketches.values():
+            combined.merge(sketch)
+        return combined.count()
+
+
+packet_stats = PacketStats()
+
+
+def get_packet_stats(session: Session, exact: bool = False) -> dict[str, Any]:
+    """Get cached APRS packet statistics.
+
+    Args:
+        session: Database session.
+        exact: Use exact counts instead of the rollups.
+
+    Returns:
+        Stats dict, see :meth:`PacketStats.get`.
+    """
+    return packet_stats.get(session, exact=exact)
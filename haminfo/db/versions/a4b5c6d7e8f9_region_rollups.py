@@ -0,0 +1,70 @@
+"""Add per-country and per-state rollup tables.
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-19
+
+The dashboard's country pages recomputed per-country totals over 24
+hours of packets (from the prefix aggregate, the station aggregate or
+the raw table, depending on the variant) whenever their cache entries
+expired. aprs_country_rollup and aprs_state_rollup hold those totals:
+packets and unique stations in the last 24 hours, the top stations and
+the number of weather stations. There is one row per country, and one
+row per state or province for the US, Canada and Australia.
+
+Countries are assigned from the callsign prefix table in
+haminfo_dashboard.utils, which SQL can't see. The tables are therefore
+maintained by the dashboard's rollup worker rather than a TimescaleDB
+job. The worker refreshes incrementally from the newest
+aprs_station_stats_hourly bucket:
+
+    python scripts/refresh_rollups.py -c haminfo.conf --interval 60
+
+The tables are created empty; the dashboard falls back to its previous
+queries until the worker's first run.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = 'a4b5c6d7e8f9'
+down_revision = 'f3a4b5c6d7e8'
+branch_labels = None
+depends_on = None
+
+
+def _rollup_columns():
+    return [
+        sa.Column('packets_24h', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('unique_stations', sa.Integer, nullable=False, server_default='0'),
+        sa.Column(
+            'top_stations', JSONB, nullable=False, server_default=sa.text("'[]'")
+        ),
+        sa.Column('weather_stations', sa.Integer, nullable=False, server_default='0'),
+        sa.Column(
+            'updated_at', sa.DateTime, nullable=False, server_default=sa.func.now()
+        ),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        'aprs_country_rollup',
+        sa.Column('country_code', sa.String(2), primary_key=True),
+        sa.Column('country_name', sa.String(100), nullable=False),
+        *_rollup_columns(),
+    )
+    op.create_table(
+        'aprs_state_rollup',
+        sa.Column('country_code', sa.String(2), primary_key=True),
+        sa.Column('state_code', sa.String(3), primary_key=True),
+        sa.Column('state_name', sa.String(100), nullable=False),
+        *_rollup_columns(),
+    )
+
+
+def downgrade():
+    op.drop_table('aprs_state_rollup')
+    op.drop_table('aprs_country_rollup')
@@ -0,0 +1,118 @@
+"""Create continuous aggregates for weather history.
+
+Revision ID: a8b9c0d1e2f3
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-19
+
+Creates two continuous aggregates over the weather_report hypertable:
+1. weather_report_hourly - per-station hourly avg/min/max of every field
+2. weather_report_daily  - per-station daily avg/min/max of every field
+
+These back /api/v1/wx/history and the dashboard state trend charts, which
+previously ran date_trunc/time_bucket + AVG over raw (and eventually
+compressed) weather_report rows on every request.
+
+Both views are real-time aggregates (materialized_only = false), so
+TimescaleDB transparently unions the materialized buckets with raw rows
+for the not-yet-materialized tail. Queries never need to handle the
+watermark themselves.
+
+The refresh windows only cover recent data, so the aggregates keep their
+history after clean_weather_reports deletes the raw rows.
+
+IMPORTANT: Requires weather_report to be a hypertable (c3d4e5f6a7b8).
+The views are created WITH NO DATA; backfill once after upgrading (outside
+a transaction):
+
+    CALL refresh_continuous_aggregate('weather_report_hourly', NULL, NULL);
+    CALL refresh_continuous_aggregate('weather_report_daily', NULL, NULL);
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a8b9c0d1e2f3'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+# Fields aggregated per bucket; matches haminfo.db.db.WX_FIELD_MAPPING
+WX_FIELDS = (
+    'temperature',
+    'humidity',
+    'pressure',
+    'wind_speed',
+    'wind_direction',
+    'wind_gust',
+    'rain_1h',
+    'rain_24h',
+    'rain_since_midnight',
+)
+
+
+def _field_columns():
+    columns = []
+    for field in WX_FIELDS:
+        columns.append(f'avg({field}) AS {field}_avg')
+        columns.append(f'min({field}) AS {field}_min')
+        columns.append(f'max({field}) AS {field}_max')
+    return ',\n            '.join(columns)
+
+
+def _create_aggregate(name, bucket_width):
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW {name}
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT
+            time_bucket('{bucket_width}', time) AS bucket,
+            weather_station_id,
+            count(*) AS report_count,
+            {_field_columns()}
+        FROM weather_report
+        GROUP BY bucket, weather_station_id
+        WITH NO DATA
+    """)
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS ix_{name}_station_bucket
+        ON {name} (weather_station_id, bucket DESC)
+    """)
+
+
+def upgrade():
+    # Aggregate 1: Hourly per-station weather
+    _create_aggregate('weather_report_hourly', '1 hour')
+
+    # Refresh policy: every 15 minutes, update the last day
+    op.execute("""
+        SELECT add_continuous_aggregate_policy('weather_report_hourly',
+            start_offset => INTERVAL '1 day',
+            end_offset => INTERVAL '1 hour',
+            schedule_interval => INTERVAL '15 minutes')
+    """)
+
+    # Retention: 90 days (raw reports are only kept for 14)
+    op.execute("""
+        SELECT add_retention_policy('weather_report_hourly', INTERVAL '90 days')
+    """)
+
+    # Aggregate 2: Daily per-station weather
+    _create_aggregate('weather_report_daily', '1 day')
+
+    # Refresh policy: every hour, update the last few days
+    op.execute("""
+        SELECT add_continuous_aggregate_policy('weather_report_daily',
+            start_offset => INTERVAL '4 days',
+            end_offset => INTERVAL '1 day',
+            schedule_interval => INTERVAL '1 hour')
+    """)
+
+    # Retention: 2 years
+    op.execute("""
+        SELECT add_retention_policy('weather_report_daily', INTERVAL '730 days')
+    """)
+
+
+def downgrade():
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS weather_report_daily CASCADE')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS weather_report_hourly CASCADE')
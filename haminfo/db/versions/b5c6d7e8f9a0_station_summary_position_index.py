@@ -0,0 +1,34 @@
+"""Index aprs_station_summary by position time.
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-19
+
+Every dashboard map mode now reads the latest position of each station
+from aprs_station_summary (haminfo_dashboard.queries.query_latest_stations)
+instead of grouping or deduplicating aprs_packet rows. The map filters on
+position_at >= now() - hours, so the partial index below lets the 1, 2 and
+6 hour windows skip stations that haven't sent a position recently.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b5c6d7e8f9a0'
+down_revision = 'a4b5c6d7e8f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_aprs_station_summary_position_at
+        ON aprs_station_summary (position_at DESC)
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_aprs_station_summary_position_at')
@@ -0,0 +1,92 @@
+"""Create daily rollups for the /stats endpoint.
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-19
+
+Creates two continuous aggregates over the aprs_packet hypertable:
+1. aprs_packet_type_stats_daily - packets per day per packet_type
+2. aprs_station_stats_daily     - packets per day per from_call
+
+/stats previously ran count(*), a GROUP BY packet_type and
+count(DISTINCT from_call) over the whole hypertable on every request.
+haminfo.db.stats now sums the (tiny) per-type rollup and folds the
+per-station rollup into per-day HyperLogLog sketches, reading only the
+current day's rows after the first load.
+
+Retention matches the default raw retention of clean-aprs-packets (30
+days), so the rollups cover the same packets as the raw table.
+
+IMPORTANT: Requires aprs_packet to be a hypertable. The views are created
+WITH NO DATA; backfill once after upgrading (outside a transaction):
+
+    CALL refresh_continuous_aggregate('aprs_packet_type_stats_daily', NULL, NULL);
+    CALL refresh_continuous_aggregate('aprs_station_stats_daily', NULL, NULL);
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b9c0d1e2f3a4'
+down_revision = 'a8b9c0d1e2f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Aggregate 1: Daily packet counts per packet type
+    op.execute("""
+        CREATE MATERIALIZED VIEW aprs_packet_type_stats_daily
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT
+            time_bucket('1 day', timestamp) AS bucket,
+            packet_type,
+            count(*) AS packet_count
+        FROM aprs_packet
+        GROUP BY bucket, packet_type
+        WITH NO DATA
+    """)
+
+    # Refresh policy: every 15 minutes, update the last 2 days
+    op.execute("""
+        SELECT add_continuous_aggregate_policy('aprs_packet_type_stats_daily',
+            start_offset => INTERVAL '2 days',
+            end_offset => INTERVAL '15 minutes',
+            schedule_interval => INTERVAL '15 minutes')
+    """)
+
+    # Retention: 30 days
+    op.execute("""
+        SELECT add_retention_policy('aprs_packet_type_stats_daily', INTERVAL '30 days')
+    """)
+
+    # Aggregate 2: Daily packet counts per station
+    op.execute("""
+        CREATE MATERIALIZED VIEW aprs_station_stats_daily
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT
+            time_bucket('1 day', timestamp) AS bucket,
+            from_call,
+            count(*) AS packet_count
+        FROM aprs_packet
+        GROUP BY bucket, from_call
+        WITH NO DATA
+    """)
+
+    # Refresh policy: every 15 minutes, update the last 2 days
+    op.execute("""
+        SELECT add_continuous_aggregate_policy('aprs_station_stats_daily',
+            start_offset => INTERVAL '2 days',
+            end_offset => INTERVAL '15 minutes',
+            schedule_interval => INTERVAL '15 minutes')
+    """)
+
+    # Retention: 30 days
+    op.execute("""
+        SELECT add_retention_policy('aprs_station_stats_daily', INTERVAL '30 days')
+    """)
+
+
+def downgrade():
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS aprs_station_stats_daily CASCADE')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS aprs_packet_type_stats_daily CASCADE')
@@ -0,0 +1,42 @@
+"""Add a unique index on station (state_id, repeater_id).
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-19
+
+RepeaterBook identifies a repeater by (State ID, Rptr ID). The sync in
+haminfo.cmds.fetch_repeaterbook now upserts whole regions with
+INSERT ... ON CONFLICT (state_id, repeater_id) DO UPDATE, which needs a
+unique index on exactly those columns (the primary key also includes id).
+
+Any duplicates left by older loaders are removed first, keeping the row
+with the lowest id.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c0d1e2f3a4b5'
+down_revision = 'b9c0d1e2f3a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        DELETE FROM station s
+        USING station keep
+        WHERE s.state_id = keep.state_id
+          AND s.repeater_id = keep.repeater_id
+          AND s.id > keep.id
+    """)
+    op.create_index(
+        'uq_station_state_id_repeater_id',
+        'station',
+        ['state_id', 'repeater_id'],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index('uq_station_state_id_repeater_id', table_name='station')
@@ -0,0 +1,63 @@
+"""Add spatial-temporal GiST indexes for map bbox queries.
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-19
+
+The dashboard's bbox queries filtered on latitude/longitude ranges. With
+only single-column indexes PostgreSQL can use at most one of the ranges
+plus the received_at index, and it rechecks everything else row by row.
+They now use ``geometry(location) && ST_MakeEnvelope(...)``
+(haminfo_dashboard.queries._packet_bbox_filter). The indexes below pair
+that point with the time column, so the box and the window are answered
+from one index:
+
+1. aprs_packet: GiST on (geometry(location), received_at). btree_gist
+   provides the GiST operator class for the timestamp. A planar envelope
+   in lon/lat is exact for points, so no latitude/longitude recheck is
+   needed. Casting the envelope to geography instead would give it
+   great-circle edges, which do not follow lines of latitude.
+   idx_aprs_packet_location (GiST on the geography) is kept for distance
+   queries.
+2. aprs_station_summary: GiST on (the position point, position_at), for
+   the map's latest-position reads (migration b5c6d7e8f9a0).
+
+On a large aprs_packet hypertable, building index 1 takes a while; the
+index is built per chunk.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c6d7e8f9a0b1'
+down_revision = 'b5c6d7e8f9a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_aprs_packet_location_received_at
+        ON aprs_packet USING gist (geometry(location), received_at)
+        WHERE location IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_aprs_station_summary_position_gist
+        ON aprs_station_summary USING gist (
+            ST_SetSRID(ST_MakePoint(longitude, latitude), 4326),
+            position_at
+        )
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_aprs_station_summary_position_gist')
+    op.execute('DROP INDEX IF EXISTS ix_aprs_packet_location_received_at')
+    # btree_gist is left installed; other objects may depend on it
@@ -0,0 +1,56 @@
+"""Add station content hashes and the station_change journal.
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-19
+
+1. station.content_hash - hash of the RepeaterBook payload a row was
+   loaded from. The sync skips rows whose hash did not change, so
+   unchanged repeaters are no longer rewritten (and updated_at no longer
+   bumped) on every refresh.
+2. station_change - compact journal of the rows each sync added, updated
+   or removed, so in-process caches can apply the delta.
+
+Existing rows start with a NULL hash and are rewritten once by the next
+sync.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd1e2f3a4b5c6'
+down_revision = 'c0d1e2f3a4b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('station', sa.Column('content_hash', sa.String(32), nullable=True))
+
+    op.execute('CREATE SEQUENCE station_change_id_seq')
+    op.create_table(
+        'station_change',
+        sa.Column(
+            'id',
+            sa.Integer(),
+            sa.Sequence('station_change_id_seq'),
+            server_default=sa.text("nextval('station_change_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column('changed_at', sa.DateTime(), nullable=True),
+        sa.Column('change_type', sa.String(8), nullable=False),
+        sa.Column('state_id', sa.String(), nullable=False),
+        sa.Column('repeater_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_station_change_changed_at', 'station_change', ['changed_at'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_station_change_changed_at', table_name='station_change')
+    op.drop_table('station_change')
+    op.execute('DROP SEQUENCE station_change_id_seq')
+    op.drop_column('station', 'content_hash')
@@ -0,0 +1,64 @@
+"""Add prefix and trigram indexes for callsign search.
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-19
+
+Callsign search used ILIKE '%term%' on aprs_packet.from_call and
+weather_station.callsign, which no btree index can serve, so every chunk
+in the time window was scanned.
+
+1. Prefix indexes on upper(callsign) with text_pattern_ops serve
+   upper(callsign) LIKE 'K1ABC%' regardless of the database collation.
+   The dashboard uses prefix matching whenever the search term looks
+   like a callsign.
+2. pg_trgm GIN indexes serve the remaining substring searches
+   (ILIKE '%ABC%') for terms of three or more characters.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e2f3a4b5c6d7'
+down_revision = 'd1e2f3a4b5c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Prefix search, newest first, for the packet search endpoint
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_aprs_packet_from_call_prefix
+        ON aprs_packet (upper(from_call) text_pattern_ops, received_at DESC)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_aprs_packet_from_call_trgm
+        ON aprs_packet USING gin (from_call gin_trgm_ops)
+        """
+    )
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_weather_station_callsign_prefix
+        ON weather_station (upper(callsign) text_pattern_ops)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_weather_station_callsign_trgm
+        ON weather_station USING gin (callsign gin_trgm_ops)
+        """
+    )
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_weather_station_callsign_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_weather_station_callsign_prefix')
+    op.execute('DROP INDEX IF EXISTS ix_aprs_packet_from_call_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_aprs_packet_from_call_prefix')
+    # pg_trgm is left installed; other objects may depend on it
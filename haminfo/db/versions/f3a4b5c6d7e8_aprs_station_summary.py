@@ -0,0 +1,345 @@
+"""Add the aprs_station_summary table.
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-10-19
+
+The dashboard's station page ran about eight queries per view, including
+an all-time count(*) and an ascending first-seen scan over every chunk
+for the callsign. aprs_station_summary keeps one row per station with
+first/last seen, the total packet count, the latest packet's symbol and
+comment, the last known position and the packet type counts of the last
+24 hours.
+
+1. aprs_station_summary_apply(...) folds a batch of freshly inserted
+   packets (passed as parallel arrays) into the table. The ingests call
+   it on the RETURNING rows of their batch insert, so duplicates skipped
+   by ON CONFLICT are not counted ([mqtt] station_summary, on by
+   default; rust-mqtt-ingest [database] station_summary, off by default).
+2. aprs_station_summary_reconcile() is a TimescaleDB job (every 15
+   minutes). It folds in aprs_station_stats_hourly, which adds stations
+   that were written by an ingest that doesn't maintain the summary and
+   keeps their counts from lagging the aggregate. For stations heard in
+   the last 24 hours it brings last_seen, the latest packet's columns and
+   the last position up to date from aprs_packet, so the summary stays
+   current without the ingest's help (and picks up positions backfilled
+   later). Finally it recomputes the exact 24 hour type counts, so the
+   rolling counts the ingest increments never drift by more than one
+   interval.
+3. aprs_station_summary_rebuild() recomputes every row from aprs_packet.
+
+The table is created empty. Populate it once after upgrading:
+
+    CALL aprs_station_summary_rebuild();
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = 'f3a4b5c6d7e8'
+down_revision = 'e2f3a4b5c6d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'aprs_station_summary',
+        sa.Column('from_call', sa.String(9), primary_key=True),
+        sa.Column('first_seen', sa.DateTime, nullable=False),
+        sa.Column('last_seen', sa.DateTime, nullable=False),
+        sa.Column('packet_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('last_packet_type', sa.String(20)),
+        sa.Column('symbol', sa.CHAR(1)),
+        sa.Column('symbol_table', sa.CHAR(1)),
+        sa.Column('comment', sa.Text),
+        sa.Column('position_at', sa.DateTime),
+        sa.Column('latitude', sa.Float),
+        sa.Column('longitude', sa.Float),
+        sa.Column('altitude', sa.Float),
+        sa.Column('speed', sa.Float),
+        sa.Column('course', sa.SmallInteger),
+        sa.Column(
+            'type_counts_24h', JSONB, nullable=False, server_default=sa.text("'{}'")
+        ),
+        sa.Column(
+            'updated_at', sa.DateTime, nullable=False, server_default=sa.func.now()
+        ),
+    )
+    op.create_index(
+        'ix_aprs_station_summary_last_seen', 'aprs_station_summary', ['last_seen']
+    )
+
+    # Sum two {packet_type: count} objects
+    op.execute("""
+        CREATE OR REPLACE FUNCTION aprs_station_summary_add_counts(a jsonb, b jsonb)
+        RETURNS jsonb LANGUAGE sql IMMUTABLE AS $$
+            SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+            FROM (
+                SELECT key, sum(value::bigint) AS total
+                FROM (
+                    SELECT * FROM jsonb_each_text(COALESCE(a, '{}'::jsonb))
+                    UNION ALL
+                    SELECT * FROM jsonb_each_text(COALESCE(b, '{}'::jsonb))
+                ) pairs
+                GROUP BY key
+            ) sums
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION aprs_station_summary_apply(
+            p_from_call text[],
+            p_received_at timestamp[],
+            p_packet_type text[],
+            p_latitude float8[],
+            p_longitude float8[],
+            p_altitude float8[],
+            p_speed float8[],
+            p_course int2[],
+            p_symbol text[],
+            p_symbol_table text[],
+            p_comment text[]
+        ) RETURNS integer LANGUAGE sql AS $$
+            WITH batch AS (
+                SELECT * FROM unnest(
+                    p_from_call, p_received_at, p_packet_type, p_latitude,
+                    p_longitude, p_altitude, p_speed, p_course, p_symbol,
+                    p_symbol_table, p_comment
+                ) AS t(
+                    from_call, received_at, packet_type, latitude,
+                    longitude, altitude, speed, course, symbol,
+                    symbol_table, comment
+                )
+            ),
+            counts AS (
+                SELECT from_call, min(received_at) AS first_seen,
+                       count(*) AS packet_count
+                FROM batch GROUP BY from_call
+            ),
+            latest AS (
+                SELECT DISTINCT ON (from_call)
+                       from_call, received_at, packet_type, symbol,
+                       symbol_table, comment
+                FROM batch ORDER BY from_call, received_at DESC
+            ),
+            latest_position AS (
+                SELECT DISTINCT ON (from_call)
+                       from_call, received_at AS position_at, latitude,
+                       longitude, altitude, speed, course
+                FROM batch
+                WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+                ORDER BY from_call, received_at DESC
+            ),
+            types AS (
+                SELECT from_call, jsonb_object_agg(packet_type, n) AS type_counts
+                FROM (
+                    SELECT from_call, COALESCE(packet_type, 'unknown') AS packet_type,
+                           count(*) AS n
+                    FROM batch GROUP BY 1, 2
+                ) t
+                GROUP BY from_call
+            ),
+            upserted AS (
+                INSERT INTO aprs_station_summary AS s (
+                    from_call, first_seen, last_seen, packet_count,
+                    last_packet_type, symbol, symbol_table, comment,
+                    position_at, latitude, longitude, altitude, speed, course,
+                    type_counts_24h, updated_at
+                )
+                SELECT c.from_call, c.first_seen, l.received_at, c.packet_count,
+                       l.packet_type, l.symbol, l.symbol_table, l.comment,
+                       p.position_at, p.latitude, p.longitude, p.altitude,
+                       p.speed, p.course, t.type_counts, now()
+                FROM counts c
+                JOIN latest l USING (from_call)
+                JOIN types t USING (from_call)
+                LEFT JOIN latest_position p USING (from_call)
+                -- Lock rows in a fixed order so concurrent batches can't deadlock
+                ORDER BY c.from_call
+                ON CONFLICT (from_call) DO UPDATE SET
+                    first_seen = LEAST(s.first_seen, EXCLUDED.first_seen),
+                    last_seen = GREATEST(s.last_seen, EXCLUDED.last_seen),
+                    packet_count = s.packet_count + EXCLUDED.packet_count,
+                    last_packet_type = CASE WHEN EXCLUDED.last_seen >= s.last_seen
+                        THEN EXCLUDED.last_packet_type ELSE s.last_packet_type END,
+                    symbol = CASE WHEN EXCLUDED.last_seen >= s.last_seen
+                        THEN EXCLUDED.symbol ELSE s.symbol END,
+                    symbol_table = CASE WHEN EXCLUDED.last_seen >= s.last_seen
+                        THEN EXCLUDED.symbol_table ELSE s.symbol_table END,
+                    comment = CASE WHEN EXCLUDED.last_seen >= s.last_seen
+                        THEN EXCLUDED.comment ELSE s.comment END,
+                    position_at = GREATEST(s.position_at, EXCLUDED.position_at),
+                    latitude = CASE WHEN EXCLUDED.position_at
+                            >= COALESCE(s.position_at, '-infinity')
+                        THEN EXCLUDED.latitude ELSE s.latitude END,
+                    longitude = CASE WHEN EXCLUDED.position_at
+                            >= COALESCE(s.position_at, '-infinity')
+                        THEN EXCLUDED.longitude ELSE s.longitude END,
+                    altitude = CASE WHEN EXCLUDED.position_at
+                            >= COALESCE(s.position_at, '-infinity')
+                        THEN EXCLUDED.altitude ELSE s.altitude END,
+                    speed = CASE WHEN EXCLUDED.position_at
+                            >= COALESCE(s.position_at, '-infinity')
+                        THEN EXCLUDED.speed ELSE s.speed END,
+                    course = CASE WHEN EXCLUDED.position_at
+                            >= COALESCE(s.position_at, '-infinity')
+                        THEN EXCLUDED.course ELSE s.course END,
+                    type_counts_24h = aprs_station_summary_add_counts(
+                        s.type_counts_24h, EXCLUDED.type_counts_24h),
+                    updated_at = now()
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM upserted
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE PROCEDURE aprs_station_summary_reconcile(
+            job_id int DEFAULT NULL, config jsonb DEFAULT NULL
+        ) LANGUAGE sql AS $$
+            -- Stations and packets the ingest didn't fold in
+            INSERT INTO aprs_station_summary AS s (
+                from_call, first_seen, last_seen, packet_count
+            )
+            SELECT from_call, min(bucket), max(bucket), sum(packet_count)
+            FROM aprs_station_stats_hourly
+            GROUP BY from_call
+            ON CONFLICT (from_call) DO UPDATE SET
+                first_seen = LEAST(s.first_seen, EXCLUDED.first_seen),
+                packet_count = GREATEST(s.packet_count, EXCLUDED.packet_count),
+                updated_at = now()
+            WHERE s.packet_count < EXCLUDED.packet_count
+               OR s.first_seen > EXCLUDED.first_seen;
+
+            -- Latest packet of stations heard since the summary last saw
+            -- them, and of the rows inserted above
+            UPDATE aprs_station_summary s
+            SET last_seen = l.received_at,
+                last_packet_type = l.packet_type,
+                symbol = l.symbol,
+                symbol_table = l.symbol_table,
+                comment = l.comment,
+                updated_at = now()
+            FROM (
+                SELECT DISTINCT ON (from_call)
+                       from_call, received_at, packet_type, symbol,
+                       symbol_table, comment
+                FROM aprs_packet
+                WHERE received_at > NOW() - INTERVAL '24 hours'
+                ORDER BY from_call, received_at DESC
+            ) l
+            WHERE s.from_call = l.from_call
+              AND (l.received_at > s.last_seen OR s.last_packet_type IS NULL);
+
+            -- Latest position, including ones backfilled into aprs_packet
+            -- after the packet was ingested
+            UPDATE aprs_station_summary s
+            SET position_at = p.received_at,
+                latitude = p.latitude,
+                longitude = p.longitude,
+                altitude = p.altitude,
+                speed = p.speed,
+                course = p.course,
+                updated_at = now()
+            FROM (
+                SELECT DISTINCT ON (from_call)
+                       from_call, received_at, latitude, longitude, altitude,
+                       speed, course
+                FROM aprs_packet
+                WHERE received_at > NOW() - INTERVAL '24 hours'
+                  AND latitude IS NOT NULL
+                  AND longitude IS NOT NULL
+                ORDER BY from_call, received_at DESC
+            ) p
+            WHERE s.from_call = p.from_call
+              AND p.received_at > COALESCE(s.position_at, '-infinity');
+
+            -- Exact packet type counts for the last 24 hours
+            UPDATE aprs_station_summary s
+            SET type_counts_24h = r.type_counts
+            FROM (
+                SELECT from_call, jsonb_object_agg(packet_type, n) AS type_counts
+                FROM (
+                    SELECT from_call, COALESCE(packet_type, 'unknown') AS packet_type,
+                           count(*) AS n
+                    FROM aprs_packet
+                    WHERE received_at > NOW() - INTERVAL '24 hours'
+                    GROUP BY 1, 2
+                ) t
+                GROUP BY from_call
+            ) r
+            WHERE s.from_call = r.from_call
+              AND s.type_counts_24h IS DISTINCT FROM r.type_counts;
+
+            -- last_seen is current by now, so this only clears stations
+            -- that really went quiet
+            UPDATE aprs_station_summary
+            SET type_counts_24h = '{}'::jsonb
+            WHERE last_seen <= NOW() - INTERVAL '24 hours'
+              AND type_counts_24h <> '{}'::jsonb;
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE PROCEDURE aprs_station_summary_rebuild()
+        LANGUAGE sql AS $$
+            TRUNCATE aprs_station_summary;
+
+            INSERT INTO aprs_station_summary (
+                from_call, first_seen, last_seen, packet_count,
+                last_packet_type, symbol, symbol_table, comment,
+                position_at, latitude, longitude, altitude, speed, course
+            )
+            SELECT c.from_call, c.first_seen, l.received_at, c.packet_count,
+                   l.packet_type, l.symbol, l.symbol_table, l.comment,
+                   p.position_at, p.latitude, p.longitude, p.altitude,
+                   p.speed, p.course
+            FROM (
+                SELECT from_call, min(received_at) AS first_seen,
+                       count(*) AS packet_count
+                FROM aprs_packet GROUP BY from_call
+            ) c
+            JOIN (
+                SELECT DISTINCT ON (from_call)
+                       from_call, received_at, packet_type, symbol,
+                       symbol_table, comment
+                FROM aprs_packet ORDER BY from_call, received_at DESC
+            ) l USING (from_call)
+            LEFT JOIN (
+                SELECT DISTINCT ON (from_call)
+                       from_call, received_at AS position_at, latitude,
+                       longitude, altitude, speed, course
+                FROM aprs_packet
+                WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+                ORDER BY from_call, received_at DESC
+            ) p USING (from_call);
+
+            CALL aprs_station_summary_reconcile();
+        $$
+    """)
+
+    op.execute("""
+        SELECT add_job('aprs_station_summary_reconcile', '15 minutes')
+    """)
+
+
+def downgrade():
+    op.execute("""
+        SELECT delete_job(job_id) FROM timescaledb_information.jobs
+        WHERE proc_name = 'aprs_station_summary_reconcile'
+    """)
+    op.execute('DROP PROCEDURE IF EXISTS aprs_station_summary_rebuild()')
+    op.execute('DROP PROCEDURE IF EXISTS aprs_station_summary_reconcile(int, jsonb)')
+    op.execute(
+        'DROP FUNCTION IF EXISTS aprs_station_summary_apply('
+        'text[], timestamp[], text[], float8[], float8[], float8[], float8[], '
+        'int2[], text[], text[], text[])'
+    )
+    op.execute('DROP FUNCTION IF EXISTS aprs_station_summary_add_counts(jsonb, jsonb)')
+    op.drop_index(
+        'ix_aprs_station_summary_last_seen', table_name='aprs_station_summary'
+    )
+    op.drop_table('aprs_station_summary')
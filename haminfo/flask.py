@@ -23,14 +23,15 @@ from flask_httpauth import HTTPBasicAuth
 from oslo_config import cfg
 from oslo_log import log as logging
 
-from cachetools import cached, TTLCache
 from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 import sentry_sdk
 
 import haminfo
 from haminfo import utils, trace, cli_helper
+from haminfo.response_cache import ResponseCache, conditional_response
 from haminfo.db import db
+from haminfo.db import stats as db_stats
 from haminfo.db.db import WX_FIELD_MAPPING
 from haminfo.conf import log as log_conf
 
@@ -68,7 +69,9 @@ def create_openapi_spec() -> APISpec:
         operations={
             'get': {
                 'summary': 'Get weather station history',
-                'description': 'Returns hourly aggregated weather data for graphing.',
+                'description': (
+                    'Returns hourly or daily aggregated weather data for graphing.'
+                ),
                 'security': [{'ApiKeyAuth': []}],
                 'parameters': [
                     {
@@ -104,6 +107,16 @@ def create_openapi_spec() -> APISpec:
                         'schema': {'type': 'string'},
                         'description': 'Comma-separated field names',
                     },
+                    {
+                        'name': 'interval',
+                        'in': 'query',
+                        'schema': {
+                            'type': 'string',
+                            'enum': ['1h', '1d'],
+                            'default': '1h',
+                        },
+                        'description': 'Aggregation bucket width',
+                    },
                 ],
                 'responses': {
                     '200': {
@@ -313,12 +326,23 @@ web_opts = [
         help='List of trusted hostnames for the Host header validation. '
         'Example: haminfo_api:8081,localhost:8081. Leave unset to trust all hosts.',
     ),
+    cfg.BoolOpt(
+        'exact_stats',
+        default=False,
+        help='Compute /stats with exact counts over the aprs_packet table '
+        'instead of the approximate rollups. Exact counts get slower as '
+        'more packets are retained.',
+    ),
 ]
 
 CONF.register_opts(web_opts, group='web')
 
 API_KEY_HEADER = 'X-Api-Key'
-ttl_cache = TTLCache(maxsize=10, ttl=600)
+# Serialized, precompressed bodies for slow-changing endpoints.
+# wx stations are rebuilt every 10 minutes; the OpenAPI spec never changes
+# for the lifetime of the process.
+response_cache = ResponseCache(ttl=600)
+static_response_cache = ResponseCache(ttl=None)
 
 # Validation constants
 LAT_MIN, LAT_MAX = -90.0, 90.0
@@ -541,6 +565,7 @@ def validate_wx_fields(fields_str: Any) -> list[str]:
 
 
 MAX_DATE_RANGE_DAYS = 30
+VALID_WX_INTERVALS = ('1h', '1d')
 
 
 def validate_date_range(start: datetime, end: datetime) -> None:
@@ -567,6 +592,31 @@ def validate_date_range(start: datetime, end: datetime) -> None:
         )
 
 
+def validate_wx_interval(interval: str | None) -> str:
+    """Validate the history aggregation interval.
+
+    Args:
+        interval: Interval string from the request, or None.
+
+    Returns:
+        The interval, defaulting to '1h'.
+
+    Raises:
+        ValidationError: If the interval is not supported.
+    """
+    if not interval:
+        return '1h'
+
+    if interval not in VALID_WX_INTERVALS:
+        valid_list = ', '.join(VALID_WX_INTERVALS)
+        raise ValidationError(
+            f"Invalid interval: '{interval}'. Valid intervals: {valid_list}",
+            'interval',
+        )
+
+    return interval
+
+
 def _run_validation(fn, *args, **kwargs):
     """Run a validation function and return (result, error_response).
 
@@ -614,11 +664,7 @@ def _get_weather_station(session, station_id: str | None, callsign: str | None):
             .first()
         )
     else:
-        station = (
-            session.query(WeatherStation.id, WeatherStation.callsign)
-            .filter(WeatherStation.callsign == callsign.upper())
-            .first()
-        )
+        station = db.find_wx_station_row_by_callsign(session, callsign.upper())
 
     if not station:
         raise ValidationError('Weather station not found', 'station_id/callsign')
@@ -633,7 +679,8 @@ def aprs_packet_to_aprsfi_entry(packet: APRSPacket) -> dict[str, str]:
     convention.
 
     Args:
-        packet: APRSPacket ORM instance.
+        packet: APRSPacket ORM instance, or a cached row with the same
+            attributes (see db.find_latest_positions_by_callsigns).
 
     Returns:
         Dict matching the aprs.fi location entry JSON schema.
@@ -693,7 +740,7 @@ def aprs_packet_to_native_entry(packet: APRSPacket) -> dict[str, Any]:
     """Convert an APRSPacket model instance to haminfo native JSON dict.
 
     Args:
-        packet: APRSPacket ORM instance.
+        packet: APRSPacket ORM instance or cached row.
 
     Returns:
         Dict with typed values matching the haminfo native location
@@ -940,7 +987,9 @@ class HaminfoFlask(flask_classful.FlaskView):
         session = self._get_db_session()
         with session() as session:
             try:
-                aprs_stats = db.get_aprs_packet_stats(session)
+                aprs_stats = db_stats.get_packet_stats(
+                    session, exact=CONF.web.exact_stats
+                )
                 stats['aprs_packets'] = aprs_stats
             except Exception as ex:
                 LOG.error(f'Failed to get APRS packet stats: {ex}')
@@ -1000,7 +1049,9 @@ class HaminfoFlask(flask_classful.FlaskView):
         session = self._get_db_session()
         entries = []
         with session() as session:
-            results = db.find_latest_positions_by_callsigns(session, callsigns)
+            results = db.find_latest_positions_by_callsigns(
+                session, callsigns, as_rows=True
+            )
             for pkt in results:
                 entries.append(aprs_packet_to_aprsfi_entry(pkt))
 
@@ -1054,7 +1105,9 @@ class HaminfoFlask(flask_classful.FlaskView):
         session = self._get_db_session()
         entries = []
         with session() as session:
-            results = db.find_latest_positions_by_callsigns(session, callsigns)
+            results = db.find_latest_positions_by_callsigns(
+                session, callsigns, as_rows=True
+            )
             for pkt in results:
                 entries.append(aprs_packet_to_native_entry(pkt))
 
@@ -1165,21 +1218,27 @@ class HaminfoFlask(flask_classful.FlaskView):
         return jsonify(entries)
 
     @require_appkey
-    @cached(cache=ttl_cache)
     def wx_stations(self):
-        """Get all weather stations."""
-        LOG.debug(f'wx_stations:: cache info={ttl_cache.currsize}/{ttl_cache.maxsize}')
-        session = self._get_db_session()
-        entries = []
-        with session() as session:
-            query = db.find_wx_stations(session)
-            if query:
-                for r in query:
-                    if r:
-                        _dict = r.to_dict()
-                        entries.append(_dict)
+        """Get all weather stations.
 
-        return jsonify(entries)
+        The body is cached with an ETag, so pollers sending
+        ``If-None-Match`` get a 304 until the station list changes.
+        """
+
+        def _build():
+            session = self._get_db_session()
+            entries = []
+            with session() as session:
+                query = db.find_wx_stations(session)
+                if query:
+                    for r in query:
+                        if r:
+                            entries.append(r.to_dict())
+            return flask.current_app.json.dumps(entries)
+
+        cached = response_cache.get_or_build('wxstations', _build)
+        LOG.debug(f'wx_stations:: etag={cached.etag} {response_cache.stats}')
+        return conditional_response(cached)
 
     @require_appkey
     @trace.timeit
@@ -1249,14 +1308,17 @@ class HaminfoFlask(flask_classful.FlaskView):
 
     def openapi(self):
         """Return OpenAPI specification."""
-        spec = create_openapi_spec()
-        return jsonify(spec.to_dict())
+        cached = static_response_cache.get_or_build(
+            'openapi',
+            lambda: flask.current_app.json.dumps(create_openapi_spec().to_dict()),
+        )
+        return conditional_response(cached)
 
     @require_appkey
     def wx_history(self) -> Response | tuple[Response, int]:
         """Handle GET /api/v1/wx/history - weather station historical data.
 
-        Returns hourly aggregated weather data for graphing.
+        Returns hourly (default) or daily aggregated weather data for graphing.
 
         Returns:
             Flask JSON response with history data or error.
@@ -1296,6 +1358,13 @@ class HaminfoFlask(flask_classful.FlaskView):
         if error:
             return error
 
+        # Validate interval
+        interval, error = _run_validation(
+            validate_wx_interval, request.args.get('interval')
+        )
+        if error:
+            return error
+
         # Look up station and get history
         session_factory = self._get_db_session()
         with session_factory() as session:
@@ -1313,6 +1382,7 @@ class HaminfoFlask(flask_classful.FlaskView):
                 start=start,
                 end=end,
                 fields=fields,
+                interval=interval,
             )
 
             return jsonify(
@@ -1321,7 +1391,7 @@ class HaminfoFlask(flask_classful.FlaskView):
                     'callsign': station.callsign,
                     'start': start.strftime('%Y-%m-%dT%H:%M:%SZ'),
                     'end': end.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                    'interval': '1h',
+                    'interval': interval,
                     'fields': fields,
                     'history': history,
                     'count': len(history),
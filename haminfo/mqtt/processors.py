@@ -31,6 +31,36 @@ STATS_INTERVAL = 500
 # How often to flush thread-local stats to shared stats (every N packets)
 STATS_FLUSH_INTERVAL = 100
 
+# Columns of inserted rows folded into aprs_station_summary, in the
+# argument order of aprs_station_summary_apply()
+SUMMARY_COLUMNS = [
+    'from_call',
+    'received_at',
+    'packet_type',
+    'latitude',
+    'longitude',
+    'altitude',
+    'speed',
+    'course',
+    'symbol',
+    'symbol_table',
+    'comment',
+]
+
+# Folds the rows of an "inserted" CTE (INSERT ... RETURNING SUMMARY_COLUMNS)
+# into the summary in the same statement
+SUMMARY_APPLY_SQL = """
+    SELECT count(*), aprs_station_summary_apply(
+        array_agg(from_call::text), array_agg(received_at),
+        array_agg(packet_type::text), array_agg(latitude),
+        array_agg(longitude), array_agg(altitude::float8),
+        array_agg(speed::float8), array_agg(course::int2),
+        array_agg(symbol::text), array_agg(symbol_table::text),
+        array_agg(comment)
+    )
+    FROM inserted
+"""
+
 
 def _prepare_insert_dict(packet_json: dict) -> Optional[dict]:
     """Convert JSON packet data directly to a dict for database insert.
@@ -187,6 +217,7 @@ class APRSPacketProcessorThread(threads.MyThread):
         stats_lock: threading.Lock,
         thread_index: int = 0,
         stats_only: bool = False,
+        station_summary: bool = True,
     ):
         super().__init__('APRSPacketProcessorThread')
         self.packet_queue = packet_queue
@@ -196,6 +227,8 @@ class APRSPacketProcessorThread(threads.MyThread):
         self.packet_dicts: list[dict] = []  # Store dicts directly, not ORM objects
         self.thread_index = thread_index
         self.stats_only = stats_only
+        # Maintain aprs_station_summary along with each saved batch
+        self.station_summary = station_summary
         # Stagger batch save thresholds
         self.batch_save_threshold = BATCH_SIZE + (thread_index * self.BATCH_STAGGER)
 
@@ -431,7 +464,7 @@ class APRSPacketProcessorThread(threads.MyThread):
 
                 # INSERT from temp to real table with conflict handling
                 # Convert location TEXT to geography using ST_GeogFromText
-                cur.execute("""
+                insert_sql = """
                     INSERT INTO aprs_packet (
                         from_call, to_call, path, timestamp, received_at, raw,
                         packet_type, latitude, longitude, location, altitude,
@@ -445,8 +478,17 @@ class APRSPacketProcessorThread(threads.MyThread):
                            altitude, course, speed, symbol, symbol_table, comment
                     FROM aprs_packet_staging
                     ON CONFLICT (from_call, timestamp) DO NOTHING
-                """)
-                actual_inserted = cur.rowcount
+                """
+                if self.station_summary:
+                    # Only rows actually inserted (not duplicates) are counted
+                    cur.execute(
+                        f'WITH inserted AS ({insert_sql} '
+                        f'RETURNING {",".join(SUMMARY_COLUMNS)}) {SUMMARY_APPLY_SQL}'
+                    )
+                    actual_inserted = cur.fetchone()[0]
+                else:
+                    cur.execute(insert_sql)
+                    actual_inserted = cur.rowcount
 
             raw_conn.commit()
             return actual_inserted
@@ -476,10 +518,16 @@ class APRSPacketProcessorThread(threads.MyThread):
             stmt = stmt.on_conflict_do_nothing(
                 index_elements=['from_call', 'timestamp']
             )
-            result = session.execute(stmt)
-            session.commit()
+            if not self.station_summary:
+                result = session.execute(stmt)
+                session.commit()
+                return result.rowcount
 
-            return result.rowcount
+            stmt = stmt.returning(*(APRSPacket.__table__.c[c] for c in SUMMARY_COLUMNS))
+            rows = session.execute(stmt).all()
+            session.commit()
+            self._apply_station_summary(session, rows)
+            return len(rows)
 
         except Exception as ex:
             if session is not None:
@@ -491,6 +539,40 @@ class APRSPacketProcessorThread(threads.MyThread):
             if session is not None:
                 session.close()
 
+    def _apply_station_summary(self, session: Any, rows: list) -> None:
+        """Fold inserted rows into aprs_station_summary (best effort).
+
+        The packets are already committed; if this fails the summary
+        reconcile job catches up.
+        """
+        from sqlalchemy import text
+
+        if not rows:
+            return
+        try:
+            columns = list(zip(*rows, strict=True))
+            session.execute(
+                text(
+                    'SELECT aprs_station_summary_apply('
+                    'CAST(:from_call AS text[]), CAST(:received_at AS timestamp[]), '
+                    'CAST(:packet_type AS text[]), CAST(:latitude AS float8[]), '
+                    'CAST(:longitude AS float8[]), CAST(:altitude AS float8[]), '
+                    'CAST(:speed AS float8[]), CAST(:course AS int2[]), '
+                    'CAST(:symbol AS text[]), CAST(:symbol_table AS text[]), '
+                    'CAST(:comment AS text[]))'
+                ),
+                {
+                    name: list(values)
+                    for name, values in zip(SUMMARY_COLUMNS, columns, strict=True)
+                },
+            )
+            session.commit()
+        except Exception as ex:
+            session.rollback()
+            logger.warning(
+                f'[T{self.thread_index}] Failed to update station summary: {ex}'
+            )
+
     def _print_stats(self) -> None:
         """Print statistics about processed packets.
 
@@ -0,0 +1,216 @@
+"""Precompressed, ETag-validated responses for slow-changing endpoints.
+
+Endpoints such as ``/wxstations`` and ``/openapi.json`` return large bodies
+that rarely change, but are polled constantly by APRSD plugins.  Instead of
+re-serializing and re-sending the full body on every hit, a
+:class:`ResponseCache` keeps one :class:`CachedBody` per route holding:
+
+- the identity body and a strong ETag (content hash) computed once
+- gzip (and brotli, when the optional ``brotli`` package is installed)
+  encodings compressed once at build time
+
+When the builder is re-run after the TTL expires and produces the same
+bytes, the existing entry (and its compressed bodies) is kept, so a data
+version is hashed once and compressed once no matter how often it is
+rebuilt or served.  :func:`conditional_response` answers ``If-None-Match``
+with ``304 Not Modified`` and picks the best pre-encoded body for the
+client's ``Accept-Encoding``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from flask import Response, request
+from oslo_log import log as logging
+
+from haminfo import utils
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+LOG = logging.getLogger(utils.DOMAIN)
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+class CachedBody:
+    """One immutable version of a response body and its encodings."""
+
+    __slots__ = ('etag', 'mimetype', 'identity', 'encoded', 'built_at')
+
+    def __init__(self, body: bytes, mimetype: str) -> None:
+        """Hash and pre-compress a response body.
+
+        Args:
+            body: The uncompressed response body.
+            mimetype: Content type of the body.
+        """
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.mimetype = mimetype
+        self.identity = body
+        self.encoded: dict[str, bytes] = {}
+        self.built_at = time.monotonic()
+
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.encoded['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encoded['br'] = brotli.compress(body, quality=11)
+
+    def select_encoding(self, accept_encodings) -> tuple[Optional[str], bytes]:
+        """Pick the smallest pre-encoded body the client accepts.
+
+        Args:
+            accept_encodings: werkzeug ``MIMEAccept``-style object from
+                ``request.accept_encodings``.
+
+        Returns:
+            Tuple of (content_encoding or None, body bytes).
+        """
+        best: tuple[Optional[str], bytes] = (None, self.identity)
+        for encoding, body in self.encoded.items():
+            if accept_encodings[encoding] and len(body) < len(best[1]):
+                best = (encoding, body)
+        return best
+
+
+class ResponseCache:
+    """Per-process store of :class:`CachedBody` entries keyed by route.
+
+    Thread-safe; builders for different keys can run concurrently, while
+    callers for the same expired key rebuild it at most once at a time.
+    """
+
+    def __init__(self, ttl: Optional[float] = 600) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds before an entry's builder is re-run.  ``None``
+                keeps entries until :meth:`invalidate` is called.
+        """
+        self._ttl = ttl
+        self._entries: dict[str, CachedBody] = {}
+        self._checked_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def _is_fresh(self, key: str, now: float) -> bool:
+        if key not in self._entries:
+            return False
+        if self._ttl is None:
+            return True
+        return now - self._checked_at.get(key, 0) < self._ttl
+
+    def get_or_build(
+        self,
+        key: str,
+        builder: Callable[[], Union[str, bytes]],
+        mimetype: str = 'application/json',
+    ) -> CachedBody:
+        """Return the cached body for ``key``, rebuilding it when stale.
+
+        Args:
+            key: Cache key (usually the route plus any parameters).
+            builder: Callable returning the serialized response body.
+            mimetype: Content type of the body.
+
+        Returns:
+            The current :class:`CachedBody` for the key.
+        """
+        now = time.monotonic()
+        if self._is_fresh(key, now):
+            return self._entries[key]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have rebuilt it while we waited
+            now = time.monotonic()
+            if self._is_fresh(key, now):
+                return self._entries[key]
+
+            body = builder()
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+
+            current = self._entries.get(key)
+            if (
+                current is None
+                or current.identity != body
+                or current.mimetype != mimetype
+            ):
+                current = CachedBody(body, mimetype)
+                self._entries[key] = current
+                LOG.debug(
+                    f'ResponseCache: new version of {key} etag={current.etag} '
+                    f'size={len(body)} encodings={list(current.encoded)}'
+                )
+            self._checked_at[key] = now
+            return current
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Force the next request to rebuild one key, or every key.
+
+        Args:
+            key: Key to expire, or None to expire all entries.
+        """
+        with self._lock:
+            if key is None:
+                self._checked_at.clear()
+            else:
+                self._checked_at.pop(key, None)
+            if self._ttl is None:
+                if key is None:
+                    self._entries.clear()
+                else:
+                    self._entries.pop(key, None)
+
+    @property
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            'entries': len(self._entries),
+            'bytes': sum(len(e.identity) for e in self._entries.values()),
+            'compressed_bytes': sum(
+                len(b) for e in self._entries.values() for b in e.encoded.values()
+            ),
+        }
+
+
+def conditional_response(
+    cached: CachedBody, cache_control: str = 'no-cache'
+) -> Response:
+    """Build a Flask response for a cached body honoring the current request.
+
+    Returns ``304 Not Modified`` when the client's ``If-None-Match`` matches
+    the body's ETag, otherwise the pre-encoded body matching the client's
+    ``Accept-Encoding``.
+
+    Args:
+        cached: The body to serve.
+        cache_control: Value for the ``Cache-Control`` header.  The default
+            lets clients keep a copy but forces revalidation.
+
+    Returns:
+        Flask Response.
+    """
+    if request.if_none_match.contains(cached.etag):
+        response = Response(status=304)
+    else:
+        encoding, body = cached.select_encoding(request.accept_encodings)
+        response = Response(body, mimetype=cached.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(cached.etag)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response
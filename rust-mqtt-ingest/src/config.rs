@@ -44,6 +44,10 @@ pub struct DatabaseConfig {
     /// Minimum number of connections in pool
     #[serde(default = "default_min_connections")]
     pub min_connections: u32,
+    /// Maintain the aprs_station_summary table with each batch
+    /// (requires the haminfo migration that creates it)
+    #[serde(default)]
+    pub station_summary: bool,
 }
 
 /// Ingest behavior configuration
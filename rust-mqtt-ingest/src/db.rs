@@ -2,14 +2,63 @@
 
 use anyhow::Result;
 use sqlx::postgres::{PgPool, PgPoolOptions};
+use sqlx::Row;
 use tracing::{debug, info, instrument};
 
 use crate::config::DatabaseConfig;
 use crate::packet::AprsPacket;
 
+/// Bulk insert of a batch passed as parallel arrays.
+const INSERT_SQL: &str = r#"
+            INSERT INTO aprs_packet (
+                from_call, to_call, path, timestamp, received_at, raw, packet_type,
+                latitude, longitude, altitude, course, speed, symbol, symbol_table,
+                comment, location
+            )
+            SELECT
+                from_call, to_call, path, timestamp, received_at, raw, packet_type,
+                latitude, longitude, altitude, course, speed, symbol, symbol_table,
+                comment,
+                CASE WHEN location_wkt IS NOT NULL 
+                     THEN ST_GeogFromText(location_wkt) 
+                     ELSE NULL 
+                END
+            FROM UNNEST(
+                $1::text[], $2::text[], $3::text[], $4::timestamp[], $5::timestamp[],
+                $6::text[], $7::text[], $8::float8[], $9::float8[], $10::float8[],
+                $11::int2[], $12::float8[], $13::char[], $14::char[], $15::text[],
+                $16::text[]
+            ) AS t(
+                from_call, to_call, path, timestamp, received_at, raw, packet_type,
+                latitude, longitude, altitude, course, speed, symbol, symbol_table,
+                comment, location_wkt
+            )
+            ON CONFLICT (from_call, timestamp) DO NOTHING
+"#;
+
+/// Folds the rows actually inserted (not duplicates) into
+/// aprs_station_summary in the same statement. Must match the argument
+/// order of aprs_station_summary_apply() and the Python ingest.
+const SUMMARY_SQL: &str = r#"
+            RETURNING from_call, received_at, packet_type, latitude, longitude,
+                      altitude, speed, course, symbol, symbol_table, comment
+        )
+        SELECT count(*), aprs_station_summary_apply(
+            array_agg(from_call::text), array_agg(received_at),
+            array_agg(packet_type::text), array_agg(latitude),
+            array_agg(longitude), array_agg(altitude::float8),
+            array_agg(speed::float8), array_agg(course::int2),
+            array_agg(symbol::text), array_agg(symbol_table::text),
+            array_agg(comment)
+        )
+        FROM inserted
+"#;
+
 /// Database connection pool wrapper.
 pub struct Database {
     pool: PgPool,
+    /// Maintain aprs_station_summary with each batch
+    station_summary: bool,
 }
 
 impl Database {
@@ -25,13 +74,22 @@ impl Database {
             .await?;
 
         info!("Connected to PostgreSQL");
-        Ok(Self { pool })
+        if config.station_summary {
+            info!("Maintaining aprs_station_summary");
+        }
+        Ok(Self {
+            pool,
+            station_summary: config.station_summary,
+        })
     }
 
     /// Insert a batch of APRS packets using bulk insert.
     ///
     /// Uses ON CONFLICT DO NOTHING since (from_call, timestamp) is the primary key.
     /// This handles duplicate packets gracefully.
+    ///
+    /// With `station_summary` enabled the inserted rows are also folded into
+    /// aprs_station_summary by the same statement.
     #[instrument(skip(self, packets), fields(batch_size = packets.len()))]
     pub async fn insert_batch(&self, packets: &[AprsPacket]) -> Result<usize> {
         if packets.is_empty() {
@@ -78,54 +136,35 @@ impl Database {
 
         // Use a single INSERT with unnest for bulk efficiency
         // Convert WKT text to PostGIS geography using ST_GeogFromText
-        let result = sqlx::query(
-            r#"
-            INSERT INTO aprs_packet (
-                from_call, to_call, path, timestamp, received_at, raw, packet_type,
-                latitude, longitude, altitude, course, speed, symbol, symbol_table,
-                comment, location
-            )
-            SELECT
-                from_call, to_call, path, timestamp, received_at, raw, packet_type,
-                latitude, longitude, altitude, course, speed, symbol, symbol_table,
-                comment,
-                CASE WHEN location_wkt IS NOT NULL 
-                     THEN ST_GeogFromText(location_wkt) 
-                     ELSE NULL 
-                END
-            FROM UNNEST(
-                $1::text[], $2::text[], $3::text[], $4::timestamp[], $5::timestamp[],
-                $6::text[], $7::text[], $8::float8[], $9::float8[], $10::float8[],
-                $11::int2[], $12::float8[], $13::char[], $14::char[], $15::text[],
-                $16::text[]
-            ) AS t(
-                from_call, to_call, path, timestamp, received_at, raw, packet_type,
-                latitude, longitude, altitude, course, speed, symbol, symbol_table,
-                comment, location_wkt
-            )
-            ON CONFLICT (from_call, timestamp) DO NOTHING
-            "#,
-        )
-        .bind(&from_calls)
-        .bind(&to_calls)
-        .bind(&paths)
-        .bind(&timestamps)
-        .bind(&received_ats)
-        .bind(&raws)
-        .bind(&packet_types)
-        .bind(&latitudes)
-        .bind(&longitudes)
-        .bind(&altitudes)
-        .bind(&courses)
-        .bind(&speeds)
-        .bind(&symbols)
-        .bind(&symbol_tables)
-        .bind(&comments)
-        .bind(&locations)
-        .execute(&self.pool)
-        .await?;
-
-        let inserted = result.rows_affected() as usize;
+        let sql = if self.station_summary {
+            format!("WITH inserted AS ({INSERT_SQL}{SUMMARY_SQL}")
+        } else {
+            INSERT_SQL.to_string()
+        };
+        let query = sqlx::query(&sql)
+            .bind(&from_calls)
+            .bind(&to_calls)
+            .bind(&paths)
+            .bind(&timestamps)
+            .bind(&received_ats)
+            .bind(&raws)
+            .bind(&packet_types)
+            .bind(&latitudes)
+            .bind(&longitudes)
+            .bind(&altitudes)
+            .bind(&courses)
+            .bind(&speeds)
+            .bind(&symbols)
+            .bind(&symbol_tables)
+            .bind(&comments)
+            .bind(&locations);
+
+        let inserted = if self.station_summary {
+            let row = query.fetch_one(&self.pool).await?;
+            row.try_get::<i64, _>(0)? as usize
+        } else {
+            query.execute(&self.pool).await?.rows_affected() as usize
+        };
         debug!(
             "Inserted {} of {} packets (duplicates skipped)",
             inserted,
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Benchmark the dashboard map station queries across bboxes and windows.
+
+Times every way /api/dashboard/map/stations has fetched stations, for each
+bbox size and each of the map's 1/2/6/24 hour windows:
+
+- legacy-fast:    limit * 10 newest packets deduped in Python, plus the
+                  separate COUNT(DISTINCT from_call) (the pre-engine fast
+                  mode)
+- legacy-groupby: max(received_at) per callsign joined back to aprs_packet,
+                  plus the COUNT (the pre-engine get_map_stations)
+- latest:         query_latest_stations, rows and total in one scan
+- tiled-cold:     get_map_stations with the tile cache flushed first
+- tiled-warm:     get_map_stations with every tile cached
+- trails:         get_map_stations_with_trails (full mode)
+
+The tiled modes need --memcached; tiled-cold flushes it, so point it at a
+scratch instance. Without it every call is a cache miss and they are
+skipped. The "world" bbox runs without a bbox, like the initial map load.
+
+Usage:
+    python scripts/benchmark_map_stations.py -c haminfo.conf
+    python scripts/benchmark_map_stations.py -c haminfo.conf --memcached 127.0.0.1:11211
+    python scripts/benchmark_map_stations.py -c haminfo.conf --center 51.5,-0.1 \\
+        --hours 1,24 --modes latest,legacy-fast --iterations 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add the dashboard package to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'haminfo-dashboard' / 'src'))
+
+# Half-widths in degrees around --center
+BBOX_SIZES = {
+    'city': 0.25,
+    'metro': 1.0,
+    'state': 3.0,
+    'region': 10.0,
+    'world': None,
+}
+
+MODES = (
+    'legacy-fast',
+    'legacy-groupby',
+    'latest',
+    'tiled-cold',
+    'tiled-warm',
+    'trails',
+)
+
+
+def _bbox_filters(APRSPacket, bbox):
+    if not bbox:
+        return []
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return [
+        APRSPacket.longitude >= min_lon,
+        APRSPacket.longitude <= max_lon,
+        APRSPacket.latitude >= min_lat,
+        APRSPacket.latitude <= max_lat,
+    ]
+
+
+def legacy_count(session, bbox, hours):
+    """The COUNT(DISTINCT from_call) count_map_stations ran."""
+    from sqlalchemy import distinct, func
+
+    from haminfo.db.models.aprs_packet import APRSPacket
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return (
+        session.query(func.count(distinct(APRSPacket.from_call)))
+        .filter(
+            APRSPacket.received_at >= since,
+            APRSPacket.latitude.isnot(None),
+            APRSPacket.longitude.isnot(None),
+            *_bbox_filters(APRSPacket, bbox),
+        )
+        .scalar()
+        or 0
+    )
+
+
+def legacy_fast(session, bbox, hours, limit):
+    """The previous get_map_stations_fast plus count_map_stations."""
+    from haminfo.db.models.aprs_packet import APRSPacket
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    packets = (
+        session.query(APRSPacket)
+        .filter(
+            APRSPacket.received_at >= since,
+            APRSPacket.latitude.isnot(None),
+            APRSPacket.longitude.isnot(None),
+            *_bbox_filters(APRSPacket, bbox),
+        )
+        .order_by(APRSPacket.received_at.desc())
+        .limit(limit * 10)
+        .all()
+    )
+    seen = set()
+    for packet in packets:
+        seen.add(packet.from_call)
+        if len(seen) >= limit:
+            break
+    return len(seen), legacy_count(session, bbox, hours)
+
+
+def legacy_groupby(session, bbox, hours, limit):
+    """The previous get_map_stations GROUP BY join plus the COUNT."""
+    from sqlalchemy import func
+
+    from haminfo.db.models.aprs_packet import APRSPacket
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    latest = (
+        session.query(
+            APRSPacket.from_call,
+            func.max(APRSPacket.received_at).label('max_received'),
+        )
+        .filter(
+            APRSPacket.received_at >= since,
+            APRSPacket.latitude.isnot(None),
+            APRSPacket.longitude.isnot(None),
+        )
+        .group_by(APRSPacket.from_call)
+        .subquery()
+    )
+    rows = (
+        session.query(APRSPacket)
+        .join(
+            latest,
+            (APRSPacket.from_call == latest.c.from_call)
+            & (APRSPacket.received_at == latest.c.max_received),
+        )
+        .filter(*_bbox_filters(APRSPacket, bbox))
+        .limit(limit)
+        .all()
+    )
+    return len(rows), legacy_count(session, bbox, hours)
+
+
+def make_modes(session, limit):
+    """Map mode name -> fn(bbox, hours) returning (rows, total)."""
+    from haminfo_dashboard import cache
+    from haminfo_dashboard import queries
+
+    def rows_and_total(result):
+        stations, total = result
+        return len(stations), total
+
+    def tiled_cold(bbox, hours):
+        cache.flush_all()
+        return rows_and_total(
+            queries.get_map_stations(session, bbox=bbox, hours=hours, limit=limit)
+        )
+
+    def tiled_warm(bbox, hours):
+        return rows_and_total(
+            queries.get_map_stations(session, bbox=bbox, hours=hours, limit=limit)
+        )
+
+    return {
+        'legacy-fast': lambda bbox, hours: legacy_fast(session, bbox, hours, limit),
+        'legacy-groupby': lambda bbox, hours: legacy_groupby(
+            session, bbox, hours, limit
+        ),
+        'latest': lambda bbox, hours: rows_and_total(
+            queries.query_latest_stations(session, bbox=bbox, hours=hours, limit=limit)
+        ),
+        'tiled-cold': tiled_cold,
+        'tiled-warm': tiled_warm,
+        'trails': lambda bbox, hours: rows_and_total(
+            queries.get_map_stations_with_trails(
+                session, bbox=bbox, hours=hours, limit=limit
+            )
+        ),
+    }
+
+
+def time_calls(fn, args, iterations: int) -> tuple[list[float], tuple[int, int]]:
+    """Call fn(*args) repeatedly, returning latencies in ms and its result."""
+    timings = []
+    result = (0, 0)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+
+def report(bbox_name, hours, mode, timings, result) -> None:
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    rows, total = result
+    print(
+        f'{bbox_name:>6} {hours:>3}h {mode:>14}: '
+        f'median {statistics.median(timings):9.1f} ms  p95 {p95:9.1f} ms  '
+        f'rows {rows:>5}  total {total:>6}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark map station queries')
+    parser.add_argument(
+        '-c', '--config', required=True, help='Path to haminfo config file'
+    )
+    parser.add_argument(
+        '--center',
+        default='37.5,-77.5',
+        help='lat,lon the bboxes are centered on (default: 37.5,-77.5)',
+    )
+    parser.add_argument(
+        '--bboxes',
+        default=','.join(BBOX_SIZES),
+        help=f'Comma-separated bbox sizes (default: {",".join(BBOX_SIZES)})',
+    )
+    parser.add_argument(
+        '--hours', default='1,2,6,24', help='Comma-separated windows (default: all)'
+    )
+    parser.add_argument(
+        '--modes', default=','.join(MODES), help='Comma-separated modes to run'
+    )
+    parser.add_argument('--limit', type=int, default=2000, help='Stations per request')
+    parser.add_argument(
+        '--iterations', type=int, default=5, help='Timed calls per combination'
+    )
+    parser.add_argument('--memcached', help='memcached host:port for tiled modes')
+    args = parser.parse_args()
+
+    from haminfo.db.db import setup_session
+    from haminfo_dashboard import cache
+    from haminfo_dashboard.app import _load_haminfo_config
+
+    _load_haminfo_config(args.config)
+    cache.init_cache(args.memcached)
+    session = setup_session()()
+
+    lat, lon = (float(v) for v in args.center.split(','))
+    hours_list = [int(h) for h in args.hours.split(',')]
+    modes = make_modes(session, args.limit)
+    selected = [m.strip() for m in args.modes.split(',')]
+    for mode in selected:
+        if mode not in modes:
+            parser.error(f'Unknown mode {mode!r}; choose from {", ".join(MODES)}')
+    if not args.memcached:
+        selected = [m for m in selected if not m.startswith('tiled')]
+        print('No --memcached: skipping the tiled modes')
+
+    try:
+        for bbox_name in args.bboxes.split(','):
+            size = BBOX_SIZES[bbox_name]
+            bbox = None
+            if size is not None:
+                bbox = (lon - size, lat - size, lon + size, lat + size)
+            for hours in hours_list:
+                for mode in selected:
+                    if mode.startswith('tiled') and bbox is None:
+                        continue
+                    fn = modes[mode]
+                    fn(bbox, hours)  # warm up (fills the tile cache)
+                    timings, result = time_calls(fn, (bbox, hours), args.iterations)
+                    report(bbox_name, hours, mode, timings, result)
+                    session.rollback()
+            print()
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark the dashboard StationLocationCache at steady state.
+
+Fills the cache to max_size, then drives updates (and lookups) drawn from
+a callsign population larger than the cache, so most inserts evict.
+Reports throughput and the worst per-call pauses, which is what the
+gevent loop running broadcast_packet sees.
+
+--compare also runs the previous implementation, which sorted every key
+by updated_at to evict 1000 entries whenever the cache overflowed.
+
+Usage:
+    python scripts/benchmark_station_cache.py
+    python scripts/benchmark_station_cache.py --updates 1000000 --population 150000
+    python scripts/benchmark_station_cache.py --ttl 3600 --compare --updates 200000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the dashboard package to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'haminfo-dashboard' / 'src'))
+
+from haminfo_dashboard.station_cache import StationLocationCache
+
+
+class SortedEvictionCache:
+    """The pre-LRU cache: dict of entries, evict by sorting all keys."""
+
+    def __init__(self, max_size: int):
+        self._cache = {}
+        self._max_size = max_size
+
+    def get(self, callsign):
+        return self._cache.get(callsign.split('-')[0].upper())
+
+    def update(self, callsign, country_code, state_code=None):
+        base_call = callsign.split('-')[0].upper()
+        if len(self._cache) >= self._max_size and base_call not in self._cache:
+            sorted_calls = sorted(self._cache.keys(), key=lambda c: self._cache[c][2])
+            for call in sorted_calls[:1000]:
+                del self._cache[call]
+        self._cache[base_call] = (country_code, state_code, datetime.utcnow())
+
+
+def run(cache, callsigns: list[str], updates: int, read_ratio: float) -> None:
+    """Drive the cache and print throughput and pause percentiles."""
+    rng = random.Random(42)
+    timings = []
+    start = time.perf_counter()
+    for _ in range(updates):
+        call = rng.choice(callsigns)
+        t0 = time.perf_counter()
+        if rng.random() < read_ratio:
+            cache.get(call)
+        else:
+            cache.update(call, 'US', 'CA')
+        timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    us = 1_000_000
+
+    def pct(p: float) -> float:
+        return timings[min(len(timings) - 1, int(len(timings) * p))] * us
+
+    print(
+        f'  {updates / elapsed:12,.0f} ops/s   '
+        f'median {statistics.median(timings) * us:6.2f} us   '
+        f'p99.9 {pct(0.999):8.2f} us   max {timings[-1] * us:10.2f} us'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark StationLocationCache')
+    parser.add_argument('--max-size', type=int, default=100_000, help='Cache capacity')
+    parser.add_argument(
+        '--population',
+        type=int,
+        default=150_000,
+        help='Distinct callsigns driven through the cache',
+    )
+    parser.add_argument(
+        '--updates', type=int, default=1_000_000, help='Operations to time'
+    )
+    parser.add_argument(
+        '--read-ratio',
+        type=float,
+        default=0.0,
+        help='Fraction of operations that are lookups instead of updates',
+    )
+    parser.add_argument('--ttl', type=float, help='Entry TTL in seconds')
+    parser.add_argument(
+        '--compare',
+        action='store_true',
+        help='Also run the old sort-on-overflow implementation (slow)',
+    )
+    args = parser.parse_args()
+
+    callsigns = [f'N{i}CALL-{i % 16}' for i in range(args.population)]
+    caches = {'lru': StationLocationCache(max_size=args.max_size, ttl=args.ttl)}
+    if args.compare:
+        caches['sorted'] = SortedEvictionCache(max_size=args.max_size)
+
+    for name, cache in caches.items():
+        # Reach steady state before timing
+        for call in callsigns[: args.max_size]:
+            cache.update(call, 'US')
+        print(f'{name}: {args.updates:,} ops, {args.population:,} callsigns')
+        run(cache, callsigns, args.updates, args.read_ratio)
+
+
+if __name__ == '__main__':
+    main()
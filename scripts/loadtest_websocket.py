@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Load test the dashboard live feed with local Socket.IO clients.
+
+Two halves, run in separate terminals:
+
+``serve`` starts the dashboard's Socket.IO handlers on a bare Flask app
+and, instead of polling the database, feeds ``broadcast_packet`` with
+synthetic packets at ``--rate`` packets/s spread over a few countries.
+The broadcaster's stats are printed every few seconds.
+
+``clients`` connects ``--clients`` python-socketio clients (optionally
+joining a country room), counts the frames and packets they receive and
+reports throughput and end-to-end latency.
+
+Run the server with ``--interval 0`` to emit every packet as its own frame
+(the pre-coalescing behaviour) and compare.
+
+Usage:
+    python scripts/loadtest_websocket.py serve --rate 200
+    python scripts/loadtest_websocket.py clients --clients 200 --duration 30
+    python scripts/loadtest_websocket.py clients --clients 50 --country DE
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the dashboard package to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'haminfo-dashboard' / 'src'))
+
+COUNTRIES = ['US', 'DE', 'JP', 'GB', 'AU']
+
+
+def serve(args):
+    """Run the live feed with a synthetic packet source."""
+    from gevent import monkey
+
+    monkey.patch_all()
+
+    import gevent
+    from flask import Flask
+
+    from haminfo_dashboard import websocket
+    from haminfo_dashboard.broadcaster import PacketBroadcaster
+
+    app = Flask(__name__)
+    websocket.broadcaster = PacketBroadcaster(
+        websocket._emit_frame,
+        interval=args.interval,
+        max_per_window=args.room_cap,
+    )
+    socketio = websocket.init_socketio(app)
+
+    def generate():
+        rng = random.Random(42)
+        delay = 1.0 / args.rate
+        seq = 0
+        while True:
+            seq += 1
+            websocket.broadcast_packet(
+                {
+                    'from_call': f'N{rng.randrange(10000)}CALL',
+                    'to_call': 'APRS',
+                    'packet_type': 'status',
+                    'comment': 'load test ' + 'x' * args.payload,
+                    'country_code': rng.choice(COUNTRIES),
+                    'seq': seq,
+                    'sent_at': time.time(),
+                }
+            )
+            gevent.sleep(delay)
+
+    def report():
+        while True:
+            gevent.sleep(5)
+            print(websocket.broadcaster.stats, flush=True)
+
+    generator = []
+
+    def start_polling():
+        # Replaces the DB poller that client connects would start
+        websocket.broadcaster.start()
+        if not generator:
+            generator.append(gevent.spawn(generate))
+            gevent.spawn(report)
+
+    websocket.start_polling = start_polling
+
+    print(
+        f'Serving on {args.host}:{args.port}: {args.rate} packets/s, '
+        f'interval {args.interval}s, room cap {args.room_cap}',
+        flush=True,
+    )
+    socketio.run(app, host=args.host, port=args.port)
+
+
+def clients(args):
+    """Connect many clients and measure what they receive."""
+    import socketio
+
+    results = []
+    lock = threading.Lock()
+
+    def run_client():
+        sio = socketio.Client(reconnection=False)
+        frames = 0
+        packets = 0
+        latencies = []
+
+        @sio.on('packets')
+        def on_packets(batch):
+            nonlocal frames, packets
+            now = time.time()
+            frames += 1
+            packets += len(batch)
+            latencies.extend(now - p['sent_at'] for p in batch if 'sent_at' in p)
+
+        try:
+            sio.connect(args.url)
+        except Exception as e:
+            print(f'connect failed: {e}', file=sys.stderr)
+            return
+        if args.country:
+            sio.emit('join_country', {'country_code': args.country})
+        time.sleep(args.duration)
+        sio.disconnect()
+        with lock:
+            results.append((frames, packets, latencies))
+
+    threads = []
+    for _ in range(args.clients):
+        thread = threading.Thread(target=run_client, daemon=True)
+        thread.start()
+        threads.append(thread)
+        # Don't stampede the handshake
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(args.duration + 30)
+
+    if not results:
+        print('No clients completed')
+        return
+
+    frames = sum(r[0] for r in results)
+    packets = sum(r[1] for r in results)
+    latencies = sorted(latency for r in results for latency in r[2])
+    seconds = args.duration * len(results)
+    print(f'{len(results)} of {args.clients} clients for {args.duration}s')
+    print(f'  frames/client/s  {frames / seconds:10.2f}')
+    print(f'  packets/client/s {packets / seconds:10.2f}')
+    if frames:
+        print(f'  packets/frame    {packets / frames:10.2f}')
+    if latencies:
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f'  latency median {statistics.median(latencies) * 1000:.1f} ms, '
+            f'p99 {p99 * 1000:.1f} ms'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the live feed')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = sub.add_parser('serve', help='Run a synthetic live feed')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=5050)
+    serve_parser.add_argument(
+        '--rate', type=float, default=100, help='Packets per second'
+    )
+    serve_parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.25,
+        help='Broadcast window in seconds (0 = one frame per packet)',
+    )
+    serve_parser.add_argument(
+        '--room-cap', type=int, default=100, help='Packets per room per window'
+    )
+    serve_parser.add_argument(
+        '--payload', type=int, default=200, help='Extra comment bytes per packet'
+    )
+
+    clients_parser = sub.add_parser('clients', help='Connect Socket.IO clients')
+    clients_parser.add_argument('--url', default='http://127.0.0.1:5050')
+    clients_parser.add_argument('--clients', type=int, default=100)
+    clients_parser.add_argument('--duration', type=float, default=20)
+    clients_parser.add_argument('--country', help='Join this country room')
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args)
+    else:
+        clients(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Backfill positions the ingest didn't extract from raw packets.
+
+Scans recent aprs_packet rows with NULL latitude whose APRS data type
+carries a position (objects, items, compressed, Mic-E), decodes them with
+aprslib on a process pool and writes latitude/longitude/location back.
+Station pages then read the stored position instead of parsing raw
+packets on every view.
+
+Run it once after an upgrade with a long ``--hours`` window, then keep it
+running with ``--interval`` (for example under systemd) to pick up new
+packets.
+
+Usage:
+    python scripts/recover_positions.py -c haminfo.conf --hours 720
+    python scripts/recover_positions.py -c haminfo.conf --interval 60
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the dashboard package to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'haminfo-dashboard' / 'src'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recover missing packet positions')
+    parser.add_argument(
+        '-c', '--config', required=True, help='Path to haminfo config file'
+    )
+    parser.add_argument(
+        '--hours', type=int, default=24, help='How far back to scan (default: 24)'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0,
+        help='Rescan every N seconds (default: 0 = scan once and exit)',
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=1000, help='Rows per batch (default: 1000)'
+    )
+    parser.add_argument(
+        '--workers', type=int, help='Decoder processes (default: CPU count)'
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+
+    from haminfo.db.db import setup_session
+    from haminfo_dashboard.app import _load_haminfo_config
+    from haminfo_dashboard.position_recovery import PositionRecovery
+
+    _load_haminfo_config(args.config)
+    worker = PositionRecovery(
+        setup_session(),
+        hours=args.hours,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+
+    if args.interval > 0:
+        worker.run_forever(args.interval)
+        return
+
+    try:
+        result = worker.run_once()
+    finally:
+        worker.close()
+    print(f'Scanned {result["scanned"]} packets, recovered {result["recovered"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Maintain the dashboard's per-country and per-state rollup tables.
+
+Rewrites aprs_country_rollup and aprs_state_rollup (packets and unique
+stations in the last 24 hours, top stations, weather station counts)
+from aprs_station_stats_hourly. After the first run only the newest
+aggregate buckets are read again.
+
+Keep it running next to the dashboard (for example under systemd):
+
+Usage:
+    python scripts/refresh_rollups.py -c haminfo.conf --interval 60
+    python scripts/refresh_rollups.py -c haminfo.conf  # once
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add the dashboard package to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'haminfo-dashboard' / 'src'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh region rollup tables')
+    parser.add_argument(
+        '-c', '--config', required=True, help='Path to haminfo config file'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0,
+        help='Refresh every N seconds (default: 0 = refresh once and exit)',
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+
+    from haminfo.db.db import setup_session
+    from haminfo_dashboard.app import _load_haminfo_config
+    from haminfo_dashboard.rollups import RegionRollup
+
+    _load_haminfo_config(args.config)
+    worker = RegionRollup(setup_session())
+
+    if args.interval > 0:
+        worker.run_forever(args.interval)
+        return
+
+    result = worker.run_once()
+    print(f'Wrote {result["countries"]} countries, {result["states"]} states')
+
+
+if __name__ == '__main__':
+    main()
@@ -281,6 +281,8 @@ def app(engine):
                 )
             if '/openapi.json' not in rules:
                 flask_app.route('/openapi.json', methods=['GET'])(server.openapi)
+            if '/stats' not in rules:
+                flask_app.route('/stats', methods=['GET'])(server.stats)
 
             yield flask_app
 
@@ -0,0 +1,184 @@
+"""Tests for tag invalidation and row caching in the dogpile query cache."""
+
+from __future__ import annotations
+
+import pickle
+from datetime import datetime
+
+import pytest
+from dogpile.cache.region import make_region
+
+from haminfo.db import caching_query
+from haminfo.db import db as haminfo_db
+from haminfo.db.models.aprs_packet import APRSPacket
+from haminfo.db.models.request import Request, WXRequest
+
+
+@pytest.fixture
+def orm_cache(db_session):
+    """ORMCache on an in-memory region, listening on the test session."""
+    regions = {'default': make_region().configure('dogpile.cache.memory')}
+    cache = caching_query.ORMCache(regions)
+    cache.listen_on_session(db_session)
+    return cache
+
+
+def _add_request(db_session, callsign: str) -> None:
+    db_session.add(Request(callsign=callsign, latitude=1.0, longitude=2.0))
+    db_session.flush()
+
+
+def _add_wx_request(db_session, callsign: str) -> None:
+    db_session.add(WXRequest(callsign=callsign, latitude=1.0, longitude=2.0))
+    db_session.flush()
+
+
+def _cached(db_session, model):
+    return (
+        db_session.query(model)
+        .options(caching_query.FromCache('default', tags=[model.__tablename__]))
+        .order_by(model.id)
+        .all()
+    )
+
+
+class TestTagInvalidation:
+    """Tests for FromCache tags and ORMCache.invalidate_tags."""
+
+    def test_results_served_from_cache(self, db_session, orm_cache):
+        _add_request(db_session, 'N0CALL')
+        assert len(_cached(db_session, Request)) == 1
+
+        _add_request(db_session, 'K1ABC')
+        assert len(_cached(db_session, Request)) == 1
+
+    def test_invalidating_tag_expires_dependent_entries(self, db_session, orm_cache):
+        _add_request(db_session, 'N0CALL')
+        assert len(_cached(db_session, Request)) == 1
+
+        _add_request(db_session, 'K1ABC')
+        orm_cache.invalidate_tags(Request.__tablename__)
+        assert len(_cached(db_session, Request)) == 2
+
+    def test_unrelated_tags_keep_their_entries(self, db_session, orm_cache):
+        _add_request(db_session, 'N0CALL')
+        _add_wx_request(db_session, 'N0CALL')
+        assert len(_cached(db_session, Request)) == 1
+        assert len(_cached(db_session, WXRequest)) == 1
+
+        _add_request(db_session, 'K1ABC')
+        _add_wx_request(db_session, 'K1ABC')
+        orm_cache.invalidate_tags(Request.__tablename__)
+
+        assert len(_cached(db_session, Request)) == 2
+        # wx_request entries were not touched
+        assert len(_cached(db_session, WXRequest)) == 1
+
+    def test_lost_generation_does_not_revive_entries(self, db_session, orm_cache):
+        region = orm_cache.cache_regions['default']
+        key = caching_query.TAG_GENERATION_PREFIX + Request.__tablename__
+        _add_request(db_session, 'N0CALL')
+        assert len(_cached(db_session, Request)) == 1
+
+        # Simulate the backend evicting the generation counter
+        region.delete(key)
+        _add_request(db_session, 'K1ABC')
+        assert len(_cached(db_session, Request)) == 2
+
+
+class TestInvalidateRequestsCache:
+    """db.invalidate_*requests_cache only expire their own table's tag."""
+
+    def test_invalidate_requests_cache(self, db_session, orm_cache, monkeypatch):
+        monkeypatch.setattr(haminfo_db, 'cache', orm_cache)
+        _add_request(db_session, 'N0CALL')
+        _add_wx_request(db_session, 'N0CALL')
+        assert len(haminfo_db.find_requests(db_session).all()) == 1
+        assert len(haminfo_db.find_wxrequests(db_session).all()) == 1
+
+        _add_request(db_session, 'K1ABC')
+        _add_wx_request(db_session, 'K1ABC')
+        haminfo_db.invalidate_requests_cache(db_session)
+
+        assert len(haminfo_db.find_requests(db_session).all()) == 2
+        assert len(haminfo_db.find_wxrequests(db_session).all()) == 1
+
+        haminfo_db.invalidate_wxrequests_cache(db_session)
+        assert len(haminfo_db.find_wxrequests(db_session).all()) == 2
+
+
+class TestRowCache:
+    """Tests for ORMCache.get_rows lightweight row caching."""
+
+    def _statement(self, db_session):
+        return (
+            db_session.query(Request.id, Request.callsign)
+            .order_by(Request.id)
+            .statement
+        )
+
+    def test_returns_named_rows(self, db_session, orm_cache):
+        _add_request(db_session, 'N0CALL')
+        rows = orm_cache.get_rows(db_session, self._statement(db_session))
+        assert len(rows) == 1
+        assert rows[0].callsign == 'N0CALL'
+        assert rows[0] == (rows[0].id, 'N0CALL')
+
+    def test_rows_served_from_cache_until_tag_invalidated(self, db_session, orm_cache):
+        def count():
+            statement = self._statement(db_session)
+            return len(orm_cache.get_rows(db_session, statement, tags=['request']))
+
+        _add_request(db_session, 'N0CALL')
+        assert count() == 1
+
+        _add_request(db_session, 'K1ABC')
+        assert count() == 1
+
+        orm_cache.invalidate_tags(Request.__tablename__)
+        assert count() == 2
+
+    def test_cached_value_is_plain_tuples(self, db_session, orm_cache):
+        _add_request(db_session, 'N0CALL')
+        orm_cache.get_rows(db_session, self._statement(db_session))
+
+        backend = orm_cache.cache_regions['default'].backend
+        payloads = [
+            value.payload
+            for value in backend._cache.values()
+            if isinstance(value.payload, bytes)
+        ]
+        fields, rows = pickle.loads(payloads[0])
+        assert fields == ('id', 'callsign')
+        assert rows == [(rows[0][0], 'N0CALL')]
+
+
+class TestLatestPositionRows:
+    """find_latest_positions_by_callsigns(as_rows=True) via the row cache."""
+
+    def test_returns_rows_with_packet_attributes(
+        self, db_session, orm_cache, monkeypatch
+    ):
+        monkeypatch.setattr(haminfo_db, 'cache', orm_cache)
+        now = datetime.utcnow()
+        db_session.add(
+            APRSPacket(
+                from_call='N0CALL',
+                to_call='APRS',
+                raw='N0CALL>APRS:!pos',
+                packet_type='position',
+                latitude=34.5,
+                longitude=-120.5,
+                timestamp=now,
+                received_at=now,
+            )
+        )
+        db_session.flush()
+
+        rows = haminfo_db.find_latest_positions_by_callsigns(
+            db_session, ['n0call'], as_rows=True
+        )
+        assert len(rows) == 1
+        assert rows[0].from_call == 'N0CALL'
+        assert rows[0].latitude == 34.5
+        assert not hasattr(rows[0], 'location')
@@ -2,6 +2,8 @@
 
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 
 class TestBuildRepeaterBookHeaders:
     """Test header construction for RepeaterBook API."""
@@ -101,3 +103,290 @@ class TestRepeaterBookAuth:
         # Verify timeout was passed
         call_args = mock_get.call_args
         assert call_args.kwargs.get('timeout') == 30
+
+
+def _repeater(sample, rptr_id, **overrides):
+    repeater = dict(sample)
+    repeater['Rptr ID'] = str(rptr_id)
+    repeater.update(overrides)
+    return repeater
+
+
+class TestStationRows:
+    """Test conversion of RepeaterBook results into upsert batches."""
+
+    def test_rows_carry_natural_key(self, sample_repeater_json):
+        from datetime import date
+
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        batches, skipped = rb_module._station_rows([sample_repeater_json])
+        (rows,) = batches.values()
+        assert skipped == set()
+        assert rows[0]['state_id'] == '51'
+        assert rows[0]['repeater_id'] == 12345
+        assert rows[0]['last_update'] == date(2024, 1, 15)
+
+    def test_rows_without_frequency_are_skipped(self, sample_repeater_json):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        repeater = _repeater(sample_repeater_json, 1)
+        del repeater['Frequency']
+        assert rb_module._station_rows([repeater]) == ({}, {('51', 1)})
+
+    def test_unparsable_rows_are_skipped(self, sample_repeater_json):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        good = _repeater(sample_repeater_json, 1)
+        bad = _repeater(sample_repeater_json, 2, **{'Input Freq': 'n/a'})
+        batches, skipped = rb_module._station_rows([good, bad])
+        (rows,) = batches.values()
+        assert [r['repeater_id'] for r in rows] == [1]
+        assert skipped == {('51', 2)}
+
+    def test_missing_optional_fields_are_not_updated(self, sample_repeater_json):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        full = _repeater(sample_repeater_json, 1)
+        partial = _repeater(sample_repeater_json, 2)
+        del partial['ARES']
+        batches, _ = rb_module._station_rows([full, partial])
+        assert len(batches) == 2
+        for update_columns, rows in batches.items():
+            if rows[0]['repeater_id'] == 2:
+                assert 'ares' not in update_columns
+                # New rows still get the default
+                assert rows[0]['ares'] is False
+
+
+class TestSyncRegions:
+    """Test concurrent download and per-region apply."""
+
+    @patch('haminfo.cmds.fetch_repeaterbook.db.invalidate_stations_cache')
+    @patch('haminfo.cmds.fetch_repeaterbook.download_repeaters')
+    def test_counts_every_region(
+        self, mock_download, mock_invalidate, sample_repeater_json
+    ):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        payloads = {
+            'a': [
+                _repeater(sample_repeater_json, 1),
+                _repeater(sample_repeater_json, 2),
+            ],
+            'b': [_repeater(sample_repeater_json, 3)],
+            'c': None,
+        }
+        mock_download.side_effect = payloads.get
+
+        count = rb_module.sync_regions(None, ['a', 'b', 'c'], fetch_only=True)
+        assert count == 3
+        mock_invalidate.assert_not_called()
+
+    @patch('haminfo.cmds.fetch_repeaterbook.download_repeaters')
+    def test_failed_download_does_not_stop_sync(
+        self, mock_download, sample_repeater_json
+    ):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        def download(url):
+            if url == 'bad':
+                raise RuntimeError('boom')
+            return [_repeater(sample_repeater_json, 1)]
+
+        mock_download.side_effect = download
+        assert rb_module.sync_regions(None, ['bad', 'good'], fetch_only=True) == 1
+
+    def test_all_region_urls(self):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        urls = rb_module.all_region_urls()
+        assert len(urls) == len(set(urls))
+        assert (
+            f'{rb_module.NA_EXPORT_URL}?country=United%20States&state=Virginia' in urls
+        )
+        assert f'{rb_module.ROW_EXPORT_URL}?country=Germany' in urls
+
+
+class TestUpsertStations:
+    """Test the set-based station upsert against SQLite."""
+
+    @pytest.fixture
+    def db_session(self, db_session):
+        """Start from an empty station table.
+
+        The DELETE also makes pysqlite open its transaction, so the upsert
+        SAVEPOINTs nest inside the per-test transaction and roll back.
+        """
+        from sqlalchemy import delete
+
+        from haminfo.db.models.station import Station
+
+        db_session.execute(delete(Station))
+        return db_session
+
+    def _rows(self, sample, *rptr_ids):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+
+        repeaters = [_repeater(sample, rptr_id) for rptr_id in rptr_ids]
+        ((update_columns, rows),) = rb_module._station_rows(repeaters)[0].items()
+        # SQLite has no sequence for the composite primary key
+        for row in rows:
+            row['id'] = row['repeater_id']
+        return rows, list(update_columns)
+
+    def _stations(self, db_session):
+        from sqlalchemy import select
+
+        from haminfo.db.models.station import Station
+
+        return db_session.execute(
+            select(Station.repeater_id, Station.callsign, Station.ares).order_by(
+                Station.repeater_id
+            )
+        ).all()
+
+    def test_inserts_then_updates_in_place(self, db_session, sample_repeater_json):
+        from haminfo.db import db
+
+        rows, update_columns = self._rows(sample_repeater_json, 1, 2)
+        assert db.upsert_stations(db_session, rows, update_columns) == 2
+
+        rows, update_columns = self._rows(sample_repeater_json, 2, 3)
+        rows[0]['callsign'] = 'K6NEW'
+        rows[0]['content_hash'] = 'changed'
+        assert db.upsert_stations(db_session, rows, update_columns) == 2
+
+        assert self._stations(db_session) == [
+            (1, 'W6ABC', True),
+            (2, 'K6NEW', True),
+            (3, 'W6ABC', True),
+        ]
+
+    def test_omitted_update_columns_keep_db_values(
+        self, db_session, sample_repeater_json
+    ):
+        from haminfo.db import db
+
+        rows, update_columns = self._rows(sample_repeater_json, 1)
+        db.upsert_stations(db_session, rows, update_columns)
+
+        rows, update_columns = self._rows(sample_repeater_json, 1)
+        rows[0]['ares'] = False
+        update_columns.remove('ares')
+        db.upsert_stations(db_session, rows, update_columns)
+
+        assert self._stations(db_session) == [(1, 'W6ABC', True)]
+
+    def test_bad_rows_are_isolated(self, db_session, sample_repeater_json):
+        from haminfo.db import db
+
+        rows, update_columns = self._rows(sample_repeater_json, 1, 2, 3, 4)
+        # Violates the NOT NULL primary key
+        rows[2]['state_id'] = None
+
+        assert db.upsert_stations(db_session, rows, update_columns) == 3
+        assert [r.repeater_id for r in self._stations(db_session)] == [1, 2, 4]
+
+
+class TestSyncRegionStations:
+    """Test content-hash delta sync and the change journal."""
+
+    @pytest.fixture
+    def db_session(self, db_session):
+        """Start from empty station tables (see TestUpsertStations)."""
+        from sqlalchemy import delete
+
+        from haminfo.db.models.station import Station
+        from haminfo.db.models.station_change import StationChange
+
+        db_session.execute(delete(Station))
+        db_session.execute(delete(StationChange))
+        return db_session
+
+    def _sync(self, db_session, repeaters):
+        import haminfo.cmds.fetch_repeaterbook as rb_module
+        from haminfo.db import db
+
+        batches, skipped = rb_module._station_rows(repeaters)
+        # SQLite has no sequence for the composite primary key
+        for rows in batches.values():
+            for row in rows:
+                row['id'] = row['repeater_id']
+        return db.sync_region_stations(db_session, batches, skipped)
+
+    def _journal(self, db_session, after_id=0):
+        from haminfo.db import db
+
+        return [
+            (change.change_type, change.repeater_id)
+            for change in db.find_station_changes(db_session, after_id)
+        ]
+
+    def test_first_sync_adds_everything(self, db_session, sample_repeater_json):
+        repeaters = [_repeater(sample_repeater_json, i) for i in (1, 2)]
+        counts = self._sync(db_session, repeaters)
+        assert counts == {'added': 2, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        assert self._journal(db_session) == [('added', 1), ('added', 2)]
+
+    def test_unchanged_rows_are_not_rewritten(self, db_session, sample_repeater_json):
+        from haminfo.db.models.station import Station
+
+        repeaters = [_repeater(sample_repeater_json, i) for i in (1, 2)]
+        self._sync(db_session, repeaters)
+        db_session.query(Station).update({Station.updated_at: None})
+
+        counts = self._sync(db_session, repeaters)
+        assert counts == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 2}
+        assert (
+            db_session.query(Station).filter(Station.updated_at.isnot(None)).count()
+            == 0
+        )
+
+    def test_delta_of_changed_and_vanished_rows(self, db_session, sample_repeater_json):
+        from haminfo.db import db
+
+        self._sync(db_session, [_repeater(sample_repeater_json, i) for i in (1, 2, 3)])
+        last_id = db.find_station_changes(db_session)[-1].id
+
+        counts = self._sync(
+            db_session,
+            [
+                _repeater(sample_repeater_json, 1),
+                _repeater(sample_repeater_json, 2, Callsign='K6NEW'),
+                _repeater(sample_repeater_json, 4),
+            ],
+        )
+        assert counts == {'added': 1, 'updated': 1, 'removed': 1, 'unchanged': 1}
+        assert sorted(self._journal(db_session, last_id)) == [
+            ('added', 4),
+            ('removed', 3),
+            ('updated', 2),
+        ]
+
+    def test_unparsable_rows_are_not_removed(self, db_session, sample_repeater_json):
+        from haminfo.db.models.station import Station
+
+        self._sync(db_session, [_repeater(sample_repeater_json, i) for i in (1, 2, 3)])
+        no_frequency = _repeater(sample_repeater_json, 3)
+        del no_frequency['Frequency']
+        counts = self._sync(
+            db_session,
+            [
+                _repeater(sample_repeater_json, 1),
+                _repeater(sample_repeater_json, 2, **{'Last Update': '01/15/2024'}),
+                no_frequency,
+            ],
+        )
+        assert counts == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 1}
+        assert db_session.query(Station).count() == 3
+
+    def test_other_regions_are_left_alone(self, db_session, sample_repeater_json):
+        from haminfo.db.models.station import Station
+
+        self._sync(db_session, [_repeater(sample_repeater_json, 1)])
+        counts = self._sync(
+            db_session, [_repeater(sample_repeater_json, 2, **{'State ID': '06'})]
+        )
+        assert counts['removed'] == 0
+        assert db_session.query(Station).count() == 2
@@ -35,3 +35,8 @@ def test_processor_count_below_minimum_raises(config):
     """processor_count below 1 should raise."""
     with pytest.raises((ValueError, cfg.ConfigFileValueError)):
         config.set_override('processor_count', 0, group='mqtt')
+
+
+def test_station_summary_default(config):
+    """station_summary should be enabled by default."""
+    assert config.mqtt.station_summary is True
@@ -0,0 +1,161 @@
+"""Tests for approximate/exact packet statistics."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from haminfo.db import stats as db_stats
+from haminfo.db.models.aprs_packet import APRSPacket
+from haminfo.db.stats import HyperLogLog, PacketStats
+
+
+def _make_packet(db_session, from_call: str, packet_type: str = 'position'):
+    """Helper to create and persist an APRSPacket for testing."""
+    now = datetime.utcnow()
+    db_session.add(
+        APRSPacket(
+            from_call=from_call,
+            to_call='APRS',
+            raw=f'{from_call}>APRS:!pos',
+            packet_type=packet_type,
+            timestamp=now,
+            received_at=now,
+        )
+    )
+    db_session.flush()
+
+
+class TestHyperLogLog:
+    """Tests for the HyperLogLog estimator."""
+
+    def test_empty_sketch_counts_zero(self):
+        assert HyperLogLog().count() == 0
+
+    def test_small_counts_are_near_exact(self):
+        hll = HyperLogLog()
+        hll.update(f'N{i}CALL' for i in range(100))
+        assert abs(hll.count() - 100) <= 2
+
+    def test_large_count_within_error(self):
+        hll = HyperLogLog()
+        hll.update(f'K{i}ABC' for i in range(50000))
+        assert abs(hll.count() - 50000) / 50000 < 0.05
+
+    def test_duplicates_do_not_change_estimate(self):
+        hll = HyperLogLog()
+        hll.update(f'W{i}XYZ' for i in range(1000))
+        before = hll.count()
+        hll.update(f'W{i}XYZ' for i in range(1000))
+        assert hll.count() == before
+
+    def test_merge_is_union(self):
+        a = HyperLogLog()
+        b = HyperLogLog()
+        a.update(f'A{i}' for i in range(3000))
+        b.update(f'A{i}' for i in range(2000, 5000))
+        a.merge(b)
+        assert abs(a.count() - 5000) / 5000 < 0.05
+
+    def test_merge_rejects_other_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestPacketStatsExact:
+    """SQLite sessions always use the exact path."""
+
+    def test_falls_back_to_exact_on_sqlite(self, db_session):
+        _make_packet(db_session, 'POS1', packet_type='position')
+        _make_packet(db_session, 'WX1', packet_type='weather')
+
+        stats = PacketStats().get(db_session)
+        assert stats['approximate'] is False
+        assert stats['total'] == 2
+        assert stats['unique_callsigns'] == 2
+
+    def test_results_cached_until_invalidated(self, db_session):
+        packet_stats = PacketStats(ttl=600)
+        _make_packet(db_session, 'POS1')
+        assert packet_stats.get(db_session)['total'] == 1
+
+        _make_packet(db_session, 'POS2')
+        assert packet_stats.get(db_session)['total'] == 1
+
+        packet_stats.invalidate()
+        assert packet_stats.get(db_session)['total'] == 2
+
+
+def _result(scalar=None, rows=None):
+    result = MagicMock()
+    result.scalar.return_value = scalar
+    result.all.return_value = rows or []
+    result.__iter__.return_value = iter(rows or [])
+    return result
+
+
+class TestPacketStatsApproximate:
+    """Approximate stats read rollups instead of aprs_packet."""
+
+    def _session(self, day_rows):
+        session = MagicMock()
+        session.bind.dialect.name = 'postgresql'
+        session.execute.side_effect = [
+            _result(scalar=1000),
+            _result(rows=[('position', 600), ('weather', 300), ('status', 100)]),
+            _result(scalar=250),
+            _result(scalar=datetime(2026, 10, 1)),
+            _result(rows=day_rows),
+        ]
+        return session
+
+    def test_answers_from_rollups(self):
+        day_rows = [
+            (datetime(2026, 10, 1), 'N0CALL'),
+            (datetime(2026, 10, 1), 'K1ABC'),
+            (datetime(2026, 10, 2), 'N0CALL'),
+        ]
+        session = self._session(day_rows)
+        stats = PacketStats().get(session)
+
+        assert stats['approximate'] is True
+        assert stats['total'] == 1000
+        assert stats['position'] == 600
+        assert stats['weather'] == 300
+        assert stats['message'] == 0
+        assert stats['other'] == 100
+        assert stats['last_24h'] == 250
+        assert stats['unique_callsigns'] == 2
+
+        sql = ' '.join(str(call.args[0]) for call in session.execute.call_args_list)
+        assert 'approximate_row_count' in sql
+        assert 'FROM aprs_packet\n' not in sql
+
+    def test_only_rereads_newest_day(self):
+        packet_stats = PacketStats(ttl=0)
+        packet_stats.get(
+            self._session(
+                [
+                    (datetime(2026, 10, 1), 'N0CALL'),
+                    (datetime(2026, 10, 2), 'K1ABC'),
+                ]
+            )
+        )
+
+        session = self._session([(datetime(2026, 10, 2), 'W2XYZ')])
+        stats = packet_stats.get(session)
+        since = session.execute.call_args_list[-1].args[1]['since']
+        assert since == datetime(2026, 10, 2)
+        assert stats['unique_callsigns'] == 3
+
+
+class TestStatsEndpoint:
+    """Tests for GET /stats."""
+
+    def test_stats_reports_mode(self, client):
+        db_stats.packet_stats.invalidate()
+        response = client.get('/stats')
+        assert response.status_code == 200
+        assert 'approximate' in response.json['aprs_packets']
@@ -0,0 +1,115 @@
+"""Tests for ETag/precompressed response caching."""
+
+from __future__ import annotations
+
+import gzip
+
+import flask
+
+from haminfo.response_cache import (
+    CachedBody,
+    ResponseCache,
+    conditional_response,
+)
+
+
+BODY = '[' + ','.join(f'{{"id": {i}, "callsign": "WX{i}"}}' for i in range(200)) + ']'
+
+
+class TestResponseCache:
+    """Tests for ResponseCache.get_or_build."""
+
+    def test_builds_once_within_ttl(self):
+        cache = ResponseCache(ttl=600)
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return BODY
+
+        first = cache.get_or_build('k', builder)
+        second = cache.get_or_build('k', builder)
+        assert first is second
+        assert len(calls) == 1
+
+    def test_unchanged_rebuild_keeps_entry(self):
+        cache = ResponseCache(ttl=0)
+        first = cache.get_or_build('k', lambda: BODY)
+        second = cache.get_or_build('k', lambda: BODY)
+        # Same bytes -> same entry, compressed bodies are not rebuilt
+        assert first is second
+
+    def test_changed_rebuild_changes_etag(self):
+        cache = ResponseCache(ttl=0)
+        first = cache.get_or_build('k', lambda: BODY)
+        second = cache.get_or_build('k', lambda: BODY + ' ')
+        assert first.etag != second.etag
+
+    def test_invalidate_static_entry(self):
+        cache = ResponseCache(ttl=None)
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return BODY
+
+        cache.get_or_build('k', builder)
+        cache.invalidate('k')
+        cache.get_or_build('k', builder)
+        assert len(calls) == 2
+
+    def test_small_bodies_not_compressed(self):
+        assert CachedBody(b'[]', 'application/json').encoded == {}
+
+    def test_gzip_body_roundtrips(self):
+        body = CachedBody(BODY.encode(), 'application/json')
+        assert gzip.decompress(body.encoded['gzip']) == BODY.encode()
+
+
+class TestConditionalResponse:
+    """Tests for conditional_response."""
+
+    def setup_method(self):
+        self.app = flask.Flask(__name__)
+        self.cached = CachedBody(BODY.encode(), 'application/json')
+
+    def test_returns_etag_and_identity(self):
+        with self.app.test_request_context('/'):
+            response = conditional_response(self.cached)
+        assert response.status_code == 200
+        assert response.get_etag()[0] == self.cached.etag
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_data() == BODY.encode()
+
+    def test_if_none_match_returns_304(self):
+        headers = {'If-None-Match': f'"{self.cached.etag}"'}
+        with self.app.test_request_context('/', headers=headers):
+            response = conditional_response(self.cached)
+        assert response.status_code == 304
+        assert response.get_data() == b''
+
+    def test_stale_etag_returns_body(self):
+        headers = {'If-None-Match': '"not-the-etag"'}
+        with self.app.test_request_context('/', headers=headers):
+            response = conditional_response(self.cached)
+        assert response.status_code == 200
+
+    def test_serves_precompressed_gzip(self):
+        headers = {'Accept-Encoding': 'gzip'}
+        with self.app.test_request_context('/', headers=headers):
+            response = conditional_response(self.cached)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == BODY.encode()
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+
+class TestOpenAPIConditionalGet:
+    """The OpenAPI spec is served with an ETag."""
+
+    def test_openapi_revalidates(self, client):
+        response = client.get('/openapi.json')
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        response = client.get('/openapi.json', headers={'If-None-Match': etag})
+        assert response.status_code == 304
@@ -0,0 +1,115 @@
+"""Tests for offline RepeaterBook snapshots."""
+
+from __future__ import annotations
+
+import csv
+
+import pytest
+from sqlalchemy import delete, select
+
+from haminfo.db import snapshot
+from haminfo.db.models.station import Station
+
+
+@pytest.fixture
+def db_session(db_session):
+    """Start from an empty station table.
+
+    The DELETE also makes pysqlite open its transaction, so upsert
+    SAVEPOINTs nest inside the per-test transaction and roll back.
+    """
+    db_session.execute(delete(Station))
+    return db_session
+
+
+def _snapshot_rows(sample_repeater_json, *rptr_ids):
+    """Station rows shaped like snapshot.read_stations() output."""
+    import haminfo.cmds.fetch_repeaterbook as rb_module
+
+    repeaters = []
+    for rptr_id in rptr_ids:
+        repeater = dict(sample_repeater_json)
+        repeater['Rptr ID'] = str(rptr_id)
+        repeaters.append(repeater)
+    (rows,) = rb_module._station_rows(repeaters)[0].values()
+    for row in rows:
+        row['id'] = row['repeater_id']
+        del row['location']
+    return rows
+
+
+def _callsigns(db_session):
+    return db_session.execute(
+        select(Station.repeater_id, Station.callsign).order_by(Station.repeater_id)
+    ).all()
+
+
+class TestStationsCsv:
+    """Tests for the COPY stream."""
+
+    def test_null_and_empty_string_are_distinct(self):
+        rows = [{'id': 1, 'landmark': '', 'county': None}]
+        buffer = snapshot.stations_csv(rows, ['id', 'landmark', 'county'])
+        assert buffer.getvalue() == '1,,\\N\n'
+
+    def test_values_with_separators_are_quoted(self):
+        rows = [{'id': 1, 'landmark': 'Twin Peaks, "North"'}]
+        buffer = snapshot.stations_csv(rows, ['id', 'landmark'])
+        assert next(csv.reader(buffer)) == ['1', 'Twin Peaks, "North"']
+
+
+class TestImportStations:
+    """Tests for the non-PostgreSQL import path."""
+
+    def test_loads_rows(self, db_session, sample_repeater_json):
+        rows = _snapshot_rows(sample_repeater_json, 1, 2)
+        assert snapshot.import_stations(db_session, rows) == 2
+        assert _callsigns(db_session) == [(1, 'W6ABC'), (2, 'W6ABC')]
+
+    def test_merges_on_natural_key(self, db_session, sample_repeater_json):
+        snapshot.import_stations(db_session, _snapshot_rows(sample_repeater_json, 1))
+
+        rows = _snapshot_rows(sample_repeater_json, 1, 2)
+        rows[0]['callsign'] = 'K6NEW'
+        rows[0]['content_hash'] = 'changed'
+        snapshot.import_stations(db_session, rows)
+        assert _callsigns(db_session) == [(1, 'K6NEW'), (2, 'W6ABC')]
+
+    def test_replace_deletes_existing_stations(self, db_session, sample_repeater_json):
+        snapshot.import_stations(db_session, _snapshot_rows(sample_repeater_json, 1))
+        snapshot.import_stations(
+            db_session, _snapshot_rows(sample_repeater_json, 2), replace=True
+        )
+        assert _callsigns(db_session) == [(2, 'W6ABC')]
+
+
+class TestParquet:
+    """Tests for reading and writing snapshot files."""
+
+    def test_requires_pyarrow(self, db_session, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, 'pa', None)
+        with pytest.raises(snapshot.SnapshotError):
+            snapshot.export_stations(db_session, tmp_path)
+
+    def test_station_round_trip(self, db_session, sample_repeater_json, tmp_path):
+        pytest.importorskip('pyarrow')
+        snapshot.import_stations(db_session, _snapshot_rows(sample_repeater_json, 1, 2))
+        assert snapshot.export_stations(db_session, tmp_path) == 2
+
+        rows = snapshot.read_stations(tmp_path)
+        assert [row['repeater_id'] for row in rows] == [1, 2]
+        assert 'location' not in rows[0]
+
+        assert snapshot.import_stations(db_session, rows, replace=True) == 2
+        assert _callsigns(db_session) == [(1, 'W6ABC'), (2, 'W6ABC')]
+
+    def test_payload_round_trip(self, sample_repeater_json, tmp_path):
+        pytest.importorskip('pyarrow')
+        payloads = {'https://example.com/export.php?state=CA': [sample_repeater_json]}
+        assert snapshot.export_payloads(payloads, tmp_path) == 1
+        assert snapshot.read_payloads(tmp_path) == payloads
+
+    def test_missing_file(self, tmp_path):
+        pytest.importorskip('pyarrow')
+        with pytest.raises(snapshot.SnapshotError):
+            snapshot.read_stations(tmp_path)
@@ -0,0 +1,104 @@
+"""Tests for aprs_station_summary maintenance in the packet processor."""
+
+import queue
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from haminfo.mqtt import APRSPacketProcessorThread
+from haminfo.mqtt.processors import SUMMARY_COLUMNS
+
+
+def _processor(session, station_summary=True):
+    processor = APRSPacketProcessorThread(
+        queue.Queue(),
+        MagicMock(return_value=session),
+        {},
+        threading.Lock(),
+        station_summary=station_summary,
+    )
+    processor.packet_dicts = [
+        {
+            'from_call': 'N0CALL',
+            'timestamp': datetime(2026, 1, 1),
+            'received_at': datetime(2026, 1, 1),
+            'raw': 'N0CALL>APRS:>test',
+            'packet_type': 'status',
+        }
+    ]
+    return processor
+
+
+def _summary_row():
+    return (
+        'N0CALL',
+        datetime(2026, 1, 1),
+        'status',
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        'test',
+    )
+
+
+class TestCopyPath:
+    """The COPY path folds inserted rows into the summary in one statement."""
+
+    def _cursor(self, session):
+        cursor = MagicMock()
+        raw_conn = session.connection.return_value.connection.dbapi_connection
+        raw_conn.cursor.return_value.__enter__.return_value = cursor
+        return cursor
+
+    def test_summary_applied_to_returned_rows(self):
+        session = MagicMock()
+        cursor = self._cursor(session)
+        cursor.fetchone.return_value = (1, 1)
+
+        assert _processor(session)._save_with_copy() == 1
+
+        sql = cursor.execute.call_args_list[-1][0][0]
+        assert 'RETURNING ' + ','.join(SUMMARY_COLUMNS) in sql
+        assert 'aprs_station_summary_apply' in sql
+
+    def test_disabled(self):
+        session = MagicMock()
+        cursor = self._cursor(session)
+        cursor.rowcount = 1
+
+        assert _processor(session, station_summary=False)._save_with_copy() == 1
+
+        sql = cursor.execute.call_args_list[-1][0][0]
+        assert 'aprs_station_summary_apply' not in sql
+
+
+class TestInsertPath:
+    """The INSERT fallback applies the summary after committing packets."""
+
+    def test_summary_applied_with_column_arrays(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [_summary_row()]
+
+        assert _processor(session)._save_with_insert() == 1
+
+        apply_call = session.execute.call_args_list[-1]
+        assert 'aprs_station_summary_apply' in str(apply_call[0][0])
+        params = apply_call[0][1]
+        assert params['from_call'] == ['N0CALL']
+        assert params['comment'] == ['test']
+        assert session.commit.call_count == 2
+
+    def test_summary_failure_keeps_packets(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [_summary_row()]
+        session.execute.side_effect = [
+            session.execute.return_value,
+            Exception('function does not exist'),
+        ]
+
+        assert _processor(session)._save_with_insert() == 1
+        session.rollback.assert_called_once()
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+import pytest
+
 from haminfo.db.db import get_wx_history
 
 
@@ -92,6 +94,38 @@ class TestWxHistoryEndpoint:
         assert response.status_code == 400
         assert 'integer' in response.json['error'].lower()
 
+    def test_defaults_to_hourly_interval(
+        self, client, api_key_header, wx_station_with_reports
+    ):
+        """Test that interval defaults to 1h."""
+        station = wx_station_with_reports
+        response = client.get(
+            f'/api/v1/wx/history?station_id={station.id}&start=2026-03-20T00:00:00Z&end=2026-03-21T00:00:00Z&fields=temperature',
+            headers=api_key_header,
+        )
+        assert response.status_code == 200
+        assert response.json['interval'] == '1h'
+
+    def test_daily_interval(self, client, api_key_header, wx_station_with_reports):
+        """Test that interval=1d returns daily buckets."""
+        station = wx_station_with_reports
+        response = client.get(
+            f'/api/v1/wx/history?station_id={station.id}&start=2026-03-20T00:00:00Z&end=2026-03-21T00:00:00Z&fields=temperature&interval=1d',
+            headers=api_key_header,
+        )
+        assert response.status_code == 200
+        assert response.json['interval'] == '1d'
+        assert response.json['count'] == 1
+
+    def test_rejects_invalid_interval(self, client, api_key_header):
+        """Test that an unsupported interval returns 400."""
+        response = client.get(
+            '/api/v1/wx/history?station_id=1&start=2026-03-20T00:00:00Z&end=2026-03-21T00:00:00Z&fields=temperature&interval=5m',
+            headers=api_key_header,
+        )
+        assert response.status_code == 400
+        assert response.json['field'] == 'interval'
+
 
 class TestGetWxHistory:
     """Tests for get_wx_history database function."""
@@ -151,6 +185,40 @@ class TestGetWxHistory:
             assert 'pressure' not in row
             assert 'wind_speed' not in row
 
+    def test_returns_daily_aggregated_data(self, db_session, wx_station_with_reports):
+        """Test that interval='1d' aggregates by day."""
+        station = wx_station_with_reports
+        start = datetime(2026, 3, 20, 0, 0, 0, tzinfo=timezone.utc)
+        end = datetime(2026, 3, 21, 0, 0, 0, tzinfo=timezone.utc)
+
+        result = get_wx_history(
+            db_session,
+            station_id=station.id,
+            start=start,
+            end=end,
+            fields=['temperature'],
+            interval='1d',
+        )
+
+        assert len(result) == 1
+        assert result[0]['time'] == '2026-03-20T00:00:00Z'
+        assert result[0]['temperature'] == 22.0
+
+    def test_rejects_unknown_interval(self, db_session):
+        """Test that an unsupported interval raises ValueError."""
+        start = datetime(2026, 3, 20, 0, 0, 0, tzinfo=timezone.utc)
+        end = datetime(2026, 3, 21, 0, 0, 0, tzinfo=timezone.utc)
+
+        with pytest.raises(ValueError):
+            get_wx_history(
+                db_session,
+                station_id=1,
+                start=start,
+                end=end,
+                fields=['temperature'],
+                interval='5m',
+            )
+
 
 class TestOpenAPIEndpoint:
     """Tests for /openapi.json endpoint."""